@@ -0,0 +1,145 @@
+"""Interactive latency under batch load, with and without admission control.
+
+Models a tool whose calls all go through one upstream with limited capacity
+(a fixed number of connections, each call holding one for the service time).
+A batch client keeps many calls in flight while an interactive client makes
+one call at a time, and the interactive latency is compared with calls
+either going straight to the upstream or through an AdmissionController.
+
+Example::
+
+    python -m benchmarks.admission --batch-clients 64 --capacity 8 --calls 200
+"""
+
+import argparse
+import asyncio
+import contextlib
+import time
+from typing import Any, Dict
+
+from .stats import environment, save_results, summarize_latencies
+
+
+async def scenario(
+    admission: bool,
+    batch_clients: int,
+    capacity: int,
+    service_ms: float,
+    calls: int,
+) -> Dict[str, Any]:
+    """
+    Run one scenario.
+
+    Args:
+        admission: Whether calls pass through admission control
+        batch_clients: Number of batch calls kept in flight
+        capacity: Calls the upstream serves at once
+        service_ms: Upstream service time per call
+        calls: Number of interactive calls to time
+
+    Returns:
+        Interactive latency statistics and batch throughput
+    """
+    from src.weather.admission import (
+        BATCH,
+        INTERACTIVE,
+        AdmissionController,
+        Overloaded,
+    )
+
+    upstream = asyncio.Semaphore(capacity)
+    controller = AdmissionController(
+        max_concurrent=capacity,
+        max_per_client=batch_clients,
+        max_queue=batch_clients * 2,
+        max_queue_per_client=batch_clients * 2,
+    )
+    batch_done = 0
+    rejected = 0
+
+    async def call(client: str, priority: str) -> None:
+        guard = (
+            controller.admit("tool", client, priority)
+            if admission
+            else contextlib.nullcontext()
+        )
+        async with guard:
+            async with upstream:
+                await asyncio.sleep(service_ms / 1000)
+
+    async def batch_worker() -> None:
+        nonlocal batch_done, rejected
+        while True:
+            try:
+                await call("batch", BATCH)
+                batch_done += 1
+            except Overloaded:
+                rejected += 1
+                await asyncio.sleep(service_ms / 1000)
+
+    workers = [asyncio.create_task(batch_worker()) for _ in range(batch_clients)]
+    await asyncio.sleep(service_ms / 1000)
+
+    latencies = []
+    start = time.perf_counter()
+    for _ in range(calls):
+        began = time.perf_counter()
+        await call("interactive", INTERACTIVE)
+        latencies.append(time.perf_counter() - began)
+    elapsed = time.perf_counter() - start
+
+    for worker in workers:
+        worker.cancel()
+    await asyncio.gather(*workers, return_exceptions=True)
+    return {
+        "interactive": summarize_latencies(latencies),
+        "batch_throughput_rps": batch_done / elapsed,
+        "batch_rejected": rejected,
+    }
+
+
+def main() -> None:
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--batch-clients", type=int, default=64)
+    parser.add_argument("--capacity", type=int, default=8)
+    parser.add_argument("--service-ms", type=float, default=20.0)
+    parser.add_argument("--calls", type=int, default=200)
+    parser.add_argument(
+        "--label", default="admission", help="Prefix for the results file"
+    )
+    parser.add_argument("--no-save", action="store_true", help="Print results only")
+    args = parser.parse_args()
+
+    results = {}
+    for admission in (False, True):
+        name = "admission" if admission else "unlimited"
+        stats = asyncio.run(
+            scenario(
+                admission,
+                args.batch_clients,
+                args.capacity,
+                args.service_ms,
+                args.calls,
+            )
+        )
+        latency = stats["interactive"]
+        print(
+            f"{name:>10}: interactive p50 {latency['p50_ms']:.1f} ms, "
+            f"p99 {latency['p99_ms']:.1f} ms; "
+            f"batch {stats['batch_throughput_rps']:.0f} calls/s"
+        )
+        results[name] = stats
+
+    if not args.no_save:
+        saved = {
+            "benchmark": "admission",
+            "parameters": vars(args),
+            "environment": environment(),
+            "results": results,
+        }
+        print(f"Results saved to {save_results(args.label, saved)}")
+
+
+if __name__ == "__main__":
+    main()
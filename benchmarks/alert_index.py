@@ -0,0 +1,135 @@
+"""Point lookup benchmark for the alert spatial index.
+
+Builds an index over randomly placed alert polygons across the continental
+United States and times point lookups against it.
+
+Example::
+
+    python -m benchmarks.alert_index --alerts 5000 --lookups 20000
+"""
+
+import argparse
+import math
+import random
+import time
+from typing import Any, Dict, List
+
+from .stats import environment, save_results, summarize_latencies
+
+# Rough bounding box of the continental United States
+LON_RANGE = (-125.0, -67.0)
+LAT_RANGE = (25.0, 49.0)
+
+
+def random_alerts(
+    count: int, rng: random.Random, vertices: int = 24
+) -> List[Dict[str, Any]]:
+    """
+    Generate alert features with irregular polygon geometry.
+
+    Args:
+        count: Number of alerts
+        rng: Random number generator
+        vertices: Vertices per polygon
+
+    Returns:
+        Alert features
+    """
+    features = []
+    for i in range(count):
+        lon, lat = rng.uniform(*LON_RANGE), rng.uniform(*LAT_RANGE)
+        radius = rng.uniform(0.1, 1.0)
+        ring = []
+        for k in range(vertices):
+            angle = 2 * math.pi * k / vertices
+            r = radius * rng.uniform(0.6, 1.0)
+            ring.append([lon + r * math.cos(angle), lat + r * math.sin(angle)])
+        ring.append(ring[0])
+        features.append(
+            {
+                "id": f"alert-{i}",
+                "geometry": {"type": "Polygon", "coordinates": [ring]},
+                "properties": {
+                    "id": f"alert-{i}",
+                    "sent": f"{i:08d}",
+                    "geocode": {"UGC": []},
+                },
+            }
+        )
+    return features
+
+
+def run(alerts: int, lookups: int, seed: int) -> Dict[str, Any]:
+    """
+    Build the index and time point lookups.
+
+    Args:
+        alerts: Number of alert polygons
+        lookups: Number of point lookups
+        seed: Random seed
+
+    Returns:
+        Build time, lookup latency and match statistics
+    """
+    from src.weather.services.alert_index import AlertIndex
+
+    rng = random.Random(seed)
+    features = random_alerts(alerts, rng)
+    index = AlertIndex()
+
+    start = time.perf_counter()
+    index.update(features)
+    build_s = time.perf_counter() - start
+
+    # Re-applying the same feed should cost almost nothing
+    start = time.perf_counter()
+    index.update(features)
+    refresh_s = time.perf_counter() - start
+
+    latencies = []
+    matched = 0
+    for _ in range(lookups):
+        lon, lat = rng.uniform(*LON_RANGE), rng.uniform(*LAT_RANGE)
+        start = time.perf_counter()
+        matched += len(index.lookup(lat, lon))
+        latencies.append(time.perf_counter() - start)
+
+    return {
+        "build_ms": build_s * 1000,
+        "refresh_unchanged_ms": refresh_s * 1000,
+        "mean_matches": matched / lookups if lookups else 0.0,
+        "latency": summarize_latencies(latencies),
+    }
+
+
+def main() -> None:
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--alerts", type=int, default=5000)
+    parser.add_argument("--lookups", type=int, default=20000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--label", default="alert_index", help="Prefix for the results file"
+    )
+    parser.add_argument("--no-save", action="store_true", help="Print results only")
+    args = parser.parse_args()
+
+    stats = run(args.alerts, args.lookups, args.seed)
+    latency = stats["latency"]
+    print(
+        f"{args.alerts} alerts: build {stats['build_ms']:.1f} ms, "
+        f"unchanged refresh {stats['refresh_unchanged_ms']:.1f} ms, "
+        f"lookup p50 {latency['p50_ms'] * 1000:.1f} us, p99 {latency['p99_ms'] * 1000:.1f} us"
+    )
+    if not args.no_save:
+        results = {
+            "benchmark": "alert_index",
+            "parameters": vars(args),
+            "environment": environment(),
+            "results": stats,
+        }
+        print(f"Results saved to {save_results(args.label, results)}")
+
+
+if __name__ == "__main__":
+    main()
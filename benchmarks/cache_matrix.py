@@ -0,0 +1,259 @@
+"""Throughput and memory of each response cache backend.
+
+Stores and reads back JSON payloads of each size with every backend, timing
+sets, hits and misses, and reports the memory each backend holds for them:
+the Python heap it retained (traced with tracemalloc) and the size it
+reports for its store (the SQLite file, the Redis server's memory).
+Without --redis-url, the Redis backend runs against the local stand-in in
+benchmarks/redis_stub.py, so its numbers include the stand-in's Python
+overhead and say little about a real server.
+
+Example::
+
+    python -m benchmarks.cache_matrix --entries 2000 --sizes 1024,65536
+"""
+
+import argparse
+import asyncio
+import gc
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from .stats import environment, save_results
+
+BACKENDS = ("memory", "sized", "sqlite", "redis")
+
+
+def payload(size: int) -> Dict[str, Any]:
+    """
+    Build an alert-like JSON payload of roughly a given encoded size.
+
+    Args:
+        size: Target size in bytes
+
+    Returns:
+        Payload
+    """
+    feature_size = 200
+    return {
+        "features": [
+            {"id": f"alert-{i}", "properties": {"description": "x" * 160}}
+            for i in range(max(1, size // feature_size))
+        ]
+    }
+
+
+def make_factory(
+    backend: str, directory: str, redis_url: Optional[str]
+) -> Callable[[], Any]:
+    """
+    Get a function creating a fresh, empty cache of a backend.
+
+    Args:
+        backend: Backend name
+        directory: Directory for SQLite files
+        redis_url: Redis server URL
+
+    Returns:
+        Cache factory
+    """
+    from src.weather.cache import MemoryCache, SizedMemoryCache
+    from src.weather.cache.redis import RedisCache
+    from src.weather.cache.sqlite import SQLiteCache
+
+    counter = iter(range(1_000_000))
+    if backend == "memory":
+        return lambda: MemoryCache(max_entries=1_000_000)
+    if backend == "sized":
+        return lambda: SizedMemoryCache(max_bytes=1 << 40, max_entries=1_000_000)
+    if backend == "sqlite":
+        return lambda: SQLiteCache(str(Path(directory) / f"{next(counter)}.sqlite3"))
+    return lambda: RedisCache(redis_url, prefix=f"bench{next(counter)}:")
+
+
+async def timed(
+    operations: List[Callable[[], Any]], concurrency: int
+) -> Dict[str, float]:
+    """
+    Run operations from a number of concurrent tasks.
+
+    Args:
+        operations: Coroutine functions to run
+        concurrency: Number of tasks
+
+    Returns:
+        Operations per second and mean latency in microseconds
+    """
+    pending = iter(operations)
+
+    async def worker() -> None:
+        for operation in pending:
+            await operation()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    count = len(operations)
+    return {
+        "ops_per_s": count / elapsed if elapsed else 0.0,
+        "mean_us": elapsed / count * 1e6 * concurrency if count else 0.0,
+    }
+
+
+async def measure(
+    factory: Callable[[], Any], entries: int, size: int, concurrency: int
+) -> Dict[str, Any]:
+    """
+    Measure one backend at one payload size.
+
+    Args:
+        factory: Cache factory
+        entries: Number of entries to store
+        size: Payload size in bytes
+        concurrency: Number of concurrent tasks
+
+    Returns:
+        Set, hit and miss throughput and memory figures
+    """
+    value = payload(size)
+    keys = [f"https://api.weather.gov/alerts/{i}" for i in range(entries)]
+
+    cache = factory()
+    sets = await timed(
+        [
+            lambda key=key: cache.set(key, value, ttl=600, tags=("alerts",))
+            for key in keys
+        ],
+        concurrency,
+    )
+    hits = await timed([lambda key=key: cache.get(key) for key in keys], concurrency)
+    misses = await timed(
+        [lambda key=key: cache.get(key + "/missing") for key in keys], concurrency
+    )
+    stats = await cache.stats()
+    await cache.clear()
+    if hasattr(cache, "close"):
+        cache.close()
+
+    # Memory is traced on a separate pass, as tracing slows every allocation.
+    # Each entry gets its own copy of the payload, as a decoded response would
+    gc.collect()
+    cache = factory()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    for key in keys:
+        await cache.set(key, payload(size), ttl=600, tags=("alerts",))
+    gc.collect()
+    retained = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    store_bytes = (await cache.stats())["bytes"]
+    await cache.clear()
+    if hasattr(cache, "close"):
+        cache.close()
+
+    return {
+        "set": sets,
+        "hit": hits,
+        "miss": misses,
+        "heap_bytes_per_entry": retained / entries,
+        "store_bytes_per_entry": store_bytes / entries if store_bytes else None,
+        "hit_ratio": stats["hit_ratio"],
+    }
+
+
+async def run(
+    backends: List[str],
+    entries: int,
+    sizes: List[int],
+    concurrency: int,
+    redis_url: Optional[str],
+) -> Dict[str, Any]:
+    """
+    Measure every backend at every payload size.
+
+    Args:
+        backends: Backend names
+        entries: Entries stored per measurement
+        sizes: Payload sizes in bytes
+        concurrency: Number of concurrent tasks
+        redis_url: Redis server URL, or None to use the local stand-in
+
+    Returns:
+        Results by backend and size
+    """
+    from .redis_stub import RedisStub
+
+    stub = None
+    if "redis" in backends and redis_url is None:
+        stub = await RedisStub().start()
+        redis_url = stub.url
+
+    results: Dict[str, Any] = {}
+    try:
+        with tempfile.TemporaryDirectory(prefix="cache-matrix-") as directory:
+            for backend in backends:
+                factory = make_factory(backend, directory, redis_url)
+                results[backend] = {}
+                for size in sizes:
+                    result = await measure(factory, entries, size, concurrency)
+                    results[backend][str(size)] = result
+                    print(
+                        f"{backend:>6} {size:>8} B: "
+                        f"set {result['set']['ops_per_s']:>9.0f}/s, "
+                        f"hit {result['hit']['ops_per_s']:>9.0f}/s, "
+                        f"miss {result['miss']['ops_per_s']:>9.0f}/s, "
+                        f"heap {result['heap_bytes_per_entry']:>9.0f} B/entry, "
+                        f"store {result['store_bytes_per_entry'] or 0:>9.0f} B/entry"
+                    )
+    finally:
+        if stub is not None:
+            await stub.stop()
+    return results
+
+
+def main() -> None:
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--backends",
+        default=",".join(BACKENDS),
+        help=f"Comma-separated backends out of {', '.join(BACKENDS)}",
+    )
+    parser.add_argument("--entries", type=int, default=2000)
+    parser.add_argument(
+        "--sizes", default="1024,65536", help="Comma-separated payload sizes in bytes"
+    )
+    parser.add_argument("--concurrency", type=int, default=1)
+    parser.add_argument(
+        "--redis-url", help="Redis server to measure instead of the local stand-in"
+    )
+    parser.add_argument(
+        "--label", default="cache_matrix", help="Prefix for the results file"
+    )
+    parser.add_argument("--no-save", action="store_true", help="Print results only")
+    args = parser.parse_args()
+
+    backends = [name.strip() for name in args.backends.split(",") if name.strip()]
+    unknown = set(backends) - set(BACKENDS)
+    if unknown:
+        parser.error(f"unknown backends: {', '.join(sorted(unknown))}")
+    sizes = [int(size) for size in args.sizes.split(",")]
+
+    results = asyncio.run(
+        run(backends, args.entries, sizes, args.concurrency, args.redis_url)
+    )
+    if not args.no_save:
+        output = {
+            "benchmark": "cache_matrix",
+            "parameters": vars(args),
+            "environment": environment(),
+            "results": results,
+        }
+        print(f"Results saved to {save_results(args.label, output)}")
+
+
+if __name__ == "__main__":
+    main()
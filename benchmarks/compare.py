@@ -0,0 +1,51 @@
+"""Compare two saved benchmark result files.
+
+Example::
+
+    python -m benchmarks.compare benchmarks/results/load-a.json benchmarks/results/load-b.json
+"""
+
+import argparse
+import json
+from pathlib import Path
+from typing import Any, Dict, Iterator, Tuple
+
+
+def flatten(data: Dict[str, Any], prefix: str = "") -> Iterator[Tuple[str, float]]:
+    """
+    Flatten nested numeric results into dotted keys.
+
+    Args:
+        data: Nested results dictionary
+        prefix: Key prefix for the current level
+
+    Yields:
+        Pairs of dotted key and numeric value
+    """
+    for key, value in data.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, dict):
+            yield from flatten(value, f"{name}.")
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            yield name, float(value)
+
+
+def main() -> None:
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("baseline", type=Path)
+    parser.add_argument("candidate", type=Path)
+    args = parser.parse_args()
+
+    baseline = dict(flatten(json.loads(args.baseline.read_text())["results"]))
+    candidate = dict(flatten(json.loads(args.candidate.read_text())["results"]))
+
+    print(f"{'metric':40} {'baseline':>12} {'candidate':>12} {'change':>9}")
+    for key in sorted(baseline.keys() & candidate.keys()):
+        old, new = baseline[key], candidate[key]
+        change = f"{(new - old) / old * 100:+.1f}%" if old else "n/a"
+        print(f"{key:40} {old:12.2f} {new:12.2f} {change:>9}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""Standalone launchers weather.py and shell.py against main.py.
+
+Starts each launcher over stdio, times how long it takes to start and list
+its tools, then times the same tool calls made one after another through
+it and through ``main.py``: forecasts and alerts against the local NWS
+stand-in for weather.py, and a short shell command for shell.py.
+
+Example::
+
+    python -m benchmarks.launchers --calls 200
+"""
+
+import argparse
+import asyncio
+import contextlib
+import sys
+import time
+from typing import Any, Dict, List, Tuple
+
+from mcp import ClientSession, StdioServerParameters
+from mcp.client.stdio import stdio_client
+
+from .mcp_load import REPO_ROOT, server_environment
+from .nws_stub import stub_server
+from .stats import environment, save_results, summarize_latencies
+
+# Tool calls each launcher is compared on, made in turn
+WORKLOADS: Dict[str, List[Tuple[str, Dict[str, Any]]]] = {
+    "weather.py": [
+        ("get_forecast", {"latitude": 39.7456, "longitude": -97.0892}),
+        ("get_alerts", {"state": "KS"}),
+    ],
+    "shell.py": [("run_shell_command", {"command": "echo hello"})],
+}
+
+
+async def measure(
+    script: str, calls: List[Tuple[str, Dict[str, Any]]], count: int, nws_base: str
+) -> Dict[str, Any]:
+    """
+    Time startup and sequential tool calls through a launcher.
+
+    Args:
+        script: Launcher to run, relative to the repository root
+        calls: Tool calls to make in turn
+        count: Number of calls to make
+        nws_base: NWS base URL for the server
+
+    Returns:
+        Startup time and call latency statistics
+    """
+    params = StdioServerParameters(
+        command=sys.executable,
+        args=[str(REPO_ROOT / script)],
+        env=server_environment(nws_base),
+        cwd=REPO_ROOT,
+    )
+    began = time.perf_counter()
+    async with stdio_client(params) as streams:
+        async with ClientSession(*streams) as session:
+            await session.initialize()
+            await session.list_tools()
+            startup = time.perf_counter() - began
+
+            latencies = []
+            for i in range(count):
+                name, arguments = calls[i % len(calls)]
+                call_began = time.perf_counter()
+                result = await session.call_tool(name, arguments)
+                latencies.append(time.perf_counter() - call_began)
+                if result.isError:
+                    raise RuntimeError(f"{script} {name} failed: {result.content}")
+    return {"startup_ms": startup * 1000, "calls": summarize_latencies(latencies)}
+
+
+def main() -> None:
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--calls", type=int, default=200)
+    parser.add_argument("--latency-ms", type=float, default=20.0)
+    parser.add_argument("--jitter-ms", type=float, default=5.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--label", default="launchers", help="Prefix for the results file"
+    )
+    parser.add_argument("--no-save", action="store_true", help="Print results only")
+    args = parser.parse_args()
+
+    results: Dict[str, Any] = {}
+    with contextlib.ExitStack() as stack:
+        nws_base = stack.enter_context(
+            stub_server(args.latency_ms, args.jitter_ms, args.seed)
+        )
+        for launcher, calls in WORKLOADS.items():
+            for script in (launcher, "main.py"):
+                stats = asyncio.run(measure(script, calls, args.calls, nws_base))
+                latency = stats["calls"]
+                print(
+                    f"{launcher} workload via {script:>10}: "
+                    f"startup {stats['startup_ms']:.0f} ms, "
+                    f"p50 {latency['p50_ms']:.2f} ms, p99 {latency['p99_ms']:.2f} ms"
+                )
+                results[f"{launcher} workload via {script}"] = stats
+
+    if not args.no_save:
+        saved = {
+            "benchmark": "launchers",
+            "parameters": vars(args),
+            "environment": environment(),
+            "results": results,
+        }
+        print(f"Results saved to {save_results(args.label, saved)}")
+
+
+if __name__ == "__main__":
+    main()
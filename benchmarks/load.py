@@ -0,0 +1,165 @@
+"""In-process load driver for the weather MCP tools.
+
+Starts the local NWS stand-in, points the weather service at it, and calls
+the tools through an in-memory MCP client session at a fixed concurrency.
+
+Example::
+
+    python -m benchmarks.load --workload mixed --concurrency 16 --requests 2000
+
+With ``--replay DIR`` responses come from an archive recorded by
+``benchmarks.record`` instead of the stand-in.
+"""
+
+import argparse
+import asyncio
+import contextlib
+import itertools
+import os
+import time
+from typing import Any, Dict, List, Tuple
+
+from .nws_stub import stub_server
+from .stats import environment, save_results, summarize_latencies
+
+WORKLOADS: Dict[str, List[Tuple[str, Dict[str, Any]]]] = {
+    "alerts": [("get_alerts", {"state": "KS"})],
+    "forecast": [("get_forecast", {"latitude": 39.7456, "longitude": -97.0892})],
+    "point-alerts": [("get_alerts_for_point", {"latitude": 38.9, "longitude": -96.5})],
+    "hourly": [("get_hourly_forecast", {"latitude": 39.7456, "longitude": -97.0892})],
+    "gridpoint": [
+        ("get_gridpoint_forecast", {"latitude": 39.7456, "longitude": -97.0892})
+    ],
+    "mixed": [
+        ("get_alerts", {"state": "KS"}),
+        ("get_forecast", {"latitude": 39.7456, "longitude": -97.0892}),
+    ],
+}
+
+
+async def drive(
+    workload: str, concurrency: int, total_requests: int, warmup: int = 0
+) -> Dict[str, Any]:
+    """
+    Call the tools through an in-process MCP client at a fixed concurrency.
+
+    The weather service must already be configured to talk to the stand-in.
+
+    Args:
+        workload: Name of the workload in WORKLOADS
+        concurrency: Number of concurrent callers
+        total_requests: Number of measured tool calls
+        warmup: Number of unmeasured calls made before measuring
+
+    Returns:
+        Dictionary with throughput, latency and error statistics
+    """
+    from mcp.shared.memory import create_connected_server_and_client_session
+
+    from src.weather.server import create_server
+
+    server = create_server()
+    calls = itertools.cycle(WORKLOADS[workload])
+    latencies: Dict[str, List[float]] = {name: [] for name, _ in WORKLOADS[workload]}
+    errors = 0
+
+    async with create_connected_server_and_client_session(server._mcp_server) as client:
+        for _ in range(warmup):
+            name, arguments = next(calls)
+            await client.call_tool(name, arguments)
+
+        remaining = total_requests
+
+        async def worker() -> None:
+            nonlocal remaining, errors
+            while remaining > 0:
+                remaining -= 1
+                name, arguments = next(calls)
+                start = time.perf_counter()
+                result = await client.call_tool(name, arguments)
+                latencies[name].append(time.perf_counter() - start)
+                text = result.content[0].text if result.content else ""
+                if result.isError or text.startswith("Unable"):
+                    errors += 1
+
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+
+    all_latencies = [value for values in latencies.values() for value in values]
+    return {
+        "elapsed_s": elapsed,
+        "throughput_rps": len(all_latencies) / elapsed if elapsed else 0.0,
+        "errors": errors,
+        "latency": summarize_latencies(all_latencies),
+        "per_tool": {
+            name: summarize_latencies(values) for name, values in latencies.items()
+        },
+    }
+
+
+def main() -> None:
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workload", choices=sorted(WORKLOADS), default="mixed")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--warmup", type=int, default=20)
+    parser.add_argument("--latency-ms", type=float, default=20.0)
+    parser.add_argument("--jitter-ms", type=float, default=5.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--cache",
+        action="store_true",
+        help="Answer from the response cache instead of calling the stand-in",
+    )
+    parser.add_argument(
+        "--replay",
+        metavar="DIR",
+        help="Serve responses from a recorded archive instead of the stand-in",
+    )
+    parser.add_argument("--label", default="load", help="Prefix for the results file")
+    parser.add_argument("--no-save", action="store_true", help="Print results only")
+    args = parser.parse_args()
+
+    if not args.cache:
+        os.environ["WEATHER_CACHE_DISABLED"] = "1"
+    # One session stands in for many users, so lift the per-client limits
+    os.environ.setdefault("WEATHER_MAX_CONCURRENT_PER_CLIENT", str(args.concurrency))
+    os.environ.setdefault("WEATHER_MAX_CONCURRENT", str(args.concurrency))
+
+    with contextlib.ExitStack() as stack:
+        if args.replay:
+            # The archive simulates the upstream latency itself
+            os.environ["WEATHER_HTTP_MODE"] = "replay"
+            os.environ["WEATHER_ARCHIVE_DIR"] = args.replay
+            os.environ["WEATHER_REPLAY_LATENCY_MS"] = str(args.latency_ms)
+            os.environ["WEATHER_REPLAY_JITTER_MS"] = str(args.jitter_ms)
+        else:
+            base_url = stack.enter_context(
+                stub_server(args.latency_ms, args.jitter_ms, args.seed)
+            )
+            # Must be set before the weather package is imported
+            os.environ["WEATHER_NWS_API_BASE"] = base_url
+        stats = asyncio.run(
+            drive(args.workload, args.concurrency, args.requests, args.warmup)
+        )
+
+    results = {
+        "benchmark": "load",
+        "parameters": vars(args),
+        "environment": environment(),
+        "results": stats,
+    }
+    latency = stats["latency"]
+    print(
+        f"{args.workload}: {stats['throughput_rps']:.1f} req/s, "
+        f"p50 {latency['p50_ms']:.1f} ms, p95 {latency['p95_ms']:.1f} ms, "
+        f"p99 {latency['p99_ms']:.1f} ms, errors {stats['errors']}"
+    )
+    if not args.no_save:
+        print(f"Results saved to {save_results(args.label, results)}")
+
+
+if __name__ == "__main__":
+    main()
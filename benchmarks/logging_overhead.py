@@ -0,0 +1,151 @@
+"""Cost of logging on the event loop, written directly or through the queue.
+
+Logs from many concurrent coroutines into a stream that takes a fixed time
+per write (standing in for a busy terminal or log collector), first with a
+plain StreamHandler and then through the queue and writer thread of
+src.weather.logs. Reports the time each logging call holds the event loop,
+and the cost of a disabled debug call with an f-string message against a
+%-style one.
+
+Example::
+
+    python -m benchmarks.logging_overhead --coroutines 50 --records 200 --write-ms 0.2
+"""
+
+import argparse
+import asyncio
+import io
+import logging
+import logging.handlers
+import queue
+import time
+import timeit
+from typing import Any, Dict
+
+from .stats import environment, save_results, summarize_latencies
+
+
+class SlowStream(io.StringIO):
+    """Stream taking a fixed time per write."""
+
+    def __init__(self, delay: float):
+        super().__init__()
+        self.delay = delay
+
+    def write(self, text: str) -> int:
+        time.sleep(self.delay)
+        return len(text)
+
+
+async def measure(
+    handler: logging.Handler, coroutines: int, records: int
+) -> Dict[str, Any]:
+    """
+    Time logging calls made from concurrent coroutines.
+
+    Args:
+        handler: Handler the logger writes to
+        coroutines: Concurrent coroutines logging
+        records: Records logged by each coroutine
+
+    Returns:
+        Latency statistics of the logging calls
+    """
+    logger = logging.getLogger("benchmarks.logging_overhead")
+    logger.handlers = [handler]
+    logger.propagate = False
+    logger.setLevel(logging.INFO)
+    latencies = []
+
+    async def work(index: int) -> None:
+        for i in range(records):
+            began = time.perf_counter()
+            logger.info("Call %d of worker %d: %s", i, index, {"state": "KS"})
+            latencies.append(time.perf_counter() - began)
+            await asyncio.sleep(0)
+
+    began = time.perf_counter()
+    await asyncio.gather(*(work(index) for index in range(coroutines)))
+    return {
+        **summarize_latencies(latencies),
+        "elapsed_s": time.perf_counter() - began,
+    }
+
+
+def disabled_call_ns(style: str, number: int = 200_000) -> float:
+    """
+    Time a debug call below the logger's level.
+
+    Args:
+        style: 'fstring' or 'percent'
+        number: Calls to time
+
+    Returns:
+        Nanoseconds per call
+    """
+    logger = logging.getLogger("benchmarks.logging_overhead.disabled")
+    logger.setLevel(logging.INFO)
+    url, size = "https://api.weather.gov/points/39.7,-97.1", 1234
+    if style == "fstring":
+        call = lambda: logger.debug(f"Fetched {url}: {size} bytes")  # noqa: E731
+    else:
+        call = lambda: logger.debug("Fetched %s: %s bytes", url, size)  # noqa: E731
+    return timeit.timeit(call, number=number) / number * 1e9
+
+
+def main() -> None:
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--coroutines", type=int, default=50)
+    parser.add_argument("--records", type=int, default=200)
+    parser.add_argument(
+        "--write-ms", type=float, default=0.2, help="Time the stream takes per write"
+    )
+    parser.add_argument(
+        "--label", default="logging_overhead", help="Prefix for the results file"
+    )
+    parser.add_argument("--no-save", action="store_true", help="Print results only")
+    args = parser.parse_args()
+
+    from src.weather.logs import ContextQueueHandler, JsonFormatter
+
+    stream = SlowStream(args.write_ms / 1000)
+    direct = logging.StreamHandler(stream)
+    direct.setFormatter(JsonFormatter())
+
+    queued = ContextQueueHandler(queue.Queue(10_000))
+    writer = logging.StreamHandler(stream)
+    writer.setFormatter(JsonFormatter())
+    listener = logging.handlers.QueueListener(queued.queue, writer)
+
+    results: Dict[str, Any] = {}
+    results["direct"] = asyncio.run(measure(direct, args.coroutines, args.records))
+    listener.start()
+    results["queued"] = asyncio.run(measure(queued, args.coroutines, args.records))
+    listener.stop()
+    results["queued"]["dropped"] = queued.dropped
+
+    for name in ("direct", "queued"):
+        latency = results[name]
+        print(
+            f"{name:>6}: p50 {latency['p50_ms'] * 1000:.1f} us, "
+            f"p99 {latency['p99_ms'] * 1000:.1f} us, "
+            f"loop busy {latency['elapsed_s']:.2f} s"
+        )
+    print(f"queued: {queued.dropped} records dropped")
+    for style in ("fstring", "percent"):
+        results[f"disabled_{style}_ns"] = disabled_call_ns(style)
+        print(f"disabled debug, {style}: {results[f'disabled_{style}_ns']:.0f} ns")
+
+    if not args.no_save:
+        saved = {
+            "benchmark": "logging_overhead",
+            "parameters": vars(args),
+            "environment": environment(),
+            "results": results,
+        }
+        print(f"Results saved to {save_results(args.label, saved)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,418 @@
+"""MCP-level load generator for the stdio and SSE transports.
+
+Spawns the server over stdio (or over SSE, or connects to a running SSE
+server), drives a weighted mix of tool calls and resource reads at one or
+more target rates, and reports achieved throughput, latency distribution,
+server memory growth and event-loop lag for each rate.
+
+By default the server is pointed at the local NWS stand-in, so the test
+runs offline. Example::
+
+    python -m benchmarks.mcp_load --transport stdio --rates 20 50 100 --duration 15
+"""
+
+import argparse
+import asyncio
+import contextlib
+import itertools
+import os
+import random
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+import psutil
+from mcp import ClientSession, StdioServerParameters
+from mcp.client.sse import sse_client
+from mcp.client.stdio import stdio_client
+
+from .nws_stub import find_free_port, stub_server
+from .stats import environment, save_results, summarize_latencies
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+# Per-client admission limits for the spawned server; the open-loop driver
+# may have many calls in flight through its one session
+OPEN_LOOP_LIMIT = 10_000
+
+OPERATIONS: Dict[str, Tuple[str, Any]] = {
+    "get_alerts": ("tool", {"state": "KS"}),
+    "get_forecast": ("tool", {"latitude": 39.7456, "longitude": -97.0892}),
+    "processes://top": ("resource", None),
+}
+
+
+def parse_mix(spec: str) -> Dict[str, float]:
+    """
+    Parse a workload mix such as ``get_alerts=4,get_forecast=4,processes://top=1``.
+
+    Args:
+        spec: Comma-separated operation=weight pairs
+
+    Returns:
+        Mapping of operation name to relative weight
+    """
+    mix = {}
+    for item in spec.split(","):
+        name, _, weight = item.rpartition("=")
+        if name not in OPERATIONS:
+            raise argparse.ArgumentTypeError(f"Unknown operation: {name}")
+        mix[name] = float(weight)
+    return mix
+
+
+class ResourceSampler:
+    """Periodically sample server RSS and client/server event-loop lag."""
+
+    def __init__(
+        self, session: ClientSession, pid: Optional[int], interval: float = 0.25
+    ):
+        self.session = session
+        self.process = psutil.Process(pid) if pid else None
+        self.interval = interval
+        self.rss: List[int] = []
+        self.client_lag: List[float] = []
+        self.ping: List[float] = []
+        self._task: Optional[asyncio.Task] = None
+
+    async def _run(self) -> None:
+        while True:
+            expected = time.perf_counter() + self.interval
+            await asyncio.sleep(self.interval)
+            # Oversleeping shows how long the load generator's own loop was blocked
+            self.client_lag.append(max(0.0, time.perf_counter() - expected))
+            if self.process:
+                with contextlib.suppress(psutil.Error):
+                    # Include SSE worker processes forked by the server
+                    processes = [self.process, *self.process.children(recursive=True)]
+                    self.rss.append(
+                        sum(process.memory_info().rss for process in processes)
+                    )
+            # A ping is answered straight from the server's event loop, so its
+            # round trip tracks how long the server loop takes to get to it
+            start = time.perf_counter()
+            await self.session.send_ping()
+            self.ping.append(time.perf_counter() - start)
+
+    def start(self) -> None:
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+
+    def summary(self) -> Dict[str, Any]:
+        memory = None
+        if self.rss:
+            memory = {
+                "start_mb": self.rss[0] / 2**20,
+                "end_mb": self.rss[-1] / 2**20,
+                "peak_mb": max(self.rss) / 2**20,
+                "growth_mb": (self.rss[-1] - self.rss[0]) / 2**20,
+            }
+        return {
+            "server_memory": memory,
+            "client_loop_lag": summarize_latencies(self.client_lag),
+            "server_ping": summarize_latencies(self.ping),
+        }
+
+
+async def run_stage(
+    sessions: List[ClientSession],
+    pid: Optional[int],
+    mix: Dict[str, float],
+    rate: float,
+    duration: float,
+    max_in_flight: int,
+    rng: random.Random,
+) -> Dict[str, Any]:
+    """
+    Drive an open-loop workload at a target rate.
+
+    Calls are issued on a Poisson schedule regardless of how quickly earlier
+    calls complete, up to ``max_in_flight`` outstanding calls; arrivals beyond
+    that are counted as dropped. Calls are spread round-robin over the client
+    sessions.
+
+    Args:
+        sessions: Initialized client sessions
+        pid: Server process id for memory sampling, if known
+        mix: Operation weights
+        rate: Target calls per second
+        duration: Seconds to run
+        max_in_flight: Cap on outstanding calls
+        rng: Random generator for arrivals and operation choice
+
+    Returns:
+        Statistics for the stage
+    """
+    names = list(mix)
+    weights = [mix[name] for name in names]
+    latencies: Dict[str, List[float]] = {name: [] for name in names}
+    errors = 0
+    dropped = 0
+    in_flight: set = set()
+
+    async def call(session: ClientSession, name: str) -> None:
+        nonlocal errors
+        kind, arguments = OPERATIONS[name]
+        start = time.perf_counter()
+        try:
+            if kind == "tool":
+                result = await session.call_tool(name, arguments)
+                text = result.content[0].text if result.content else ""
+                if result.isError or text.startswith("Unable"):
+                    errors += 1
+            else:
+                await session.read_resource(name)
+        except Exception:
+            errors += 1
+        latencies[name].append(time.perf_counter() - start)
+
+    sampler = ResourceSampler(sessions[0], pid)
+    sampler.start()
+    clients = itertools.cycle(sessions)
+    start = time.perf_counter()
+    next_arrival = start
+    while next_arrival - start < duration:
+        await asyncio.sleep(max(0.0, next_arrival - time.perf_counter()))
+        if len(in_flight) >= max_in_flight:
+            dropped += 1
+        else:
+            task = asyncio.create_task(
+                call(next(clients), rng.choices(names, weights)[0])
+            )
+            in_flight.add(task)
+            task.add_done_callback(in_flight.discard)
+        next_arrival += rng.expovariate(rate)
+    if in_flight:
+        await asyncio.gather(*in_flight)
+    elapsed = time.perf_counter() - start
+    await sampler.stop()
+
+    completed = [value for values in latencies.values() for value in values]
+    return {
+        "target_rps": rate,
+        "achieved_rps": len(completed) / elapsed if elapsed else 0.0,
+        "completed": len(completed),
+        "errors": errors,
+        "dropped": dropped,
+        "latency": summarize_latencies(completed),
+        "per_operation": {
+            name: summarize_latencies(values) for name, values in latencies.items()
+        },
+        **sampler.summary(),
+    }
+
+
+def server_environment(nws_base: str, cache: bool = False) -> Dict[str, str]:
+    """
+    Build the environment for a spawned server process.
+
+    Args:
+        nws_base: NWS base URL the server should talk to
+        cache: Whether the server may answer from its response cache
+
+    Returns:
+        Environment variables for the child process
+    """
+    env = dict(os.environ)
+    env["WEATHER_NWS_API_BASE"] = nws_base
+    if not cache:
+        env["WEATHER_CACHE_DISABLED"] = "1"
+    # One session stands in for many users, so lift the per-client limits
+    env.setdefault("WEATHER_MAX_CONCURRENT_PER_CLIENT", str(OPEN_LOOP_LIMIT))
+    env.setdefault("WEATHER_MAX_QUEUE_PER_CLIENT", str(OPEN_LOOP_LIMIT))
+    env["PYTHONPATH"] = os.pathsep.join(
+        filter(None, [str(REPO_ROOT), env.get("PYTHONPATH")])
+    )
+    return env
+
+
+@contextlib.asynccontextmanager
+async def connect(
+    args: argparse.Namespace, nws_base: str
+) -> AsyncIterator[Tuple[List[ClientSession], Optional[int]]]:
+    """
+    Connect to the server under test over the requested transport.
+
+    Args:
+        args: Parsed command-line arguments
+        nws_base: NWS base URL for spawned servers
+
+    Yields:
+        Initialized client sessions and the server process id, if known
+    """
+    if args.transport == "stdio":
+        params = StdioServerParameters(
+            command=sys.executable,
+            args=["-m", "main"],
+            env=server_environment(nws_base, args.cache),
+        )
+        async with stdio_client(params) as streams:
+            async with ClientSession(*streams) as session:
+                await session.initialize()
+                # The stand-in is also a child of this process, so match on the command line
+                servers = [
+                    child.pid
+                    for child in psutil.Process().children()
+                    if "main" in child.cmdline()
+                ]
+                yield [session], servers[0] if servers else None
+        return
+
+    process = None
+    url = args.url
+    if not url:
+        port = find_free_port()
+        command = [
+            sys.executable,
+            "-m",
+            "main",
+            "--transport",
+            "sse",
+            "--host",
+            "127.0.0.1",
+            "--port",
+            str(port),
+        ]
+        command += ["--workers", str(args.workers)]
+        process = subprocess.Popen(
+            command, env=server_environment(nws_base, args.cache), cwd=REPO_ROOT
+        )
+        url = f"http://127.0.0.1:{port}/sse"
+        await wait_for_port("127.0.0.1", port)
+    try:
+        async with contextlib.AsyncExitStack() as stack:
+            sessions = []
+            for _ in range(args.clients):
+                streams = await stack.enter_async_context(sse_client(url))
+                session = await stack.enter_async_context(ClientSession(*streams))
+                await session.initialize()
+                sessions.append(session)
+            yield sessions, process.pid if process else None
+    finally:
+        if process:
+            # uvicorn waits for open SSE streams on graceful shutdown
+            process.terminate()
+            try:
+                process.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                process.kill()
+                process.wait()
+
+
+async def wait_for_port(host: str, port: int, timeout: float = 15.0) -> None:
+    """
+    Wait until a TCP port accepts connections.
+
+    Args:
+        host: Host to connect to
+        port: Port to connect to
+        timeout: Seconds to wait before giving up
+    """
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            _, writer = await asyncio.open_connection(host, port)
+            writer.close()
+            await writer.wait_closed()
+            return
+        except OSError:
+            if time.monotonic() > deadline:
+                raise RuntimeError(f"Server did not start listening on {host}:{port}")
+            await asyncio.sleep(0.1)
+
+
+async def run(args: argparse.Namespace, nws_base: str) -> List[Dict[str, Any]]:
+    """
+    Run every requested rate stage against one server.
+
+    Args:
+        args: Parsed command-line arguments
+        nws_base: NWS base URL for spawned servers
+
+    Returns:
+        Statistics for each stage
+    """
+    rng = random.Random(args.seed)
+    stages = []
+    async with connect(args, nws_base) as (sessions, pid):
+        for rate in args.rates:
+            stage = await run_stage(
+                sessions, pid, args.mix, rate, args.duration, args.max_in_flight, rng
+            )
+            latency = stage["latency"]
+            print(
+                f"{args.transport} @ {rate:g} rps: achieved {stage['achieved_rps']:.1f} rps, "
+                f"p50 {latency.get('p50_ms', 0):.1f} ms, p99 {latency.get('p99_ms', 0):.1f} ms, "
+                f"errors {stage['errors']}, dropped {stage['dropped']}"
+            )
+            stages.append(stage)
+    return stages
+
+
+def main() -> None:
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--transport", choices=["stdio", "sse"], default="stdio")
+    parser.add_argument(
+        "--url", help="SSE endpoint of a running server; spawns one when omitted"
+    )
+    parser.add_argument(
+        "--clients", type=int, default=1, help="Concurrent SSE client sessions"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Worker processes for a spawned SSE server",
+    )
+    parser.add_argument("--rates", type=float, nargs="+", default=[10.0, 25.0, 50.0])
+    parser.add_argument(
+        "--duration", type=float, default=10.0, help="Seconds per rate stage"
+    )
+    parser.add_argument(
+        "--mix", type=parse_mix, default="get_alerts=4,get_forecast=4,processes://top=1"
+    )
+    parser.add_argument("--max-in-flight", type=int, default=256)
+    parser.add_argument(
+        "--nws-base", help="NWS base URL; starts the local stand-in when omitted"
+    )
+    parser.add_argument("--latency-ms", type=float, default=20.0)
+    parser.add_argument("--jitter-ms", type=float, default=5.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--cache",
+        action="store_true",
+        help="Let a spawned server answer from its response cache",
+    )
+    parser.add_argument("--label", default=None, help="Prefix for the results file")
+    parser.add_argument("--no-save", action="store_true", help="Print results only")
+    args = parser.parse_args()
+    if args.transport == "stdio" and args.clients != 1:
+        parser.error("--clients applies to the SSE transport only")
+
+    with contextlib.ExitStack() as stack:
+        nws_base = args.nws_base or stack.enter_context(
+            stub_server(args.latency_ms, args.jitter_ms, args.seed)
+        )
+        stages = asyncio.run(run(args, nws_base))
+
+    results = {
+        "benchmark": "mcp_load",
+        "parameters": {**vars(args), "nws_base": args.nws_base or "stand-in"},
+        "environment": environment(),
+        "results": {"stages": {f"{stage['target_rps']:g}": stage for stage in stages}},
+    }
+    if not args.no_save:
+        path = save_results(args.label or f"mcp-load-{args.transport}", results)
+        print(f"Results saved to {path}")
+
+
+if __name__ == "__main__":
+    main()
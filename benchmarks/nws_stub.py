@@ -0,0 +1,208 @@
+"""Local stand-in for api.weather.gov used by the benchmarks.
+
+Serves the recorded fixtures in ``benchmarks/fixtures`` with configurable
+latency and jitter so that load tests exercise the real HTTP path without
+touching the network.
+
+Run it standalone with::
+
+    python -m benchmarks.nws_stub --port 8765 --latency-ms 50 --jitter-ms 10
+"""
+
+import argparse
+import asyncio
+import contextlib
+import json
+import multiprocessing
+import random
+import socket
+import time
+from pathlib import Path
+from typing import Dict, Iterator, Optional
+
+import httpx
+import uvicorn
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import Response
+from starlette.routing import Route
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures"
+RECORDED_BASE = "https://api.weather.gov"
+
+
+def load_fixtures(base_url: str, fixtures_dir: Path = FIXTURES_DIR) -> Dict[str, bytes]:
+    """
+    Load the recorded fixtures and point their embedded links at the stand-in.
+
+    Args:
+        base_url: Base URL the stand-in is served from
+        fixtures_dir: Directory containing the recorded JSON payloads
+
+    Returns:
+        Mapping of fixture name to response body
+    """
+    fixtures = {}
+    for path in sorted(fixtures_dir.glob("*.json")):
+        body = path.read_text(encoding="utf-8").replace(RECORDED_BASE, base_url)
+        # Re-serialize compactly, the way the real API sends it
+        fixtures[path.stem] = json.dumps(json.loads(body)).encode("utf-8")
+    return fixtures
+
+
+def create_app(
+    base_url: str,
+    latency_ms: float = 0.0,
+    jitter_ms: float = 0.0,
+    seed: Optional[int] = None,
+) -> Starlette:
+    """
+    Create the ASGI application serving the NWS fixtures.
+
+    Args:
+        base_url: Base URL the stand-in is served from
+        latency_ms: Mean artificial latency added to every response
+        jitter_ms: Maximum deviation from the mean latency
+        seed: Seed for the jitter generator, for reproducible runs
+
+    Returns:
+        Starlette application
+    """
+    fixtures = load_fixtures(base_url)
+    rng = random.Random(seed)
+
+    async def respond(name: str) -> Response:
+        delay = latency_ms + rng.uniform(-jitter_ms, jitter_ms)
+        if delay > 0:
+            await asyncio.sleep(delay / 1000)
+        return Response(fixtures[name], media_type="application/geo+json")
+
+    async def points(request: Request) -> Response:
+        return await respond("points")
+
+    async def forecast(request: Request) -> Response:
+        return await respond("forecast")
+
+    async def hourly(request: Request) -> Response:
+        return await respond("hourly")
+
+    async def gridpoint(request: Request) -> Response:
+        return await respond("gridpoint")
+
+    async def alerts(request: Request) -> Response:
+        return await respond("alerts")
+
+    async def health(request: Request) -> Response:
+        return Response("ok", media_type="text/plain")
+
+    return Starlette(
+        routes=[
+            Route("/points/{coordinates}", points),
+            Route("/gridpoints/{office}/{grid}", gridpoint),
+            Route("/gridpoints/{office}/{grid}/forecast", forecast),
+            Route("/gridpoints/{office}/{grid}/forecast/hourly", hourly),
+            Route("/alerts/active/area/{state}", alerts),
+            Route("/alerts/active", alerts),
+            Route("/health", health),
+        ]
+    )
+
+
+def find_free_port(host: str = "127.0.0.1") -> int:
+    """
+    Find a free TCP port on the given host.
+
+    Args:
+        host: Interface to probe
+
+    Returns:
+        Port number that was free at the time of the call
+    """
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind((host, 0))
+        return sock.getsockname()[1]
+
+
+def serve(
+    host: str = "127.0.0.1",
+    port: int = 8765,
+    latency_ms: float = 0.0,
+    jitter_ms: float = 0.0,
+    seed: Optional[int] = None,
+) -> None:
+    """
+    Serve the stand-in until interrupted.
+
+    Args:
+        host: Interface to bind
+        port: Port to bind
+        latency_ms: Mean artificial latency added to every response
+        jitter_ms: Maximum deviation from the mean latency
+        seed: Seed for the jitter generator
+    """
+    app = create_app(f"http://{host}:{port}", latency_ms, jitter_ms, seed)
+    uvicorn.run(app, host=host, port=port, log_level="warning", access_log=False)
+
+
+@contextlib.contextmanager
+def stub_server(
+    latency_ms: float = 0.0,
+    jitter_ms: float = 0.0,
+    seed: Optional[int] = None,
+    host: str = "127.0.0.1",
+    startup_timeout: float = 10.0,
+) -> Iterator[str]:
+    """
+    Run the stand-in in a child process for the duration of the block.
+
+    The stand-in gets its own process so that its work does not compete with
+    the server under test for the same event loop.
+
+    Args:
+        latency_ms: Mean artificial latency added to every response
+        jitter_ms: Maximum deviation from the mean latency
+        seed: Seed for the jitter generator
+        host: Interface to bind
+        startup_timeout: Seconds to wait for the stand-in to accept requests
+
+    Yields:
+        Base URL of the running stand-in
+    """
+    port = find_free_port(host)
+    base_url = f"http://{host}:{port}"
+    process = multiprocessing.get_context("spawn").Process(
+        target=serve,
+        args=(host, port, latency_ms, jitter_ms, seed),
+        daemon=True,
+    )
+    process.start()
+    try:
+        deadline = time.monotonic() + startup_timeout
+        while True:
+            try:
+                httpx.get(f"{base_url}/health", timeout=1).raise_for_status()
+                break
+            except httpx.HTTPError:
+                if time.monotonic() > deadline or not process.is_alive():
+                    raise RuntimeError("NWS stand-in failed to start")
+                time.sleep(0.05)
+        yield base_url
+    finally:
+        process.terminate()
+        process.join(timeout=5)
+
+
+def main() -> None:
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+    serve(args.host, args.port, args.latency_ms, args.jitter_ms, args.seed)
+
+
+if __name__ == "__main__":
+    main()
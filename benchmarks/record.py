@@ -0,0 +1,98 @@
+"""Record NWS responses into an archive for offline replay.
+
+Calls the weather tools in-process with ``WEATHER_HTTP_MODE=record`` so that
+every upstream response they need is written to the archive. The archive can
+then be replayed by the server (``WEATHER_HTTP_MODE=replay``) or by
+``benchmarks.load --replay DIR`` without any network access.
+
+Example::
+
+    python -m benchmarks.record --archive nws-archive \\
+        --points 39.7456,-97.0892 40.015,-105.2705 --states KS CO
+"""
+
+import argparse
+import asyncio
+import os
+from typing import List, Tuple
+
+
+def parse_point(value: str) -> Tuple[float, float]:
+    """
+    Parse a 'lat,lon' command-line argument.
+
+    Args:
+        value: Coordinates separated by a comma
+
+    Returns:
+        Latitude and longitude
+    """
+    try:
+        latitude, longitude = (float(part) for part in value.split(","))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Expected lat,lon but got {value!r}")
+    return latitude, longitude
+
+
+async def record(points: List[Tuple[float, float]], states: List[str]) -> int:
+    """
+    Call every tool that reaches the NWS API for the given places.
+
+    Args:
+        points: Coordinates to record forecasts and point alerts for
+        states: State codes to record alerts for
+
+    Returns:
+        Number of tool calls that failed
+    """
+    from src.weather.server import create_server
+
+    server = create_server(warmup=False)
+    calls = [("get_alerts", {"state": state}) for state in states]
+    for latitude, longitude in points:
+        arguments = {"latitude": latitude, "longitude": longitude}
+        calls += [
+            ("get_forecast", arguments),
+            ("get_hourly_forecast", arguments),
+            ("get_gridpoint_forecast", arguments),
+            ("get_alerts_for_point", arguments),
+        ]
+
+    failures = 0
+    for name, arguments in calls:
+        result = await server.call_tool(name, arguments)
+        text = result[0].text if result else ""
+        if text.startswith("Unable"):
+            failures += 1
+            print(f"  {name} {arguments}: {text}")
+    return failures
+
+
+def main() -> None:
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--archive", required=True, help="Archive directory")
+    parser.add_argument("--points", type=parse_point, nargs="*", default=[])
+    parser.add_argument("--states", nargs="*", default=[])
+    parser.add_argument(
+        "--nws-base", help="Record from this base URL instead of api.weather.gov"
+    )
+    args = parser.parse_args()
+
+    # Must be set before the weather package is imported
+    os.environ["WEATHER_HTTP_MODE"] = "record"
+    os.environ["WEATHER_ARCHIVE_DIR"] = args.archive
+    os.environ["WEATHER_CACHE_DISABLED"] = "1"
+    if args.nws_base:
+        os.environ["WEATHER_NWS_API_BASE"] = args.nws_base
+
+    failures = asyncio.run(record(args.points, [s.upper() for s in args.states]))
+
+    from src.weather.utils.archive import get_archive
+
+    print(f"{len(get_archive())} responses in {args.archive}, {failures} failed calls")
+    raise SystemExit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
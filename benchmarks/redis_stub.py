@@ -0,0 +1,252 @@
+"""Local stand-in for a Redis server, for testing and benchmarking RedisCache.
+
+Implements the handful of commands RedisCache sends, over real sockets and
+the real protocol, with Redis's expiry semantics. It keeps everything in one
+database and does no persistence.
+
+Run it standalone with::
+
+    python -m benchmarks.redis_stub --port 6390
+"""
+
+import argparse
+import asyncio
+import fnmatch
+import time
+from typing import Any, Callable, Dict, List, Optional, Set, Union
+
+from src.weather.cache.redis import read_reply
+
+Value = Union[bytes, Set[bytes]]
+
+
+def _encode(reply: Any) -> bytes:
+    """Encode a reply as RESP2."""
+    if reply is None:
+        return b"$-1\r\n"
+    if isinstance(reply, Exception):
+        return f"-ERR {reply}\r\n".encode()
+    if isinstance(reply, bool):
+        return b":%d\r\n" % int(reply)
+    if isinstance(reply, int):
+        return b":%d\r\n" % reply
+    if isinstance(reply, str):
+        return f"+{reply}\r\n".encode()
+    if isinstance(reply, bytes):
+        return b"$%d\r\n%s\r\n" % (len(reply), reply)
+    return b"*%d\r\n" % len(reply) + b"".join(_encode(item) for item in reply)
+
+
+class RedisStub:
+    """
+    In-memory Redis stand-in serving GET, MGET, SET, DEL, SADD, SMEMBERS,
+    PEXPIRE, PTTL, SCAN, DBSIZE, INFO, FLUSHDB, SELECT, AUTH and PING.
+    """
+
+    def __init__(self):
+        self.data: Dict[bytes, Value] = {}
+        self.expires: Dict[bytes, float] = {}
+        self.commands = 0
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._handlers: Dict["asyncio.Task[None]", asyncio.StreamWriter] = {}
+
+    @property
+    def url(self) -> str:
+        """URL of the running stand-in."""
+        host, port = self._server.sockets[0].getsockname()[:2]
+        return f"redis://{host}:{port}/0"
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> "RedisStub":
+        """
+        Start listening.
+
+        Args:
+            host: Interface to listen on
+            port: Port to listen on, 0 for any free port
+
+        Returns:
+            This stand-in
+        """
+        self._server = await asyncio.start_server(self._serve, host, port)
+        return self
+
+    async def stop(self) -> None:
+        """Stop listening and close every client connection."""
+        self._server.close()
+        for writer in self._handlers.values():
+            writer.close()
+        await asyncio.gather(*self._handlers, return_exceptions=True)
+        await self._server.wait_closed()
+
+    async def _serve(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        task = asyncio.current_task()
+        self._handlers[task] = writer
+        try:
+            while True:
+                command = await read_reply(reader)
+                writer.write(_encode(self.execute(command)))
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+            del self._handlers[task]
+
+    def _live(self, key: bytes) -> Optional[Value]:
+        expires_at = self.expires.get(key)
+        if expires_at is not None and expires_at <= time.time():
+            self.data.pop(key, None)
+            del self.expires[key]
+        return self.data.get(key)
+
+    def execute(self, command: List[bytes]) -> Any:
+        """
+        Run one command.
+
+        Args:
+            command: Command name and arguments
+
+        Returns:
+            Reply value, or an exception for an error reply
+        """
+        self.commands += 1
+        name, args = command[0].decode().upper(), command[1:]
+        handler: Optional[Callable[..., Any]] = getattr(self, f"_{name.lower()}", None)
+        if handler is None:
+            return ValueError(f"unknown command '{name}'")
+        try:
+            return handler(*args)
+        except (KeyError, TypeError, ValueError) as e:
+            return ValueError(f"wrong arguments for '{name}': {e}")
+
+    def _ping(self) -> str:
+        return "PONG"
+
+    def _auth(self, *credentials: bytes) -> str:
+        return "OK"
+
+    def _select(self, db: bytes) -> str:
+        return "OK"
+
+    def _get(self, key: bytes) -> Optional[bytes]:
+        value = self._live(key)
+        if isinstance(value, set):
+            raise ValueError("WRONGTYPE")
+        return value
+
+    def _set(self, key: bytes, value: bytes, *options: bytes) -> str:
+        self.data[key] = value
+        self.expires.pop(key, None)
+        for unit, amount in zip(options[::2], options[1::2]):
+            scale = {b"PX": 0.001, b"EX": 1.0}[unit.upper()]
+            self.expires[key] = time.time() + int(amount) * scale
+        return "OK"
+
+    def _mget(self, *keys: bytes) -> List[Optional[bytes]]:
+        return [self._get(key) for key in keys]
+
+    def _del(self, *keys: bytes) -> int:
+        removed = 0
+        for key in keys:
+            if self._live(key) is not None:
+                del self.data[key]
+                self.expires.pop(key, None)
+                removed += 1
+        return removed
+
+    def _sadd(self, key: bytes, *members: bytes) -> int:
+        value = self._live(key)
+        if value is None:
+            value = self.data[key] = set()
+        added = len(set(members) - value)
+        value.update(members)
+        return added
+
+    def _smembers(self, key: bytes) -> List[bytes]:
+        return sorted(self._live(key) or ())
+
+    def _pexpire(self, key: bytes, milliseconds: bytes, *flags: bytes) -> int:
+        if self._live(key) is None:
+            return 0
+        expires_at = time.time() + int(milliseconds) / 1000
+        current = self.expires.get(key)
+        flag = flags[0].upper() if flags else b""
+        if flag == b"NX" and current is not None:
+            return 0
+        # A key without an expiry counts as living forever
+        if flag == b"GT" and (current is None or expires_at <= current):
+            return 0
+        self.expires[key] = expires_at
+        return 1
+
+    def _pttl(self, key: bytes) -> int:
+        if self._live(key) is None:
+            return -2
+        expires_at = self.expires.get(key)
+        return -1 if expires_at is None else int((expires_at - time.time()) * 1000)
+
+    def _scan(self, cursor: bytes, *options: bytes) -> List[Any]:
+        pattern, count = "*", 10
+        for option, value in zip(options[::2], options[1::2]):
+            if option.upper() == b"MATCH":
+                pattern = value.decode()
+            elif option.upper() == b"COUNT":
+                count = int(value)
+        # The cursor is the last key returned, so keys deleted between calls
+        # do not make the scan skip others
+        after = b"" if cursor == b"0" else bytes.fromhex(cursor.decode())
+        keys = sorted(
+            key
+            for key in list(self.data)
+            if key > after and self._live(key) is not None
+        )
+        page = keys[:count]
+        following = page[-1].hex().encode() if len(keys) > count else b"0"
+        matched = [key for key in page if fnmatch.fnmatchcase(key.decode(), pattern)]
+        return [following, matched]
+
+    def _dbsize(self) -> int:
+        return sum(1 for key in list(self.data) if self._live(key) is not None)
+
+    def _info(self, *sections: bytes) -> bytes:
+        used = sum(
+            len(key) + (sum(map(len, value)) if isinstance(value, set) else len(value))
+            for key, value in self.data.items()
+        )
+        return f"# Memory\r\nused_memory:{used}\r\n".encode()
+
+    def _flushdb(self, *options: bytes) -> str:
+        self.data.clear()
+        self.expires.clear()
+        return "OK"
+
+
+async def serve(host: str, port: int) -> None:
+    """
+    Run a stand-in until interrupted.
+
+    Args:
+        host: Interface to listen on
+        port: Port to listen on
+    """
+    stub = await RedisStub().start(host, port)
+    print(f"Redis stand-in listening on {stub.url}")
+    await asyncio.Event().wait()
+
+
+def main() -> None:
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=6390)
+    args = parser.parse_args()
+    try:
+        asyncio.run(serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
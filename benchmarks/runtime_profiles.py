@@ -0,0 +1,110 @@
+"""Runtime profiles compared on the same stdio workload.
+
+Spawns a stdio server once per runtime profile, drives the same seeded mix
+of tool calls at each target rate through benchmarks.mcp_load, and reports
+throughput, latency, server ping round trips and RSS for each profile, with
+the server's own collection counts and loop stalls from runtime://loop.
+
+Example::
+
+    python -m benchmarks.runtime_profiles --rates 50 100 --duration 10
+"""
+
+import argparse
+import asyncio
+import contextlib
+import json
+import os
+import random
+from typing import Any, Dict
+
+from .mcp_load import connect, parse_mix, run_stage
+from .nws_stub import stub_server
+from .stats import environment, save_results
+
+
+async def measure(
+    args: argparse.Namespace, nws_base: str, profile: str
+) -> Dict[str, Any]:
+    """
+    Run every rate stage against a server started with a profile.
+
+    Args:
+        args: Parsed command-line arguments
+        nws_base: NWS base URL for the spawned server
+        profile: Runtime profile name
+
+    Returns:
+        Statistics for each stage and the server's runtime report
+    """
+    os.environ["WEATHER_RUNTIME_PROFILE"] = profile
+    rng = random.Random(args.seed)
+    stages = {}
+    async with connect(args, nws_base) as (sessions, pid):
+        for rate in args.rates:
+            stage = await run_stage(
+                sessions, pid, args.mix, rate, args.duration, args.max_in_flight, rng
+            )
+            latency, ping = stage["latency"], stage["server_ping"]
+            print(
+                f"{profile:>8} @ {rate:g} rps: achieved {stage['achieved_rps']:.1f} rps, "
+                f"p50 {latency.get('p50_ms', 0):.1f} ms, "
+                f"p99 {latency.get('p99_ms', 0):.1f} ms, "
+                f"ping p99 {ping.get('p99_ms', 0):.2f} ms"
+            )
+            stages[f"{rate:g}"] = stage
+        report = await sessions[0].read_resource("runtime://loop")
+    runtime = json.loads(report.contents[0].text)
+    for line in runtime:
+        print(f"{profile:>8}   {line}")
+    return {"stages": stages, "runtime": runtime}
+
+
+def main() -> None:
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--profiles", nargs="+", default=["default", "tuned", "server"])
+    parser.add_argument("--rates", type=float, nargs="+", default=[50.0, 100.0])
+    parser.add_argument(
+        "--duration", type=float, default=10.0, help="Seconds per rate stage"
+    )
+    parser.add_argument(
+        "--mix", type=parse_mix, default="get_alerts=4,get_forecast=4,processes://top=1"
+    )
+    parser.add_argument("--max-in-flight", type=int, default=256)
+    parser.add_argument("--latency-ms", type=float, default=20.0)
+    parser.add_argument("--jitter-ms", type=float, default=5.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--cache",
+        action="store_true",
+        help="Let the server answer from its response cache",
+    )
+    parser.add_argument(
+        "--label", default="runtime_profiles", help="Prefix for the results file"
+    )
+    parser.add_argument("--no-save", action="store_true", help="Print results only")
+    args = parser.parse_args()
+    # Settings benchmarks.mcp_load.connect expects for a spawned stdio server
+    args.transport, args.url, args.clients, args.workers = "stdio", None, 1, 1
+
+    results: Dict[str, Any] = {}
+    with contextlib.ExitStack() as stack:
+        nws_base = stack.enter_context(
+            stub_server(args.latency_ms, args.jitter_ms, args.seed)
+        )
+        for profile in args.profiles:
+            results[profile] = asyncio.run(measure(args, nws_base, profile))
+
+    if not args.no_save:
+        saved = {
+            "benchmark": "runtime_profiles",
+            "parameters": vars(args),
+            "environment": environment(),
+            "results": results,
+        }
+        print(f"Results saved to {save_results(args.label, saved)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""Per-command latency of pooled shells against a new shell per command.
+
+Runs the same small commands one after another through run_shell_command,
+first spawning a shell for each and then through a ShellPool, and reports
+the latency of each. The first pooled command, which starts the shell, is
+included.
+
+Example::
+
+    python -m benchmarks.shell_pool --calls 500 --commands "true,echo hello,date"
+"""
+
+import argparse
+import asyncio
+import time
+from typing import Any, Dict, List
+
+from .stats import environment, save_results, summarize_latencies
+
+
+async def measure(pooled: bool, commands: List[str], calls: int) -> Dict[str, Any]:
+    """
+    Time commands run one at a time.
+
+    Args:
+        pooled: Whether commands run in a ShellPool
+        commands: Commands to run in turn
+        calls: Number of commands to run
+
+    Returns:
+        Latency statistics
+    """
+    from src.weather.services import system_service
+
+    pool = system_service.ShellPool(size=1) if pooled else None
+    system_service._shell_pool = pool
+    latencies = []
+    try:
+        for i in range(calls):
+            began = time.perf_counter()
+            result = await system_service.run_shell_command(
+                commands[i % len(commands)], timeout=10
+            )
+            latencies.append(time.perf_counter() - began)
+            if not result["success"]:
+                raise RuntimeError(f"Command failed: {result['stderr']}")
+    finally:
+        system_service._shell_pool = None
+        if pool is not None:
+            await pool.close()
+    return summarize_latencies(latencies)
+
+
+def main() -> None:
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--calls", type=int, default=500)
+    parser.add_argument(
+        "--commands",
+        default="true,echo hello,date",
+        help="Comma-separated commands to run in turn",
+    )
+    parser.add_argument(
+        "--label", default="shell_pool", help="Prefix for the results file"
+    )
+    parser.add_argument("--no-save", action="store_true", help="Print results only")
+    args = parser.parse_args()
+    commands = [command for command in args.commands.split(",") if command.strip()]
+
+    results = {}
+    for pooled in (False, True):
+        name = "pooled" if pooled else "spawn"
+        latency = asyncio.run(measure(pooled, commands, args.calls))
+        print(
+            f"{name:>6}: p50 {latency['p50_ms']:.2f} ms, "
+            f"p99 {latency['p99_ms']:.2f} ms, mean {latency['mean_ms']:.2f} ms"
+        )
+        results[name] = latency
+
+    if not args.no_save:
+        saved = {
+            "benchmark": "shell_pool",
+            "parameters": vars(args),
+            "environment": environment(),
+            "results": results,
+        }
+        print(f"Results saved to {save_results(args.label, saved)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""Statistics and result persistence shared by the benchmarks."""
+
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Sequence
+
+RESULTS_DIR = Path(__file__).parent / "results"
+
+
+def percentile(sorted_values: Sequence[float], pct: float) -> float:
+    """
+    Compute a percentile using linear interpolation between closest ranks.
+
+    Args:
+        sorted_values: Values sorted in ascending order
+        pct: Percentile in the range 0-100
+
+    Returns:
+        Interpolated percentile, or 0.0 for an empty sequence
+    """
+    if not sorted_values:
+        return 0.0
+    rank = (len(sorted_values) - 1) * pct / 100
+    low = int(rank)
+    high = min(low + 1, len(sorted_values) - 1)
+    return sorted_values[low] + (sorted_values[high] - sorted_values[low]) * (
+        rank - low
+    )
+
+
+def summarize_latencies(latencies: List[float]) -> Dict[str, float]:
+    """
+    Summarize a list of latencies given in seconds.
+
+    Args:
+        latencies: Per-call latencies in seconds
+
+    Returns:
+        Dictionary of latency statistics in milliseconds
+    """
+    values = sorted(latencies)
+    if not values:
+        return {"count": 0}
+    return {
+        "count": len(values),
+        "min_ms": values[0] * 1000,
+        "mean_ms": sum(values) / len(values) * 1000,
+        "p50_ms": percentile(values, 50) * 1000,
+        "p95_ms": percentile(values, 95) * 1000,
+        "p99_ms": percentile(values, 99) * 1000,
+        "max_ms": values[-1] * 1000,
+    }
+
+
+def environment() -> Dict[str, Any]:
+    """
+    Describe the environment a benchmark ran in.
+
+    Returns:
+        Dictionary with interpreter, platform and git revision
+    """
+    try:
+        revision = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        revision = "unknown"
+    return {
+        "python": sys.version.split()[0],
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "git_revision": revision,
+    }
+
+
+def save_results(
+    name: str, results: Dict[str, Any], output_dir: Path = RESULTS_DIR
+) -> Path:
+    """
+    Save benchmark results as JSON.
+
+    Args:
+        name: Benchmark name, used as the file name prefix
+        results: Results to save
+        output_dir: Directory to write into
+
+    Returns:
+        Path of the written file
+    """
+    output_dir.mkdir(parents=True, exist_ok=True)
+    path = output_dir / f"{name}-{time.strftime('%Y%m%d-%H%M%S')}.json"
+    path.write_text(json.dumps(results, indent=2) + "\n", encoding="utf-8")
+    return path
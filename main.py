@@ -1,11 +1,74 @@
 """Main entry point for the weather MCP server."""
 
-from src.weather import main as server_main
+import argparse
+import os
+import sys
 
 
 def main():
     """Run the weather MCP server."""
-    server_main()
+    parser = argparse.ArgumentParser(description="Weather MCP server")
+    parser.add_argument(
+        "--transport", choices=["stdio", "sse", "daemon"], default="stdio"
+    )
+    parser.add_argument("--host", default=os.environ.get("FASTMCP_HOST", "0.0.0.0"))
+    parser.add_argument(
+        "--port", type=int, default=int(os.environ.get("FASTMCP_PORT", "8000"))
+    )
+    parser.add_argument(
+        "--measure-startup",
+        action="store_true",
+        help="Report per-module import time of the server and exit non-zero on a regression",
+    )
+    parser.add_argument("--startup-threshold-ms", type=float, default=None)
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=int(os.environ.get("WEATHER_WORKERS", "1")),
+        help="Number of SSE worker processes sharing one listening socket",
+    )
+    parser.add_argument(
+        "--shared",
+        action="store_true",
+        default=bool(os.environ.get("WEATHER_SHARED_DAEMON")),
+        help="Forward stdio to the shared daemon, starting it if needed",
+    )
+    parser.add_argument(
+        "--socket", default=None, help="Unix socket of the shared daemon"
+    )
+    parser.add_argument(
+        "--profile",
+        choices=["default", "tuned", "server"],
+        default=os.environ.get("WEATHER_RUNTIME_PROFILE"),
+        help="Runtime profile: event loop, garbage collector and loop-lag monitoring",
+    )
+    args = parser.parse_args()
+
+    if args.measure_startup:
+        from src.weather.startup import DEFAULT_THRESHOLD_MS, report_startup
+
+        threshold = args.startup_threshold_ms or DEFAULT_THRESHOLD_MS
+        sys.exit(report_startup(threshold_ms=threshold))
+
+    # The server is imported per mode, so the forwarder starts without the MCP SDK
+    if args.transport == "sse":
+        from src.weather import serve_sse
+
+        serve_sse(
+            workers=args.workers, host=args.host, port=args.port, profile=args.profile
+        )
+    elif args.transport == "daemon":
+        from src.weather import serve_daemon
+
+        serve_daemon(args.socket, profile=args.profile)
+    elif args.shared:
+        from src.weather.daemon import forward_stdio
+
+        sys.exit(forward_stdio(args.socket))
+    else:
+        from src.weather import main as server_main
+
+        server_main(profile=args.profile)
 
 
 if __name__ == "__main__":
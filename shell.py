@@ -1,49 +1,18 @@
-import subprocess
-import psutil
-from mcp.server.fastmcp import FastMCP
+"""Standalone MCP server for shell commands and the process list.
 
-mcp = FastMCP("Shell Command Server")
+Kept for configurations that launch this file (``uv run shell.py`` or
+``mcp dev shell.py``). The server is the package's own (see
+src/weather/server.py), limited to the system tools, so commands run with
+its time budgets, output limits and optional shell pool.
+"""
 
+from src.weather.logs import configure_logging
+from src.weather.server import create_server, main
 
-@mcp.tool()
-async def run_shell_command(command: str) -> str:
-    """Run a shell command and return the output."""
-    try:
-        result = subprocess.run(
-            command, shell=True, check=True, text=True, capture_output=True
-        )
-        return result.stdout
-    except subprocess.CalledProcessError as e:
-        return f"Error: {e.stderr}"
-
-
-@mcp.resource("processes://top")
-def get_top_processes() -> list[str]:
-    """Get the top 10 processes currently running on the workstation."""
-    try:
-        # Get all processes and filter out ones with None CPU percentage
-        processes = []
-        for proc in psutil.process_iter(["pid", "name", "cpu_percent"]):
-            try:
-                info = proc.info
-                if info["cpu_percent"] is not None:
-                    processes.append(info)
-            except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
-                continue
-
-        # Sort by CPU percentage and get top 10
-        top_processes = sorted(processes, key=lambda p: p["cpu_percent"], reverse=True)[
-            :10
-        ]
-
-        # Format the output
-        return [
-            f"PID: {proc['pid']}, Name: {proc['name']}, CPU: {proc['cpu_percent']:.1f}%"
-            for proc in top_processes
-        ]
-    except Exception as e:
-        return [f"Error getting process information: {str(e)}"]
+# Before FastMCP sets up logging of its own
+configure_logging()
+mcp = create_server("Shell Command Server", warmup=False, features=("system",))
 
 
 if __name__ == "__main__":
-    mcp.run()
+    main(server=mcp)
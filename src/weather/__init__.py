@@ -1,6 +1,16 @@
-"""Weather MCP server package."""
+"""Weather MCP server package.
 
-from .server import create_server, run_server, main
+The server is imported on first access, so that the daemon forwarder (see
+daemon) can run without loading the MCP SDK.
+"""
 
 __version__ = "0.1.0"
-__all__ = ["create_server", "run_server", "main"]
+__all__ = ["create_server", "run_server", "serve_sse", "serve_daemon", "main"]
+
+
+def __getattr__(name):
+    if name in __all__:
+        from . import server
+
+        return getattr(server, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,330 @@
+"""Admission control for concurrent tool calls.
+
+Every tool call must take a slot for its tool and a slot for its client
+before it runs. When either is taken, the call waits in a bounded queue;
+when the queue is full, or the call has waited longer than the queue
+timeout, it is rejected at once with an Overloaded error rather than piling
+up sockets and memory.
+
+Calls are either interactive (the default) or batch. Interactive calls are
+admitted ahead of any waiting batch call, and batch calls may only ever hold
+part of a tool's slots, so a burst of batch work cannot take the capacity
+interactive users need. A client marks a call as batch by sending
+``"priority": "batch"`` in the request's ``_meta``.
+
+Clients are told apart by their connection (the MCP session serving it),
+never by anything the client sends, so a client cannot escape its limits
+by naming itself anew or use up another client's slots by borrowing its
+name. Time spent in the queue counts against the call's time budget.
+
+Limits apply per process; with several SSE workers each has its own.
+"""
+
+import asyncio
+import logging
+import os
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Deque, Dict, Optional, Tuple
+
+from .utils.deadline import current_budget
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+INTERACTIVE = "interactive"
+BATCH = "batch"
+PRIORITIES = (INTERACTIVE, BATCH)
+
+MAX_CONCURRENT = int(os.environ.get("WEATHER_MAX_CONCURRENT", "32"))
+MAX_CONCURRENT_PER_CLIENT = int(
+    os.environ.get("WEATHER_MAX_CONCURRENT_PER_CLIENT", "8")
+)
+MAX_QUEUE = int(os.environ.get("WEATHER_MAX_QUEUE", "64"))
+MAX_QUEUE_PER_CLIENT = int(os.environ.get("WEATHER_MAX_QUEUE_PER_CLIENT", "16"))
+QUEUE_TIMEOUT = float(os.environ.get("WEATHER_QUEUE_TIMEOUT", "10"))
+
+# Share of a tool's slots batch calls may hold at once
+BATCH_SHARE = 0.5
+
+# Tools with a lower limit than MAX_CONCURRENT
+TOOL_LIMITS = {"run_shell_command": 4}
+
+_controller: Optional["AdmissionController"] = None
+
+
+class Overloaded(Exception):
+    """Raised when a tool call is rejected because the server is too busy."""
+
+
+class _Waiter:
+    """A queued tool call."""
+
+    __slots__ = ("tool", "client", "priority", "future", "queued_at")
+
+    def __init__(self, tool: str, client: str, priority: str):
+        self.tool = tool
+        self.client = client
+        self.priority = priority
+        self.future: asyncio.Future = asyncio.get_running_loop().create_future()
+        self.queued_at = time.monotonic()
+
+
+class AdmissionController:
+    """
+    Per-tool and per-client concurrency limits with bounded priority queues.
+    """
+
+    def __init__(
+        self,
+        max_concurrent: int = MAX_CONCURRENT,
+        max_per_client: int = MAX_CONCURRENT_PER_CLIENT,
+        max_queue: int = MAX_QUEUE,
+        max_queue_per_client: int = MAX_QUEUE_PER_CLIENT,
+        queue_timeout: float = QUEUE_TIMEOUT,
+        batch_share: float = BATCH_SHARE,
+        tool_limits: Optional[Dict[str, int]] = None,
+    ):
+        self.max_concurrent = max_concurrent
+        self.max_per_client = max_per_client
+        self.max_queue = max_queue
+        self.max_queue_per_client = max_queue_per_client
+        self.queue_timeout = queue_timeout
+        self.batch_share = batch_share
+        self.tool_limits = dict(TOOL_LIMITS if tool_limits is None else tool_limits)
+        self._active: Dict[str, int] = {}
+        self._active_batch: Dict[str, int] = {}
+        self._client_active: Dict[str, int] = {}
+        self._queues: Dict[str, Deque[_Waiter]] = {
+            priority: deque() for priority in PRIORITIES
+        }
+        self._stats: Dict[str, Dict[str, float]] = {}
+
+    def tool_limit(self, tool: str) -> int:
+        """
+        Get the number of calls of a tool that may run at once.
+
+        Args:
+            tool: Tool name
+
+        Returns:
+            Concurrency limit
+        """
+        return self.tool_limits.get(tool, self.max_concurrent)
+
+    def _batch_limit(self, tool: str) -> int:
+        return max(1, int(self.tool_limit(tool) * self.batch_share))
+
+    def _can_run(self, tool: str, client: str, priority: str) -> bool:
+        if self._active.get(tool, 0) >= self.tool_limit(tool):
+            return False
+        if self._client_active.get(client, 0) >= self.max_per_client:
+            return False
+        return priority != BATCH or self._active_batch.get(tool, 0) < self._batch_limit(
+            tool
+        )
+
+    def _tool_stats(self, tool: str) -> Dict[str, float]:
+        return self._stats.setdefault(
+            tool,
+            {
+                "admitted": 0,
+                "queued": 0,
+                "rejected": 0,
+                "timed_out": 0,
+                "wait_total": 0.0,
+                "wait_max": 0.0,
+            },
+        )
+
+    def _start(self, tool: str, client: str, priority: str, waited: float) -> None:
+        self._active[tool] = self._active.get(tool, 0) + 1
+        self._client_active[client] = self._client_active.get(client, 0) + 1
+        if priority == BATCH:
+            self._active_batch[tool] = self._active_batch.get(tool, 0) + 1
+        stats = self._tool_stats(tool)
+        stats["admitted"] += 1
+        stats["wait_total"] += waited
+        stats["wait_max"] = max(stats["wait_max"], waited)
+
+    def _finish(self, tool: str, client: str, priority: str) -> None:
+        for counts, key in ((self._active, tool), (self._client_active, client)):
+            counts[key] -= 1
+            if not counts[key]:
+                del counts[key]
+        if priority == BATCH:
+            self._active_batch[tool] -= 1
+            if not self._active_batch[tool]:
+                del self._active_batch[tool]
+        self._dispatch()
+
+    def _dispatch(self) -> None:
+        """Admit every queued call that can now run, interactive calls first."""
+        now = time.monotonic()
+        for priority in PRIORITIES:
+            queue = self._queues[priority]
+            for waiter in list(queue):
+                if waiter.future.done():
+                    queue.remove(waiter)
+                elif self._can_run(waiter.tool, waiter.client, priority):
+                    queue.remove(waiter)
+                    self._start(
+                        waiter.tool, waiter.client, priority, now - waiter.queued_at
+                    )
+                    waiter.future.set_result(None)
+
+    def _queued(self, tool: Optional[str] = None, client: Optional[str] = None) -> int:
+        return sum(
+            1
+            for queue in self._queues.values()
+            for waiter in queue
+            if (tool is None or waiter.tool == tool)
+            and (client is None or waiter.client == client)
+        )
+
+    async def _acquire(self, tool: str, client: str, priority: str) -> None:
+        # Queued calls are only ever blocked by limits that also block this
+        # one (or by their own client's limit), so starting now is fair
+        if self._can_run(tool, client, priority):
+            self._start(tool, client, priority, 0.0)
+            return
+
+        stats = self._tool_stats(tool)
+        if self._queued(tool=tool) >= self.max_queue:
+            stats["rejected"] += 1
+            raise Overloaded(f"Server busy: too many {tool} calls waiting; retry later")
+        if self._queued(client=client) >= self.max_queue_per_client:
+            stats["rejected"] += 1
+            raise Overloaded("Server busy: too many of your calls waiting; retry later")
+
+        # Waiting longer than the call's budget would leave it no time to run
+        timeout = self.queue_timeout
+        budget = current_budget()
+        if budget is not None:
+            timeout = min(timeout, budget.remaining())
+
+        waiter = _Waiter(tool, client, priority)
+        self._queues[priority].append(waiter)
+        stats["queued"] += 1
+        try:
+            async with asyncio.timeout(timeout):
+                await asyncio.shield(waiter.future)
+        except TimeoutError:
+            if waiter.future.done():
+                return
+            self._queues[priority].remove(waiter)
+            waiter.future.cancel()
+            stats["timed_out"] += 1
+            raise Overloaded(
+                f"Server busy: {tool} call waited {timeout:.1f}s; retry later"
+            )
+        except asyncio.CancelledError:
+            if waiter.future.done():
+                # Admitted just as the caller gave up; hand the slot on
+                self._finish(tool, client, priority)
+            else:
+                self._queues[priority].remove(waiter)
+                waiter.future.cancel()
+            raise
+
+    @asynccontextmanager
+    async def admit(
+        self, tool: str, client: str, priority: str = INTERACTIVE
+    ) -> AsyncIterator[None]:
+        """
+        Hold a slot for a tool call while the enclosed block runs.
+
+        Args:
+            tool: Tool name
+            client: Key identifying the calling client
+            priority: INTERACTIVE or BATCH
+
+        Raises:
+            Overloaded: If the call's queue is full or it waited too long
+        """
+        priority = priority if priority in PRIORITIES else INTERACTIVE
+        await self._acquire(tool, client, priority)
+        try:
+            yield
+        finally:
+            self._finish(tool, client, priority)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Get the current queue state and counters.
+
+        Returns:
+            Per-tool active calls, queue lengths, limits and counters, and
+            the number of clients with calls running
+        """
+        tools = {}
+        for tool in sorted(set(self._stats) | set(self._active)):
+            stats = self._tool_stats(tool)
+            admitted = stats["admitted"]
+            tools[tool] = {
+                "limit": self.tool_limit(tool),
+                "active": self._active.get(tool, 0),
+                "active_batch": self._active_batch.get(tool, 0),
+                "queued_interactive": sum(
+                    1 for w in self._queues[INTERACTIVE] if w.tool == tool
+                ),
+                "queued_batch": sum(1 for w in self._queues[BATCH] if w.tool == tool),
+                "admitted": int(admitted),
+                "queued": int(stats["queued"]),
+                "rejected": int(stats["rejected"]),
+                "timed_out": int(stats["timed_out"]),
+                "mean_wait_ms": (
+                    stats["wait_total"] / admitted * 1000 if admitted else 0.0
+                ),
+                "max_wait_ms": stats["wait_max"] * 1000,
+            }
+        return {"tools": tools, "clients": len(self._client_active)}
+
+
+def get_controller() -> AdmissionController:
+    """
+    Get the process-wide admission controller, creating it on first use.
+
+    Returns:
+        Admission controller configured from the environment
+    """
+    global _controller
+    if _controller is None:
+        _controller = AdmissionController()
+    return _controller
+
+
+def set_controller(controller: Optional[AdmissionController]) -> None:
+    """
+    Replace the process-wide admission controller.
+
+    Args:
+        controller: Controller to use, or None to recreate it on next use
+    """
+    global _controller
+    _controller = controller
+
+
+def call_identity(context: Any) -> Tuple[str, str]:
+    """
+    Identify the client and priority of the tool call being handled.
+
+    The client is the session the call arrived on. Client-supplied fields
+    such as the client_id in ``_meta`` are not trusted for this.
+
+    Args:
+        context: FastMCP request context
+
+    Returns:
+        Client key and priority; calls made outside a request share the
+        'local' client
+    """
+    try:
+        request = context.request_context
+    except ValueError:
+        return "local", INTERACTIVE
+    meta = request.meta
+    priority = getattr(meta, "priority", None) if meta else None
+    client = f"session-{id(request.session):x}"
+    return client, priority if priority in PRIORITIES else INTERACTIVE
@@ -0,0 +1,133 @@
+"""Caching of upstream API responses and formatted tool output.
+
+Response caches share the async interface in ``base.CacheBackend``:
+
+- ``MemoryCache``: in-process LRU bounded by entry count
+- ``SizedMemoryCache``: in-process LRU bounded by the bytes it holds
+- ``SQLiteCache``: a local file shared by every process that opens it
+- ``RedisCache``: a Redis server shared by processes on any host
+- ``NullCache``: caches nothing
+"""
+
+import os
+from typing import Any, Optional
+
+from .base import CacheBackend, CacheMetrics, encode
+from .memory import DEFAULT_MAX_BYTES, MemoryCache, SizedMemoryCache
+from .null import NullCache
+from .output import OutputCache, get_output_cache, output_key, set_output_cache
+
+Cache = CacheBackend
+
+BACKENDS = ("memory", "sized", "sqlite", "redis", "none")
+
+_cache: Optional[Cache] = None
+
+
+def __getattr__(name: str) -> Any:
+    # sqlite3 and the Redis client are only imported when actually used
+    if name == "SQLiteCache":
+        from .sqlite import SQLiteCache
+
+        return SQLiteCache
+    if name == "RedisCache":
+        from .redis import RedisCache
+
+        return RedisCache
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def create_cache(backend: str) -> Cache:
+    """
+    Create a response cache backend configured from the environment.
+
+    WEATHER_CACHE_PATH is the SQLite file, WEATHER_CACHE_URL the Redis URL
+    and WEATHER_CACHE_MAX_BYTES the size limit of the sized backend.
+
+    Args:
+        backend: One of BACKENDS
+
+    Returns:
+        Cache instance
+
+    Raises:
+        ValueError: If the backend is unknown or its settings are missing
+    """
+    if backend == "memory":
+        return MemoryCache()
+    if backend == "sized":
+        return SizedMemoryCache(
+            int(os.environ.get("WEATHER_CACHE_MAX_BYTES", DEFAULT_MAX_BYTES))
+        )
+    if backend == "sqlite":
+        path = os.environ.get("WEATHER_CACHE_PATH")
+        if not path:
+            raise ValueError("The sqlite cache backend needs WEATHER_CACHE_PATH")
+        from .sqlite import SQLiteCache
+
+        return SQLiteCache(path)
+    if backend == "redis":
+        from .redis import DEFAULT_URL, RedisCache
+
+        return RedisCache(os.environ.get("WEATHER_CACHE_URL", DEFAULT_URL))
+    if backend == "none":
+        return NullCache()
+    raise ValueError(f"Unknown cache backend {backend!r}; expected one of {BACKENDS}")
+
+
+def get_cache() -> Cache:
+    """
+    Get the process-wide cache, creating it on first use.
+
+    WEATHER_CACHE_BACKEND selects the backend by name. Without it, responses
+    are cached in the SQLite file named by WEATHER_CACHE_PATH when that is
+    set, and in process memory otherwise. Setting WEATHER_CACHE_DISABLED
+    turns caching off entirely.
+
+    Returns:
+        Cache instance
+    """
+    global _cache
+    if _cache is None:
+        if os.environ.get("WEATHER_CACHE_DISABLED"):
+            backend = "none"
+        elif os.environ.get("WEATHER_CACHE_BACKEND"):
+            backend = os.environ["WEATHER_CACHE_BACKEND"].lower()
+        elif os.environ.get("WEATHER_CACHE_PATH"):
+            backend = "sqlite"
+        else:
+            backend = "memory"
+        _cache = create_cache(backend)
+    return _cache
+
+
+def set_cache(cache: Optional[Cache]) -> None:
+    """
+    Replace the process-wide cache.
+
+    Args:
+        cache: Cache to use, or None to recreate it from the environment on next use
+    """
+    global _cache
+    _cache = cache
+
+
+__all__ = [
+    "BACKENDS",
+    "Cache",
+    "CacheBackend",
+    "CacheMetrics",
+    "MemoryCache",
+    "NullCache",
+    "OutputCache",
+    "RedisCache",
+    "SQLiteCache",
+    "SizedMemoryCache",
+    "create_cache",
+    "encode",
+    "get_cache",
+    "get_output_cache",
+    "output_key",
+    "set_cache",
+    "set_output_cache",
+]
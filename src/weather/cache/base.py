@@ -0,0 +1,84 @@
+"""Interface shared by the cache backends."""
+
+import json
+from typing import Any, Dict, Iterable, Optional, Protocol
+
+COUNTERS = ("hits", "misses", "sets", "evictions", "expirations", "invalidations")
+
+
+def encode(value: Any) -> str:
+    """
+    Encode a value as compact JSON, the form the backends store it in.
+
+    Args:
+        value: JSON-serializable value
+
+    Returns:
+        JSON text
+    """
+    return json.dumps(value, separators=(",", ":"))
+
+
+class CacheMetrics:
+    """
+    Operation counters of a cache backend.
+
+    Counts are kept per process, even for backends whose entries are shared
+    between processes.
+    """
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.sets = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Get the counters and the hit ratio.
+
+        Returns:
+            Dictionary of counter values, plus 'hit_ratio'
+        """
+        counts: Dict[str, Any] = {name: getattr(self, name) for name in COUNTERS}
+        reads = self.hits + self.misses
+        counts["hit_ratio"] = self.hits / reads if reads else 0.0
+        return counts
+
+
+class CacheBackend(Protocol):
+    """
+    Async interface of every cache backend.
+
+    Values are JSON-serializable. Every entry has a TTL and may carry tags;
+    invalidate_tag removes every entry stored with a tag. A caller that has
+    already encoded a value with encode() passes the text to set, so large
+    payloads are not serialized twice.
+    """
+
+    async def get(self, key: str) -> Optional[Any]:
+        """Get a cached value, or None if missing or expired."""
+
+    async def set(
+        self,
+        key: str,
+        value: Any,
+        ttl: float,
+        tags: Iterable[str] = (),
+        encoded: Optional[str] = None,
+    ) -> None:
+        """Store a value for ttl seconds, under the given tags."""
+
+    async def delete(self, key: str) -> bool:
+        """Remove an entry, returning whether it existed."""
+
+    async def invalidate_tag(self, tag: str) -> int:
+        """Remove every entry stored with a tag, returning how many."""
+
+    async def clear(self) -> None:
+        """Remove all entries."""
+
+    async def stats(self) -> Dict[str, Any]:
+        """Get the backend name, entry count, size in bytes and counters."""
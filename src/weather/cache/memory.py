@@ -0,0 +1,286 @@
+"""In-process cache backends."""
+
+import json
+import math
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, NamedTuple, Optional, Set, Tuple
+
+from .base import CacheMetrics, encode
+
+DEFAULT_MAX_ENTRIES = 10_000
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+SWEEP_INTERVAL = 60
+
+
+class _Entry(NamedTuple):
+    text: str
+    expires_at: float
+    tags: Tuple[str, ...]
+    size: int
+
+
+class MemoryCache:
+    """
+    Dictionary-backed LRU cache with per-entry TTL.
+
+    Entries are private to the current process; use SQLiteCache or
+    RedisCache to share entries between worker processes. Values are stored
+    as JSON text and decoded on every read, as the other backends do, so a
+    caller changing a value it read or stored cannot change what later
+    readers get. Once the cache
+    holds max_entries, the least recently used entry is evicted, and expired
+    entries are swept out periodically so keys that are never read again do
+    not accumulate.
+    """
+
+    name = "memory"
+
+    def __init__(
+        self,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        sweep_interval: float = SWEEP_INTERVAL,
+    ):
+        self.max_entries = max_entries
+        self.sweep_interval = sweep_interval
+        self.metrics = CacheMetrics()
+        self.bytes = 0
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._tags: Dict[str, Set[str]] = {}
+        self._next_sweep = time.time() + sweep_interval
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _size(self, key: str, text: str) -> int:
+        """Get the size an entry is accounted at; entries are not sized here."""
+        return 0
+
+    def _full(self) -> bool:
+        return len(self._entries) > self.max_entries
+
+    def _admits(self, size: int) -> bool:
+        """Check whether an entry of a size can be stored at all."""
+        return True
+
+    def _remove(self, key: str) -> Optional[_Entry]:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return None
+        self.bytes -= entry.size
+        for tag in entry.tags:
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[tag]
+        return entry
+
+    async def get(self, key: str) -> Optional[Any]:
+        """
+        Get a cached value.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Cached value, or None if missing or expired
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            self.metrics.misses += 1
+            return None
+
+        if entry.expires_at <= time.time():
+            self._remove(key)
+            self.metrics.expirations += 1
+            self.metrics.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.metrics.hits += 1
+        return json.loads(entry.text)
+
+    async def set(
+        self,
+        key: str,
+        value: Any,
+        ttl: float,
+        tags: Iterable[str] = (),
+        encoded: Optional[str] = None,
+    ) -> None:
+        """
+        Store a value.
+
+        Args:
+            key: Cache key
+            value: JSON-serializable value to store
+            ttl: Time to live in seconds
+            tags: Tags to invalidate the entry by
+            encoded: The value's JSON encoding, if the caller already has it
+        """
+        now = time.time()
+        if now >= self._next_sweep:
+            self.sweep(now)
+        self._remove(key)
+        text = encode(value) if encoded is None else encoded
+        size = self._size(key, text)
+        if not self._admits(size):
+            return
+        entry = _Entry(text, now + ttl, tuple(tags), size)
+        self._entries[key] = entry
+        self.bytes += entry.size
+        for tag in entry.tags:
+            self._tags.setdefault(tag, set()).add(key)
+        self.metrics.sets += 1
+        while self._full():
+            self._remove(next(iter(self._entries)))
+            self.metrics.evictions += 1
+
+    async def delete(self, key: str) -> bool:
+        """
+        Remove an entry.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            True if the entry existed
+        """
+        return self._remove(key) is not None
+
+    async def invalidate_tag(self, tag: str) -> int:
+        """
+        Remove every entry stored with a tag.
+
+        Args:
+            tag: Tag
+
+        Returns:
+            Number of entries removed
+        """
+        keys = list(self._tags.get(tag, ()))
+        for key in keys:
+            self._remove(key)
+        self.metrics.invalidations += len(keys)
+        return len(keys)
+
+    def shrink(self, fraction: float) -> int:
+        """
+        Evict a share of the least recently used entries.
+
+        Args:
+            fraction: Share of the entries to evict, from 0 to 1
+
+        Returns:
+            Number of entries evicted
+        """
+        count = min(len(self._entries), math.ceil(len(self._entries) * fraction))
+        for key in list(self._entries)[:count]:
+            self._remove(key)
+        self.metrics.evictions += count
+        return count
+
+    def sweep(self, now: Optional[float] = None) -> int:
+        """
+        Remove every expired entry.
+
+        Args:
+            now: Current time, defaults to the system clock
+
+        Returns:
+            Number of entries removed
+        """
+        now = time.time() if now is None else now
+        expired = [
+            key for key, entry in self._entries.items() if entry.expires_at <= now
+        ]
+        for key in expired:
+            self._remove(key)
+        self.metrics.expirations += len(expired)
+        self._next_sweep = now + self.sweep_interval
+        return len(expired)
+
+    async def clear(self) -> None:
+        """Remove all entries."""
+        self._entries.clear()
+        self._tags.clear()
+        self.bytes = 0
+
+    async def stats(self) -> Dict[str, Any]:
+        """
+        Get the cache's size and counters.
+
+        Returns:
+            Dictionary with the backend 'name', 'entries', 'bytes' (0 when
+            entries are not sized) and the operation counters
+        """
+        return {
+            "name": self.name,
+            "entries": len(self._entries),
+            "bytes": self.bytes,
+            **self.metrics.snapshot(),
+        }
+
+
+class SizedMemoryCache(MemoryCache):
+    """
+    In-process LRU cache bounded by the size of its entries.
+
+    Each entry is accounted at the length of its key plus its JSON encoding,
+    which tracks the memory it holds far better than an entry count when
+    payloads range from a few hundred bytes (a point) to megabytes (the
+    national alert feed). Least recently used entries are evicted once the
+    total exceeds max_bytes, or the count exceeds max_entries. An entry
+    larger than max_bytes on its own is not stored, rather than emptying
+    the cache to make room for it.
+    """
+
+    name = "sized"
+
+    def __init__(
+        self,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        sweep_interval: float = SWEEP_INTERVAL,
+    ):
+        super().__init__(max_entries, sweep_interval)
+        self.max_bytes = max_bytes
+
+    def _size(self, key: str, text: str) -> int:
+        """Get the size an entry is accounted at."""
+        return len(key) + len(text.encode())
+
+    def _full(self) -> bool:
+        return self.bytes > self.max_bytes or super()._full()
+
+    def _admits(self, size: int) -> bool:
+        """Check whether an entry of a size fits in the cache on its own."""
+        return size <= self.max_bytes
+
+    def resize(self, max_bytes: int) -> int:
+        """
+        Change the size limit, evicting entries until the cache fits it.
+
+        Args:
+            max_bytes: New size limit
+
+        Returns:
+            Number of entries evicted
+        """
+        self.max_bytes = max_bytes
+        evicted = 0
+        while self._entries and self._full():
+            self._remove(next(iter(self._entries)))
+            evicted += 1
+        self.metrics.evictions += evicted
+        return evicted
+
+    async def stats(self) -> Dict[str, Any]:
+        """
+        Get the cache's size, limits and counters.
+
+        Returns:
+            Dictionary with the backend 'name', 'entries', 'bytes',
+            'max_bytes' and the operation counters
+        """
+        return {**await super().stats(), "max_bytes": self.max_bytes}
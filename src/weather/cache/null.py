@@ -0,0 +1,88 @@
+"""Cache backend that stores nothing."""
+
+from typing import Any, Dict, Iterable, Optional
+
+from .base import CacheMetrics
+
+
+class NullCache:
+    """
+    Cache that never holds an entry.
+
+    Selected with WEATHER_CACHE_DISABLED so that benchmarks measure the
+    upstream request path rather than cache hits.
+    """
+
+    name = "none"
+
+    def __init__(self):
+        self.metrics = CacheMetrics()
+
+    async def get(self, key: str) -> Optional[Any]:
+        """
+        Get a cached value.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Always None
+        """
+        self.metrics.misses += 1
+        return None
+
+    async def set(
+        self,
+        key: str,
+        value: Any,
+        ttl: float,
+        tags: Iterable[str] = (),
+        encoded: Optional[str] = None,
+    ) -> None:
+        """
+        Discard a value.
+
+        Args:
+            key: Cache key
+            value: Value that would have been stored
+            ttl: Time to live in seconds
+            tags: Tags the entry would have been stored with
+            encoded: The value's JSON encoding, if the caller already has it
+        """
+
+    async def delete(self, key: str) -> bool:
+        """
+        Remove an entry.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Always False
+        """
+        return False
+
+    async def invalidate_tag(self, tag: str) -> int:
+        """
+        Remove every entry stored with a tag.
+
+        Args:
+            tag: Tag
+
+        Returns:
+            Always 0
+        """
+        return 0
+
+    async def clear(self) -> None:
+        """Remove all entries."""
+
+    async def stats(self) -> Dict[str, Any]:
+        """
+        Get the cache's size and counters.
+
+        Returns:
+            Dictionary with the backend 'name', 'entries', 'bytes' and the
+            operation counters
+        """
+        return {"name": self.name, "entries": 0, "bytes": 0, **self.metrics.snapshot()}
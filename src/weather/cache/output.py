@@ -0,0 +1,166 @@
+"""Memoization of formatted tool output.
+
+Formatting a large alert list or decoding a week of gridpoint layers costs
+far more than fetching the cached payload behind it. Tool output is
+therefore cached under the tool name, its normalized arguments and the
+versions of the upstream payloads it was built from. A new payload has a
+new version, so stale output is never served and simply ages out of the
+LRU.
+"""
+
+import math
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Sequence, Tuple
+
+DEFAULT_MAX_ENTRIES = 1024
+
+_output_cache: Optional["OutputCache"] = None
+
+
+def output_key(
+    tool: str, arguments: Dict[str, Any], versions: Sequence[Optional[str]]
+) -> Optional[Tuple[Hashable, ...]]:
+    """
+    Build the cache key for a tool result.
+
+    Args:
+        tool: Tool name
+        arguments: Normalized arguments the output depends on
+        versions: Versions of the payloads the output was built from
+
+    Returns:
+        Cache key, or None if a payload version is unknown and the output
+        must not be cached
+    """
+    if not versions or any(version is None for version in versions):
+        return None
+    return (tool, tuple(sorted(arguments.items())), tuple(versions))
+
+
+class OutputCache:
+    """
+    LRU map from output keys to formatted tool output.
+
+    Entries are private to the current process and hold no TTL; they are
+    only ever found again while their payload versions are current. Besides
+    max_entries, the cache can be bounded by the characters of output it
+    holds (max_bytes, which the memory governor sets).
+    """
+
+    def __init__(
+        self, max_entries: int = DEFAULT_MAX_ENTRIES, max_bytes: Optional[int] = None
+    ):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.bytes = 0
+        self._entries: "OrderedDict[Tuple[Hashable, ...], str]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Optional[Tuple[Hashable, ...]]) -> Optional[str]:
+        """
+        Get memoized output.
+
+        Args:
+            key: Key from output_key, or None
+
+        Returns:
+            Output text, or None if not cached
+        """
+        text = self._entries.get(key) if key is not None else None
+        if text is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._entries.move_to_end(key)
+        return text
+
+    def set(self, key: Optional[Tuple[Hashable, ...]], text: str) -> str:
+        """
+        Memoize output.
+
+        Args:
+            key: Key from output_key; nothing is stored for None
+            text: Output text
+
+        Returns:
+            The text, so a tool can return the result of storing it
+        """
+        if key is not None:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.bytes -= len(previous)
+            self._entries[key] = text
+            self.bytes += len(text)
+            self._evict()
+        return text
+
+    def _full(self) -> bool:
+        return len(self._entries) > self.max_entries or (
+            self.max_bytes is not None and self.bytes > self.max_bytes
+        )
+
+    def _evict(self, count: int = 0) -> int:
+        """Evict at least count entries, then more until within the limits."""
+        evicted = 0
+        while self._entries and (evicted < count or self._full()):
+            self.bytes -= len(self._entries.popitem(last=False)[1])
+            evicted += 1
+        return evicted
+
+    def resize(self, max_bytes: Optional[int]) -> int:
+        """
+        Change the size limit, evicting entries until the cache fits it.
+
+        Args:
+            max_bytes: New limit in characters of output, or None for none
+
+        Returns:
+            Number of entries evicted
+        """
+        self.max_bytes = max_bytes
+        return self._evict()
+
+    def shrink(self, fraction: float) -> int:
+        """
+        Evict a share of the least recently used entries.
+
+        Args:
+            fraction: Share of the entries to evict, from 0 to 1
+
+        Returns:
+            Number of entries evicted
+        """
+        return self._evict(math.ceil(len(self._entries) * fraction))
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        self._entries.clear()
+        self.bytes = 0
+
+
+def get_output_cache() -> OutputCache:
+    """
+    Get the process-wide output cache, creating it on first use.
+
+    Returns:
+        Output cache
+    """
+    global _output_cache
+    if _output_cache is None:
+        _output_cache = OutputCache()
+    return _output_cache
+
+
+def set_output_cache(cache: Optional[OutputCache]) -> None:
+    """
+    Replace the process-wide output cache.
+
+    Args:
+        cache: Cache to use, or None to create a new one on next use
+    """
+    global _output_cache
+    _output_cache = cache
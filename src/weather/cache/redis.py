@@ -0,0 +1,361 @@
+"""Redis cache backend shared between processes and hosts.
+
+Speaks the Redis serialization protocol (RESP2) directly over asyncio
+streams, so no client library is needed. Commands are pipelined: storing an
+entry with its tags is one round trip.
+"""
+
+import asyncio
+import json
+import logging
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+from urllib.parse import urlsplit
+
+from .base import CacheMetrics, encode
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+DEFAULT_URL = "redis://localhost:6379/0"
+DEFAULT_PREFIX = "weather:"
+DEFAULT_POOL_SIZE = 8
+DEFAULT_TIMEOUT = 2.0
+SCAN_BATCH = 500
+
+
+class RedisError(Exception):
+    """Error reply from a Redis server."""
+
+
+# Failures that make a cache operation a miss rather than an error
+_ERRORS = (OSError, EOFError, RedisError)
+
+Connection = Tuple[asyncio.StreamReader, asyncio.StreamWriter]
+
+
+def encode_command(*args: Any) -> bytes:
+    """
+    Encode a command as a RESP array of bulk strings.
+
+    Args:
+        *args: Command name and arguments; non-bytes values are sent as text
+
+    Returns:
+        Encoded command
+    """
+    parts = [b"*%d\r\n" % len(args)]
+    for arg in args:
+        data = arg if isinstance(arg, bytes) else str(arg).encode()
+        parts.append(b"$%d\r\n%s\r\n" % (len(data), data))
+    return b"".join(parts)
+
+
+async def read_reply(reader: asyncio.StreamReader) -> Any:
+    """
+    Read one RESP2 value.
+
+    Error replies are returned as RedisError instances rather than raised,
+    so that every reply of a pipeline is consumed.
+
+    Args:
+        reader: Stream to read from
+
+    Returns:
+        str for simple strings, bytes for bulk strings, int, list, None for
+        null replies, or RedisError
+
+    Raises:
+        ConnectionError: If the stream ends or holds something other than RESP
+    """
+    line = await reader.readline()
+    if not line.endswith(b"\r\n"):
+        raise ConnectionError("Connection closed by Redis server")
+    kind, rest = line[:1], line[1:-2]
+    if kind == b"+":
+        return rest.decode()
+    if kind == b"-":
+        return RedisError(rest.decode())
+    if kind == b":":
+        return int(rest)
+    if kind == b"$":
+        length = int(rest)
+        return None if length < 0 else (await reader.readexactly(length + 2))[:-2]
+    if kind == b"*":
+        length = int(rest)
+        if length < 0:
+            return None
+        return [await read_reply(reader) for _ in range(length)]
+    raise ConnectionError(f"Unexpected reply from Redis server: {line[:40]!r}")
+
+
+class RedisCache:
+    """
+    Cache stored in a Redis server.
+
+    Entries expire through Redis's own TTLs. Each tag is a Redis set of the
+    keys stored with it, kept at least as long as its longest-lived entry;
+    setting that expiry uses PEXPIRE with NX and GT, which need Redis 7.
+    An entry's current tags are stored next to it, so storing it again
+    under other tags needs no extra round trip: invalidation skips keys
+    whose current tags no longer include the tag. Connections are pooled,
+    up to pool_size in use at once.
+    """
+
+    name = "redis"
+
+    def __init__(
+        self,
+        url: str = DEFAULT_URL,
+        prefix: str = DEFAULT_PREFIX,
+        pool_size: int = DEFAULT_POOL_SIZE,
+        timeout: float = DEFAULT_TIMEOUT,
+    ):
+        parts = urlsplit(url)
+        if parts.scheme != "redis":
+            raise ValueError(f"Unsupported Redis URL: {url}")
+        self.url = url
+        self.host = parts.hostname or "localhost"
+        self.port = parts.port or 6379
+        self.db = int(parts.path.strip("/") or 0)
+        self.password = parts.password
+        self.prefix = prefix
+        self.timeout = timeout
+        self.metrics = CacheMetrics()
+        self._slots = asyncio.Semaphore(pool_size)
+        self._idle: List[Connection] = []
+
+    def _key(self, key: str) -> str:
+        return f"{self.prefix}k:{key}"
+
+    def _tag(self, tag: str) -> str:
+        return f"{self.prefix}t:{tag}"
+
+    def _tags_of(self, key: str) -> str:
+        return f"{self.prefix}g:{key}"
+
+    async def _connect(self) -> Connection:
+        reader, writer = await asyncio.open_connection(self.host, self.port)
+        setup: List[Sequence[Any]] = []
+        if self.password:
+            setup.append(("AUTH", self.password))
+        if self.db:
+            setup.append(("SELECT", self.db))
+        if setup:
+            writer.write(b"".join(encode_command(*command) for command in setup))
+            await writer.drain()
+            for _ in setup:
+                reply = await read_reply(reader)
+                if isinstance(reply, RedisError):
+                    writer.close()
+                    raise reply
+        return reader, writer
+
+    async def execute(self, *commands: Sequence[Any]) -> List[Any]:
+        """
+        Send commands in one pipeline and read their replies.
+
+        Args:
+            *commands: Commands, each a sequence of name and arguments
+
+        Returns:
+            Reply to each command
+
+        Raises:
+            RedisError: If any command failed
+            OSError: If the server cannot be reached or times out
+        """
+        async with self._slots:
+            connection = self._idle.pop() if self._idle else None
+            try:
+                async with asyncio.timeout(self.timeout):
+                    if connection is None:
+                        connection = await self._connect()
+                    reader, writer = connection
+                    writer.write(b"".join(encode_command(*c) for c in commands))
+                    await writer.drain()
+                    replies = [await read_reply(reader) for _ in commands]
+            except BaseException:
+                # A connection with unread replies cannot be reused
+                if connection is not None:
+                    connection[1].close()
+                raise
+            self._idle.append(connection)
+
+        for reply in replies:
+            if isinstance(reply, RedisError):
+                raise reply
+        return replies
+
+    async def get(self, key: str) -> Optional[Any]:
+        """
+        Get a cached value.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Cached value, or None if missing, expired or unreachable
+        """
+        try:
+            (data,) = await self.execute(("GET", self._key(key)))
+        except _ERRORS as e:
+            logger.error("Error reading cache entry %s: %s", key, e)
+            data = None
+        if data is None:
+            self.metrics.misses += 1
+            return None
+        self.metrics.hits += 1
+        return json.loads(data)
+
+    async def set(
+        self,
+        key: str,
+        value: Any,
+        ttl: float,
+        tags: Iterable[str] = (),
+        encoded: Optional[str] = None,
+    ) -> None:
+        """
+        Store a value.
+
+        Args:
+            key: Cache key
+            value: JSON-serializable value to store
+            ttl: Time to live in seconds
+            tags: Tags to invalidate the entry by
+            encoded: The value's JSON encoding, if the caller already has it
+        """
+        milliseconds = int(ttl * 1000)
+        if milliseconds <= 0:
+            # Already expired
+            await self.delete(key)
+            return
+
+        tags = sorted(set(tags))
+        commands: List[Sequence[Any]] = [
+            (
+                "SET",
+                self._key(key),
+                encode(value) if encoded is None else encoded,
+                "PX",
+                milliseconds,
+            ),
+            (
+                ("SET", self._tags_of(key), json.dumps(tags), "PX", milliseconds)
+                if tags
+                else ("DEL", self._tags_of(key))
+            ),
+        ]
+        for tag in tags:
+            tag_key = self._tag(tag)
+            commands += [
+                ("SADD", tag_key, key),
+                ("PEXPIRE", tag_key, milliseconds, "NX"),
+                ("PEXPIRE", tag_key, milliseconds, "GT"),
+            ]
+        try:
+            await self.execute(*commands)
+            self.metrics.sets += 1
+        except _ERRORS as e:
+            logger.error("Error writing cache entry %s: %s", key, e)
+
+    async def delete(self, key: str) -> bool:
+        """
+        Remove an entry.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            True if the entry existed
+        """
+        try:
+            removed, _ = await self.execute(
+                ("DEL", self._key(key)), ("DEL", self._tags_of(key))
+            )
+        except _ERRORS as e:
+            logger.error("Error deleting cache entry %s: %s", key, e)
+            return False
+        return removed > 0
+
+    async def invalidate_tag(self, tag: str) -> int:
+        """
+        Remove every entry stored with a tag.
+
+        Args:
+            tag: Tag
+
+        Returns:
+            Number of entries removed
+        """
+        tag_key = self._tag(tag)
+        try:
+            (members,) = await self.execute(("SMEMBERS", tag_key))
+            keys = [member.decode() for member in members]
+            if not keys:
+                return 0
+            (current,) = await self.execute(
+                ("MGET", *(self._tags_of(key) for key in keys))
+            )
+            # Keys stored again without the tag, or already expired, are kept
+            tagged = [
+                key
+                for key, tags in zip(keys, current)
+                if tags is not None and tag in json.loads(tags)
+            ]
+            removed = 0
+            if tagged:
+                removed, _ = await self.execute(
+                    ("DEL", *(self._key(key) for key in tagged)),
+                    ("DEL", *(self._tags_of(key) for key in tagged)),
+                )
+            await self.execute(("DEL", tag_key))
+        except _ERRORS as e:
+            logger.error("Error invalidating cache tag %s: %s", tag, e)
+            return 0
+        self.metrics.invalidations += removed
+        return removed
+
+    async def clear(self) -> None:
+        """Remove every entry and tag under this cache's prefix."""
+        cursor = b"0"
+        while True:
+            cursor, keys = (
+                await self.execute(
+                    ("SCAN", cursor, "MATCH", f"{self.prefix}*", "COUNT", SCAN_BATCH)
+                )
+            )[0]
+            if keys:
+                await self.execute(("DEL", *keys))
+            if cursor == b"0":
+                break
+
+    async def stats(self) -> Dict[str, Any]:
+        """
+        Get the server's size and this process's counters.
+
+        Returns:
+            Dictionary with the backend 'name', 'entries' and 'bytes' (keys
+            and memory of the whole Redis database) and the operation
+            counters; 'entries' and 'bytes' are None if the server cannot
+            be reached
+        """
+        entries = memory = None
+        try:
+            entries, info = await self.execute(("DBSIZE",), ("INFO", "memory"))
+            for line in info.decode().splitlines():
+                if line.startswith("used_memory:"):
+                    memory = int(line.split(":", 1)[1])
+        except _ERRORS as e:
+            logger.error("Error reading cache stats: %s", e)
+        return {
+            "name": self.name,
+            "entries": entries,
+            "bytes": memory,
+            **self.metrics.snapshot(),
+        }
+
+    def close(self) -> None:
+        """Close the pooled connections."""
+        while self._idle:
+            self._idle.pop()[1].close()
@@ -0,0 +1,251 @@
+"""SQLite cache backend shared between processes."""
+
+import asyncio
+import json
+import logging
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional
+
+from .base import CacheMetrics, encode
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS cache (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL,
+    expires_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS cache_expires_at ON cache (expires_at);
+CREATE TABLE IF NOT EXISTS cache_tags (
+    tag TEXT NOT NULL,
+    key TEXT NOT NULL,
+    PRIMARY KEY (tag, key)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS cache_tags_key ON cache_tags (key);
+"""
+
+SWEEP_INTERVAL = 60
+
+
+class SQLiteCache:
+    """
+    Cache stored in a local SQLite file.
+
+    Every process that opens the same file sees the same entries, which lets
+    SSE worker processes share upstream responses. The database runs in WAL
+    mode so readers in one worker do not block writers in another. Tags
+    are kept in a separate table, so invalidating a tag removes its entries
+    for every process.
+    """
+
+    name = "sqlite"
+
+    def __init__(self, path: str, sweep_interval: float = SWEEP_INTERVAL):
+        self.path = path
+        self.sweep_interval = sweep_interval
+        self._next_sweep = time.time() + sweep_interval
+        self.metrics = CacheMetrics()
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(
+            path, timeout=5, check_same_thread=False, isolation_level=None
+        )
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.executescript(SCHEMA)
+
+    def _get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT value FROM cache WHERE key = ? AND expires_at > ?",
+                (key, time.time()),
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def _set(self, key: str, value: str, expires_at: float, tags: List[str]) -> None:
+        now = time.time()
+        if now >= self._next_sweep:
+            self.sweep(now)
+        with self._lock, self._transaction():
+            self._connection.execute(
+                "INSERT OR REPLACE INTO cache (key, value, expires_at) VALUES (?, ?, ?)",
+                (key, value, expires_at),
+            )
+            self._connection.execute("DELETE FROM cache_tags WHERE key = ?", (key,))
+            self._connection.executemany(
+                "INSERT INTO cache_tags (tag, key) VALUES (?, ?)",
+                [(tag, key) for tag in tags],
+            )
+
+    def _transaction(self) -> sqlite3.Connection:
+        # The connection is in autocommit mode; as a context manager it
+        # commits or rolls back the explicit transaction begun here
+        self._connection.execute("BEGIN IMMEDIATE")
+        return self._connection
+
+    def _delete(self, key: str) -> bool:
+        with self._lock, self._transaction():
+            self._connection.execute("DELETE FROM cache_tags WHERE key = ?", (key,))
+            cursor = self._connection.execute("DELETE FROM cache WHERE key = ?", (key,))
+        return cursor.rowcount > 0
+
+    def _invalidate_tag(self, tag: str) -> int:
+        with self._lock, self._transaction():
+            keys = "SELECT key FROM cache_tags WHERE tag = ?"
+            cursor = self._connection.execute(
+                f"DELETE FROM cache WHERE key IN ({keys})", (tag,)
+            )
+            self._connection.execute(
+                f"DELETE FROM cache_tags WHERE key IN ({keys})", (tag,)
+            )
+        return cursor.rowcount
+
+    def _stats(self) -> Dict[str, Any]:
+        with self._lock:
+            entries = self._connection.execute("SELECT COUNT(*) FROM cache").fetchone()
+            pages = self._connection.execute("PRAGMA page_count").fetchone()
+            page_size = self._connection.execute("PRAGMA page_size").fetchone()
+        return {
+            "name": self.name,
+            "entries": entries[0],
+            "bytes": pages[0] * page_size[0],
+            **self.metrics.snapshot(),
+        }
+
+    def sweep(self, now: Optional[float] = None) -> int:
+        """
+        Delete every expired row.
+
+        Runs automatically from set at most once per sweep_interval.
+
+        Args:
+            now: Current time, defaults to the system clock
+
+        Returns:
+            Number of rows deleted
+        """
+        now = time.time() if now is None else now
+        self._next_sweep = now + self.sweep_interval
+        with self._lock, self._transaction():
+            self._connection.execute(
+                "DELETE FROM cache_tags WHERE key IN "
+                "(SELECT key FROM cache WHERE expires_at <= ?)",
+                (now,),
+            )
+            cursor = self._connection.execute(
+                "DELETE FROM cache WHERE expires_at <= ?", (now,)
+            )
+        self.metrics.expirations += cursor.rowcount
+        return cursor.rowcount
+
+    def _clear(self) -> None:
+        with self._lock, self._transaction():
+            self._connection.execute("DELETE FROM cache_tags")
+            self._connection.execute("DELETE FROM cache")
+
+    async def get(self, key: str) -> Optional[Any]:
+        """
+        Get a cached value.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Cached value, or None if missing or expired
+        """
+        try:
+            value = await asyncio.to_thread(self._get, key)
+        except sqlite3.Error as e:
+            logger.error("Error reading cache entry %s: %s", key, e)
+            value = None
+        if value is None:
+            self.metrics.misses += 1
+        else:
+            self.metrics.hits += 1
+        return value
+
+    async def set(
+        self,
+        key: str,
+        value: Any,
+        ttl: float,
+        tags: Iterable[str] = (),
+        encoded: Optional[str] = None,
+    ) -> None:
+        """
+        Store a value.
+
+        Args:
+            key: Cache key
+            value: JSON-serializable value to store
+            ttl: Time to live in seconds
+            tags: Tags to invalidate the entry by
+            encoded: The value's JSON encoding, if the caller already has it
+        """
+        try:
+            await asyncio.to_thread(
+                self._set,
+                key,
+                encode(value) if encoded is None else encoded,
+                time.time() + ttl,
+                list(tags),
+            )
+            self.metrics.sets += 1
+        except sqlite3.Error as e:
+            logger.error("Error writing cache entry %s: %s", key, e)
+
+    async def delete(self, key: str) -> bool:
+        """
+        Remove an entry.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            True if the entry existed
+        """
+        try:
+            return await asyncio.to_thread(self._delete, key)
+        except sqlite3.Error as e:
+            logger.error("Error deleting cache entry %s: %s", key, e)
+            return False
+
+    async def invalidate_tag(self, tag: str) -> int:
+        """
+        Remove every entry stored with a tag.
+
+        Args:
+            tag: Tag
+
+        Returns:
+            Number of entries removed
+        """
+        try:
+            removed = await asyncio.to_thread(self._invalidate_tag, tag)
+        except sqlite3.Error as e:
+            logger.error("Error invalidating cache tag %s: %s", tag, e)
+            return 0
+        self.metrics.invalidations += removed
+        return removed
+
+    async def clear(self) -> None:
+        """Remove all entries."""
+        await asyncio.to_thread(self._clear)
+
+    async def stats(self) -> Dict[str, Any]:
+        """
+        Get the cache's size and counters.
+
+        Returns:
+            Dictionary with the backend 'name', 'entries', 'bytes' (the size
+            of the database file) and this process's operation counters
+        """
+        return await asyncio.to_thread(self._stats)
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._connection.close()
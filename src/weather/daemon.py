@@ -0,0 +1,419 @@
+"""Shared local daemon for stdio clients.
+
+Each MCP client on a host (every Claude Desktop window, every ``mcp dev``
+session) normally launches a server process of its own, with its own cold
+caches and connections. In daemon mode one long-lived server listens on a
+Unix socket and runs an MCP session per connection, sharing its HTTP
+connection pool, response caches and samplers between them. The stdio
+entry point becomes a forwarder that copies bytes between stdin/stdout and
+the socket, starting the daemon first if none is running.
+
+The forwarder imports nothing beyond a few standard library modules (not
+even asyncio), so it starts in a few milliseconds. The daemon exits once it has had no clients for
+WEATHER_DAEMON_IDLE_TIMEOUT seconds.
+
+The daemon keeps the environment of the client that started it. It records
+its WEATHER_* settings next to the socket, and a forwarder whose own
+settings differ warns on stderr that they are not in effect.
+"""
+
+import argparse
+import fcntl
+import json
+import logging
+import os
+import signal
+import socket
+import stat
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from contextlib import AsyncExitStack
+from pathlib import Path
+from typing import IO, TYPE_CHECKING, Dict, List, Optional
+
+if TYPE_CHECKING:
+    import asyncio
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+IDLE_TIMEOUT = float(os.environ.get("WEATHER_DAEMON_IDLE_TIMEOUT", "1800"))
+# Seconds the forwarder waits for a daemon it started to accept connections
+START_TIMEOUT = 10.0
+# Longest JSON-RPC message line accepted from a client
+MAX_MESSAGE_BYTES = 16 * 1024 * 1024
+COPY_CHUNK = 64 * 1024
+
+
+def private_directory(directory: str) -> str:
+    """
+    Create a directory only this user can use, or check an existing one.
+
+    Anyone can create a name under /tmp first. Unless the directory is this
+    user's own, another user could put a socket in it and receive every
+    tool call, so anything else is refused.
+
+    Args:
+        directory: Directory path
+
+    Returns:
+        The directory path
+
+    Raises:
+        PermissionError: If the path is a symlink, not a directory, owned by
+            another user or open to other users
+    """
+    os.makedirs(directory, mode=0o700, exist_ok=True)
+    info = os.lstat(directory)
+    if (
+        not stat.S_ISDIR(info.st_mode)
+        or info.st_uid != os.getuid()
+        or stat.S_IMODE(info.st_mode) != 0o700
+    ):
+        raise PermissionError(
+            f"{directory} is not a private directory of this user; "
+            "remove it or set WEATHER_DAEMON_SOCKET"
+        )
+    return directory
+
+
+def default_socket_path() -> str:
+    """
+    Get the daemon's socket path.
+
+    WEATHER_DAEMON_SOCKET overrides the default, a socket in the user's
+    runtime directory or, without one, in a private directory under /tmp.
+
+    Returns:
+        Socket path
+
+    Raises:
+        PermissionError: If the directory under /tmp is not private to this
+            user
+    """
+    path = os.environ.get("WEATHER_DAEMON_SOCKET")
+    if path:
+        return path
+    directory = os.environ.get("XDG_RUNTIME_DIR")
+    if not directory:
+        directory = private_directory(
+            os.path.join(tempfile.gettempdir(), f"weather-mcp-{os.getuid()}")
+        )
+    return os.path.join(directory, "weather-mcp.sock")
+
+
+def weather_settings() -> Dict[str, str]:
+    """
+    Get this process's WEATHER_* environment variables.
+
+    Returns:
+        Variable names and values
+    """
+    return {
+        name: value for name, value in os.environ.items() if name.startswith("WEATHER_")
+    }
+
+
+def check_settings(path: str) -> List[str]:
+    """
+    Compare this process's WEATHER_* settings with the running daemon's.
+
+    Args:
+        path: Socket path
+
+    Returns:
+        Names of the variables that differ, empty if the daemon recorded
+        none
+    """
+    try:
+        with open(f"{path}.env") as f:
+            daemon = json.load(f)
+    except (OSError, ValueError):
+        return []
+    own = weather_settings()
+    return sorted(
+        name for name in own.keys() | daemon.keys() if own.get(name) != daemon.get(name)
+    )
+
+
+def acquire_lock(path: str) -> Optional[IO[bytes]]:
+    """
+    Take the lock that makes one daemon the owner of a socket path.
+
+    Args:
+        path: Socket path
+
+    Returns:
+        Open lock file, held until closed, or None if another daemon holds it
+    """
+    lock = open(f"{path}.lock", "wb")
+    try:
+        fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except BlockingIOError:
+        lock.close()
+        return None
+    return lock
+
+
+async def _serve_connection(
+    server, reader: "asyncio.StreamReader", writer: "asyncio.StreamWriter"
+) -> None:
+    """
+    Run an MCP session over a client connection.
+
+    Messages are newline-delimited JSON-RPC, as on stdio.
+
+    Args:
+        server: MCP server instance
+        reader: Stream from the client
+        writer: Stream to the client
+    """
+    import anyio
+    import mcp.types as types
+
+    read_writer, read_stream = anyio.create_memory_object_stream(0)
+    write_stream, write_reader = anyio.create_memory_object_stream(0)
+
+    async def receive() -> None:
+        async with read_writer:
+            while line := await reader.readline():
+                try:
+                    message = types.JSONRPCMessage.model_validate_json(line)
+                except Exception as exc:
+                    await read_writer.send(exc)
+                    continue
+                await read_writer.send(message)
+
+    async def send() -> None:
+        async with write_reader:
+            async for message in write_reader:
+                data = message.model_dump_json(by_alias=True, exclude_none=True)
+                writer.write(data.encode() + b"\n")
+                await writer.drain()
+
+    try:
+        async with anyio.create_task_group() as tg:
+            tg.start_soon(receive)
+            tg.start_soon(send)
+            await server._mcp_server.run(
+                read_stream,
+                write_stream,
+                server._mcp_server.create_initialization_options(),
+            )
+            tg.cancel_scope.cancel()
+    except* (ConnectionError, anyio.ClosedResourceError, anyio.BrokenResourceError):
+        # The client went away mid-session
+        pass
+    except* ValueError as group:
+        # A line longer than the reader's limit
+        logger.warning("Closing daemon client connection: %s", group.exceptions[0])
+    finally:
+        writer.close()
+
+
+async def run_daemon(server, path: str, idle_timeout: float = IDLE_TIMEOUT) -> bool:
+    """
+    Serve MCP sessions on a Unix socket until idle or terminated.
+
+    Args:
+        server: MCP server instance
+        path: Socket path
+        idle_timeout: Seconds without clients after which the daemon exits;
+            0 keeps it running
+
+    Returns:
+        False if another daemon already owns the socket, True once this one
+        has stopped
+    """
+    lock = acquire_lock(path)
+    if lock is None:
+        logger.info("Another weather daemon is serving %s", path)
+        return False
+
+    import asyncio
+
+    from .utils.http import shared_client
+
+    loop = asyncio.get_running_loop()
+    stop = asyncio.Event()
+    clients = 0
+    idle_since = loop.time()
+
+    async def handle(
+        reader: "asyncio.StreamReader", writer: "asyncio.StreamWriter"
+    ) -> None:
+        nonlocal clients, idle_since
+        clients += 1
+        try:
+            await _serve_connection(server, reader, writer)
+        finally:
+            clients -= 1
+            idle_since = loop.time()
+
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+
+    try:
+        async with AsyncExitStack() as stack:
+            await stack.enter_async_context(shared_client())
+            if os.environ.get("WEATHER_WARMUP_CONFIG"):
+                from .services.warmup import warmup_running
+
+                await stack.enter_async_context(warmup_running())
+
+            # Holding the lock, any socket file left behind is stale
+            if os.path.exists(path):
+                os.unlink(path)
+            previous = os.umask(0o177)
+            try:
+                # Recorded before listening, so every client can compare
+                with open(f"{path}.env", "w") as f:
+                    json.dump(weather_settings(), f)
+                listener = await asyncio.start_unix_server(
+                    handle, path, limit=MAX_MESSAGE_BYTES
+                )
+            finally:
+                os.umask(previous)
+            logger.info("Weather daemon %s listening on %s", os.getpid(), path)
+
+            async with listener:
+                while not stop.is_set():
+                    try:
+                        await asyncio.wait_for(stop.wait(), timeout=1.0)
+                    except TimeoutError:
+                        pass
+                    idle = loop.time() - idle_since
+                    if idle_timeout and not clients and idle >= idle_timeout:
+                        logger.info("Weather daemon idle for %.0fs, exiting", idle)
+                        break
+                listener.close()
+    finally:
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            loop.remove_signal_handler(sig)
+        for leftover in (path, f"{path}.env"):
+            if os.path.exists(leftover):
+                os.unlink(leftover)
+        lock.close()
+    return True
+
+
+def start_daemon(path: str) -> subprocess.Popen:
+    """
+    Start a daemon process in the background.
+
+    The daemon inherits this process's environment and logs to the socket
+    path with a .log suffix.
+
+    Args:
+        path: Socket path
+
+    Returns:
+        Daemon process
+    """
+    with open(f"{path}.log", "ab") as log:
+        return subprocess.Popen(
+            [sys.executable, "-m", "src.weather.daemon", "--socket", path],
+            cwd=PROJECT_ROOT,
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=log,
+            start_new_session=True,
+        )
+
+
+def connect(path: str, start: bool = True) -> socket.socket:
+    """
+    Connect to the daemon, starting it if none is running.
+
+    Args:
+        path: Socket path
+        start: Whether to start a daemon when none answers
+
+    Returns:
+        Connected socket
+
+    Raises:
+        ConnectionError: If no daemon accepts the connection in time
+    """
+    deadline = time.monotonic() + START_TIMEOUT
+    started = None
+    while True:
+        client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            client.connect(path)
+            return client
+        except (FileNotFoundError, ConnectionRefusedError):
+            client.close()
+        if not start:
+            raise ConnectionError(f"No weather daemon is listening on {path}")
+        if started is None:
+            # If several clients start one at once, the lock picks the daemon
+            started = start_daemon(path)
+        if time.monotonic() > deadline:
+            raise ConnectionError(f"Weather daemon did not start on {path}")
+        time.sleep(0.02)
+
+
+def forward_stdio(path: Optional[str] = None) -> int:
+    """
+    Copy stdin to the daemon and the daemon's replies to stdout.
+
+    Args:
+        path: Socket path, defaults to default_socket_path()
+
+    Returns:
+        Exit status
+    """
+    try:
+        path = path or default_socket_path()
+        client = connect(path)
+    except OSError as e:
+        print(f"weather: {e}", file=sys.stderr)
+        return 1
+    differing = check_settings(path)
+    if differing:
+        print(
+            f"weather: warning: the running daemon has different {', '.join(differing)} "
+            "settings; they take effect once it restarts",
+            file=sys.stderr,
+        )
+
+    def upstream() -> None:
+        try:
+            while data := os.read(sys.stdin.fileno(), COPY_CHUNK):
+                client.sendall(data)
+            client.shutdown(socket.SHUT_WR)
+        except OSError:
+            pass
+
+    threading.Thread(target=upstream, daemon=True).start()
+    output = sys.stdout.fileno()
+    try:
+        while data := client.recv(COPY_CHUNK):
+            view = memoryview(data)
+            while view:
+                view = view[os.write(output, view) :]
+    except OSError:
+        return 1
+    finally:
+        client.close()
+    return 0
+
+
+def main() -> None:
+    """Run the daemon in the foreground."""
+    parser = argparse.ArgumentParser(description="Shared weather MCP daemon")
+    parser.add_argument("--socket", default=None, help="Unix socket path")
+    args = parser.parse_args()
+
+    from .server import serve_daemon
+
+    serve_daemon(args.socket)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,249 @@
+"""Non-blocking, structured logging.
+
+Loggers hand records to a bounded in-memory queue, and a background thread
+formats them and writes them to stderr, so a slow terminal or log collector
+never holds up the event loop. Messages use %-style arguments and are only
+formatted by that thread; records for disabled levels cost a level check.
+If the queue fills up (the writer cannot keep up), further records are
+dropped and counted rather than buffered without bound.
+
+Records carry the fields set with log_context() where they were logged,
+such as the tool and request id of the call being handled. Output is one
+JSON object per line by default; WEATHER_LOG_FORMAT=text selects plain
+lines. WEATHER_LOG_LEVEL sets the level (INFO).
+
+Hot-path debug logs can go through sampled(), which passes on one record in
+every WEATHER_LOG_SAMPLE_EVERY (100) and marks it with the sampling rate.
+"""
+
+import atexit
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterator, Optional, TextIO
+
+LOG_LEVEL = os.environ.get("WEATHER_LOG_LEVEL", "INFO").upper()
+LOG_FORMAT = os.environ.get("WEATHER_LOG_FORMAT", "json").lower()
+SAMPLE_EVERY = int(os.environ.get("WEATHER_LOG_SAMPLE_EVERY", "100"))
+# Records waiting for the writer thread before new ones are dropped
+MAX_QUEUED = 10_000
+
+_context: ContextVar[Dict[str, Any]] = ContextVar("weather_log_context", default={})
+_handler: Optional["ContextQueueHandler"] = None
+_listener: Optional[logging.handlers.QueueListener] = None
+_lock = threading.Lock()
+
+
+@contextmanager
+def log_context(**fields: Any) -> Iterator[None]:
+    """
+    Add fields to every record logged in this context.
+
+    Args:
+        **fields: Field names and values, such as tool='get_forecast'
+    """
+    token = _context.set({**_context.get(), **fields})
+    try:
+        yield
+    finally:
+        _context.reset(token)
+
+
+class ContextQueueHandler(logging.handlers.QueueHandler):
+    """
+    Queue records unformatted, tagged with the current log context.
+
+    The arguments of a record are formatted later on the writer thread, so
+    they should not be objects that change after they are logged.
+    """
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record.context = _context.get()
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class JsonFormatter(logging.Formatter):
+    """Format records as JSON lines with their context fields."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": datetime.fromtimestamp(record.created, timezone.utc).isoformat(
+                timespec="milliseconds"
+            ),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            **getattr(record, "context", {}),
+        }
+        if hasattr(record, "sample_every"):
+            entry["sample_every"] = record.sample_every
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+class TextFormatter(logging.Formatter):
+    """Format records as level:logger:message, followed by context fields."""
+
+    def __init__(self):
+        super().__init__(logging.BASIC_FORMAT)
+
+    def format(self, record: logging.LogRecord) -> str:
+        text = super().format(record)
+        fields = dict(getattr(record, "context", {}))
+        if hasattr(record, "sample_every"):
+            fields["sample_every"] = record.sample_every
+        if not fields:
+            return text
+        return f"{text} [{' '.join(f'{k}={v}' for k, v in fields.items())}]"
+
+
+class _StderrHandler(logging.StreamHandler):
+    """Write to whatever sys.stderr is when a record is written."""
+
+    def __init__(self):
+        super().__init__(sys.stderr)
+
+    @property
+    def stream(self) -> TextIO:
+        return sys.stderr
+
+    @stream.setter
+    def stream(self, value: TextIO) -> None:
+        pass
+
+
+def _start(stream: Optional[TextIO], fmt: str) -> None:
+    global _listener
+    writer = _StderrHandler() if stream is None else logging.StreamHandler(stream)
+    writer.setFormatter(JsonFormatter() if fmt == "json" else TextFormatter())
+    _listener = logging.handlers.QueueListener(_handler.queue, writer)
+    _listener.start()
+
+
+def configure_logging(
+    level: Optional[str] = None,
+    fmt: Optional[str] = None,
+    stream: Optional[TextIO] = None,
+) -> None:
+    """
+    Route the root logger through the queue and start the writer thread.
+
+    Does nothing if logging is already configured this way. Forked children
+    get a writer thread of their own.
+
+    Args:
+        level: Level name, defaults to WEATHER_LOG_LEVEL
+        fmt: 'json' or 'text', defaults to WEATHER_LOG_FORMAT
+        stream: Stream to write to, defaults to stderr
+    """
+    global _handler
+    with _lock:
+        if _handler is not None:
+            return
+        fmt = fmt or LOG_FORMAT
+        _handler = ContextQueueHandler(queue.Queue(MAX_QUEUED))
+        root = logging.getLogger()
+        root.addHandler(_handler)
+        root.setLevel(level or LOG_LEVEL)
+        # httpx logs every request at INFO; upstream requests are logged
+        # through a sampled debug logger in utils.http instead
+        logging.getLogger("httpx").setLevel(logging.WARNING)
+        _start(stream, fmt)
+        atexit.register(shutdown_logging)
+
+        def restart_in_child() -> None:
+            # The parent's writer thread does not exist in a forked child
+            _handler.queue = queue.Queue(MAX_QUEUED)
+            _start(stream, fmt)
+
+        os.register_at_fork(after_in_child=restart_in_child)
+
+
+def shutdown_logging() -> None:
+    """Write out queued records and stop the writer thread."""
+    global _listener
+    listener, _listener = _listener, None
+    if listener is not None:
+        listener.stop()
+
+
+def dropped_records() -> int:
+    """
+    Get the number of records dropped because the queue was full.
+
+    Returns:
+        Records dropped
+    """
+    return _handler.dropped if _handler is not None else 0
+
+
+class SampledLogger:
+    """
+    Logger passing on one record in every few, for hot-path debug logs.
+
+    Records that are passed on carry a sample_every field, so counts can be
+    scaled back up.
+
+    Args:
+        logger: Logger to write to
+        every: Pass on one record in this many
+    """
+
+    def __init__(self, logger: logging.Logger, every: int = SAMPLE_EVERY):
+        self.logger = logger
+        self.every = max(1, every)
+        self._seen = 0
+
+    def log(self, level: int, msg: str, *args: Any) -> None:
+        """
+        Log a record if the level is enabled and its turn has come.
+
+        Args:
+            level: Logging level
+            msg: Message with %-style placeholders
+            *args: Placeholder values
+        """
+        if not self.logger.isEnabledFor(level):
+            return
+        self._seen += 1
+        if (self._seen - 1) % self.every:
+            return
+        self.logger.log(
+            level, msg, *args, extra={"sample_every": self.every}, stacklevel=3
+        )
+
+    def debug(self, msg: str, *args: Any) -> None:
+        """Log a sampled debug record."""
+        self.log(logging.DEBUG, msg, *args)
+
+
+def sampled(logger: logging.Logger, every: int = SAMPLE_EVERY) -> SampledLogger:
+    """
+    Wrap a logger to pass on one record in every few.
+
+    Args:
+        logger: Logger to write to
+        every: Pass on one record in this many
+
+    Returns:
+        Sampled logger
+    """
+    return SampledLogger(logger, every)
@@ -0,0 +1,475 @@
+"""Memory governor keeping the server within a memory budget.
+
+The governor samples the process's resident set size and, when the server
+runs in a memory-limited cgroup, the cgroup's working set. Their share of
+the limit sets a pressure level. Each subsystem holding memory (the
+in-process response cache, the formatted output cache, the alert change
+history and the buffers of upstream responses) gets a share of the limit
+as its byte budget, scaled down as pressure rises. Above normal pressure
+the governor also sheds a growing share of each cache's least recently used
+entries on every check, down to halving it at critical pressure, but only
+from caches still over their budget. A level is left only once usage has
+fallen a margin below its threshold.
+
+WEATHER_MEMORY_LIMIT sets the limit in bytes. Without it, the limit is 80%
+of the cgroup limit when there is one and a quarter of physical memory
+otherwise. Checks run every WEATHER_MEMORY_CHECK_INTERVAL seconds (5) while
+tools are being called; WEATHER_MEMORY_GOVERNOR=0 turns the governor off.
+"""
+
+import asyncio
+import contextvars
+import gc
+import logging
+import os
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+ENABLED = os.environ.get("WEATHER_MEMORY_GOVERNOR", "1") != "0"
+CHECK_INTERVAL = float(os.environ.get("WEATHER_MEMORY_CHECK_INTERVAL", "5"))
+# Share of the cgroup limit used as the default memory limit
+CGROUP_SHARE = 0.8
+# Share of physical memory used as the limit outside a limited cgroup
+PHYSICAL_SHARE = 0.25
+
+NORMAL = "normal"
+ELEVATED = "elevated"
+HIGH = "high"
+CRITICAL = "critical"
+
+# Pressure levels by the share of the limit in use, highest first
+LEVELS = ((0.95, CRITICAL), (0.85, HIGH), (0.7, ELEVATED), (0.0, NORMAL))
+RANKS = {level: rank for rank, (_, level) in enumerate(reversed(LEVELS))}
+# Scale applied to every budget at each level
+BUDGET_SCALE = {NORMAL: 1.0, ELEVATED: 0.75, HIGH: 0.5, CRITICAL: 0.25}
+# Share of each cache's entries shed on every check at each level; at
+# critical a cache is halved each check rather than emptied at once
+SHED_FRACTION = {NORMAL: 0.0, ELEVATED: 0.1, HIGH: 0.25, CRITICAL: 0.5}
+# Share of the limit usage must fall below a level's threshold before the
+# level is lowered, so pressure near a threshold does not flap
+HYSTERESIS = 0.05
+
+CGROUP_ROOT = "/sys/fs/cgroup"
+# Lists the cgroup of this process in each hierarchy
+PROC_CGROUP = "/proc/self/cgroup"
+# cgroup v1 reports an unlimited group as a huge page-aligned number
+CGROUP_V1_UNLIMITED = 1 << 60
+
+_governor: Optional["MemoryGovernor"] = None
+
+
+def _read_int(path: str) -> Optional[int]:
+    try:
+        with open(path) as f:
+            value = f.read().strip()
+    except OSError:
+        return None
+    return int(value) if value.isdigit() else None
+
+
+def _own_cgroup(v2: bool, proc_cgroup: str) -> str:
+    """
+    Get this process's cgroup path in the memory hierarchy.
+
+    Args:
+        v2: Whether the unified (v2) hierarchy is used
+        proc_cgroup: Path of the process's cgroup list
+
+    Returns:
+        Path relative to the hierarchy's mount point, '' if unknown
+    """
+    try:
+        with open(proc_cgroup) as f:
+            lines = f.read().splitlines()
+    except OSError:
+        return ""
+    for line in lines:
+        hierarchy, _, rest = line.partition(":")
+        controllers, _, path = rest.partition(":")
+        if (v2 and hierarchy == "0" and not controllers) or (
+            not v2 and "memory" in controllers.split(",")
+        ):
+            return path.lstrip("/")
+    return ""
+
+
+def cgroup_memory(
+    root: str = CGROUP_ROOT, proc_cgroup: str = PROC_CGROUP
+) -> Tuple[Optional[int], Optional[int]]:
+    """
+    Get the memory limit and working set of the process's cgroup.
+
+    The process's own group is found through /proc/self/cgroup, since under
+    systemd or a delegating container runtime it is nested below the mount
+    point. A limit set on any group above it applies as well, so the
+    tightest limit on the way up to the mount point is taken, with that
+    group's working set. Where the listed group is not visible (a cgroup
+    namespace or a bind-mounted group), the mount point itself is used.
+
+    The working set leaves out inactive file cache, which the kernel
+    reclaims before it runs out of memory.
+
+    Args:
+        root: cgroup filesystem mount point
+        proc_cgroup: Path of the process's cgroup list
+
+    Returns:
+        Limit and working set in bytes, each None if not limited or unknown
+    """
+    v2 = os.path.exists(os.path.join(root, "cgroup.controllers")) or os.path.exists(
+        os.path.join(root, "memory.max")
+    )
+    if v2:
+        base = root
+        limit_file, usage_file, inactive_key = (
+            "memory.max",
+            "memory.current",
+            "inactive_file",
+        )
+    else:
+        base = os.path.join(root, "memory")
+        limit_file, usage_file, inactive_key = (
+            "memory.limit_in_bytes",
+            "memory.usage_in_bytes",
+            "total_inactive_file",
+        )
+
+    own = _own_cgroup(v2, proc_cgroup)
+    if not os.path.isdir(os.path.join(base, own)):
+        own = ""
+    parts = [part for part in own.split("/") if part]
+    # The process's own group first, then each parent up to the mount point
+    groups = [os.path.join(base, *parts[:end]) for end in range(len(parts), -1, -1)]
+    chosen, limit = groups[0], None
+    for group in groups:
+        group_limit = _read_int(os.path.join(group, limit_file))
+        if group_limit is None or group_limit >= CGROUP_V1_UNLIMITED:
+            continue
+        if limit is None or group_limit < limit:
+            chosen, limit = group, group_limit
+
+    usage = _read_int(os.path.join(chosen, usage_file))
+    if usage is not None:
+        try:
+            with open(os.path.join(chosen, "memory.stat")) as f:
+                for line in f:
+                    key, _, value = line.partition(" ")
+                    if key == inactive_key:
+                        usage = max(0, usage - int(value))
+                        break
+        except OSError:
+            pass
+    return limit, usage
+
+
+def process_rss() -> int:
+    """
+    Get the resident set size of this process.
+
+    Returns:
+        Resident set size in bytes
+    """
+    # Imported on first use to keep server startup fast
+    import psutil
+
+    return psutil.Process().memory_info().rss
+
+
+def default_limit() -> int:
+    """
+    Get the memory limit configured by the environment or the host.
+
+    Returns:
+        Limit in bytes
+    """
+    configured = os.environ.get("WEATHER_MEMORY_LIMIT")
+    if configured:
+        return int(configured)
+    cgroup_limit, _ = cgroup_memory()
+    if cgroup_limit is not None:
+        return int(cgroup_limit * CGROUP_SHARE)
+
+    import psutil
+
+    return int(psutil.virtual_memory().total * PHYSICAL_SHARE)
+
+
+def pressure_level(ratio: float) -> str:
+    """
+    Get the pressure level of a share of the limit in use.
+
+    Args:
+        ratio: Memory in use divided by the limit
+
+    Returns:
+        One of NORMAL, ELEVATED, HIGH and CRITICAL
+    """
+    return next(level for threshold, level in LEVELS if ratio >= threshold)
+
+
+class Subsystem:
+    """
+    Something holding memory the governor budgets and sheds.
+
+    Args:
+        name: Name shown in the usage report
+        share: Share of the memory limit it may use at normal pressure
+        usage: Callable returning its (bytes, entries), either None if unknown
+        budget: Callable applying a byte budget, if it can be bounded
+        shed: Callable evicting a share of its entries and returning how
+            many were evicted, if it can shed
+        minimum: Budget it keeps however high the pressure
+    """
+
+    def __init__(
+        self,
+        name: str,
+        share: float,
+        usage: Callable[[], Tuple[Optional[int], Optional[int]]],
+        budget: Optional[Callable[[int], Any]] = None,
+        shed: Optional[Callable[[float], int]] = None,
+        minimum: int = 0,
+    ):
+        self.name = name
+        self.share = share
+        self.usage = usage
+        self.budget = budget
+        self.shed = shed
+        self.minimum = minimum
+        self.current_budget: Optional[int] = None
+        self.shed_entries = 0
+
+
+class MemoryGovernor:
+    """
+    Periodic memory checks assigning budgets and shedding cache entries.
+    """
+
+    def __init__(
+        self,
+        limit: Optional[int] = None,
+        subsystems: Optional[List[Subsystem]] = None,
+        interval: float = CHECK_INTERVAL,
+        sample: Optional[Callable[[], Dict[str, Optional[int]]]] = None,
+    ):
+        self.limit = default_limit() if limit is None else limit
+        self.subsystems = default_subsystems() if subsystems is None else subsystems
+        self.interval = interval
+        self._sample = sample or self._sample_process
+        self.level = NORMAL
+        self.last: Dict[str, Any] = {}
+        self.checks = 0
+        self.sheds = 0
+        self._task: Optional[asyncio.Task] = None
+
+    def _sample_process(self) -> Dict[str, Optional[int]]:
+        cgroup_limit, cgroup_usage = cgroup_memory()
+        return {
+            "rss": process_rss(),
+            "cgroup_limit": cgroup_limit,
+            "cgroup_usage": cgroup_usage,
+        }
+
+    def check(self) -> str:
+        """
+        Sample memory, set budgets for the pressure level and shed if needed.
+
+        Returns:
+            Pressure level
+        """
+        sample = self._sample()
+        ratio = sample["rss"] / self.limit
+        if sample["cgroup_limit"] and sample["cgroup_usage"] is not None:
+            ratio = max(ratio, sample["cgroup_usage"] / sample["cgroup_limit"])
+        level = pressure_level(ratio)
+        if RANKS[level] < RANKS[self.level]:
+            # Lower the level only as far as usage is clear of the threshold
+            relaxed = pressure_level(ratio + HYSTERESIS)
+            level = relaxed if RANKS[relaxed] < RANKS[self.level] else self.level
+        if level != self.level:
+            log = logger.info if level == NORMAL else logger.warning
+            log(
+                "Memory pressure %s: %s B resident, %.0f%% of the limit",
+                level,
+                sample["rss"],
+                ratio * 100,
+            )
+        self.level = level
+        self.checks += 1
+
+        for subsystem in self.subsystems:
+            if subsystem.budget is None:
+                continue
+            budget = max(
+                subsystem.minimum,
+                int(self.limit * subsystem.share * BUDGET_SCALE[level]),
+            )
+            if budget != subsystem.current_budget:
+                subsystem.budget(budget)
+                subsystem.current_budget = budget
+
+        fraction = SHED_FRACTION[level]
+        if fraction:
+            for subsystem in self.subsystems:
+                if subsystem.shed is None:
+                    continue
+                size = subsystem.usage()[0]
+                # A cache already within its budget is not shed further
+                if (
+                    size is not None
+                    and subsystem.current_budget is not None
+                    and size <= subsystem.current_budget
+                ):
+                    continue
+                subsystem.shed_entries += subsystem.shed(fraction)
+            self.sheds += 1
+            if level == CRITICAL:
+                gc.collect()
+
+        self.last = {**sample, "ratio": ratio, "checked_at": time.time()}
+        return level
+
+    async def run(self) -> None:
+        """Check memory every interval until cancelled."""
+        while True:
+            try:
+                self.check()
+            except Exception as e:
+                logger.error("Error checking memory: %s", e)
+            await asyncio.sleep(self.interval)
+
+    def start(self) -> None:
+        """Start periodic checks in the running event loop, if not running."""
+        if self._task is None or self._task.done():
+            # Run outside the caller's context, so no call's budget applies
+            self._task = asyncio.create_task(self.run(), context=contextvars.Context())
+
+    def stop(self) -> None:
+        """Stop periodic checks."""
+        if self._task is not None and not self._task.get_loop().is_closed():
+            self._task.cancel()
+            self._task = None
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Get the latest sample and the usage of each subsystem.
+
+        Returns:
+            Dictionary with the 'limit', 'level', the latest sample ('rss',
+            'cgroup_limit', 'cgroup_usage', 'ratio'), check counts and
+            'subsystems' by name with their 'bytes', 'entries', 'budget' and
+            'shed' entries so far
+        """
+        subsystems = {}
+        for subsystem in self.subsystems:
+            size, entries = subsystem.usage()
+            subsystems[subsystem.name] = {
+                "bytes": size,
+                "entries": entries,
+                "budget": subsystem.current_budget,
+                "shed": subsystem.shed_entries,
+            }
+        return {
+            "limit": self.limit,
+            "level": self.level,
+            **self.last,
+            "checks": self.checks,
+            "sheds": self.sheds,
+            "subsystems": subsystems,
+        }
+
+
+def default_subsystems() -> List[Subsystem]:
+    """
+    Get the subsystems of this server that hold memory.
+
+    The response cache is looked up on every use, as it may be replaced.
+    Only in-process backends hold memory here; the sized backend reports
+    and is bounded by bytes, the plain LRU only by entries shed.
+
+    Returns:
+        Subsystems
+    """
+    from .cache import get_cache, get_output_cache
+    from .utils.http import get_buffered_bytes, set_response_budget
+
+    def cache_usage() -> Tuple[Optional[int], Optional[int]]:
+        cache = get_cache()
+        if not hasattr(cache, "shrink"):
+            return None, None
+        return (cache.bytes if hasattr(cache, "resize") else None), len(cache)
+
+    def cache_budget(max_bytes: int) -> None:
+        cache = get_cache()
+        if hasattr(cache, "resize"):
+            cache.resize(max_bytes)
+
+    def cache_shed(fraction: float) -> int:
+        cache = get_cache()
+        return cache.shrink(fraction) if hasattr(cache, "shrink") else 0
+
+    def alert_store():
+        from .services.weather_service import _alert_store
+
+        return _alert_store
+
+    return [
+        Subsystem("response_cache", 0.4, cache_usage, cache_budget, cache_shed),
+        Subsystem(
+            "output_cache",
+            0.1,
+            lambda: (get_output_cache().bytes, len(get_output_cache())),
+            lambda max_bytes: get_output_cache().resize(max_bytes),
+            lambda fraction: get_output_cache().shrink(fraction),
+        ),
+        Subsystem(
+            "alert_history",
+            0.05,
+            lambda: (None, len(alert_store())),
+            shed=lambda fraction: alert_store().shrink(fraction),
+        ),
+        # The budget caps each response body; points and forecasts stay
+        # well inside the minimum
+        Subsystem(
+            "response_buffers",
+            0.1,
+            lambda: (get_buffered_bytes(), None),
+            set_response_budget,
+            minimum=1024 * 1024,
+        ),
+    ]
+
+
+def get_governor() -> MemoryGovernor:
+    """
+    Get the process-wide memory governor, creating it on first use.
+
+    Returns:
+        Memory governor
+    """
+    global _governor
+    if _governor is None:
+        _governor = MemoryGovernor()
+    return _governor
+
+
+def set_governor(governor: Optional[MemoryGovernor]) -> None:
+    """
+    Replace the process-wide memory governor.
+
+    Args:
+        governor: Governor to use, or None to create a new one on next use
+    """
+    global _governor
+    if _governor is not None and _governor is not governor:
+        _governor.stop()
+    _governor = governor
+
+
+def ensure_running() -> None:
+    """Start the governor's periodic checks unless WEATHER_MEMORY_GOVERNOR=0."""
+    if ENABLED:
+        get_governor().start()
@@ -1,13 +1,29 @@
 """Resources package for the MCP server."""
 
+from ..tools import FEATURES
+from .admission_resources import register_resources as register_admission_resources
+from .cache_resources import register_resources as register_cache_resources
+from .memory_resources import register_resources as register_memory_resources
+from .network_resources import register_resources as register_network_resources
+from .runtime_resources import register_resources as register_runtime_resources
 from .system_resources import register_resources as register_system_resources
 
 
-def register_all_resources(server):
+def register_all_resources(server, features=FEATURES):
     """
     Register all resources with the server.
 
+    The server's own usage and state resources are always registered; the
+    process list only with the 'system' feature group.
+
     Args:
         server: MCP server instance
+        features: Feature groups, see tools.register_all_tools
     """
-    register_system_resources(server)
+    if "system" in features:
+        register_system_resources(server)
+    register_network_resources(server)
+    register_admission_resources(server)
+    register_cache_resources(server)
+    register_memory_resources(server)
+    register_runtime_resources(server)
@@ -0,0 +1,43 @@
+"""Admission control resources for the MCP server."""
+
+import logging
+from typing import List
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+
+def register_resources(server):
+    """
+    Register all admission control resources with the server.
+
+    Args:
+        server: MCP server instance
+    """
+
+    @server.resource("admission://queues")
+    def get_admission_queues_resource() -> List[str]:
+        """
+        Get the concurrency and queue state of every tool called so far.
+
+        Returns:
+            List of formatted queue strings
+        """
+        from ..admission import get_controller
+
+        snapshot = get_controller().snapshot()
+
+        if not snapshot["tools"]:
+            return ["No tool calls made yet"]
+
+        return [
+            f"Tool: {tool}, Active: {stats['active']}/{stats['limit']} "
+            f"(batch {stats['active_batch']}), "
+            f"Queued: {stats['queued_interactive']} interactive, "
+            f"{stats['queued_batch']} batch, "
+            f"Admitted: {stats['admitted']}, Rejected: {stats['rejected']}, "
+            f"Timed out: {stats['timed_out']}, "
+            f"Wait: {stats['mean_wait_ms']:.1f} ms mean, "
+            f"{stats['max_wait_ms']:.1f} ms max"
+            for tool, stats in snapshot["tools"].items()
+        ] + [f"Clients with calls running: {snapshot['clients']}"]
@@ -0,0 +1,39 @@
+"""Cache resources for the MCP server."""
+
+import logging
+from typing import List
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+
+def register_resources(server):
+    """
+    Register all cache resources with the server.
+
+    Args:
+        server: MCP server instance
+    """
+
+    @server.resource("cache://stats")
+    async def get_cache_stats_resource() -> List[str]:
+        """
+        Get the size and hit rates of the response and output caches.
+
+        Returns:
+            List of formatted cache statistics strings
+        """
+        from ..cache import get_cache, get_output_cache
+
+        stats = await get_cache().stats()
+        outputs = get_output_cache()
+        size = "unknown" if stats["bytes"] is None else f"{stats['bytes']} B"
+        return [
+            f"Response cache: {stats['name']}, Entries: {stats['entries']}, "
+            f"Size: {size}, Hits: {stats['hits']}, Misses: {stats['misses']}, "
+            f"Hit ratio: {stats['hit_ratio']:.1%}, Sets: {stats['sets']}, "
+            f"Evictions: {stats['evictions']}, Expirations: {stats['expirations']}, "
+            f"Invalidations: {stats['invalidations']}",
+            f"Output cache: Entries: {len(outputs)}, Hits: {outputs.hits}, "
+            f"Misses: {outputs.misses}",
+        ]
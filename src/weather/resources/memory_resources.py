@@ -0,0 +1,60 @@
+"""Memory governor resources for the MCP server."""
+
+import logging
+from typing import List
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+
+def _size(value) -> str:
+    return "unknown" if value is None else f"{value} B"
+
+
+def register_resources(server):
+    """
+    Register all memory governor resources with the server.
+
+    Args:
+        server: MCP server instance
+    """
+
+    @server.resource("memory://usage")
+    def get_memory_usage_resource() -> List[str]:
+        """
+        Get the memory pressure and the usage and budget of each subsystem.
+
+        Returns:
+            List of formatted memory usage strings
+        """
+        from ..memory import get_governor
+
+        snapshot = get_governor().snapshot()
+
+        if not snapshot["checks"]:
+            lines = [
+                f"Memory limit: {snapshot['limit']} B, not checked yet "
+                "(checks start with the first tool call)"
+            ]
+        else:
+            lines = [
+                f"Memory limit: {snapshot['limit']} B, "
+                f"Resident: {snapshot['rss']} B ({snapshot['ratio']:.0%}), "
+                f"Pressure: {snapshot['level']}, Checks: {snapshot['checks']}, "
+                f"Sheds: {snapshot['sheds']}"
+            ]
+            if snapshot["cgroup_limit"] is not None:
+                lines.append(
+                    f"Cgroup limit: {snapshot['cgroup_limit']} B, "
+                    f"Working set: {_size(snapshot['cgroup_usage'])}"
+                )
+
+        for name, stats in snapshot["subsystems"].items():
+            entries = (
+                "" if stats["entries"] is None else f", Entries: {stats['entries']}"
+            )
+            lines.append(
+                f"Subsystem: {name}, Size: {_size(stats['bytes'])}{entries}, "
+                f"Budget: {'none' if stats['budget'] is None else _size(stats['budget'])}, Shed: {stats['shed']}"
+            )
+        return lines
@@ -0,0 +1,38 @@
+"""Network resources for the MCP server."""
+
+import logging
+from typing import List
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+
+def register_resources(server):
+    """
+    Register all network resources with the server.
+
+    Args:
+        server: MCP server instance
+    """
+
+    @server.resource("network://usage")
+    def get_network_usage_resource() -> List[str]:
+        """
+        Get the bytes transferred from upstream APIs, per endpoint.
+
+        Returns:
+            List of formatted transfer strings
+        """
+        from ..utils.http import get_transfer_stats
+
+        stats = get_transfer_stats()
+
+        if not stats:
+            return ["No upstream requests made yet"]
+
+        return [
+            f"Endpoint: {endpoint}, Requests: {counts['requests']}, "
+            f"Wire: {counts['wire_bytes']} B, Body: {counts['body_bytes']} B, "
+            f"Oversized: {counts['oversized']}"
+            for endpoint, counts in sorted(stats.items())
+        ]
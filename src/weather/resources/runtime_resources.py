@@ -0,0 +1,55 @@
+"""Runtime profile resources for the MCP server."""
+
+import logging
+from typing import List
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+
+def register_resources(server):
+    """
+    Register all runtime profile resources with the server.
+
+    Args:
+        server: MCP server instance
+    """
+
+    @server.resource("runtime://loop")
+    def get_runtime_loop_resource() -> List[str]:
+        """
+        Get the runtime profile, collector state and event-loop stalls.
+
+        Returns:
+            List of formatted runtime strings
+        """
+        import gc
+
+        from ..runtime import current_profile, get_monitor, loop_name
+
+        profile = current_profile()
+        collections = ", ".join(
+            f"gen{generation}: {stats['collections']}"
+            for generation, stats in enumerate(gc.get_stats())
+        )
+        lines = [
+            f"Profile: {profile.name}, Event loop: {loop_name()}",
+            f"GC thresholds: {gc.get_threshold()}, "
+            f"Frozen objects: {gc.get_freeze_count()}, Collections: {collections}",
+        ]
+
+        monitor = get_monitor()
+        if monitor is None:
+            return lines + ["Loop-lag monitoring: off"]
+
+        stats = monitor.snapshot()
+        lines.append(
+            f"Loop-lag threshold: {stats['threshold_ms']:.0f} ms, "
+            f"Heartbeats: {stats['beats']}, Stalls: {stats['stalls']}, "
+            f"Max lag: {stats['max_lag_ms']:.1f} ms"
+        )
+        for stall in reversed(stats["recent"]):
+            where = stall["coroutine"] or "unknown code"
+            frame = stall["stack"][-1] if stall["stack"] else "no stack captured"
+            lines.append(f"Stall: {stall['lag_ms']:.0f} ms in {where} at {frame}")
+        return lines
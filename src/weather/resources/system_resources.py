@@ -3,8 +3,6 @@
 import logging
 from typing import List
 
-from ..services.system_service import get_top_processes
-
 # Configure logging
 logger = logging.getLogger(__name__)
 
@@ -25,6 +23,8 @@ def register_resources(server):
         Returns:
             List of formatted process strings
         """
+        from ..services.system_service import get_top_processes
+
         processes = get_top_processes(limit=10)
 
         if not processes:
@@ -0,0 +1,299 @@
+"""Runtime profiles: event loop, garbage collector and loop-lag monitoring.
+
+A profile is selected with WEATHER_RUNTIME_PROFILE or ``main.py --profile``:
+
+- ``default`` leaves the interpreter as it is.
+- ``tuned`` runs on uvloop when it is installed, freezes the objects created
+  at startup (modules, tool and resource registrations) into the permanent
+  generation so collections stop traversing them, and watches the event
+  loop for stalls.
+- ``server`` also raises the collector's thresholds, trading some memory
+  for far fewer collections in long-running SSE servers and daemons.
+
+The loop-lag monitor runs a heartbeat task in the event loop and a watchdog
+thread beside it. When the heartbeat is late by more than
+WEATHER_LOOP_LAG_MS milliseconds (100), the watchdog records which task was
+running and where, and the stall is logged with it once the loop is free.
+"""
+
+import asyncio
+import contextvars
+import gc
+import logging
+import os
+import sys
+import threading
+import time
+import traceback
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+LAG_THRESHOLD = float(os.environ.get("WEATHER_LOOP_LAG_MS", "100")) / 1000
+# Thresholds for long-running servers: young collections every 50,000 net
+# allocations instead of 700, full collections a tenth as often
+SERVER_GC_THRESHOLDS = (50_000, 20, 100)
+# Frames of the stalled stack kept with each stall
+STACK_DEPTH = 8
+# Stalls kept for the runtime://loop resource
+RECENT_STALLS = 20
+
+
+class RuntimeProfile(NamedTuple):
+    """Interpreter settings applied at startup."""
+
+    name: str
+    # Run on uvloop when it is installed
+    uvloop: bool
+    # Move objects created at startup into the permanent generation
+    freeze: bool
+    # Collector thresholds, or None to keep the interpreter's
+    gc_thresholds: Optional[Tuple[int, int, int]]
+    # Loop lag in seconds reported as a stall, or None for no monitoring
+    lag_threshold: Optional[float]
+
+
+PROFILES = {
+    "default": RuntimeProfile("default", False, False, None, None),
+    "tuned": RuntimeProfile("tuned", True, True, None, LAG_THRESHOLD),
+    "server": RuntimeProfile("server", True, True, SERVER_GC_THRESHOLDS, LAG_THRESHOLD),
+}
+
+_profile = PROFILES["default"]
+_monitor: Optional["LoopLagMonitor"] = None
+
+
+def get_profile(name: Optional[str] = None) -> RuntimeProfile:
+    """
+    Look up a runtime profile.
+
+    Args:
+        name: Profile name; defaults to WEATHER_RUNTIME_PROFILE, then 'default'
+
+    Returns:
+        Runtime profile
+
+    Raises:
+        ValueError: If the name is not a known profile
+    """
+    name = (name or os.environ.get("WEATHER_RUNTIME_PROFILE") or "default").lower()
+    if name not in PROFILES:
+        raise ValueError(
+            f"Unknown runtime profile {name!r}, expected one of {', '.join(PROFILES)}"
+        )
+    return PROFILES[name]
+
+
+def current_profile() -> RuntimeProfile:
+    """
+    Get the runtime profile applied to this process.
+
+    Returns:
+        Runtime profile
+    """
+    return _profile
+
+
+def apply_profile(name: Optional[str] = None) -> RuntimeProfile:
+    """
+    Apply a runtime profile before the event loop starts.
+
+    Args:
+        name: Profile name; defaults to WEATHER_RUNTIME_PROFILE, then 'default'
+
+    Returns:
+        The applied profile
+    """
+    global _profile
+    _profile = get_profile(name)
+    if _profile.gc_thresholds is not None:
+        gc.set_threshold(*_profile.gc_thresholds)
+    if _profile.uvloop:
+        try:
+            import uvloop
+        except ImportError:
+            logger.info("uvloop is not installed, using the default event loop")
+        else:
+            asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    logger.info("Runtime profile: %s", _profile.name)
+    return _profile
+
+
+def freeze_startup_objects() -> None:
+    """
+    Freeze the objects created so far, if the profile asks for it.
+
+    Call once the server is set up, and before forking workers, so that
+    later collections skip the startup objects and forked workers do not
+    copy the pages holding them by updating their reference counts.
+    """
+    if _profile.freeze:
+        gc.collect()
+        gc.freeze()
+        logger.info("Froze %s startup objects", gc.get_freeze_count())
+
+
+class LoopLagMonitor:
+    """
+    Heartbeat in the event loop with a watchdog thread catching stalls.
+
+    Args:
+        threshold: Lag in seconds reported as a stall
+        interval: Seconds between heartbeats, defaults to half the threshold
+    """
+
+    def __init__(
+        self, threshold: float = LAG_THRESHOLD, interval: Optional[float] = None
+    ):
+        self.threshold = threshold
+        self.interval = interval or threshold / 2
+        self.beats = 0
+        self.stalls = 0
+        self.max_lag = 0.0
+        self.recent: List[Dict[str, Any]] = []
+        self._due = 0.0
+        self._culprit: Optional[Dict[str, Any]] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread_id: Optional[int] = None
+        self._task: Optional[asyncio.Task] = None
+        self._stopped = threading.Event()
+
+    def _capture(self) -> Dict[str, Any]:
+        """Describe what the loop's thread is running right now."""
+        task = asyncio.current_task(self._loop)
+        coroutine = task.get_coro() if task is not None else None
+        frame = sys._current_frames().get(self._thread_id)
+        stack = traceback.extract_stack(frame)[-STACK_DEPTH:] if frame else []
+        return {
+            "task": task.get_name() if task is not None else None,
+            "coroutine": getattr(coroutine, "__qualname__", None),
+            "stack": [f"{f.filename}:{f.lineno} in {f.name}" for f in stack],
+        }
+
+    def _watch(self) -> None:
+        """Capture the stalled code once the heartbeat is overdue."""
+        while not self._stopped.wait(self.threshold / 4):
+            due = self._due
+            # Capture early, so stalls just over the threshold have a stack too
+            if (
+                self._culprit is None
+                and due
+                and time.monotonic() - due > self.threshold / 2
+            ):
+                self._culprit = {"due": due, **self._capture()}
+
+    def _record(self, lag: float, due: float) -> None:
+        culprit = self._culprit if self._culprit and self._culprit["due"] == due else {}
+        stall = {
+            "lag_ms": lag * 1000,
+            "at": time.time(),
+            "task": culprit.get("task"),
+            "coroutine": culprit.get("coroutine"),
+            "stack": culprit.get("stack", []),
+        }
+        self.stalls += 1
+        self.recent = [*self.recent[-(RECENT_STALLS - 1) :], stall]
+        where = stall["coroutine"] or "unknown code"
+        if stall["task"]:
+            where = f"{where} (task {stall['task']})"
+        logger.warning(
+            "Event loop stalled for %.0f ms in %s%s",
+            stall["lag_ms"],
+            where,
+            "".join(f"\n  {line}" for line in stall["stack"]),
+        )
+
+    async def _heartbeat(self) -> None:
+        while True:
+            self._culprit = None
+            self._due = due = time.monotonic() + self.interval
+            await asyncio.sleep(self.interval)
+            lag = max(0.0, time.monotonic() - due)
+            self._due = 0.0
+            self.beats += 1
+            self.max_lag = max(self.max_lag, lag)
+            if lag >= self.threshold:
+                self._record(lag, due)
+
+    def start(self) -> None:
+        """Start monitoring the running event loop, if not monitoring it."""
+        loop = asyncio.get_running_loop()
+        if self._task is not None and not self._task.done() and self._loop is loop:
+            return
+        self.stop()
+        self._loop = loop
+        self._thread_id = threading.get_ident()
+        self._stopped = threading.Event()
+        # Run outside the caller's context, so no call's budget applies
+        self._task = loop.create_task(self._heartbeat(), context=contextvars.Context())
+        threading.Thread(
+            target=self._watch, name="loop-lag-watchdog", daemon=True
+        ).start()
+
+    def stop(self) -> None:
+        """Stop monitoring."""
+        self._stopped.set()
+        if self._task is not None and not self._task.get_loop().is_closed():
+            self._task.cancel()
+        self._task = None
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Get the stall counters.
+
+        Returns:
+            Dictionary with the 'threshold_ms', 'beats', 'stalls',
+            'max_lag_ms' and the most 'recent' stalls
+        """
+        return {
+            "threshold_ms": self.threshold * 1000,
+            "beats": self.beats,
+            "stalls": self.stalls,
+            "max_lag_ms": self.max_lag * 1000,
+            "recent": list(self.recent),
+        }
+
+
+def get_monitor() -> Optional[LoopLagMonitor]:
+    """
+    Get the loop-lag monitor, if the profile monitors the loop.
+
+    Returns:
+        Loop-lag monitor, or None
+    """
+    global _monitor
+    if _monitor is None and _profile.lag_threshold is not None:
+        _monitor = LoopLagMonitor(_profile.lag_threshold)
+    return _monitor
+
+
+def set_monitor(monitor: Optional[LoopLagMonitor]) -> None:
+    """
+    Replace the loop-lag monitor.
+
+    Args:
+        monitor: Monitor to use, or None to create one on next use
+    """
+    global _monitor
+    if _monitor is not None and _monitor is not monitor:
+        _monitor.stop()
+    _monitor = monitor
+
+
+def ensure_monitoring() -> None:
+    """Start monitoring the running event loop if the profile asks for it."""
+    monitor = get_monitor()
+    if monitor is not None:
+        monitor.start()
+
+
+def loop_name() -> str:
+    """
+    Get the class of the running event loop.
+
+    Returns:
+        Qualified class name
+    """
+    loop_class = type(asyncio.get_running_loop())
+    return f"{loop_class.__module__}.{loop_class.__qualname__}"
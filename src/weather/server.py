@@ -1,51 +1,223 @@
 """Main MCP server implementation."""
 
 import logging
+import os
+from contextlib import asynccontextmanager
+from functools import partial
+from typing import Any, AsyncIterator, Dict, Sequence
+
 from mcp.server.fastmcp import FastMCP
 
-from .tools import register_all_tools
+from .logs import configure_logging
+from .tools import FEATURES, register_all_tools
 from .resources import register_all_resources
 
 # Configure logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("weather-server")
 
 
-def create_server(name="weather"):
+class WeatherServer(FastMCP):
+    """
+    FastMCP server whose tool calls pass through admission control.
+
+    The call's time budget starts before admission, so time spent waiting
+    in the queue is taken from it.
+
+    The first tool call also starts the memory governor's periodic checks
+    and, if the runtime profile asks for it, the loop-lag monitor.
+    """
+
+    async def call_tool(self, name: str, arguments: Dict[str, Any]) -> Sequence[Any]:
+        """
+        Call a tool once the admission controller grants it a slot.
+
+        Args:
+            name: Tool name
+            arguments: Tool arguments
+
+        Returns:
+            Tool result content
+
+        Raises:
+            Overloaded: If the call is rejected (reported to the client as
+                a tool error)
+        """
+        from .admission import call_identity, get_controller
+        from .logs import log_context
+        from .memory import ensure_running
+        from .runtime import ensure_monitoring
+        from .utils.deadline import deadline
+
+        ensure_running()
+        ensure_monitoring()
+
+        # Unknown tools fail straight away without taking a slot
+        if self._tool_manager.get_tool(name) is None:
+            return await super().call_tool(name, arguments)
+
+        context = self.get_context()
+        client, priority = call_identity(context)
+        try:
+            request_id = context.request_id
+        except ValueError:
+            request_id = None
+        with log_context(tool=name, request_id=request_id, client=client), deadline():
+            async with get_controller().admit(name, client, priority):
+                return await super().call_tool(name, arguments)
+
+
+@asynccontextmanager
+async def warmup_lifespan(server: FastMCP) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Keep the cache warm for the configured watch-list while a session runs.
+
+    The warm-up loop is shared by all sessions in the process. Nothing is
+    imported unless WEATHER_WARMUP_CONFIG is set.
+
+    Args:
+        server: MCP server instance
+    """
+    if not os.environ.get("WEATHER_WARMUP_CONFIG"):
+        yield {}
+        return
+
+    from .services.warmup import warmup_running
+
+    async with warmup_running():
+        yield {}
+
+
+def create_server(name="weather", warmup=True, features=FEATURES):
     """
     Create and configure the MCP server instance.
 
+    Logging is left to the entry points, which configure it before any
+    server is created, as FastMCP otherwise installs a handler of its own.
+
     Args:
         name: Server name
+        warmup: Whether sessions keep the watch-list cache warm while they run
+        features: Tool groups to serve: 'weather' (NWS tools) and 'system'
+            (shell commands)
 
     Returns:
         Configured MCP server instance
     """
-    server = FastMCP(name)
+    server = (
+        WeatherServer(name, lifespan=warmup_lifespan) if warmup else WeatherServer(name)
+    )
 
     # Register all tools and resources
-    register_all_tools(server)
-    register_all_resources(server)
+    register_all_tools(server, features)
+    register_all_resources(server, features)
 
     return server
 
 
-async def run_server(transport="stdio"):
+async def run_server(transport="stdio", profile=None):
     """
     Run the MCP server with the specified transport.
 
+    The event loop is already running, so a profile's uvloop setting only
+    applies to loops created later.
+
     Args:
         transport: Transport type ("stdio" or "sse")
+        profile: Runtime profile name, defaults to WEATHER_RUNTIME_PROFILE
     """
+    from .runtime import apply_profile, ensure_monitoring, freeze_startup_objects
+
+    configure_logging()
+    apply_profile(profile)
     server = create_server()
-    logger.info(f"Starting weather MCP server with {transport} transport")
-    # Use run_async instead of run to avoid nested event loops
-    await server.run_async(transport=transport)
+    freeze_startup_objects()
+    ensure_monitoring()
+    logger.info("Starting weather MCP server with %s transport", transport)
+    # Use run_async instead of run to avoid nested event loops. FastMCP
+    # releases without run_async expose one coroutine per transport instead.
+    if hasattr(server, "run_async"):
+        await server.run_async(transport=transport)
+    elif transport == "sse":
+        await server.run_sse_async()
+    else:
+        await server.run_stdio_async()
+
+
+def serve_sse(workers=1, host="0.0.0.0", port=8000, profile=None):
+    """
+    Run the MCP server with the SSE transport.
+
+    Args:
+        workers: Number of worker processes sharing the listening socket
+        host: Interface to listen on
+        port: Port to listen on
+        profile: Runtime profile name, defaults to WEATHER_RUNTIME_PROFILE
+    """
+    from .runtime import apply_profile, freeze_startup_objects
+    from .workers import create_sse_app, run_workers
 
+    # Forked workers inherit the profile's settings and logging
+    configure_logging()
+    apply_profile(profile)
+
+    # Warm-up runs for the life of the process rather than per session
+    if workers > 1:
+        run_workers(workers, host, port, partial(create_server, warmup=False))
+        return
+
+    import uvicorn
+
+    server = create_server(warmup=False)
+    freeze_startup_objects()
+    logger.info("Starting weather MCP server with sse transport")
+    uvicorn.run(
+        create_sse_app(server, warmup=True),
+        host=host,
+        port=port,
+        log_level=server.settings.log_level.lower(),
+    )
+
+
+def serve_daemon(socket_path=None, profile=None):
+    """
+    Run the MCP server as a shared daemon on a Unix socket.
 
-def main():
-    """Entry point for running the server."""
+    Args:
+        socket_path: Socket to listen on, defaults to daemon.default_socket_path()
+        profile: Runtime profile name, defaults to WEATHER_RUNTIME_PROFILE
+    """
+    import asyncio
+
+    from .daemon import default_socket_path, run_daemon
+    from .runtime import apply_profile, freeze_startup_objects
+
+    configure_logging()
+    apply_profile(profile)
+    # Warm-up runs for the life of the daemon rather than per session
+    server = create_server(warmup=False)
+    freeze_startup_objects()
+    logger.info("Starting weather MCP daemon")
+    asyncio.run(run_daemon(server, socket_path or default_socket_path()))
+
+
+def main(profile=None, server=None):
+    """
+    Entry point for running the server.
+
+    Args:
+        profile: Runtime profile name, defaults to WEATHER_RUNTIME_PROFILE
+        server: Server to run, such as one built by a standalone launcher;
+            a server with every feature is created by default
+    """
+    from .runtime import apply_profile, freeze_startup_objects
+
+    # Before FastMCP sets up logging of its own; a launcher passing a
+    # server has configured it already
+    configure_logging()
+    apply_profile(profile)
     # Create and run the server directly without asyncio.run
-    server = create_server()
+    if server is None:
+        server = create_server()
+    freeze_startup_objects()
     logger.info("Starting weather MCP server with stdio transport")
     server.run(transport="stdio")
@@ -0,0 +1,197 @@
+"""In-memory spatial index over active weather alerts."""
+
+import logging
+import math
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+Ring = List[Tuple[float, float]]
+BBox = Tuple[float, float, float, float]
+
+
+def _point_in_ring(lon: float, lat: float, ring: Ring) -> bool:
+    """
+    Test whether a point lies inside a linear ring using ray casting.
+
+    Args:
+        lon: Longitude of the point
+        lat: Latitude of the point
+        ring: Ring vertices as (lon, lat) pairs
+
+    Returns:
+        True if the point is inside the ring
+    """
+    inside = False
+    j = len(ring) - 1
+    for i in range(len(ring)):
+        xi, yi = ring[i]
+        xj, yj = ring[j]
+        if (yi > lat) != (yj > lat) and lon < (xj - xi) * (lat - yi) / (yj - yi) + xi:
+            inside = not inside
+        j = i
+    return inside
+
+
+def _polygons(geometry: Optional[Dict[str, Any]]) -> List[List[Ring]]:
+    """
+    Extract polygons from a GeoJSON Polygon or MultiPolygon geometry.
+
+    Args:
+        geometry: GeoJSON geometry, possibly None
+
+    Returns:
+        List of polygons, each an outer ring followed by any holes
+    """
+    if not geometry:
+        return []
+    if geometry.get("type") == "Polygon":
+        parts = [geometry["coordinates"]]
+    elif geometry.get("type") == "MultiPolygon":
+        parts = geometry["coordinates"]
+    else:
+        return []
+    return [
+        [[(float(x), float(y)) for x, y, *_ in ring] for ring in part]
+        for part in parts
+        if part
+    ]
+
+
+class AlertIndex:
+    """
+    Grid bucket index over alert polygons and UGC zone codes.
+
+    Each polygon is registered in every grid cell its bounding box touches,
+    so a lookup only tests the few polygons in the point's cell. Alerts
+    without geometry are found through the UGC zone codes they affect.
+    """
+
+    def __init__(self, cell_size: float = 1.0):
+        self.cell_size = cell_size
+        self._alerts: Dict[str, Dict[str, Any]] = {}
+        self._versions: Dict[str, str] = {}
+        self._shapes: Dict[str, List[Tuple[BBox, List[Ring]]]] = {}
+        self._cells: Dict[Tuple[int, int], Set[str]] = {}
+        self._zones: Dict[str, Set[str]] = {}
+
+    def __len__(self) -> int:
+        return len(self._alerts)
+
+    def _cell(self, lon: float, lat: float) -> Tuple[int, int]:
+        return math.floor(lon / self.cell_size), math.floor(lat / self.cell_size)
+
+    def _cells_for(self, bbox: BBox) -> Iterable[Tuple[int, int]]:
+        min_x, min_y = self._cell(bbox[0], bbox[1])
+        max_x, max_y = self._cell(bbox[2], bbox[3])
+        for x in range(min_x, max_x + 1):
+            for y in range(min_y, max_y + 1):
+                yield x, y
+
+    def _insert(self, alert_id: str, feature: Dict[str, Any]) -> None:
+        shapes = []
+        for polygon in _polygons(feature.get("geometry")):
+            outer = polygon[0]
+            xs = [x for x, _ in outer]
+            ys = [y for _, y in outer]
+            bbox = (min(xs), min(ys), max(xs), max(ys))
+            shapes.append((bbox, polygon))
+            for cell in self._cells_for(bbox):
+                self._cells.setdefault(cell, set()).add(alert_id)
+        self._shapes[alert_id] = shapes
+
+        # A polygon is the alert's real extent; its UGC codes name whole
+        # counties and zones the polygon only partly covers
+        if not shapes:
+            for zone in feature.get("properties", {}).get("geocode", {}).get("UGC", []):
+                self._zones.setdefault(zone, set()).add(alert_id)
+        self._alerts[alert_id] = feature
+
+    def _remove(self, alert_id: str) -> None:
+        feature = self._alerts.pop(alert_id)
+        self._versions.pop(alert_id, None)
+        for bbox, _ in self._shapes.pop(alert_id, []):
+            for cell in self._cells_for(bbox):
+                ids = self._cells.get(cell)
+                if ids is not None:
+                    ids.discard(alert_id)
+                    if not ids:
+                        del self._cells[cell]
+        for zone in feature.get("properties", {}).get("geocode", {}).get("UGC", []):
+            ids = self._zones.get(zone)
+            if ids is not None:
+                ids.discard(alert_id)
+                if not ids:
+                    del self._zones[zone]
+
+    def update(self, features: List[Dict[str, Any]]) -> Dict[str, int]:
+        """
+        Bring the index in line with a complete set of active alerts.
+
+        Only alerts that are new, changed (by ``sent``/``updated``) or gone
+        are touched, so refreshing with a mostly unchanged feed is cheap.
+
+        Args:
+            features: Every currently active alert feature
+
+        Returns:
+            Counts of added, updated and removed alerts
+        """
+        counts = {"added": 0, "updated": 0, "removed": 0}
+        seen = set()
+        for feature in features:
+            props = feature.get("properties", {})
+            alert_id = props.get("id") or feature.get("id")
+            if not alert_id:
+                continue
+            seen.add(alert_id)
+            version = f"{props.get('sent')}|{props.get('updated')}"
+            if self._versions.get(alert_id) == version:
+                continue
+            if alert_id in self._alerts:
+                self._remove(alert_id)
+                counts["updated"] += 1
+            else:
+                counts["added"] += 1
+            self._insert(alert_id, feature)
+            self._versions[alert_id] = version
+
+        for alert_id in [alert_id for alert_id in self._alerts if alert_id not in seen]:
+            self._remove(alert_id)
+            counts["removed"] += 1
+        return counts
+
+    def lookup(
+        self, latitude: float, longitude: float, zones: Iterable[str] = ()
+    ) -> List[Dict[str, Any]]:
+        """
+        Find the alerts covering a point.
+
+        Args:
+            latitude: Latitude coordinate
+            longitude: Longitude coordinate
+            zones: UGC zone codes containing the point (e.g., 'KSZ009', 'KSC201')
+
+        Returns:
+            Matching alert features
+        """
+        matches = set()
+        for alert_id in self._cells.get(self._cell(longitude, latitude), ()):
+            for bbox, polygon in self._shapes[alert_id]:
+                if not (
+                    bbox[0] <= longitude <= bbox[2] and bbox[1] <= latitude <= bbox[3]
+                ):
+                    continue
+                outer, holes = polygon[0], polygon[1:]
+                if _point_in_ring(longitude, latitude, outer) and not any(
+                    _point_in_ring(longitude, latitude, hole) for hole in holes
+                ):
+                    matches.add(alert_id)
+                    break
+        for zone in zones:
+            matches.update(self._zones.get(zone, ()))
+        features = [self._alerts[alert_id] for alert_id in matches]
+        return sorted(
+            features, key=lambda feature: feature["properties"].get("sent") or ""
+        )
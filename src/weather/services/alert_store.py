@@ -0,0 +1,218 @@
+"""Versioned store of active alerts per state, for polling changes.
+
+Each time a state's alerts are fetched and differ from the last fetch, the
+store records a new version: a snapshot of every active alert's ``sent`` and
+``updated`` fields. A client holding a token for an earlier version gets the
+alerts that are new, updated or expired since then, found by diffing that
+snapshot against the current one, instead of the whole list again.
+"""
+
+import logging
+import math
+import secrets
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Versions kept per state; older tokens get every active alert again
+DEFAULT_HISTORY = 64
+
+# Alert id -> (revision, event, area)
+Snapshot = Dict[str, Tuple[str, str, str]]
+
+
+def _alert_id(feature: Dict[str, Any]) -> Optional[str]:
+    return feature.get("properties", {}).get("id") or feature.get("id")
+
+
+def _snapshot(features: List[Dict[str, Any]]) -> Snapshot:
+    """
+    Summarize alerts down to what a diff and an expiry notice need.
+
+    Args:
+        features: Alert features
+
+    Returns:
+        Revision, event and area of each alert, by alert id
+    """
+    snapshot = {}
+    for feature in features:
+        alert_id = _alert_id(feature)
+        if not alert_id:
+            continue
+        props = feature.get("properties", {})
+        snapshot[alert_id] = (
+            f"{props.get('sent')}|{props.get('updated')}",
+            props.get("event", "Unknown"),
+            props.get("areaDesc", "Unknown"),
+        )
+    return snapshot
+
+
+class AlertStore:
+    """
+    Alert versions per state, addressed by opaque change tokens.
+
+    Tokens name the state, the store and the version, so a token from
+    another process (or from before a restart) is recognized as unknown
+    and answered with every active alert.
+    """
+
+    def __init__(self, history: int = DEFAULT_HISTORY):
+        self.history = history
+        self.epoch = secrets.token_hex(4)
+        self._versions: Dict[str, int] = {}
+        self._sources: Dict[str, Optional[str]] = {}
+        self._features: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        self._snapshots: Dict[str, "OrderedDict[int, Snapshot]"] = {}
+
+    def token(self, state: str) -> str:
+        """
+        Get the token for a state's current version.
+
+        Args:
+            state: Two-letter state code
+
+        Returns:
+            Change token
+        """
+        return f"{state}.{self.epoch}.{self._versions.get(state, 0)}"
+
+    def _since(self, state: str, token: str) -> Optional[int]:
+        """Get the version a token refers to, if this store still holds it."""
+        try:
+            token_state, epoch, version = token.split(".")
+            number = int(version)
+        except ValueError:
+            return None
+        if token_state != state or epoch != self.epoch:
+            return None
+        return number if number in self._snapshots.get(state, {}) else None
+
+    def update(
+        self, state: str, features: List[Dict[str, Any]], source: Optional[str] = None
+    ) -> int:
+        """
+        Record a state's complete set of active alerts.
+
+        Args:
+            state: Two-letter state code
+            features: Every active alert feature for the state
+            source: Version of the payload the features came from; an
+                unchanged payload is not diffed again
+
+        Returns:
+            The state's current version
+        """
+        if source is not None and self._sources.get(state) == source:
+            return self._versions[state]
+
+        snapshot = _snapshot(features)
+        snapshots = self._snapshots.setdefault(state, OrderedDict())
+        self._sources[state] = source
+        self._features[state] = {
+            alert_id: feature
+            for feature in features
+            if (alert_id := _alert_id(feature)) is not None
+        }
+        if snapshots and snapshots[next(reversed(snapshots))] == snapshot:
+            return self._versions[state]
+
+        version = self._versions.get(state, 0) + 1
+        self._versions[state] = version
+        snapshots[version] = snapshot
+        while len(snapshots) > self.history:
+            snapshots.popitem(last=False)
+        logger.info("Alert store: %s now at version %s", state, version)
+        return version
+
+    def __len__(self) -> int:
+        return sum(len(snapshots) for snapshots in self._snapshots.values())
+
+    def shrink(self, fraction: float) -> int:
+        """
+        Forget a share of each state's oldest versions.
+
+        Tokens for forgotten versions are answered with every active alert,
+        as if they came from another process. The current version of each
+        state is always kept.
+
+        Args:
+            fraction: Share of the older versions to forget, from 0 to 1
+
+        Returns:
+            Number of versions forgotten
+        """
+        forgotten = 0
+        for snapshots in self._snapshots.values():
+            count = max(0, math.ceil((len(snapshots) - 1) * fraction))
+            for _ in range(count):
+                snapshots.popitem(last=False)
+            forgotten += count
+        return forgotten
+
+    def changes(self, state: str, since_token: str = "") -> Dict[str, Any]:
+        """
+        Get the alerts that changed since a token's version.
+
+        An alert that supersedes an expired one (by listing it in its
+        ``references``) is reported as updated rather than as a new alert
+        plus an expired one.
+
+        Args:
+            state: Two-letter state code
+            since_token: Token from an earlier call, or '' for every alert
+
+        Returns:
+            Dictionary with the new token, 'new' and 'updated' alert
+            features, 'expired' alerts as (id, event, area) and 'resync',
+            which is True when the token was not recognized
+        """
+        current = self._features.get(state, {})
+        since = self._since(state, since_token) if since_token else None
+
+        def by_sent(ids) -> List[Dict[str, Any]]:
+            return sorted(
+                (current[alert_id] for alert_id in ids),
+                key=lambda feature: feature["properties"].get("sent") or "",
+            )
+
+        if since is None:
+            return {
+                "token": self.token(state),
+                "new": by_sent(current),
+                "updated": [],
+                "expired": [],
+                "resync": bool(since_token),
+            }
+
+        old = self._snapshots[state][since]
+        latest = self._snapshots[state][self._versions[state]]
+        new = {alert_id for alert_id in latest if alert_id not in old}
+        expired = {alert_id for alert_id in old if alert_id not in latest}
+        updated = {
+            alert_id
+            for alert_id in latest
+            if alert_id in old and latest[alert_id][0] != old[alert_id][0]
+        }
+
+        for alert_id in list(new):
+            references = current[alert_id]["properties"].get("references") or []
+            replaced = {ref.get("identifier") for ref in references} & expired
+            if replaced:
+                new.discard(alert_id)
+                updated.add(alert_id)
+                expired -= replaced
+
+        return {
+            "token": self.token(state),
+            "new": by_sent(new),
+            "updated": by_sent(updated),
+            "expired": [
+                (alert_id, old[alert_id][1], old[alert_id][2])
+                for alert_id in sorted(expired)
+            ],
+            "resync": False,
+        }
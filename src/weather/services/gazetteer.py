@@ -0,0 +1,371 @@
+"""Offline lookup of US place names.
+
+The gazetteer is a UTF-8 text file of places sorted by a normalized key::
+
+    boulder,co<TAB>Boulder<TAB>CO<TAB>40.0150<TAB>-105.2705<TAB>108250
+
+It is memory-mapped rather than read: loading it only records where each
+line starts, and exact and prefix lookups binary-search the mapped lines.
+A trigram index for misspelled names is built on the first fuzzy lookup.
+
+The bundled file covers state capitals and larger US cities. To cover every
+incorporated place and census-designated place, build a replacement from
+the Census Bureau's national places gazetteer file::
+
+    python -m src.weather.services.gazetteer 2023_Gaz_place_national.txt \\
+        src/weather/data/places.tsv
+"""
+
+import argparse
+import logging
+import mmap
+import re
+import unicodedata
+from array import array
+from bisect import bisect_left
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+DEFAULT_PATH = Path(__file__).resolve().parent.parent / "data" / "places.tsv"
+
+# Fuzzy matches must share at least this fraction of their trigrams
+MIN_SIMILARITY = 0.4
+
+# Prefix matches considered before ranking
+MAX_PREFIX_MATCHES = 200
+
+STATES = {
+    "alabama": "al",
+    "alaska": "ak",
+    "arizona": "az",
+    "arkansas": "ar",
+    "california": "ca",
+    "colorado": "co",
+    "connecticut": "ct",
+    "delaware": "de",
+    "district of columbia": "dc",
+    "florida": "fl",
+    "georgia": "ga",
+    "hawaii": "hi",
+    "idaho": "id",
+    "illinois": "il",
+    "indiana": "in",
+    "iowa": "ia",
+    "kansas": "ks",
+    "kentucky": "ky",
+    "louisiana": "la",
+    "maine": "me",
+    "maryland": "md",
+    "massachusetts": "ma",
+    "michigan": "mi",
+    "minnesota": "mn",
+    "mississippi": "ms",
+    "missouri": "mo",
+    "montana": "mt",
+    "nebraska": "ne",
+    "nevada": "nv",
+    "new hampshire": "nh",
+    "new jersey": "nj",
+    "new mexico": "nm",
+    "new york": "ny",
+    "north carolina": "nc",
+    "north dakota": "nd",
+    "ohio": "oh",
+    "oklahoma": "ok",
+    "oregon": "or",
+    "pennsylvania": "pa",
+    "puerto rico": "pr",
+    "rhode island": "ri",
+    "south carolina": "sc",
+    "south dakota": "sd",
+    "tennessee": "tn",
+    "texas": "tx",
+    "utah": "ut",
+    "vermont": "vt",
+    "virginia": "va",
+    "washington": "wa",
+    "west virginia": "wv",
+    "wisconsin": "wi",
+    "wyoming": "wy",
+}
+STATE_CODES = set(STATES.values())
+
+# Written either way in place names; both sides are normalized to the short form
+_ABBREVIATIONS = {"saint": "st", "sainte": "ste", "mount": "mt", "fort": "ft"}
+
+# Legal/statistical area descriptions the Census appends to place names
+_CENSUS_SUFFIX = re.compile(
+    r"\s+(city and borough|consolidated government|metropolitan government|"
+    r"unified government|urban county|city|town|township|village|borough|"
+    r"municipality|CDP|comunidad|zona urbana)(\s+\(balance\))?$"
+)
+
+
+class Place(NamedTuple):
+    """A place found in the gazetteer."""
+
+    name: str
+    state: str
+    latitude: float
+    longitude: float
+    weight: int
+
+
+def normalize(text: str) -> str:
+    """
+    Normalize a place name for comparison.
+
+    Accents and punctuation are dropped, case is folded and common
+    abbreviations are unified, so 'St. Louis' and 'saint louis' match.
+
+    Args:
+        text: Place name
+
+    Returns:
+        Normalized name
+    """
+    text = unicodedata.normalize("NFKD", text)
+    text = "".join(c for c in text if not unicodedata.combining(c)).lower()
+    words = re.sub(r"[^a-z0-9]+", " ", text).split()
+    return " ".join(_ABBREVIATIONS.get(word, word) for word in words)
+
+
+def parse_query(query: str) -> Tuple[str, Optional[str]]:
+    """
+    Split a query such as 'Boulder, CO' into a normalized name and state.
+
+    The state may be a two-letter code or a full name, after a comma or
+    as the last words of the query.
+
+    Args:
+        query: Place query
+
+    Returns:
+        Normalized name and lower-case state code, or None if no state is given
+    """
+    name, _, rest = query.rpartition(",")
+    if name and normalize(rest) in STATES:
+        return normalize(name), STATES[normalize(rest)]
+    if name and normalize(rest) in STATE_CODES:
+        return normalize(name), normalize(rest)
+
+    words = normalize(query).split()
+    # Longest state names first, so 'west virginia' is not read as 'virginia'
+    for count in (3, 2, 1):
+        if len(words) <= count:
+            continue
+        tail = " ".join(words[-count:])
+        if tail in STATES:
+            return " ".join(words[:-count]), STATES[tail]
+        if count == 1 and tail in STATE_CODES:
+            return " ".join(words[:-1]), tail
+    return " ".join(words), None
+
+
+def _trigrams(name: str) -> set:
+    padded = f"  {name} "
+    return {padded[i : i + 3] for i in range(len(padded) - 2)}
+
+
+class Gazetteer:
+    """
+    Memory-mapped, sorted place list with prefix and trigram lookup.
+
+    Exact and prefix lookups cost a binary search over the line offsets;
+    fuzzy lookups score the places sharing a trigram with the query.
+    """
+
+    def __init__(self, path: Path = DEFAULT_PATH):
+        self.path = Path(path)
+        with open(self.path, "rb") as f:
+            self._data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._offsets = array("I")
+        position, size = 0, len(self._data)
+        while position < size:
+            end = self._data.find(b"\n", position)
+            end = size if end < 0 else end
+            if self._data[position : position + 1] != b"#":
+                self._offsets.append(position)
+            position = end + 1
+        self._trigram_index: Optional[Dict[str, array]] = None
+
+    def __len__(self) -> int:
+        return len(self._offsets)
+
+    def _key(self, index: int) -> bytes:
+        start = self._offsets[index]
+        return self._data[start : self._data.find(b"\t", start)]
+
+    def _place(self, index: int) -> Place:
+        start = self._offsets[index]
+        end = self._data.find(b"\n", start)
+        line = self._data[start : end if end >= 0 else len(self._data)]
+        _, name, state, latitude, longitude, weight = line.decode().split("\t")
+        return Place(name, state, float(latitude), float(longitude), int(weight))
+
+    def _prefixed(self, prefix: str, limit: int) -> List[int]:
+        """Get the indexes of up to limit places whose key starts with prefix."""
+        target = prefix.encode()
+        index = bisect_left(range(len(self._offsets)), target, key=self._key)
+        found = []
+        while (
+            index < len(self._offsets)
+            and len(found) < limit
+            and self._key(index).startswith(target)
+        ):
+            found.append(index)
+            index += 1
+        return found
+
+    def _build_trigram_index(self) -> Dict[str, array]:
+        index: Dict[str, array] = {}
+        for i in range(len(self._offsets)):
+            name = self._key(i).decode().rpartition(",")[0]
+            for trigram in _trigrams(name):
+                index.setdefault(trigram, array("I")).append(i)
+        logger.info("Gazetteer trigram index built over %s places", len(self))
+        return index
+
+    def _similar(self, name: str, state: Optional[str]) -> List[Tuple[float, int]]:
+        """Score places by the share of trigrams their names have with name."""
+        if self._trigram_index is None:
+            self._trigram_index = self._build_trigram_index()
+        wanted = _trigrams(name)
+        shared: Dict[int, int] = {}
+        for trigram in wanted:
+            for i in self._trigram_index.get(trigram, ()):
+                shared[i] = shared.get(i, 0) + 1
+
+        scored = []
+        for i, count in shared.items():
+            key_name, _, key_state = self._key(i).decode().rpartition(",")
+            if state and key_state != state:
+                continue
+            similarity = count / len(wanted | _trigrams(key_name))
+            if similarity >= MIN_SIMILARITY:
+                scored.append((similarity, i))
+        return scored
+
+    def search(self, query: str, limit: int = 5) -> List[Place]:
+        """
+        Find the places best matching a query.
+
+        Exact name matches come first, then names starting with the query,
+        then names spelled similarly. Within each, larger places (by weight,
+        normally population) come first.
+
+        Args:
+            query: Place such as 'Boulder, CO', 'boulder colorado' or 'Boulder'
+            limit: Maximum number of places
+
+        Returns:
+            Matching places, best first
+        """
+        name, state = parse_query(query)
+        if not name:
+            return []
+
+        def ranked(indexes: List[int]) -> List[Place]:
+            places = [self._place(i) for i in indexes]
+            places = [p for p in places if not state or p.state.lower() == state]
+            return sorted(places, key=lambda place: -place.weight)[:limit]
+
+        exact = ranked(self._prefixed(f"{name},", MAX_PREFIX_MATCHES))
+        if exact:
+            return exact
+        prefixed = ranked(self._prefixed(name, MAX_PREFIX_MATCHES))
+        if prefixed:
+            return prefixed
+
+        scored = self._similar(name, state)
+        scored.sort(key=lambda pair: (-pair[0], -self._place(pair[1]).weight))
+        return [self._place(i) for _, i in scored[:limit]]
+
+    def resolve(self, query: str) -> Optional[Place]:
+        """
+        Find the single place a query most likely means.
+
+        Args:
+            query: Place such as 'Boulder, CO'
+
+        Returns:
+            Best matching place, or None if nothing matches
+        """
+        places = self.search(query, limit=1)
+        return places[0] if places else None
+
+    def close(self) -> None:
+        """Unmap the gazetteer file."""
+        self._data.close()
+
+
+_gazetteer: Optional[Gazetteer] = None
+
+
+def get_gazetteer() -> Gazetteer:
+    """
+    Get the bundled gazetteer, mapping it on first use.
+
+    Returns:
+        Gazetteer
+    """
+    global _gazetteer
+    if _gazetteer is None:
+        _gazetteer = Gazetteer()
+    return _gazetteer
+
+
+def build_from_census(source: Path, destination: Path) -> int:
+    """
+    Convert a Census Bureau national places gazetteer file to the lookup format.
+
+    The Census file carries no population, so places are weighted by land
+    area, which ranks larger places first among those sharing a name.
+
+    Args:
+        source: Tab-separated Census gazetteer file (e.g. 2023_Gaz_place_national.txt)
+        destination: Gazetteer file to write
+
+    Returns:
+        Number of places written
+    """
+    lines = []
+    with open(source, encoding="utf-8") as f:
+        header = [column.strip() for column in f.readline().split("\t")]
+        columns = {column: i for i, column in enumerate(header)}
+        for row in f:
+            fields = [field.strip() for field in row.split("\t")]
+            name = _CENSUS_SUFFIX.sub("", fields[columns["NAME"]])
+            state = fields[columns["USPS"]]
+            key = f"{normalize(name)},{state.lower()}"
+            lines.append(
+                f"{key}\t{name}\t{state}\t{float(fields[columns['INTPTLAT']]):.4f}\t"
+                f"{float(fields[columns['INTPTLONG']]):.4f}\t"
+                f"{int(fields[columns['ALAND']]) // 1000}\n"
+            )
+
+    lines.sort(key=lambda line: line.split("\t", 1)[0].encode())
+    with open(destination, "w", encoding="utf-8") as f:
+        f.write("# key\tname\tstate\tlatitude\tlongitude\tweight\n")
+        f.writelines(lines)
+    return len(lines)
+
+
+def main() -> None:
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(
+        description=build_from_census.__doc__.split("\n")[1].strip()
+    )
+    parser.add_argument(
+        "source", type=Path, help="Census national places gazetteer file"
+    )
+    parser.add_argument("destination", type=Path, help="Gazetteer file to write")
+    args = parser.parse_args()
+    print(f"Wrote {build_from_census(args.source, args.destination)} places")
+
+
+if __name__ == "__main__":
+    main()
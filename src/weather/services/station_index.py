@@ -0,0 +1,187 @@
+"""In-memory nearest-neighbour index over NWS observation stations."""
+
+import heapq
+import logging
+import math
+from typing import Any, Dict, Iterable, List, Sequence, Tuple
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+EARTH_RADIUS_KM = 6371.0088
+
+# Compact station record: (identifier, name, latitude, longitude, time zone)
+Station = Tuple[str, str, float, float, str]
+Point = Tuple[float, float, float]
+
+
+def _unit_vector(latitude: float, longitude: float) -> Point:
+    """
+    Convert a coordinate to a point on the unit sphere.
+
+    Straight-line distance between such points grows with great-circle
+    distance, so a Euclidean KD-tree over them finds the nearest stations
+    without special cases at the poles or the antimeridian.
+
+    Args:
+        latitude: Latitude in degrees
+        longitude: Longitude in degrees
+
+    Returns:
+        (x, y, z) on the unit sphere
+    """
+    lat, lon = math.radians(latitude), math.radians(longitude)
+    return (math.cos(lat) * math.cos(lon), math.cos(lat) * math.sin(lon), math.sin(lat))
+
+
+def _chord_to_km(chord_squared: float) -> float:
+    """Convert a squared chord length on the unit sphere to kilometres."""
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(chord_squared) / 2))
+
+
+def distance_km(
+    latitude: float, longitude: float, other_latitude: float, other_longitude: float
+) -> float:
+    """
+    Get the great-circle distance between two coordinates.
+
+    Args:
+        latitude: Latitude of the first coordinate
+        longitude: Longitude of the first coordinate
+        other_latitude: Latitude of the second coordinate
+        other_longitude: Longitude of the second coordinate
+
+    Returns:
+        Distance in kilometres
+    """
+    a = _unit_vector(latitude, longitude)
+    b = _unit_vector(other_latitude, other_longitude)
+    return _chord_to_km(sum((x - y) ** 2 for x, y in zip(a, b)))
+
+
+def parse_stations(features: Iterable[Dict[str, Any]]) -> List[Station]:
+    """
+    Reduce station features from the /stations endpoint to compact records.
+
+    Args:
+        features: GeoJSON station features
+
+    Returns:
+        Station records; features without an identifier or a point are skipped
+    """
+    stations = []
+    for feature in features:
+        props = feature.get("properties", {})
+        geometry = feature.get("geometry") or {}
+        coordinates = geometry.get("coordinates") or []
+        identifier = props.get("stationIdentifier")
+        if geometry.get("type") != "Point" or len(coordinates) < 2 or not identifier:
+            continue
+        longitude, latitude = float(coordinates[0]), float(coordinates[1])
+        stations.append(
+            (
+                identifier,
+                props.get("name") or identifier,
+                latitude,
+                longitude,
+                props.get("timeZone") or "",
+            )
+        )
+    return stations
+
+
+class StationIndex:
+    """
+    KD-tree over station positions on the unit sphere.
+
+    The tree is implicit: each subtree is a slice of the station list with
+    its median, along the axis of its depth, in the middle. Building sorts
+    each slice once per level; a lookup visits O(log n) nodes for the few
+    nearest stations a tool needs.
+    """
+
+    def __init__(self, stations: Sequence[Station] = ()):
+        self._stations: List[Station] = []
+        self._points: List[Point] = []
+        self.build(stations)
+
+    def __len__(self) -> int:
+        return len(self._stations)
+
+    def build(self, stations: Sequence[Station]) -> None:
+        """
+        Replace the indexed stations.
+
+        Args:
+            stations: Station records
+        """
+        pairs = [
+            (_unit_vector(station[2], station[3]), station) for station in stations
+        ]
+
+        # Subtrees still to arrange, kept on a list rather than the call stack
+        pending = [(0, len(pairs), 0)]
+        while pending:
+            lo, hi, axis = pending.pop()
+            if hi - lo <= 1:
+                continue
+            pairs[lo:hi] = sorted(pairs[lo:hi], key=lambda pair: pair[0][axis])
+            mid = (lo + hi) // 2
+            pending.append((lo, mid, (axis + 1) % 3))
+            pending.append((mid + 1, hi, (axis + 1) % 3))
+
+        self._points = [point for point, _ in pairs]
+        self._stations = [station for _, station in pairs]
+
+    def nearest(
+        self, latitude: float, longitude: float, count: int = 1
+    ) -> List[Tuple[Station, float]]:
+        """
+        Find the stations nearest to a coordinate.
+
+        Args:
+            latitude: Latitude coordinate
+            longitude: Longitude coordinate
+            count: Number of stations to find
+
+        Returns:
+            Up to count (station, distance in km) pairs, nearest first
+        """
+        if not self._points or count < 1:
+            return []
+        target = _unit_vector(latitude, longitude)
+        points = self._points
+        # Max-heap of the best candidates so far, as (-distance², index)
+        best: List[Tuple[float, int]] = []
+
+        # Subtrees to visit, with a lower bound on their squared distance
+        pending = [(0, len(points), 0, 0.0)]
+        while pending:
+            lo, hi, axis, bound = pending.pop()
+            if lo >= hi or (len(best) == count and bound >= -best[0][0]):
+                continue
+            mid = (lo + hi) // 2
+            point = points[mid]
+            distance = (
+                (point[0] - target[0]) ** 2
+                + (point[1] - target[1]) ** 2
+                + (point[2] - target[2]) ** 2
+            )
+            if len(best) < count:
+                heapq.heappush(best, (-distance, mid))
+            elif distance < -best[0][0]:
+                heapq.heapreplace(best, (-distance, mid))
+
+            offset = target[axis] - point[axis]
+            following = (axis + 1) % 3
+            below, above = (lo, mid), (mid + 1, hi)
+            near, far = (below, above) if offset < 0 else (above, below)
+            # The far side lies beyond the splitting plane; the near side is
+            # pushed last so it is searched first
+            pending.append((*far, following, max(bound, offset * offset)))
+            pending.append((*near, following, bound))
+
+        return [
+            (self._stations[index], _chord_to_km(-distance))
+            for distance, index in sorted(best, reverse=True)
+        ]
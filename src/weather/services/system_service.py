@@ -1,32 +1,388 @@
 """System service for interacting with the local system."""
 
+import asyncio
 import logging
-import subprocess
-import psutil
-from typing import List, Dict, Any
+import os
+import secrets
+import shlex
+import signal
+from typing import List, Dict, Any, Optional, Tuple
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
+SHELL = "/bin/sh"
 
-def run_shell_command(command: str) -> Dict[str, Any]:
+# Seconds a shell command may run; 0 lets it run until it exits
+SHELL_TIMEOUT = float(os.environ.get("WEATHER_SHELL_TIMEOUT", "300")) or None
+
+# Long-lived shells to run commands in; 0 starts a new shell for each command
+SHELL_POOL_SIZE = int(os.environ.get("WEATHER_SHELL_POOL", "0"))
+# Commands a pooled shell runs before it is replaced
+SHELL_MAX_COMMANDS = int(os.environ.get("WEATHER_SHELL_MAX_COMMANDS", "100"))
+# Bytes of stdout or stderr kept from a pooled command before it is stopped
+SHELL_MAX_OUTPUT = int(os.environ.get("WEATHER_SHELL_MAX_OUTPUT", str(1024 * 1024)))
+READ_CHUNK = 64 * 1024
+
+
+def _kill(process: asyncio.subprocess.Process) -> None:
+    """Kill a shell and every process it started."""
+    try:
+        os.killpg(process.pid, signal.SIGKILL)
+    except ProcessLookupError:
+        pass
+
+
+async def _drain(reader: asyncio.StreamReader, buffer: bytearray) -> None:
+    """Read a stream to its end into a buffer."""
+    while chunk := await reader.read(READ_CHUNK):
+        buffer += chunk
+
+
+def _timed_out(stdout: bytes, stderr: bytes, timeout: float) -> Dict[str, Any]:
+    """
+    Build the result of a command stopped at its timeout.
+
+    Args:
+        stdout: Standard output captured before the command was stopped
+        stderr: Standard error captured before the command was stopped
+        timeout: Seconds the command was allowed
+
+    Returns:
+        Dictionary with success status, the partial stdout and stderr, and
+        timed_out set
+    """
+    message = f"Command timed out after {timeout:.1f}s"
+    stderr_text = stderr.decode(errors="replace")
+    if stderr_text and not stderr_text.endswith("\n"):
+        stderr_text += "\n"
+    return {
+        "success": False,
+        "stdout": stdout.decode(errors="replace"),
+        "stderr": stderr_text + message,
+        "timed_out": True,
+    }
+
+
+class OutputLimitExceeded(Exception):
+    """A pooled command wrote more output than it may."""
+
+
+async def _read_until(
+    reader: asyncio.StreamReader, marker: bytes, limit: int, data: bytearray
+) -> Tuple[bytes, bytes]:
+    """
+    Read a stream up to a marker.
+
+    Args:
+        reader: Stream to read
+        marker: Bytes ending the output
+        limit: Bytes of output allowed before the marker
+        data: Buffer to read into, which keeps what was read if the read
+            is cancelled
+
+    Returns:
+        Output before the marker and whatever was read after it
+
+    Raises:
+        OutputLimitExceeded: If more than limit bytes come before the marker
+        EOFError: If the stream ends first
+    """
+    searched = 0
+    while True:
+        index = data.find(marker, searched)
+        if index >= 0:
+            return bytes(data[:index]), bytes(data[index + len(marker) :])
+        if len(data) > limit + len(marker):
+            raise OutputLimitExceeded(f"More than {limit} bytes of output")
+        # The marker may straddle the end of what has been read
+        searched = max(0, len(data) - len(marker) + 1)
+        chunk = await reader.read(READ_CHUNK)
+        if not chunk:
+            raise EOFError("Shell exited")
+        data += chunk
+
+
+class ShellWorker:
+    """
+    Long-lived shell that runs commands sent over its stdin.
+
+    Each command runs in a subshell, so a cd, exit or variable it sets does
+    not carry over to the next one, with stdin from /dev/null so it cannot
+    read the commands that follow. After it, the shell writes a line with a
+    random token and the exit status to stdout, and the token to stderr;
+    everything before those lines is the command's output.
+
+    Attributes:
+        stdout: Standard output read for the current or last command
+        stderr: Standard error read for the current or last command
+    """
+
+    def __init__(self, process: asyncio.subprocess.Process):
+        self.process = process
+        self.commands = 0
+        self.stdout = bytearray()
+        self.stderr = bytearray()
+
+    @classmethod
+    async def start(cls) -> "ShellWorker":
+        """
+        Start a shell in its own process group.
+
+        Returns:
+            Worker
+        """
+        process = await asyncio.create_subprocess_exec(
+            SHELL,
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            start_new_session=True,
+        )
+        return cls(process)
+
+    async def run(self, command: str, max_output: int) -> Tuple[int, bytes, bytes]:
+        """
+        Run a command.
+
+        Args:
+            command: Shell command to execute
+            max_output: Bytes of stdout and of stderr allowed
+
+        Returns:
+            Exit status, stdout and stderr
+
+        Raises:
+            OutputLimitExceeded: If the command wrote more than max_output
+                bytes to either stream
+            EOFError: If the shell exited
+        """
+        token = secrets.token_hex(16)
+        script = (
+            f"( eval {shlex.quote(command)} ) </dev/null; "
+            f"printf '\\n%s %d\\n' {token} $?; "
+            f"printf '\\n%s\\n' {token} >&2\n"
+        )
+        self.stdout, self.stderr = bytearray(), bytearray()
+        self.process.stdin.write(script.encode())
+        await self.process.stdin.drain()
+        self.commands += 1
+
+        stdout_task = asyncio.ensure_future(
+            _read_until(
+                self.process.stdout, f"\n{token} ".encode(), max_output, self.stdout
+            )
+        )
+        stderr_task = asyncio.ensure_future(
+            _read_until(
+                self.process.stderr, f"\n{token}\n".encode(), max_output, self.stderr
+            )
+        )
+        try:
+            (stdout, status), (stderr, _) = await asyncio.gather(
+                stdout_task, stderr_task
+            )
+        finally:
+            stdout_task.cancel()
+            stderr_task.cancel()
+
+        while not status.endswith(b"\n"):
+            chunk = await self.process.stdout.read(READ_CHUNK)
+            if not chunk:
+                raise EOFError("Shell exited")
+            status += chunk
+        return int(status.split(b"\n", 1)[0]), stdout, stderr
+
+    def kill(self) -> None:
+        """Kill the shell and any command it is running."""
+        _kill(self.process)
+
+    async def close(self) -> None:
+        """Kill the shell and wait for it to exit."""
+        self.kill()
+        await self.process.wait()
+
+
+class ShellPool:
+    """
+    Pool of long-lived shells, saving a process spawn per command.
+
+    Shells are started on first use, up to size running commands at once.
+    A shell is replaced after max_commands commands, and killed with its
+    command when the command times out, writes too much output or the
+    caller is cancelled. A command that times out still returns the output
+    it wrote before then.
+    """
+
+    def __init__(
+        self,
+        size: int = 4,
+        max_commands: int = SHELL_MAX_COMMANDS,
+        max_output: int = SHELL_MAX_OUTPUT,
+    ):
+        self.size = size
+        self.max_commands = max_commands
+        self.max_output = max_output
+        self._slots = asyncio.Semaphore(size)
+        self._idle: List[ShellWorker] = []
+
+    async def run(
+        self, command: str, timeout: float, max_output: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """
+        Run a shell command in a pooled shell.
+
+        Args:
+            command: Shell command to execute
+            timeout: Seconds the command may run
+            max_output: Bytes of stdout and of stderr allowed, defaults to
+                the pool's limit
+
+        Returns:
+            Dictionary with success status, stdout, and stderr, and
+            timed_out for a command stopped at its timeout, as
+            run_shell_command returns
+        """
+        max_output = self.max_output if max_output is None else max_output
+        async with self._slots:
+            worker = self._idle.pop() if self._idle else None
+            try:
+                async with asyncio.timeout(timeout):
+                    if worker is None:
+                        worker = await ShellWorker.start()
+                    status, stdout, stderr = await worker.run(command, max_output)
+            except TimeoutError:
+                await self._discard(worker)
+                logger.error("Command '%s' timed out after %.1fs", command, timeout)
+                if worker is None:
+                    return _timed_out(b"", b"", timeout)
+                return _timed_out(worker.stdout, worker.stderr, timeout)
+            except OutputLimitExceeded:
+                await self._discard(worker)
+                logger.error(
+                    "Command '%s' exceeded %s output bytes", command, max_output
+                )
+                return {
+                    "success": False,
+                    "stdout": "",
+                    "stderr": f"Command stopped after {max_output} bytes of output",
+                }
+            except (OSError, EOFError) as e:
+                await self._discard(worker)
+                logger.error("Error executing command '%s': %s", command, e)
+                return {"success": False, "stdout": "", "stderr": str(e)}
+            except asyncio.CancelledError:
+                if worker is not None:
+                    worker.kill()
+                raise
+
+            if worker.commands >= self.max_commands:
+                await self._discard(worker)
+            else:
+                self._idle.append(worker)
+
+        if status != 0:
+            logger.error(
+                "Error executing command '%s': exit status %s", command, status
+            )
+            return {
+                "success": False,
+                "stdout": "",
+                "stderr": stderr.decode(errors="replace"),
+            }
+        return {
+            "success": True,
+            "stdout": stdout.decode(errors="replace"),
+            "stderr": stderr.decode(errors="replace"),
+        }
+
+    async def _discard(self, worker: Optional[ShellWorker]) -> None:
+        if worker is not None:
+            await worker.close()
+
+    async def close(self) -> None:
+        """Kill every idle shell."""
+        while self._idle:
+            await self._idle.pop().close()
+
+
+_shell_pool: Optional[ShellPool] = None
+
+
+def get_shell_pool() -> Optional[ShellPool]:
+    """
+    Get the shell pool, if WEATHER_SHELL_POOL enables one.
+
+    Returns:
+        Shell pool, or None to start a shell for each command
+    """
+    global _shell_pool
+    if _shell_pool is None and SHELL_POOL_SIZE > 0:
+        _shell_pool = ShellPool(SHELL_POOL_SIZE)
+    return _shell_pool
+
+
+async def run_shell_command(
+    command: str, timeout: Optional[float] = SHELL_TIMEOUT
+) -> Dict[str, Any]:
     """
     Run a shell command and return the output.
 
+    The command runs in its own process group, which is killed when the
+    command times out or the calling task is cancelled. If WEATHER_SHELL_POOL
+    is set, it runs in a pooled shell instead of a new one (see ShellPool).
+
     Args:
         command: Shell command to execute
+        timeout: Seconds the command may run, defaults to WEATHER_SHELL_TIMEOUT;
+            None lets it run until it exits
 
     Returns:
-        Dictionary with success status, stdout, and stderr
+        Dictionary with success status, stdout, and stderr. A command stopped
+        at its timeout also has timed_out set, with the output it wrote
+        before then.
     """
+    pool = get_shell_pool()
+    if pool is not None:
+        return await pool.run(command, timeout)
+
+    process = await asyncio.create_subprocess_shell(
+        command,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+        start_new_session=True,
+    )
+    stdout, stderr = bytearray(), bytearray()
     try:
-        result = subprocess.run(
-            command, shell=True, check=True, text=True, capture_output=True
+        async with asyncio.timeout(timeout):
+            await asyncio.gather(
+                _drain(process.stdout, stdout),
+                _drain(process.stderr, stderr),
+                process.wait(),
+            )
+    except TimeoutError:
+        _kill(process)
+        await process.wait()
+        logger.error("Command '%s' timed out after %.1fs", command, timeout)
+        return _timed_out(stdout, stderr, timeout)
+    except asyncio.CancelledError:
+        _kill(process)
+        raise
+
+    if process.returncode != 0:
+        logger.error(
+            "Error executing command '%s': exit status %s", command, process.returncode
         )
-        return {"success": True, "stdout": result.stdout, "stderr": result.stderr}
-    except subprocess.CalledProcessError as e:
-        logger.error(f"Error executing command '{command}': {str(e)}")
-        return {"success": False, "stdout": "", "stderr": str(e.stderr)}
+        return {
+            "success": False,
+            "stdout": "",
+            "stderr": stderr.decode(errors="replace"),
+        }
+    return {
+        "success": True,
+        "stdout": stdout.decode(errors="replace"),
+        "stderr": stderr.decode(errors="replace"),
+    }
 
 
 def get_top_processes(limit: int = 10) -> List[Dict[str, Any]]:
@@ -39,6 +395,9 @@ def get_top_processes(limit: int = 10) -> List[Dict[str, Any]]:
     Returns:
         List of process information dictionaries
     """
+    # Imported on first use to keep server startup fast
+    import psutil
+
     try:
         # Get all processes and filter out ones with None CPU percentage
         processes = []
@@ -53,5 +412,5 @@ def get_top_processes(limit: int = 10) -> List[Dict[str, Any]]:
         # Sort by CPU percentage and get top N
         return sorted(processes, key=lambda p: p["cpu_percent"], reverse=True)[:limit]
     except Exception as e:
-        logger.error(f"Error getting process information: {str(e)}")
+        logger.error("Error getting process information: %s", e)
         return []
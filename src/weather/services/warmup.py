@@ -0,0 +1,280 @@
+"""Cache warm-up for a configured watch-list of locations and states.
+
+The watch-list is a TOML file named by the WEATHER_WARMUP_CONFIG
+environment variable::
+
+    concurrency = 8        # upstream requests in flight at once
+    rate = 10.0            # upstream requests per second
+    refresh_margin = 30    # seconds before expiry to refresh an entry
+    retry_interval = 60    # seconds to wait after a failed refresh
+    states = ["KS", "MO"]
+    locations = [
+        [39.7456, -97.0892],
+        { latitude = 38.9, longitude = -96.5 },
+    ]
+
+At startup every point is resolved and every forecast and alert list is
+fetched; afterwards each entry is refreshed shortly before its cache entry
+expires, so interactive calls are served from the cache.
+"""
+
+import asyncio
+import logging
+import os
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Tuple
+
+from . import weather_service
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+CONFIG_ENV = "WEATHER_WARMUP_CONFIG"
+
+DEFAULTS: Dict[str, Any] = {
+    "concurrency": 8,
+    "rate": 10.0,
+    "refresh_margin": 30,
+    "retry_interval": 60,
+    "states": [],
+    "locations": [],
+}
+
+_warmer: Optional["Warmer"] = None
+_task: Optional[asyncio.Task] = None
+_users = 0
+
+
+def load_config(path: str) -> Dict[str, Any]:
+    """
+    Load a warm-up watch-list.
+
+    Args:
+        path: Path to the TOML file
+
+    Returns:
+        Configuration with defaults applied and locations as (lat, lon) pairs
+
+    Raises:
+        ValueError: If a location or setting is malformed
+    """
+    import tomllib
+
+    with open(path, "rb") as f:
+        config = {**DEFAULTS, **tomllib.load(f)}
+
+    locations: List[Tuple[float, float]] = []
+    for entry in config["locations"]:
+        if isinstance(entry, dict):
+            entry = (entry.get("latitude"), entry.get("longitude"))
+        try:
+            latitude, longitude = (float(value) for value in entry)
+        except (TypeError, ValueError):
+            raise ValueError(f"Invalid warm-up location: {entry!r}")
+        locations.append((latitude, longitude))
+
+    config["locations"] = locations
+    config["states"] = [str(state).upper() for state in config["states"]]
+    if config["concurrency"] < 1 or config["rate"] <= 0:
+        raise ValueError("Warm-up concurrency and rate must be positive")
+    return config
+
+
+class RateLimiter:
+    """Token bucket limiting how often upstream requests may start."""
+
+    def __init__(self, rate: float, burst: int = 1):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        """Wait until a request may start."""
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(
+                    self.burst, self._tokens + (now - self._updated) * self.rate
+                )
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+class Warmer:
+    """
+    Keeps the response cache warm for a watch-list.
+
+    Every location has a forecast job, and every state an alerts job. Each
+    job records when it is next due, which is its cache TTL minus the refresh
+    margin after the last success, or the retry interval after a failure.
+    """
+
+    def __init__(
+        self, config: Dict[str, Any], clock: Callable[[], float] = time.monotonic
+    ):
+        self.config = config
+        self._clock = clock
+        self._semaphore = asyncio.Semaphore(config["concurrency"])
+        # The limiter paces real requests, so it always runs on the real clock
+        self._limiter = RateLimiter(config["rate"])
+        self._due: Dict[Tuple[Any, ...], float] = {}
+        for latitude, longitude in config["locations"]:
+            self._due[("forecast", latitude, longitude)] = 0.0
+        for state in config["states"]:
+            self._due[("alerts", state)] = 0.0
+        # Point metadata has its own, much longer, refresh schedule
+        self._point_due: Dict[Tuple[float, float], float] = {}
+
+    def _next_due(self, ttl: float) -> float:
+        return self._clock() + max(ttl - self.config["refresh_margin"], 1.0)
+
+    async def _warm_forecast(self, latitude: float, longitude: float) -> bool:
+        refresh_point = self._point_due.get((latitude, longitude), 0.0) <= self._clock()
+        await self._limiter.acquire()
+        point = await weather_service.get_weather_point(
+            latitude, longitude, refresh=refresh_point
+        )
+        if not point:
+            return False
+        if refresh_point:
+            self._point_due[(latitude, longitude)] = self._next_due(
+                weather_service.POINT_TTL
+            )
+
+        await self._limiter.acquire()
+        forecast = await weather_service.get_weather_forecast(
+            point["properties"]["forecast"], refresh=True
+        )
+        return forecast is not None
+
+    async def _warm_alerts(self, state: str) -> bool:
+        await self._limiter.acquire()
+        return await weather_service.get_weather_alerts(state, refresh=True) is not None
+
+    async def _run_job(self, job: Tuple[Any, ...]) -> bool:
+        async with self._semaphore:
+            try:
+                if job[0] == "forecast":
+                    ttl = weather_service.FORECAST_TTL
+                    ok = await self._warm_forecast(job[1], job[2])
+                else:
+                    ttl = weather_service.ALERTS_TTL
+                    ok = await self._warm_alerts(job[1])
+            except Exception as e:
+                logger.warning("Warm-up of %s failed: %s", job, e)
+                ok = False
+        self._due[job] = (
+            self._next_due(ttl) if ok else self._clock() + self.config["retry_interval"]
+        )
+        return ok
+
+    async def run_once(self) -> Dict[str, int]:
+        """
+        Refresh every job that is due.
+
+        Returns:
+            Counts of refreshed and failed jobs
+        """
+        now = self._clock()
+        due = [job for job, when in self._due.items() if when <= now]
+        results = await asyncio.gather(*(self._run_job(job) for job in due))
+        return {"refreshed": sum(results), "failed": len(results) - sum(results)}
+
+    def seconds_until_due(self) -> float:
+        """
+        Get the time until the next job is due.
+
+        Returns:
+            Seconds until the earliest due job, 0 if one is already due
+        """
+        if not self._due:
+            return float("inf")
+        return max(min(self._due.values()) - self._clock(), 0.0)
+
+    async def run(self) -> None:
+        """Refresh jobs as they come due until cancelled."""
+        while True:
+            start = time.perf_counter()
+            counts = await self.run_once()
+            if counts["refreshed"] or counts["failed"]:
+                logger.info(
+                    "Warm-up refreshed %s entries (%s failed) in %.1fs",
+                    counts["refreshed"],
+                    counts["failed"],
+                    time.perf_counter() - start,
+                )
+            await asyncio.sleep(max(self.seconds_until_due(), 1.0))
+
+
+async def start_warmup(path: Optional[str] = None) -> Optional[Warmer]:
+    """
+    Start the warm-up loop, or join it if it is already running.
+
+    Every call must be paired with a call to stop_warmup.
+
+    Args:
+        path: Watch-list file, defaults to the WEATHER_WARMUP_CONFIG environment variable
+
+    Returns:
+        The running warmer, or None if no watch-list is configured
+    """
+    global _warmer, _task, _users
+    _users += 1
+    if _task is not None:
+        return _warmer
+
+    path = path or os.environ.get(CONFIG_ENV)
+    if not path:
+        return None
+    try:
+        config = load_config(path)
+    except (OSError, ValueError) as e:
+        logger.error("Error loading warm-up config %s: %s", path, e)
+        return None
+
+    _warmer = Warmer(config)
+    _task = asyncio.create_task(_warmer.run())
+    logger.info(
+        "Warm-up started for %s locations and %s states",
+        len(config["locations"]),
+        len(config["states"]),
+    )
+    return _warmer
+
+
+async def stop_warmup() -> None:
+    """Leave the warm-up loop, stopping it when the last user leaves."""
+    global _warmer, _task, _users
+    _users = max(_users - 1, 0)
+    if _users or _task is None:
+        return
+    task, _task, _warmer = _task, None, None
+    task.cancel()
+    try:
+        await task
+    except asyncio.CancelledError:
+        pass
+
+
+@asynccontextmanager
+async def warmup_running(path: Optional[str] = None) -> AsyncIterator[Optional[Warmer]]:
+    """
+    Keep the warm-up loop running for the duration of the block.
+
+    Args:
+        path: Watch-list file, defaults to the WEATHER_WARMUP_CONFIG environment variable
+
+    Yields:
+        The running warmer, or None if no watch-list is configured
+    """
+    warmer = await start_warmup(path)
+    try:
+        yield warmer
+    finally:
+        await stop_warmup()
@@ -1,39 +1,187 @@
 """Weather service for interacting with the National Weather Service API."""
 
+import asyncio
+import contextvars
+import hashlib
 import logging
-from typing import Dict, Any, Optional
+import os
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Any, Iterator, List, Optional, Tuple
 
-from ..utils.http import make_request
+from ..cache import encode, get_cache
+from ..utils.deadline import current_budget, mark_exhausted, skip_hop
+from ..utils.http import endpoint_name, make_request
+from .alert_index import AlertIndex
+from .alert_store import AlertStore
+from .station_index import Station, StationIndex, distance_km, parse_stations
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
 # Constants
-NWS_API_BASE = "https://api.weather.gov"
+NWS_API_BASE = os.environ.get("WEATHER_NWS_API_BASE", "https://api.weather.gov").rstrip(
+    "/"
+)
 
+# Cache lifetimes in seconds. Grid point metadata changes very rarely, while
+# alerts need to stay close to real time.
+POINT_TTL = 24 * 60 * 60
+FORECAST_TTL = 10 * 60
+ALERTS_TTL = 60
+OBSERVATION_TTL = 5 * 60
 
-async def get_weather_alerts(state: str) -> Optional[Dict[str, Any]]:
+# The station list is rebuilt daily; a cached copy stays usable for a week
+# so a restarted server can answer at once while it refreshes
+STATIONS_TTL = 24 * 60 * 60
+STATIONS_CACHE_TTL = 7 * 24 * 60 * 60
+STATIONS_CACHE_KEY = "stations:v1"
+STATIONS_PAGE_SIZE = 500
+MAX_STATION_PAGES = 200
+
+# Stations tried for an observation, and how far away they may be
+NEAREST_STATIONS = 3
+MAX_STATION_DISTANCE_KM = 150.0
+
+# Index over every active alert in the country, refreshed at most once per ALERTS_TTL
+_alert_index = AlertIndex()
+_alert_index_refreshed = 0.0
+_alert_index_lock = asyncio.Lock()
+
+# Index over every observation station, rebuilt in the background
+_station_index = StationIndex()
+_station_list_fetched = 0.0
+_station_index_lock = asyncio.Lock()
+_station_refresh: Optional[asyncio.Task] = None
+
+# Versions of each state's alerts, for get_alert_changes
+_alert_store = AlertStore()
+
+# Versions of the payloads read by the current call, while one is tracking them
+_payload_versions: ContextVar[Optional[List[Optional[str]]]] = ContextVar(
+    "weather_payload_versions", default=None
+)
+
+
+def payload_version(data: Any, encoded: Optional[str] = None) -> str:
+    """
+    Compute the version of an upstream payload from its content.
+
+    Args:
+        data: JSON payload
+        encoded: The payload encoded with cache.encode, if already done
+
+    Returns:
+        Short content hash
+    """
+    body = (encode(data) if encoded is None else encoded).encode("utf-8")
+    return hashlib.blake2b(body, digest_size=8).hexdigest()
+
+
+@contextmanager
+def payload_versions() -> Iterator[List[Optional[str]]]:
+    """
+    Collect the versions of the payloads read in the enclosed block.
+
+    A payload whose version is unknown is recorded as None.
+
+    Yields:
+        List the versions are appended to, in the order payloads are read
+    """
+    versions: List[Optional[str]] = []
+    token = _payload_versions.set(versions)
+    try:
+        yield versions
+    finally:
+        _payload_versions.reset(token)
+
+
+def _response_key(url: str) -> str:
+    return f"response:{url}"
+
+
+async def _cached_request(
+    url: str, ttl: float, refresh: bool = False
+) -> Optional[Dict[str, Any]]:
+    """
+    Fetch a URL through the response cache.
+
+    A cache hit counts as a hop of the current time budget that took no
+    time, so the remaining hops get a larger share. When a forced refresh
+    fails, for instance because the budget ran out, the cached response is
+    returned instead.
+
+    Every response is stored in one entry together with its
+    payload_version, so a payload is never read with the version of another
+    fetch. The version is reported to an enclosing payload_versions block,
+    and the entry is tagged with the response's endpoint
+    (such as '/alerts/active/area/{}'), so that every cached response from
+    one endpoint can be invalidated at once.
+
+    Args:
+        url: URL to fetch
+        ttl: Seconds to cache a successful response for
+        refresh: Fetch from upstream even if a cached response exists
+
+    Returns:
+        Response data or None if the request fails
+    """
+    cache = get_cache()
+    key = _response_key(url)
+    versions = _payload_versions.get()
+    if not refresh:
+        entry = await cache.get(key)
+        if entry is not None:
+            skip_hop()
+            if versions is not None:
+                versions.append(entry["version"])
+            return entry["data"]
+
+    data = await make_request(url, headers={"Accept": "application/geo+json"})
+    if data is not None:
+        # Encoded once per fetch, for both the version hash and the cache
+        encoded = encode(data)
+        version = payload_version(data, encoded)
+        await cache.set(
+            key,
+            {"data": data, "version": version},
+            ttl,
+            (endpoint_name(url),),
+            encoded=f'{{"data":{encoded},"version":"{version}"}}',
+        )
+    elif refresh:
+        entry = await cache.get(key)
+        data, version = (entry["data"], entry["version"]) if entry else (None, None)
+    if versions is not None and data is not None:
+        versions.append(version)
+    return data
+
+
+async def get_weather_alerts(
+    state: str, refresh: bool = False
+) -> Optional[Dict[str, Any]]:
     """
     Get active weather alerts for a state.
 
     Args:
         state: State code (e.g., 'CA', 'NY')
+        refresh: Bypass the cache and fetch fresh data
 
     Returns:
         Weather alerts data or None if the request fails
     """
     url = f"{NWS_API_BASE}/alerts/active/area/{state}"
-    headers = {"Accept": "application/geo+json"}
 
     try:
-        return await make_request(url, headers=headers)
+        return await _cached_request(url, ALERTS_TTL, refresh)
     except Exception as e:
-        logger.error(f"Error fetching alerts for {state}: {str(e)}")
+        logger.error("Error fetching alerts for %s: %s", state, e)
         return None
 
 
 async def get_weather_point(
-    latitude: float, longitude: float
+    latitude: float, longitude: float, refresh: bool = False
 ) -> Optional[Dict[str, Any]]:
     """
     Get weather point data for coordinates.
@@ -41,34 +189,327 @@ async def get_weather_point(
     Args:
         latitude: Latitude coordinate
         longitude: Longitude coordinate
+        refresh: Bypass the cache and fetch fresh data
 
     Returns:
         Weather point data or None if the request fails
     """
     url = f"{NWS_API_BASE}/points/{latitude},{longitude}"
-    headers = {"Accept": "application/geo+json"}
 
     try:
-        return await make_request(url, headers=headers)
+        return await _cached_request(url, POINT_TTL, refresh)
     except Exception as e:
-        logger.error(f"Error fetching point data for {latitude},{longitude}: {str(e)}")
+        logger.error("Error fetching point data for %s,%s: %s", latitude, longitude, e)
         return None
 
 
-async def get_weather_forecast(forecast_url: str) -> Optional[Dict[str, Any]]:
+async def get_weather_forecast(
+    forecast_url: str, refresh: bool = False
+) -> Optional[Dict[str, Any]]:
     """
     Get weather forecast data.
 
     Args:
         forecast_url: URL for the forecast endpoint
+        refresh: Bypass the cache and fetch fresh data
 
     Returns:
         Weather forecast data or None if the request fails
     """
-    headers = {"Accept": "application/geo+json"}
+    try:
+        return await _cached_request(forecast_url, FORECAST_TTL, refresh)
+    except Exception as e:
+        logger.error("Error fetching forecast data: %s", e)
+        return None
+
+
+async def get_gridpoint_data(
+    grid_url: str, refresh: bool = False
+) -> Optional[Dict[str, Any]]:
+    """
+    Get raw gridpoint forecast layers.
 
+    Args:
+        grid_url: URL for the gridpoint endpoint (the point's 'forecastGridData')
+        refresh: Bypass the cache and fetch fresh data
+
+    Returns:
+        Gridpoint data or None if the request fails
+    """
     try:
-        return await make_request(forecast_url, headers=headers)
+        return await _cached_request(grid_url, FORECAST_TTL, refresh)
     except Exception as e:
-        logger.error(f"Error fetching forecast data: {str(e)}")
+        logger.error("Error fetching gridpoint data: %s", e)
         return None
+
+
+async def refresh_alert_index() -> AlertIndex:
+    """
+    Refresh the national alert index if it is older than ALERTS_TTL.
+
+    If another call is already refreshing it, waits at most until the
+    current time budget runs out and then returns the index as it is.
+
+    Returns:
+        The alert index, possibly stale if the refresh failed
+    """
+    global _alert_index_refreshed
+    # Wait for a refresh in progress elsewhere no longer than this call's budget
+    budget = current_budget()
+    try:
+        async with asyncio.timeout(budget.remaining() if budget else None):
+            await _alert_index_lock.acquire()
+    except TimeoutError:
+        mark_exhausted()
+        return _alert_index
+
+    try:
+        if time.monotonic() - _alert_index_refreshed < ALERTS_TTL:
+            skip_hop()
+            return _alert_index
+
+        try:
+            data = await _cached_request(f"{NWS_API_BASE}/alerts/active", ALERTS_TTL)
+        except Exception as e:
+            logger.error("Error fetching active alerts: %s", e)
+            data = None
+
+        if data and "features" in data:
+            counts = _alert_index.update(data["features"])
+            _alert_index_refreshed = time.monotonic()
+            logger.info("Alert index refreshed: %s", counts)
+        return _alert_index
+    finally:
+        _alert_index_lock.release()
+
+
+def _zone_codes(point_data: Optional[Dict[str, Any]]) -> List[str]:
+    """
+    Extract the UGC zone codes a point lies in from its point metadata.
+
+    Args:
+        point_data: Weather point data, possibly None
+
+    Returns:
+        Zone codes such as 'KSZ009' and 'KSC201'
+    """
+    if not point_data:
+        return []
+    props = point_data.get("properties", {})
+    urls = [props.get(key) for key in ("forecastZone", "county", "fireWeatherZone")]
+    return [url.rstrip("/").rsplit("/", 1)[-1] for url in urls if url]
+
+
+async def get_alerts_for_point(
+    latitude: float, longitude: float
+) -> Optional[List[Dict[str, Any]]]:
+    """
+    Get the active alerts covering a coordinate.
+
+    Polygon alerts are matched against the point directly; zone-based alerts
+    are matched through the point's forecast zone and county codes.
+
+    Args:
+        latitude: Latitude coordinate
+        longitude: Longitude coordinate
+
+    Returns:
+        Matching alert features, or None if no alert data is available
+    """
+    index = await refresh_alert_index()
+    if not _alert_index_refreshed:
+        return None
+
+    point_data = await get_weather_point(latitude, longitude)
+    return index.lookup(latitude, longitude, _zone_codes(point_data))
+
+
+async def get_alert_changes(
+    state: str, since_token: str = ""
+) -> Optional[Dict[str, Any]]:
+    """
+    Get the alerts for a state that changed since an earlier call.
+
+    Args:
+        state: State code (e.g., 'CA', 'NY')
+        since_token: Token returned by the earlier call, or '' for every
+            active alert
+
+    Returns:
+        Changes and the token for the next call (see AlertStore.changes),
+        or None if the alerts could not be fetched
+    """
+    state = state.upper()
+    with payload_versions() as versions:
+        data = await get_weather_alerts(state)
+
+    if not data or "features" not in data:
+        return None
+
+    _alert_store.update(state, data["features"], versions[0] if versions else None)
+    return _alert_store.changes(state, since_token)
+
+
+async def fetch_station_list() -> Optional[List[Station]]:
+    """
+    Fetch every observation station, following the /stations pagination.
+
+    Returns:
+        Station records, or None if any page could not be fetched
+    """
+    url: Optional[str] = f"{NWS_API_BASE}/stations?limit={STATIONS_PAGE_SIZE}"
+    stations: List[Station] = []
+    for _ in range(MAX_STATION_PAGES):
+        data = await make_request(url, headers={"Accept": "application/geo+json"})
+        if not data or "features" not in data:
+            return None
+        stations.extend(parse_stations(data["features"]))
+        url = (data.get("pagination") or {}).get("next")
+        if not data["features"] or not url:
+            break
+    return stations
+
+
+async def _install_stations(stations: List[Station], fetched: float) -> None:
+    """Build an index over a station list off the event loop and swap it in."""
+    global _station_index, _station_list_fetched
+    _station_index = await asyncio.to_thread(StationIndex, stations)
+    _station_list_fetched = fetched
+    logger.info("Station index built over %s stations", len(stations))
+
+
+async def _refresh_stations() -> None:
+    """Fetch the station list, cache it and rebuild the index from it."""
+    try:
+        stations = await fetch_station_list()
+        if not stations:
+            logger.warning("Station list could not be fetched")
+            return
+        fetched = time.time()
+        await get_cache().set(
+            STATIONS_CACHE_KEY,
+            {"fetched": fetched, "stations": stations},
+            STATIONS_CACHE_TTL,
+        )
+        await _install_stations(stations, fetched)
+    except Exception as e:
+        logger.error("Error refreshing station index: %s", e)
+
+
+def _start_station_refresh() -> None:
+    """Start refreshing the station index in the background, unless already."""
+    global _station_refresh
+    if _station_refresh is not None and not _station_refresh.done():
+        return
+    # A fresh context, so the refresh does not run under the calling tool's
+    # time budget or get reported as one of its payloads
+    _station_refresh = asyncio.create_task(
+        _refresh_stations(), context=contextvars.Context()
+    )
+
+
+async def get_station_index() -> StationIndex:
+    """
+    Get the station index, starting a background refresh when it is stale.
+
+    On first use the index is built from the cached station list, if there
+    is one. Callers never wait for the station list to be fetched; until
+    the first refresh completes, the index may be empty.
+
+    Returns:
+        The station index, possibly empty or stale
+    """
+    if not _station_list_fetched:
+        async with _station_index_lock:
+            if not _station_list_fetched:
+                cached = await get_cache().get(STATIONS_CACHE_KEY)
+                if cached and cached.get("stations"):
+                    stations = [tuple(station) for station in cached["stations"]]
+                    await _install_stations(stations, cached["fetched"])
+
+    if time.time() - _station_list_fetched > STATIONS_TTL:
+        _start_station_refresh()
+    return _station_index
+
+
+async def _point_stations(
+    latitude: float, longitude: float
+) -> List[Tuple[Station, float]]:
+    """
+    Find nearby stations through the point's station list.
+
+    Used until the station index has been built: it costs two upstream hops
+    that the index saves.
+
+    Args:
+        latitude: Latitude coordinate
+        longitude: Longitude coordinate
+
+    Returns:
+        Up to NEAREST_STATIONS (station, distance in km) pairs, nearest first
+    """
+    point_data = await get_weather_point(latitude, longitude)
+    url = point_data and point_data["properties"].get("observationStations")
+    if not url:
+        return []
+    data = await _cached_request(url, POINT_TTL)
+    if not data or "features" not in data:
+        return []
+    found = [
+        (station, distance_km(latitude, longitude, station[2], station[3]))
+        for station in parse_stations(data["features"])
+    ]
+    return sorted(found, key=lambda pair: pair[1])[:NEAREST_STATIONS]
+
+
+async def get_current_conditions(
+    latitude: float, longitude: float
+) -> Optional[Dict[str, Any]]:
+    """
+    Get the latest observation from the nearest reporting station.
+
+    Stations are found in the local station index, so a call normally makes
+    one upstream request, for the observation. A station whose latest
+    observation lacks a temperature is passed over for the next nearest.
+
+    Args:
+        latitude: Latitude coordinate
+        longitude: Longitude coordinate
+
+    Returns:
+        Dictionary with the 'station' record, its 'distance_km' and the
+        'observation' properties; None if no station is near enough or no
+        observation could be fetched
+    """
+    budget = current_budget()
+    index = await get_station_index()
+    if len(index):
+        candidates = index.nearest(latitude, longitude, NEAREST_STATIONS)
+    else:
+        candidates = await _point_stations(latitude, longitude)
+
+    fallback = None
+    for station, distance in candidates:
+        if distance > MAX_STATION_DISTANCE_KM:
+            break
+        try:
+            data = await _cached_request(
+                f"{NWS_API_BASE}/stations/{station[0]}/observations/latest",
+                OBSERVATION_TTL,
+            )
+        except Exception as e:
+            logger.error("Error fetching observation for %s: %s", station[0], e)
+            data = None
+        if not data or "properties" not in data:
+            if budget and budget.exhausted:
+                break
+            continue
+        result = {
+            "station": station,
+            "distance_km": distance,
+            "observation": data["properties"],
+        }
+        if (data["properties"].get("temperature") or {}).get("value") is not None:
+            return result
+        fallback = fallback or result
+    return fallback
@@ -0,0 +1,139 @@
+"""Startup import-time measurement.
+
+Runs a fresh interpreter with ``-X importtime``, reports where import time is
+spent, and flags regressions: a total import time above a threshold, or a
+module that is meant to load lazily being imported at startup.
+"""
+
+import os
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Any, Dict, List
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+DEFAULT_MODULE = "src.weather.server"
+DEFAULT_THRESHOLD_MS = float(os.environ.get("WEATHER_STARTUP_THRESHOLD_MS", "1000"))
+
+# Modules that should only load on first tool use
+LAZY_MODULES = (
+    "psutil",
+    "sqlite3",
+    "src.weather.services",
+    "src.weather.utils",
+)
+
+
+def parse_importtime(output: str) -> List[Dict[str, Any]]:
+    """
+    Parse ``-X importtime`` output.
+
+    Args:
+        output: stderr of an interpreter run with ``-X importtime``
+
+    Returns:
+        One entry per imported module with self and cumulative time in microseconds
+    """
+    entries = []
+    for line in output.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:") :].split("|", 2)
+        entries.append(
+            {
+                "module": name.strip(),
+                "depth": (len(name) - len(name.lstrip()) - 1) // 2,
+                "self_us": int(self_us),
+                "cumulative_us": int(cumulative_us),
+            }
+        )
+    return entries
+
+
+def measure_startup(module: str = DEFAULT_MODULE) -> Dict[str, Any]:
+    """
+    Measure the import cost of a module in a fresh interpreter.
+
+    Args:
+        module: Module to import
+
+    Returns:
+        Dictionary with total import time, wall time, per-module entries and
+        any lazily-loaded modules that were imported eagerly
+    """
+    code = f"import sys, {module}; print('\\n'.join(sys.modules))"
+    start = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+        cwd=PROJECT_ROOT,
+    )
+    wall_ms = (time.perf_counter() - start) * 1000
+
+    entries = parse_importtime(result.stderr)
+    loaded = set(result.stdout.split())
+    total_us = next(
+        (e["cumulative_us"] for e in reversed(entries) if e["module"] == module), 0
+    )
+    eager = sorted(name for name in loaded if name.startswith(LAZY_MODULES))
+    return {
+        "module": module,
+        "import_ms": total_us / 1000,
+        "wall_ms": wall_ms,
+        "modules": entries,
+        "eager": eager,
+    }
+
+
+def report_startup(
+    module: str = DEFAULT_MODULE,
+    threshold_ms: float = DEFAULT_THRESHOLD_MS,
+    top: int = 15,
+) -> int:
+    """
+    Print a startup import-time report and check it against the threshold.
+
+    Args:
+        module: Module to import
+        threshold_ms: Maximum acceptable import time in milliseconds
+        top: Number of modules and packages to list
+
+    Returns:
+        Process exit code: 0 when within budget, 1 on a regression
+    """
+    measurement = measure_startup(module)
+    entries = measurement["modules"]
+
+    by_package: Dict[str, int] = defaultdict(int)
+    for entry in entries:
+        by_package[entry["module"].split(".")[0]] += entry["self_us"]
+
+    print(f"Slowest modules by self time importing {module}:")
+    for entry in sorted(entries, key=lambda e: e["self_us"], reverse=True)[:top]:
+        print(f"  {entry['self_us'] / 1000:8.1f} ms  {entry['module']}")
+
+    print("Import time by top-level package:")
+    for package, self_us in sorted(
+        by_package.items(), key=lambda item: item[1], reverse=True
+    )[:top]:
+        print(f"  {self_us / 1000:8.1f} ms  {package}")
+
+    print(
+        f"Total import time: {measurement['import_ms']:.1f} ms "
+        f"(threshold {threshold_ms:.0f} ms, interpreter wall time {measurement['wall_ms']:.1f} ms)"
+    )
+
+    failed = False
+    if measurement["eager"]:
+        print("Modules that should load lazily were imported at startup:")
+        for name in measurement["eager"]:
+            print(f"  {name}")
+        failed = True
+    if measurement["import_ms"] > threshold_ms:
+        print("Startup import time exceeds the threshold")
+        failed = True
+    return 1 if failed else 0
@@ -4,12 +4,20 @@ from .weather_tools import register_tools as register_weather_tools
 from .system_tools import register_tools as register_system_tools
 
 
-def register_all_tools(server):
+# Groups of tools a server can be built with
+FEATURES = ("weather", "system")
+
+
+def register_all_tools(server, features=FEATURES):
     """
-    Register all tools with the server.
+    Register all tools of the selected feature groups with the server.
 
     Args:
         server: MCP server instance
+        features: Feature groups: 'weather' (NWS tools) and 'system'
+            (shell commands)
     """
-    register_weather_tools(server)
-    register_system_tools(server)
+    if "weather" in features:
+        register_weather_tools(server)
+    if "system" in features:
+        register_system_tools(server)
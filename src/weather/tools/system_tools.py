@@ -1,8 +1,6 @@
 """System tools for the MCP server."""
 
 import logging
-from ..services.system_service import run_shell_command as service_run_shell_command
-
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -27,9 +25,15 @@ def register_tools(server):
         Returns:
             Command output or error message
         """
-        result = service_run_shell_command(command)
+        from ..services.system_service import (
+            run_shell_command as service_run_shell_command,
+        )
+
+        result = await service_run_shell_command(command)
 
         if result["success"]:
             return result["stdout"]
+        elif result.get("timed_out"):
+            return f"Error: {result['stderr']}\nOutput so far:\n{result['stdout']}"
         else:
             return f"Error: {result['stderr']}"
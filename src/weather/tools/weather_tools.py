@@ -1,18 +1,123 @@
-"""Weather tools for the MCP server."""
+"""Weather tools for the MCP server.
 
-import logging
+Services and formatting helpers are imported inside the tools so that they
+load on first use rather than while the server is starting up.
+"""
 
-from ..services.weather_service import (
-    get_weather_alerts,
-    get_weather_point,
-    get_weather_forecast,
+import logging
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    Hashable,
+    List,
+    Optional,
+    Tuple,
 )
-from ..utils.formatting import format_alert, format_forecast
+
+if TYPE_CHECKING:
+    from ..utils.deadline import Budget
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
 
+def _location_tz(points_data: Dict[str, Any]) -> Optional[Any]:
+    """
+    Get the time zone of a point, if it is known on this system.
+
+    Args:
+        points_data: Weather point data
+
+    Returns:
+        Time zone, or None to keep the forecast's own offsets
+    """
+    from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+    name = points_data["properties"].get("timeZone")
+    try:
+        return ZoneInfo(name) if name else None
+    except (ZoneInfoNotFoundError, ValueError):
+        return None
+
+
+def _unavailable(message: str, budget: "Budget") -> str:
+    """
+    Explain a failed fetch, noting when the call ran out of time.
+
+    Args:
+        message: Error message
+        budget: Time budget of the call
+
+    Returns:
+        Error message for the client
+    """
+    if budget.exhausted:
+        return f"{message} The request ran out of time; please try again."
+    return message
+
+
+def _memoized(key: Optional[Tuple[Hashable, ...]], build: Callable[[], str]) -> str:
+    """
+    Get formatted output from the output cache, building it on a miss.
+
+    Args:
+        key: Key from cache.output_key, or None to always build
+        build: Function producing the output
+
+    Returns:
+        Output text
+    """
+    from ..cache import get_output_cache
+
+    outputs = get_output_cache()
+    text = outputs.get(key)
+    return text if text is not None else outputs.set(key, build())
+
+
+def _alert_page(
+    features: List[Dict[str, Any]], cursor: str, max_results: int, max_chars: int
+) -> str:
+    """
+    Format one page of alerts, most severe and soonest first.
+
+    Args:
+        features: Every alert feature
+        cursor: Cursor from the previous page, or '' for the first page
+        max_results: Maximum number of alerts on the page
+        max_chars: Maximum length of the formatted alerts
+
+    Returns:
+        Formatted alerts, followed by the cursor for the next page if there
+        is one, or error message
+    """
+    from ..utils.formatting import format_alert
+    from ..utils.paging import (
+        MAX_CHARS_LIMIT,
+        MAX_RESULTS_LIMIT,
+        alert_sort_key,
+        page_footer,
+        paginate,
+    )
+
+    try:
+        page = paginate(
+            features,
+            alert_sort_key,
+            format_alert,
+            cursor,
+            max(1, min(max_results, MAX_RESULTS_LIMIT)),
+            max(1, min(max_chars, MAX_CHARS_LIMIT)),
+        )
+    except ValueError:
+        return "Invalid cursor; call again without one to start from the first page."
+
+    if not page["entries"]:
+        return "No more alerts."
+    return "\n".join(page["entries"]) + page_footer(page)
+
+
 def register_tools(server):
     """
     Register all weather tools with the server.
@@ -22,26 +127,160 @@ def register_tools(server):
     """
 
     @server.tool()
-    async def get_alerts(state: str) -> str:
+    async def get_alerts(
+        state: str,
+        cursor: str = "",
+        max_results: int = 20,
+        max_chars: int = 20_000,
+    ) -> str:
         """
-        Get active weather alerts for a state.
+        Get active weather alerts for a state, most severe first.
 
         Args:
             state: Two-letter state code (e.g., 'CA', 'NY')
+            cursor: Cursor returned with the previous page, for the next page
+            max_results: Maximum number of alerts to return (1-100)
+            max_chars: Maximum length of the returned alerts
 
         Returns:
-            Formatted alerts or error message
+            Formatted alerts, with a cursor for the next page when more
+            alerts are active, or error message
         """
-        data = await get_weather_alerts(state)
+        from ..cache import output_key
+        from ..services.weather_service import get_weather_alerts, payload_versions
+        from ..utils.deadline import deadline
+
+        with deadline() as budget, payload_versions() as versions:
+            data = await get_weather_alerts(state)
 
         if not data or "features" not in data:
-            return "Unable to fetch alerts or no alerts found."
+            return _unavailable("Unable to fetch alerts or no alerts found.", budget)
 
         if not data["features"]:
             return "No active alerts for this state."
 
-        alerts = [format_alert(feature) for feature in data["features"]]
-        return "\n".join(alerts)
+        return _memoized(
+            output_key(
+                "get_alerts",
+                {
+                    "state": state.upper(),
+                    "cursor": cursor,
+                    "max_results": max_results,
+                    "max_chars": max_chars,
+                },
+                versions,
+            ),
+            lambda: _alert_page(data["features"], cursor, max_results, max_chars),
+        )
+
+    @server.tool()
+    async def get_alert_changes(state: str, since_token: str = "") -> str:
+        """
+        Get the weather alerts for a state that changed since a previous call.
+
+        Pass the token returned by the previous call to get only the alerts
+        that are new, updated or expired since then. Without a token, every
+        active alert is returned.
+
+        Args:
+            state: Two-letter state code (e.g., 'CA', 'NY')
+            since_token: Token returned by the previous call
+
+        Returns:
+            Changed alerts followed by the token for the next call, or
+            error message
+        """
+        from ..services.weather_service import get_alert_changes as find_changes
+        from ..utils.deadline import deadline
+        from ..utils.formatting import format_alert_changes
+
+        with deadline() as budget:
+            changes = await find_changes(state, since_token)
+
+        if changes is None:
+            return _unavailable("Unable to fetch alerts for this state.", budget)
+
+        return format_alert_changes(changes, since_token)
+
+    @server.tool()
+    async def get_alerts_for_point(
+        latitude: float,
+        longitude: float,
+        cursor: str = "",
+        max_results: int = 20,
+        max_chars: int = 20_000,
+    ) -> str:
+        """
+        Get active weather alerts covering a specific location, most severe first.
+
+        Args:
+            latitude: Latitude coordinate
+            longitude: Longitude coordinate
+            cursor: Cursor returned with the previous page, for the next page
+            max_results: Maximum number of alerts to return (1-100)
+            max_chars: Maximum length of the returned alerts
+
+        Returns:
+            Formatted alerts, with a cursor for the next page when more
+            alerts are active, or error message
+        """
+        from ..services.weather_service import get_alerts_for_point as find_alerts
+        from ..utils.deadline import deadline
+
+        # The national alert index and the point's zones
+        with deadline(hops=2) as budget:
+            features = await find_alerts(latitude, longitude)
+
+        if features is None:
+            return _unavailable(
+                "Unable to fetch alerts for the specified location.", budget
+            )
+
+        # Alerts found with a stale index or without the point's zones
+        note = (
+            "\n\nNote: some alert data could not be fetched in time; "
+            "this list may be incomplete."
+            if budget.exhausted
+            else ""
+        )
+
+        if not features:
+            return "No active alerts for this location." + note
+
+        return _alert_page(features, cursor, max_results, max_chars) + note
+
+    @server.tool()
+    async def get_current_conditions(latitude: float, longitude: float) -> str:
+        """
+        Get the current weather observed at the station nearest to coordinates.
+
+        Args:
+            latitude: Latitude coordinate
+            longitude: Longitude coordinate
+
+        Returns:
+            Formatted observation or error message
+        """
+        from ..services.weather_service import (
+            get_current_conditions as find_conditions,
+        )
+        from ..utils.deadline import deadline
+        from ..utils.formatting import format_observation
+
+        # The observation, with time to try the next station
+        with deadline(hops=2) as budget:
+            conditions = await find_conditions(latitude, longitude)
+
+        if conditions is None:
+            return _unavailable(
+                "Unable to fetch current conditions for the specified location.",
+                budget,
+            )
+
+        time_zone = conditions["station"][4]
+        return format_observation(
+            conditions, _location_tz({"properties": {"timeZone": time_zone}})
+        )
 
     @server.tool()
     async def get_forecast(latitude: float, longitude: float) -> str:
@@ -55,20 +294,185 @@ def register_tools(server):
         Returns:
             Formatted forecast or error message
         """
-        points_data = await get_weather_point(latitude, longitude)
+        from ..cache import output_key
+        from ..services.weather_service import (
+            get_weather_forecast,
+            get_weather_point,
+            payload_versions,
+        )
+        from ..utils.deadline import deadline
+        from ..utils.formatting import format_forecast
+
+        with deadline(hops=2) as budget, payload_versions() as versions:
+            points_data = await get_weather_point(latitude, longitude)
 
-        if not points_data:
-            return "Unable to fetch forecast data for the specified location."
+            if not points_data:
+                return _unavailable(
+                    "Unable to fetch forecast data for the specified location.", budget
+                )
 
-        forecast_url = points_data["properties"]["forecast"]
-        forecast_data = await get_weather_forecast(forecast_url)
+            forecast_url = points_data["properties"]["forecast"]
+            forecast_data = await get_weather_forecast(forecast_url)
 
         if not forecast_data:
-            return "Unable to fetch detailed forecast data."
+            return _unavailable("Unable to fetch detailed forecast data.", budget)
 
         periods = forecast_data["properties"]["periods"]
-        forecasts = [
-            format_forecast(period) for period in periods[:5]
-        ]  # Only show next 5 periods
+        return _memoized(
+            output_key("get_forecast", {}, versions),
+            # Only show next 5 periods
+            lambda: "\n---\n".join(format_forecast(period) for period in periods[:5]),
+        )
+
+    @server.tool()
+    async def get_forecast_by_place(place: str) -> str:
+        """
+        Get weather forecast for a US place by name.
+
+        Args:
+            place: City or town, optionally with its state (e.g. 'Boulder, CO')
+
+        Returns:
+            Formatted forecast or error message
+        """
+        from ..services.gazetteer import get_gazetteer
+
+        found = get_gazetteer().resolve(place)
+        if found is None:
+            return f"Unable to find a US place matching '{place}'."
+
+        forecast = await get_forecast(found.latitude, found.longitude)
+        return (
+            f"Forecast for {found.name}, {found.state} "
+            f"({found.latitude:.4f}, {found.longitude:.4f}):\n{forecast}"
+        )
+
+    @server.tool()
+    async def get_hourly_forecast(
+        latitude: float, longitude: float, hours: int = 48
+    ) -> str:
+        """
+        Get a summary of the hourly forecast for coordinates.
+
+        Args:
+            latitude: Latitude coordinate
+            longitude: Longitude coordinate
+            hours: Number of hours to summarize (1-156)
+
+        Returns:
+            Forecast digest with temperature range, freezing crossings,
+            rain windows and peak wind, or error message
+        """
+        from ..cache import output_key
+        from ..services.weather_service import (
+            get_weather_forecast,
+            get_weather_point,
+            payload_versions,
+        )
+        from ..utils.deadline import deadline
+        from ..utils.formatting import format_forecast_digest
+        from ..utils.timeseries import decode_hourly, summarize
+
+        with deadline(hops=2) as budget, payload_versions() as versions:
+            points_data = await get_weather_point(latitude, longitude)
+
+            if not points_data:
+                return _unavailable(
+                    "Unable to fetch forecast data for the specified location.", budget
+                )
+
+            forecast_data = await get_weather_forecast(
+                points_data["properties"]["forecastHourly"]
+            )
+
+        if not forecast_data or not forecast_data["properties"].get("periods"):
+            return _unavailable("Unable to fetch hourly forecast data.", budget)
+
+        hours = max(1, min(hours, 156))
+
+        def build() -> str:
+            start, series = decode_hourly(forecast_data["properties"]["periods"], hours)
+            return format_forecast_digest(
+                summarize(start, series), _location_tz(points_data)
+            )
+
+        return _memoized(
+            output_key("get_hourly_forecast", {"hours": hours}, versions), build
+        )
+
+    @server.tool()
+    async def get_gridpoint_forecast(
+        latitude: float, longitude: float, days: int = 7
+    ) -> str:
+        """
+        Get a summary of the raw gridpoint forecast for coordinates.
+
+        Includes quantitative precipitation and wind gusts, which the
+        period forecasts do not report.
+
+        Args:
+            latitude: Latitude coordinate
+            longitude: Longitude coordinate
+            days: Number of days to summarize (1-7)
+
+        Returns:
+            Forecast digest with temperature range, freezing crossings,
+            rain windows, total precipitation and peak wind, or error message
+        """
+        from ..cache import output_key
+        from ..services.weather_service import (
+            get_gridpoint_data,
+            get_weather_point,
+            payload_versions,
+        )
+        from ..utils.deadline import deadline
+        from ..utils.formatting import format_forecast_digest
+        from ..utils.timeseries import decode_layer, series_start, summarize
+
+        with deadline(hops=2) as budget, payload_versions() as versions:
+            points_data = await get_weather_point(latitude, longitude)
+
+            if not points_data:
+                return _unavailable(
+                    "Unable to fetch forecast data for the specified location.", budget
+                )
+
+            grid_data = await get_gridpoint_data(
+                points_data["properties"]["forecastGridData"]
+            )
+
+        if not grid_data or "validTimes" not in grid_data.get("properties", {}):
+            return _unavailable("Unable to fetch gridpoint forecast data.", budget)
+
+        props = grid_data["properties"]
+        start = series_start(props["validTimes"])
+        hours = max(1, min(days, 7)) * 24
+        layers = {
+            "temperature": "temperature",
+            "precipitation": "probabilityOfPrecipitation",
+            "wind": "windSpeed",
+            "gust": "windGust",
+            "amount": "quantitativePrecipitation",
+        }
+
+        def build() -> str:
+            series = {
+                name: decode_layer(
+                    props[layer], start, hours, accumulated=name == "amount"
+                )[0]
+                for name, layer in layers.items()
+                if layer in props
+            }
+            return format_forecast_digest(
+                summarize(start, series), _location_tz(points_data)
+            )
 
-        return "\n---\n".join(forecasts)
+        # The summary window starts at the current hour
+        return _memoized(
+            output_key(
+                "get_gridpoint_forecast",
+                {"hours": hours, "start": start.isoformat()},
+                versions,
+            ),
+            build,
+        )
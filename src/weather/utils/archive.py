@@ -0,0 +1,210 @@
+"""Record and replay of upstream HTTP responses.
+
+With ``WEATHER_HTTP_MODE=record`` every successful response fetched by
+make_request is also written to a local archive; with
+``WEATHER_HTTP_MODE=replay`` responses are served from the archive and the
+network is never touched. The archive lives in ``WEATHER_ARCHIVE_DIR``
+(default ``~/.cache/weather-mcp/archive``) and holds one gzip-compressed
+JSON file per response plus an append-only ``index.jsonl``.
+
+Entries are keyed by path and query string only, so an archive recorded
+against api.weather.gov also replays behind any other base URL.
+"""
+
+import asyncio
+import gzip
+import hashlib
+import json
+import logging
+import os
+import random
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+from urllib.parse import urlencode, urlsplit
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+MODES = ("live", "record", "replay")
+DEFAULT_ARCHIVE_DIR = Path.home() / ".cache" / "weather-mcp" / "archive"
+INDEX_FILE = "index.jsonl"
+
+_archive: Optional["ResponseArchive"] = None
+
+
+def http_mode() -> str:
+    """
+    Get the configured HTTP mode.
+
+    Returns:
+        'live', 'record' or 'replay'
+    """
+    mode = os.environ.get("WEATHER_HTTP_MODE", "live").lower()
+    if mode not in MODES:
+        logger.warning("Unknown WEATHER_HTTP_MODE %r, using live", mode)
+        return "live"
+    return mode
+
+
+def archive_key(url: str, params: Optional[Dict[str, Any]] = None) -> str:
+    """
+    Build the archive key for a request.
+
+    Args:
+        url: Request URL
+        params: Optional query parameters
+
+    Returns:
+        Path and sorted query string, without scheme or host
+    """
+    parts = urlsplit(url)
+    query = [item for item in parts.query.split("&") if item]
+    if params:
+        query += urlencode(sorted(params.items())).split("&")
+    key = parts.path or "/"
+    return f"{key}?{'&'.join(sorted(query))}" if query else key
+
+
+class ResponseArchive:
+    """
+    Directory of gzip-compressed JSON responses with an append-only index.
+
+    Re-recording a key appends a new index line that supersedes the old one,
+    so the index can be written by several processes without rewriting it.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = Path(directory)
+        self._index: Optional[Dict[str, Dict[str, Any]]] = None
+        self._lock = threading.Lock()
+
+    def _load_index(self) -> Dict[str, Dict[str, Any]]:
+        if self._index is None:
+            index = {}
+            path = self.directory / INDEX_FILE
+            if path.exists():
+                with open(path, encoding="utf-8") as f:
+                    for line in f:
+                        if line.strip():
+                            entry = json.loads(line)
+                            index[entry["key"]] = entry
+            self._index = index
+        return self._index
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._load_index())
+
+    def __contains__(self, key: str) -> bool:
+        with self._lock:
+            return key in self._load_index()
+
+    def save(self, key: str, data: Any) -> Dict[str, Any]:
+        """
+        Write a response to the archive.
+
+        Args:
+            key: Archive key from archive_key
+            data: JSON response body
+
+        Returns:
+            The index entry written
+        """
+        body = json.dumps(data, separators=(",", ":")).encode("utf-8")
+        name = hashlib.sha1(key.encode("utf-8")).hexdigest() + ".json.gz"
+        entry = {
+            "key": key,
+            "file": name,
+            "size": len(body),
+            "recorded_at": time.time(),
+        }
+        with self._lock:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            tmp = self.directory / f".{name}.{os.getpid()}"
+            tmp.write_bytes(gzip.compress(body, compresslevel=6))
+            os.replace(tmp, self.directory / name)
+            with open(self.directory / INDEX_FILE, "a", encoding="utf-8") as f:
+                f.write(json.dumps(entry) + "\n")
+            self._load_index()[key] = entry
+        return entry
+
+    def load(self, key: str) -> Optional[Any]:
+        """
+        Read a response from the archive.
+
+        Args:
+            key: Archive key from archive_key
+
+        Returns:
+            The recorded JSON body, or None if the key was never recorded
+        """
+        with self._lock:
+            entry = self._load_index().get(key)
+        if entry is None:
+            return None
+        body = gzip.decompress((self.directory / entry["file"]).read_bytes())
+        return json.loads(body)
+
+    async def record(
+        self, url: str, params: Optional[Dict[str, Any]], data: Any
+    ) -> None:
+        """
+        Record a live response.
+
+        Args:
+            url: Request URL
+            params: Optional query parameters
+            data: JSON response body
+        """
+        try:
+            await asyncio.to_thread(self.save, archive_key(url, params), data)
+        except OSError as e:
+            logger.error("Error recording response for %s: %s", url, e)
+
+    async def replay(
+        self, url: str, params: Optional[Dict[str, Any]] = None
+    ) -> Optional[Any]:
+        """
+        Serve a recorded response, with the configured simulated latency.
+
+        Latency is WEATHER_REPLAY_LATENCY_MS plus or minus up to
+        WEATHER_REPLAY_JITTER_MS milliseconds.
+
+        Args:
+            url: Request URL
+            params: Optional query parameters
+
+        Returns:
+            The recorded JSON body, or None if it was never recorded
+        """
+        latency = float(os.environ.get("WEATHER_REPLAY_LATENCY_MS", "0"))
+        jitter = float(os.environ.get("WEATHER_REPLAY_JITTER_MS", "0"))
+        delay = latency + random.uniform(-jitter, jitter)
+        if delay > 0:
+            await asyncio.sleep(delay / 1000)
+
+        key = archive_key(url, params)
+        try:
+            data = await asyncio.to_thread(self.load, key)
+        except (OSError, ValueError) as e:
+            logger.error("Error replaying response for %s: %s", key, e)
+            return None
+        if data is None:
+            logger.warning("No recorded response for %s", key)
+        return data
+
+
+def get_archive() -> ResponseArchive:
+    """
+    Get the process-wide response archive, creating it on first use.
+
+    Returns:
+        Archive in WEATHER_ARCHIVE_DIR
+    """
+    global _archive
+    directory = os.environ.get("WEATHER_ARCHIVE_DIR", str(DEFAULT_ARCHIVE_DIR))
+    if _archive is None or str(_archive.directory) != str(Path(directory)):
+        _archive = ResponseArchive(directory)
+    return _archive
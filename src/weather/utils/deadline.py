@@ -0,0 +1,143 @@
+"""Per-call time budgets shared by every upstream hop of a tool invocation.
+
+A tool opens a budget with ``deadline(hops=...)``. The budget lives in a
+context variable, so every request made while handling the call, however
+deep in the service layer, sees it without it being passed around. Each
+hop takes an even share of the time left for the hops still to come: a
+slow first hop cannot starve the ones after it, and time left over by a
+fast hop (or a cache hit) carries over to the next.
+
+Cancellation needs no bookkeeping here: when an MCP client cancels a
+request the tool's task is cancelled, which aborts the pending httpx
+request or subprocess wait it is suspended in.
+"""
+
+import os
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, Optional
+
+# Seconds a tool invocation may spend on upstream requests
+DEFAULT_BUDGET = float(os.environ.get("WEATHER_TOOL_BUDGET", "20"))
+
+# Timeout of a single hop made outside any budget (e.g. by cache warm-up)
+MAX_HOP_TIMEOUT = 30.0
+
+
+class DeadlineExceeded(Exception):
+    """Raised when a call's time budget has run out before a hop starts."""
+
+
+class Budget:
+    """
+    Time remaining for one tool invocation and the hops it still has to make.
+
+    Attributes:
+        expires_at: Monotonic time the budget runs out at
+        hops: Number of hops still expected, including the next one
+        exhausted: Whether a hop was skipped or cut short for lack of time
+    """
+
+    def __init__(self, seconds: float, hops: int = 1):
+        self.expires_at = time.monotonic() + seconds
+        self.hops = max(1, hops)
+        self.exhausted = False
+
+    def remaining(self) -> float:
+        """
+        Get the time left in the budget.
+
+        Returns:
+            Seconds remaining, never negative
+        """
+        return max(0.0, self.expires_at - time.monotonic())
+
+    def next_hop(self) -> float:
+        """
+        Start the next hop and get its timeout.
+
+        Returns:
+            Seconds the hop may take
+
+        Raises:
+            DeadlineExceeded: If no time is left
+        """
+        remaining = self.remaining()
+        if remaining <= 0:
+            self.exhausted = True
+            raise DeadlineExceeded("time budget exhausted")
+        share = remaining / self.hops
+        self.hops = max(1, self.hops - 1)
+        return min(share, MAX_HOP_TIMEOUT)
+
+    def skip_hop(self) -> None:
+        """Count a hop that needed no request, e.g. a cache hit."""
+        self.hops = max(1, self.hops - 1)
+
+
+_budget: ContextVar[Optional[Budget]] = ContextVar("weather_budget", default=None)
+
+
+@contextmanager
+def deadline(seconds: Optional[float] = None, hops: int = 1) -> Iterator[Budget]:
+    """
+    Run the enclosed block under a time budget.
+
+    A budget opened inside another never outlasts the outer one.
+
+    Args:
+        seconds: Length of the budget, defaults to DEFAULT_BUDGET
+            (set with the WEATHER_TOOL_BUDGET environment variable)
+        hops: Number of dependent upstream requests the block expects to make
+
+    Yields:
+        The budget
+    """
+    budget = Budget(DEFAULT_BUDGET if seconds is None else seconds, hops)
+    outer = _budget.get()
+    if outer is not None:
+        budget.expires_at = min(budget.expires_at, outer.expires_at)
+    token = _budget.set(budget)
+    try:
+        yield budget
+    finally:
+        _budget.reset(token)
+
+
+def current_budget() -> Optional[Budget]:
+    """
+    Get the budget of the current call.
+
+    Returns:
+        The innermost open budget, or None outside any budget
+    """
+    return _budget.get()
+
+
+def hop_timeout() -> float:
+    """
+    Start a hop under the current budget and get its timeout.
+
+    Returns:
+        Seconds the hop may take, MAX_HOP_TIMEOUT outside any budget
+
+    Raises:
+        DeadlineExceeded: If the current budget has run out
+    """
+    budget = _budget.get()
+    return MAX_HOP_TIMEOUT if budget is None else budget.next_hop()
+
+
+def skip_hop() -> None:
+    """Count a hop that needed no request against the current budget."""
+    budget = _budget.get()
+    if budget is not None:
+        budget.skip_hop()
+
+
+def mark_exhausted() -> None:
+    """Record that a hop of the current call was cut short by its timeout."""
+    budget = _budget.get()
+    if budget is not None:
+        budget.exhausted = True
@@ -1,6 +1,7 @@
 """Formatting utilities for weather data."""
 
-from typing import Dict, Any
+from datetime import datetime, tzinfo
+from typing import Dict, Any, Optional
 
 
 def format_alert(feature: Dict[str, Any]) -> str:
@@ -40,3 +41,172 @@ def format_forecast(period: Dict[str, Any]) -> str:
     Wind: {period['windSpeed']} {period['windDirection']}
     Forecast: {period['detailedForecast']}
     """
+
+
+def format_alert_changes(changes: Dict[str, Any], since_token: str = "") -> str:
+    """
+    Format the alert changes since a token into a readable string.
+
+    Args:
+        changes: Changes from AlertStore.changes
+        since_token: The token the changes were requested for
+
+    Returns:
+        Formatted changes, ending with the token for the next call
+    """
+    sections = []
+    if changes["resync"]:
+        sections.append("Token not recognized; showing every active alert.")
+
+    for label, features in (("New", changes["new"]), ("Updated", changes["updated"])):
+        if features:
+            sections.append(
+                f"{label} alerts ({len(features)}):\n"
+                + "\n".join(format_alert(feature) for feature in features)
+            )
+
+    if changes["expired"]:
+        sections.append(
+            f"Expired alerts ({len(changes['expired'])}):\n"
+            + "\n".join(
+                f"    {event} ({area})" for _, event, area in changes["expired"]
+            )
+        )
+
+    if not (changes["new"] or changes["updated"] or changes["expired"]):
+        sections.append(
+            "No changes since the last call."
+            if since_token and not changes["resync"]
+            else "No active alerts for this state."
+        )
+
+    sections.append(f"Token: {changes['token']}")
+    return "\n\n".join(sections)
+
+
+def _format_time(value: datetime, tz: Optional[tzinfo]) -> str:
+    """Format a digest timestamp in the location's time zone."""
+    return (
+        value.astimezone(tz).strftime("%a %d %b %H:%M")
+        if tz
+        else value.strftime("%a %d %b %H:%M %z")
+    )
+
+
+def format_forecast_digest(digest: Dict[str, Any], tz: Optional[tzinfo] = None) -> str:
+    """
+    Format a forecast digest into a readable summary.
+
+    Args:
+        digest: Digest from utils.timeseries.summarize
+        tz: Time zone to show times in, defaults to the digest's own offsets
+
+    Returns:
+        Formatted digest string
+    """
+    lines = [
+        f"Period: {_format_time(digest['start'], tz)} to {_format_time(digest['end'], tz)} "
+        f"({digest['hours']} hours)"
+    ]
+
+    temperature = digest.get("temperature")
+    if temperature:
+        lines.append(
+            f"Temperature: low {temperature['min']:.0f}°F ({_format_time(temperature['min_at'], tz)}), "
+            f"high {temperature['max']:.0f}°F ({_format_time(temperature['max_at'], tz)})"
+        )
+    else:
+        lines.append("Temperature: no data")
+
+    for crossing_time, direction in digest.get("freezing", []):
+        change = "drops below" if direction == "below" else "rises above"
+        lines.append(f"Freezing: {change} 32°F at {_format_time(crossing_time, tz)}")
+
+    rain_windows = digest.get("rain_windows", [])
+    if rain_windows:
+        for begin, end, peak in rain_windows:
+            lines.append(
+                f"Rain likely: {_format_time(begin, tz)} to {_format_time(end, tz)} (peak {peak:.0f}%)"
+            )
+    else:
+        lines.append("Rain likely: none")
+
+    if digest.get("precipitation_total") is not None:
+        lines.append(f"Total precipitation: {digest['precipitation_total']:.2f} in")
+
+    wind, gust = digest.get("wind"), digest.get("gust")
+    if wind:
+        text = f"Wind: up to {wind['max']:.0f} mph ({_format_time(wind['max_at'], tz)})"
+        if gust:
+            text += f", gusts to {gust['max']:.0f} mph"
+        lines.append(text)
+
+    return "\n".join(lines)
+
+
+COMPASS_POINTS = "N NNE NE ENE E ESE SE SSE S SSW SW WSW W WNW NW NNW".split()
+
+
+def _measurement(props: Dict[str, Any], name: str) -> Optional[float]:
+    """Get the value of an observation measurement, None if not reported."""
+    return (props.get(name) or {}).get("value")
+
+
+def format_observation(conditions: Dict[str, Any], tz: Optional[tzinfo] = None) -> str:
+    """
+    Format the latest observation from a station into a readable summary.
+
+    Measurements the station did not report are left out.
+
+    Args:
+        conditions: Result of weather_service.get_current_conditions
+        tz: Time zone to show the observation time in, defaults to its own offset
+
+    Returns:
+        Formatted observation string
+    """
+    identifier, name = conditions["station"][:2]
+    props = conditions["observation"]
+    lines = [f"Station: {name} ({identifier}), {conditions['distance_km']:.0f} km away"]
+
+    if props.get("timestamp"):
+        observed = datetime.fromisoformat(props["timestamp"])
+        lines.append(f"Observed: {_format_time(observed, tz)}")
+    if props.get("textDescription"):
+        lines.append(f"Conditions: {props['textDescription']}")
+
+    temperature = _measurement(props, "temperature")
+    if temperature is not None:
+        lines.append(
+            f"Temperature: {temperature * 9 / 5 + 32:.0f}°F ({temperature:.1f}°C)"
+        )
+    dewpoint = _measurement(props, "dewpoint")
+    if dewpoint is not None:
+        lines.append(f"Dewpoint: {dewpoint * 9 / 5 + 32:.0f}°F")
+    humidity = _measurement(props, "relativeHumidity")
+    if humidity is not None:
+        lines.append(f"Humidity: {humidity:.0f}%")
+
+    speed = _measurement(props, "windSpeed")
+    if speed is not None:
+        direction = _measurement(props, "windDirection")
+        if speed == 0:
+            text = "Wind: calm"
+        elif direction is None:
+            text = f"Wind: {speed * 0.621371:.0f} mph"
+        else:
+            compass = COMPASS_POINTS[round(direction / 22.5) % 16]
+            text = f"Wind: {compass} {speed * 0.621371:.0f} mph"
+        gust = _measurement(props, "windGust")
+        if gust:
+            text += f", gusts to {gust * 0.621371:.0f} mph"
+        lines.append(text)
+
+    pressure = _measurement(props, "barometricPressure")
+    if pressure is not None:
+        lines.append(f"Pressure: {pressure / 100:.0f} hPa")
+    visibility = _measurement(props, "visibility")
+    if visibility is not None:
+        lines.append(f"Visibility: {visibility / 1609.344:.1f} mi")
+
+    return "\n".join(lines)
@@ -1,44 +1,288 @@
 """HTTP utilities for making API requests."""
 
-import httpx
-from typing import Any, Dict, Optional
+import asyncio
+import importlib.util
+import json
+import logging
+import os
+import threading
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, Optional
+
+from ..logs import sampled
+from .deadline import DeadlineExceeded, hop_timeout, mark_exhausted
+
+# Configure logging
+logger = logging.getLogger(__name__)
+# One debug line per upstream request would swamp the log under load
+_request_log = sampled(logger)
 
 # Constants
 USER_AGENT = "weather-app/1.0"
+MAX_RESPONSE_BYTES = int(
+    os.environ.get("WEATHER_MAX_RESPONSE_BYTES", str(32 * 1024 * 1024))
+)
+
+# httpx decodes brotli and zstd responses when the optional packages are installed
+ACCEPT_ENCODING = ", ".join(
+    ["gzip", "deflate"]
+    + (["br"] if importlib.util.find_spec("brotli") else [])
+    + (["zstd"] if importlib.util.find_spec("zstandard") else [])
+)
+
+# Upstream connections a shared client keeps open
+MAX_CONNECTIONS = 64
+MAX_KEEPALIVE_CONNECTIONS = 16
+
+_transfer_stats: Dict[str, Dict[str, int]] = {}
+_stats_lock = threading.Lock()
+_shared_client: Optional[Any] = None
+
+# Body bytes held by responses still being read, and the memory governor's
+# cap on a single body (see memory)
+_buffered_bytes = 0
+_response_budget: Optional[int] = None
+
+
+class ResponseTooLarge(Exception):
+    """Raised when a response body exceeds the configured maximum size."""
+
+
+def endpoint_name(url: str) -> str:
+    """
+    Reduce a URL to its endpoint, replacing identifiers with placeholders.
+
+    Path segments containing a digit or written in capitals (coordinates,
+    office and zone codes, state codes) are identifiers.
+
+    Args:
+        url: Request URL
+
+    Returns:
+        Endpoint such as '/gridpoints/{}/{}/forecast'
+    """
+    from urllib.parse import urlsplit
+
+    segments = [
+        "{}" if any(c.isdigit() for c in segment) or segment.isupper() else segment
+        for segment in urlsplit(url).path.split("/")
+    ]
+    return "/".join(segments) or "/"
+
+
+def _count_transfer(endpoint: str, **counts: int) -> None:
+    with _stats_lock:
+        stats = _transfer_stats.setdefault(
+            endpoint,
+            {"requests": 0, "wire_bytes": 0, "body_bytes": 0, "oversized": 0},
+        )
+        for name, value in counts.items():
+            stats[name] += value
+
+
+def get_transfer_stats() -> Dict[str, Dict[str, int]]:
+    """
+    Get the bytes transferred per upstream endpoint since startup.
+
+    Returns:
+        Mapping of endpoint to request count, compressed bytes received,
+        decoded body bytes and number of oversized responses
+    """
+    with _stats_lock:
+        return {endpoint: dict(stats) for endpoint, stats in _transfer_stats.items()}
+
+
+def get_buffered_bytes() -> int:
+    """
+    Get the body bytes held by responses still being read.
+
+    Returns:
+        Bytes buffered
+    """
+    return _buffered_bytes
+
+
+def set_response_budget(max_bytes: Optional[int]) -> None:
+    """
+    Cap the body size of every response below MAX_RESPONSE_BYTES.
+
+    The memory governor lowers the cap under memory pressure, so that very
+    large payloads (such as the national alert feed during an alert storm)
+    are refused rather than buffered.
+
+    Args:
+        max_bytes: Body size cap, or None to lift it
+    """
+    global _response_budget
+    _response_budget = max_bytes
+
+
+def reset_transfer_stats() -> None:
+    """Clear the per-endpoint transfer counters."""
+    with _stats_lock:
+        _transfer_stats.clear()
+
+
+@asynccontextmanager
+async def shared_client() -> AsyncIterator[Any]:
+    """
+    Send every request through one pooled client while the context is open.
+
+    Without it each request opens a client of its own, which suits
+    short-lived processes; a long-lived process serving many clients (see
+    daemon) keeps its upstream connections alive across requests instead.
+
+    Yields:
+        The shared httpx.AsyncClient
+    """
+    global _shared_client
+    # Imported on first use to keep server startup fast
+    import httpx
+
+    limits = httpx.Limits(
+        max_connections=MAX_CONNECTIONS,
+        max_keepalive_connections=MAX_KEEPALIVE_CONNECTIONS,
+    )
+    async with httpx.AsyncClient(limits=limits) as client:
+        _shared_client = client
+        try:
+            yield client
+        finally:
+            _shared_client = None
+
+
+@asynccontextmanager
+async def _client() -> AsyncIterator[Any]:
+    """Get the shared client if one is open, otherwise a client for one request."""
+    if _shared_client is not None:
+        yield _shared_client
+        return
+
+    import httpx
+
+    async with httpx.AsyncClient() as client:
+        yield client
 
 
 async def make_request(
     url: str,
     headers: Optional[Dict[str, str]] = None,
     params: Optional[Dict[str, Any]] = None,
-    timeout: int = 30,
+    timeout: Optional[float] = None,
+    max_bytes: Optional[int] = None,
 ) -> Dict[str, Any] | None:
     """
     Make an HTTP request to the specified URL.
 
+    The body is streamed and decompressed incrementally, and the request is
+    abandoned as soon as the decoded body grows past max_bytes.
+
+    The timeout bounds the whole request, not just each read. Without an
+    explicit timeout the request is one hop of the current call's time
+    budget (see utils.deadline) and is skipped when the budget has run out.
+
+    In record mode successful responses are also written to the response
+    archive; in replay mode they are served from it without a request (see
+    utils.archive).
+
     Args:
         url: The URL to make the request to
         headers: Optional headers to include in the request
         params: Optional query parameters
-        timeout: Request timeout in seconds
+        timeout: Request timeout in seconds, defaults to the hop's share of
+            the current budget
+        max_bytes: Maximum decoded body size, defaults to MAX_RESPONSE_BYTES
+            (set with the WEATHER_MAX_RESPONSE_BYTES environment variable)
 
     Returns:
         JSON response as a dictionary or None if the request fails
     """
+    from .archive import get_archive, http_mode
+
+    if timeout is None:
+        try:
+            timeout = hop_timeout()
+        except DeadlineExceeded:
+            logger.warning("Skipping request to %s: time budget exhausted", url)
+            return None
+
+    mode = http_mode()
+    try:
+        async with asyncio.timeout(timeout):
+            if mode == "replay":
+                return await get_archive().replay(url, params)
+            data = await _fetch(url, headers, params, timeout, max_bytes)
+    except TimeoutError:
+        logger.warning("Request to %s timed out after %.1fs", url, timeout)
+        mark_exhausted()
+        _count_transfer(endpoint_name(url), requests=1)
+        return None
+
+    if data is not None and mode == "record":
+        await get_archive().record(url, params, data)
+    return data
+
+
+async def _fetch(
+    url: str,
+    headers: Optional[Dict[str, str]],
+    params: Optional[Dict[str, Any]],
+    timeout: float,
+    max_bytes: Optional[int],
+) -> Dict[str, Any] | None:
+    """Stream a response body from upstream, see make_request."""
+    # Imported on first use to keep server startup fast
+    import httpx
+
     default_headers = {
         "User-Agent": USER_AGENT,
+        "Accept-Encoding": ACCEPT_ENCODING,
     }
 
     if headers:
         default_headers.update(headers)
 
-    async with httpx.AsyncClient() as client:
+    global _buffered_bytes
+    limit = MAX_RESPONSE_BYTES if max_bytes is None else max_bytes
+    if _response_budget is not None:
+        limit = min(limit, _response_budget)
+    endpoint = endpoint_name(url)
+    chunks = []
+    size = 0
+    wire_bytes = 0
+
+    async with _client() as client:
         try:
-            response = await client.get(
-                url, headers=default_headers, params=params, timeout=timeout
-            )
-            response.raise_for_status()
-            return response.json()
+            async with client.stream(
+                "GET", url, headers=default_headers, params=params, timeout=timeout
+            ) as response:
+                response.raise_for_status()
+                # A compressed body larger than the limit cannot decode to less
+                declared = response.headers.get("content-length", "")
+                if declared.isdigit() and int(declared) > limit:
+                    raise ResponseTooLarge(f"{declared} bytes declared")
+                async for chunk in response.aiter_bytes():
+                    size += len(chunk)
+                    if size > limit:
+                        raise ResponseTooLarge(f"more than {limit} bytes")
+                    chunks.append(chunk)
+                    _buffered_bytes += len(chunk)
+                wire_bytes = response.num_bytes_downloaded
+        except ResponseTooLarge as e:
+            logger.warning("Response from %s too large: %s", url, e)
+            _count_transfer(endpoint, requests=1, oversized=1)
+            return None
+        except httpx.TimeoutException:
+            mark_exhausted()
+            _count_transfer(endpoint, requests=1)
+            return None
         except (httpx.RequestError, httpx.HTTPStatusError):
             # In a production app, you'd want to log this error
+            _count_transfer(endpoint, requests=1)
             return None
+        finally:
+            _buffered_bytes -= sum(len(chunk) for chunk in chunks)
+
+    _count_transfer(endpoint, requests=1, wire_bytes=wire_bytes, body_bytes=size)
+    _request_log.debug("Fetched %s: %s bytes, %s on the wire", url, size, wire_bytes)
+    return json.loads(b"".join(chunks))
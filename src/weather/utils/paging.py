@@ -0,0 +1,195 @@
+"""Cursor pagination of large result sets into size-bounded pages.
+
+Pages are cut by keyset rather than by offset: the cursor holds the sort key
+of the last item shown, and the next page starts after it. Alerts that
+appear or expire between calls therefore never shift the page boundary, and
+only the items on the page are ever rendered.
+"""
+
+import base64
+import heapq
+import json
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, TypeVar
+
+T = TypeVar("T")
+Key = Tuple[Any, ...]
+
+# Page size limits of the tools using pagination
+DEFAULT_MAX_RESULTS = 20
+MAX_RESULTS_LIMIT = 100
+DEFAULT_MAX_CHARS = 20_000
+MAX_CHARS_LIMIT = 100_000
+
+# Most severe first
+SEVERITY_ORDER = {"Extreme": 0, "Severe": 1, "Moderate": 2, "Minor": 3}
+
+# Sort position of alerts without a usable onset time: after all others
+NO_ONSET = 1e18
+
+
+def _timestamp(value: Optional[str]) -> float:
+    """Convert an ISO-8601 time to a POSIX timestamp, NO_ONSET if unusable."""
+    try:
+        return datetime.fromisoformat(value).timestamp() if value else NO_ONSET
+    except ValueError:
+        return NO_ONSET
+
+
+# Types of the parts of an alert_sort_key: severity rank, onset, id
+ALERT_KEY_TYPES = (int, float, str)
+
+
+def alert_sort_key(feature: Dict[str, Any]) -> Key:
+    """
+    Order alerts by severity, then by onset, then by id.
+
+    Args:
+        feature: Alert feature
+
+    Returns:
+        Sort key; the id makes it unique, as a cursor key must be
+    """
+    props = feature.get("properties", {})
+    return (
+        SEVERITY_ORDER.get(props.get("severity"), len(SEVERITY_ORDER)),
+        _timestamp(props.get("onset") or props.get("effective") or props.get("sent")),
+        str(props.get("id") or feature.get("id") or ""),
+    )
+
+
+def encode_cursor(key: Key) -> str:
+    """
+    Encode a sort key as an opaque cursor.
+
+    Args:
+        key: Sort key of the last item on a page
+
+    Returns:
+        URL-safe cursor string
+    """
+    return base64.urlsafe_b64encode(json.dumps(list(key)).encode()).decode()
+
+
+def _is_part(value: Any, kind: type) -> bool:
+    """Check a decoded cursor part against the type of its sort key part."""
+    if isinstance(value, bool):
+        return False
+    if kind is float:
+        return isinstance(value, (int, float))
+    return isinstance(value, kind)
+
+
+def decode_cursor(cursor: str, key_types: Sequence[type] = ALERT_KEY_TYPES) -> Key:
+    """
+    Decode a cursor made by encode_cursor.
+
+    Cursors come from clients, so the key must have exactly the parts of
+    the sort key it is compared with, each of the right type; anything else
+    would fail the comparison.
+
+    Args:
+        cursor: Cursor string
+        key_types: Type of each part of the sort key
+
+    Returns:
+        Sort key
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        key = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except (ValueError, TypeError) as e:
+        raise ValueError(f"Invalid cursor: {cursor!r}") from e
+    if (
+        not isinstance(key, list)
+        or len(key) != len(key_types)
+        or not all(_is_part(part, kind) for part, kind in zip(key, key_types))
+    ):
+        raise ValueError(f"Invalid cursor: {cursor!r}")
+    return tuple(key)
+
+
+def paginate(
+    items: Sequence[T],
+    key: Callable[[T], Key],
+    render: Callable[[T], str],
+    cursor: str = "",
+    max_results: int = DEFAULT_MAX_RESULTS,
+    max_chars: int = DEFAULT_MAX_CHARS,
+    key_types: Sequence[type] = ALERT_KEY_TYPES,
+) -> Dict[str, Any]:
+    """
+    Render one page of items in key order.
+
+    A page ends after max_results items or before the item that would take
+    the rendered text past max_chars, whichever comes first. A page always
+    holds at least one item; an item longer than max_chars on its own is
+    truncated.
+
+    Args:
+        items: Every item, in any order
+        key: Unique sort key of an item
+        render: Function rendering an item; called only for items on the page
+        cursor: Cursor from the previous page, or '' for the first page
+        max_results: Maximum number of items on the page
+        max_chars: Maximum total length of the rendered items
+        key_types: Type of each part of the sort key, to check the cursor
+
+    Returns:
+        Dictionary with the rendered 'entries', the 'total' number of
+        items, the number 'before' the page and the 'next_cursor', which is
+        None on the last page
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    after = decode_cursor(cursor, key_types) if cursor else None
+    keyed = [(key(item), item) for item in items]
+    remaining = [pair for pair in keyed if after is None or pair[0] > after]
+
+    entries: List[str] = []
+    used = 0
+    last: Optional[Key] = None
+    for item_key, item in heapq.nsmallest(
+        max_results, remaining, key=lambda pair: pair[0]
+    ):
+        text = render(item)
+        # Entries are joined with newlines
+        if entries and used + 1 + len(text) > max_chars:
+            break
+        if len(text) > max_chars:
+            text = text[:max_chars] + "..."
+        used += len(text) + (1 if entries else 0)
+        entries.append(text)
+        last = item_key
+
+    more = len(remaining) > len(entries)
+    return {
+        "entries": entries,
+        "total": len(keyed),
+        "before": len(keyed) - len(remaining),
+        "next_cursor": encode_cursor(last) if more and last is not None else None,
+    }
+
+
+def page_footer(page: Dict[str, Any], noun: str = "alerts") -> str:
+    """
+    Describe where a page sits in the result set and how to get the next one.
+
+    Args:
+        page: Page from paginate
+        noun: Name of the items
+
+    Returns:
+        Footer text, or '' when the page holds every item
+    """
+    if page["next_cursor"] is None and not page["before"]:
+        return ""
+    first = page["before"] + 1
+    last = page["before"] + len(page["entries"])
+    footer = f"\n\nShowing {noun} {first}-{last} of {page['total']}."
+    if page["next_cursor"]:
+        footer += f' For more, call again with cursor="{page["next_cursor"]}".'
+    return footer
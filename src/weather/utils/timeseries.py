@@ -0,0 +1,283 @@
+"""Decoding and summarizing of NWS forecast time series.
+
+Gridpoint layers encode each value with an ISO-8601 interval
+(``2025-03-18T04:00:00+00:00/PT3H``) covering one or more hours. The
+helpers here expand those layers, and hourly forecast periods, onto a
+common hourly axis stored as ``array('d')``, with NaN marking hours that
+have no data, and reduce them to a compact digest.
+
+The summaries are plain Python loops, one pass over each series. A week of
+hourly data is a few hundred values, so this is cheap enough without NumPy.
+"""
+
+import math
+import re
+from array import array
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+HOUR = timedelta(hours=1)
+NAN = float("nan")
+
+_DURATION = re.compile(
+    r"P(?:(?P<weeks>\d+)W)?(?:(?P<days>\d+)D)?"
+    r"(?:T(?:(?P<hours>\d+)H)?(?:(?P<minutes>\d+)M)?(?:(?P<seconds>\d+)S)?)?$"
+)
+
+# Conversions from the units used by /gridpoints to the US units used by /forecast
+UNIT_CONVERSIONS: Dict[str, Tuple[str, Callable[[float], float]]] = {
+    "wmoUnit:degC": ("°F", lambda value: value * 9 / 5 + 32),
+    "wmoUnit:km_h-1": ("mph", lambda value: value * 0.621371),
+    "wmoUnit:mm": ("in", lambda value: value / 25.4),
+    "wmoUnit:percent": ("%", lambda value: value),
+}
+
+
+def parse_duration(value: str) -> timedelta:
+    """
+    Parse an ISO-8601 duration such as 'PT1H' or 'P1DT6H'.
+
+    Args:
+        value: Duration string
+
+    Returns:
+        Duration as a timedelta
+
+    Raises:
+        ValueError: If the string is not a supported duration
+    """
+    match = _DURATION.match(value)
+    if not match or value == "P":
+        raise ValueError(f"Unsupported ISO-8601 duration: {value}")
+    parts = {name: int(part) for name, part in match.groupdict().items() if part}
+    return timedelta(**parts)
+
+
+def parse_interval(valid_time: str) -> Tuple[datetime, timedelta]:
+    """
+    Parse an ISO-8601 '<start>/<duration>' interval.
+
+    Args:
+        valid_time: Interval string, e.g. '2025-03-18T04:00:00+00:00/PT3H'
+
+    Returns:
+        Start time and duration
+    """
+    start, _, duration = valid_time.partition("/")
+    return datetime.fromisoformat(start), parse_duration(duration or "PT1H")
+
+
+def series_start(valid_times: str, now: Optional[datetime] = None) -> datetime:
+    """
+    Choose the first hour of the summary window for a gridpoint forecast.
+
+    The window starts at the current hour when it falls within the forecast's
+    valid times, and at the start of the valid times otherwise.
+
+    Args:
+        valid_times: The forecast's 'validTimes' interval
+        now: Current time, defaults to the system clock
+
+    Returns:
+        Start of the hourly axis
+    """
+    start, duration = parse_interval(valid_times)
+    now = (now or datetime.now(timezone.utc)).replace(minute=0, second=0, microsecond=0)
+    return now if start <= now < start + duration else start
+
+
+def decode_layer(
+    layer: Dict[str, Any], start: datetime, hours: int, accumulated: bool = False
+) -> Tuple[array, Optional[str]]:
+    """
+    Expand an interval-encoded gridpoint layer onto an hourly axis.
+
+    Args:
+        layer: Gridpoint layer with 'uom' and 'values' entries
+        start: First hour of the axis
+        hours: Number of hours on the axis
+        accumulated: Whether each value is a total over its interval (e.g.
+            precipitation amount) to be spread evenly across its hours
+
+    Returns:
+        Hourly values in US units, NaN where missing, and the unit label
+    """
+    values = array("d", [NAN]) * hours
+    unit, convert = UNIT_CONVERSIONS.get(
+        layer.get("uom", ""), (None, lambda value: value)
+    )
+
+    for entry in layer.get("values", []):
+        if entry.get("value") is None:
+            continue
+        begin, duration = parse_interval(entry["validTime"])
+        count = max(1, int(duration / HOUR))
+        first = math.floor((begin - start) / HOUR)
+        lo, hi = max(first, 0), min(first + count, hours)
+        if lo >= hi:
+            continue
+        value = convert(entry["value"])
+        if accumulated:
+            value /= count
+        values[lo:hi] = array("d", [value]) * (hi - lo)
+    return values, unit
+
+
+def _wind_speed(text: str) -> float:
+    """Take the upper bound of an hourly wind speed such as '5 to 10 mph'."""
+    numbers = re.findall(r"\d+(?:\.\d+)?", text or "")
+    return float(numbers[-1]) if numbers else NAN
+
+
+def decode_hourly(
+    periods: List[Dict[str, Any]], hours: int
+) -> Tuple[datetime, Dict[str, array]]:
+    """
+    Convert hourly forecast periods into hourly series.
+
+    Args:
+        periods: Periods from a /forecast/hourly response
+        hours: Number of hours to decode
+
+    Returns:
+        Start of the axis and series for temperature, precipitation
+        probability and wind speed
+    """
+    start = datetime.fromisoformat(periods[0]["startTime"])
+    series = {
+        name: array("d", [NAN]) * hours
+        for name in ("temperature", "precipitation", "wind")
+    }
+
+    for period in periods:
+        index = math.floor((datetime.fromisoformat(period["startTime"]) - start) / HOUR)
+        if not 0 <= index < hours:
+            continue
+        temperature = period.get("temperature")
+        if temperature is not None:
+            if period.get("temperatureUnit") == "C":
+                temperature = temperature * 9 / 5 + 32
+            series["temperature"][index] = temperature
+        probability = (period.get("probabilityOfPrecipitation") or {}).get("value")
+        series["precipitation"][index] = NAN if probability is None else probability
+        series["wind"][index] = _wind_speed(period.get("windSpeed", ""))
+    return start, series
+
+
+def extremes(values: array) -> Optional[Dict[str, Any]]:
+    """
+    Find the minimum and maximum of a series, ignoring missing hours.
+
+    Args:
+        values: Hourly series
+
+    Returns:
+        Minimum and maximum values with their hour offsets, or None if empty
+    """
+    present = [(value, index) for index, value in enumerate(values) if value == value]
+    if not present:
+        return None
+    low, high = min(present), max(present, key=lambda item: (item[0], -item[1]))
+    return {"min": low[0], "min_at": low[1], "max": high[0], "max_at": high[1]}
+
+
+def windows(values: array, threshold: float) -> List[Tuple[int, int, float]]:
+    """
+    Find runs of consecutive hours at or above a threshold.
+
+    Args:
+        values: Hourly series
+        threshold: Inclusive lower bound
+
+    Returns:
+        (first hour, end hour exclusive, peak value) for each run
+    """
+    runs = []
+    begin = None
+    for index, value in enumerate(values):
+        if value >= threshold:
+            if begin is None:
+                begin = index
+        elif begin is not None:
+            runs.append((begin, index, max(values[begin:index])))
+            begin = None
+    if begin is not None:
+        runs.append((begin, len(values), max(values[begin:])))
+    return runs
+
+
+def crossings(values: array, threshold: float) -> List[Tuple[int, str]]:
+    """
+    Find the hours where a series crosses a threshold.
+
+    Missing hours are skipped, so a crossing is reported at the first
+    known hour on the other side of the threshold.
+
+    Args:
+        values: Hourly series
+        threshold: Threshold value
+
+    Returns:
+        (hour, 'below' or 'above') for each crossing
+    """
+    known = [(index, value) for index, value in enumerate(values) if value == value]
+    return [
+        (index, "below" if value < threshold else "above")
+        for (_, previous), (index, value) in zip(known, known[1:])
+        if (previous < threshold) != (value < threshold)
+    ]
+
+
+def summarize(
+    start: datetime,
+    series: Dict[str, array],
+    rain_threshold: float = 50,
+    freezing: float = 32.0,
+) -> Dict[str, Any]:
+    """
+    Reduce hourly series to a compact digest.
+
+    Hour offsets are converted to timestamps so the digest can be
+    formatted without the underlying series.
+
+    Args:
+        start: First hour of the axis
+        series: Hourly series keyed by 'temperature', 'precipitation'
+            (probability, %), 'wind' and optionally 'gust' and 'amount'
+        rain_threshold: Precipitation probability that starts a rain window
+        freezing: Temperature threshold for freeze/thaw crossings, in °F
+
+    Returns:
+        Digest dictionary
+    """
+
+    def at(hour: int) -> datetime:
+        return start + hour * HOUR
+
+    hours = max((len(values) for values in series.values()), default=0)
+    digest: Dict[str, Any] = {"start": start, "end": at(hours), "hours": hours}
+
+    for name in ("temperature", "wind", "gust"):
+        found = extremes(series[name]) if name in series else None
+        if found:
+            found["min_at"], found["max_at"] = at(found["min_at"]), at(found["max_at"])
+        digest[name] = found
+
+    temperature = series.get("temperature", array("d"))
+    digest["freezing"] = [
+        (at(hour), direction) for hour, direction in crossings(temperature, freezing)
+    ]
+
+    precipitation = series.get("precipitation", array("d"))
+    digest["rain_windows"] = [
+        (at(begin), at(end), peak)
+        for begin, end, peak in windows(precipitation, rain_threshold)
+    ]
+
+    amount = series.get("amount")
+    digest["precipitation_total"] = (
+        math.fsum(value for value in amount if value == value)
+        if amount is not None
+        else None
+    )
+    return digest
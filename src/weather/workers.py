@@ -0,0 +1,337 @@
+"""Pre-fork multi-worker deployment for the SSE transport.
+
+The supervisor binds one listening socket and forks N worker processes that
+all accept from it, so the kernel spreads connections across cores. Workers
+share upstream responses through a SQLite cache file.
+
+An MCP SSE session lives in the worker that accepted the ``GET /sse`` stream,
+but the client's ``POST /messages/`` requests arrive on separate connections
+and may be accepted by any worker. Each worker therefore also listens on a
+private Unix socket, and a worker that receives a message for a session it
+does not own forwards the request to its siblings.
+"""
+
+import logging
+import os
+import shutil
+import signal
+import socket
+import tempfile
+import time
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Callable, Dict, List, Sequence
+from urllib.parse import parse_qs
+from uuid import UUID
+
+import httpx
+import uvicorn
+from mcp.server.fastmcp import FastMCP
+from mcp.server.sse import SseServerTransport
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import Response
+from starlette.routing import Mount, Route
+from starlette.types import Receive, Scope, Send
+
+from .logs import configure_logging, shutdown_logging
+from .runtime import freeze_startup_objects
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+FORWARDED_HEADER = "x-weather-forwarded"
+
+# Remembered owners of foreign sessions; closed sessions are never reported, so the map is bounded
+MAX_SESSION_OWNERS = 10_000
+
+# A worker that exits sooner than this after starting counts as a failed start
+MIN_WORKER_UPTIME = 10.0
+RESTART_DELAY = 0.5
+MAX_RESTART_DELAY = 30.0
+# Consecutive failed starts after which a worker is no longer restarted
+MAX_FAILED_STARTS = 8
+
+
+def _session_id(scope: Scope) -> UUID | None:
+    """
+    Extract the MCP session id from a message request.
+
+    Args:
+        scope: ASGI scope of the request
+
+    Returns:
+        Session id, or None if missing or malformed
+    """
+    query = parse_qs(scope.get("query_string", b"").decode())
+    try:
+        return UUID(hex=query["session_id"][0])
+    except (KeyError, ValueError):
+        return None
+
+
+def create_sse_app(
+    server: FastMCP, peers: Sequence[str] = (), warmup: bool = False
+) -> Starlette:
+    """
+    Create the SSE application for a server, with optional session forwarding.
+
+    Args:
+        server: MCP server instance
+        peers: Unix socket paths of sibling workers to forward unknown sessions to
+        warmup: Whether to keep the watch-list cache warm while the app runs
+
+    Returns:
+        Starlette application serving ``/sse`` and ``/messages/``
+    """
+    sse = SseServerTransport("/messages/")
+    peer_clients: Dict[str, httpx.AsyncClient] = {}
+    # Sibling that owns each foreign session, learned from the first forward
+    owners: "OrderedDict[UUID, str]" = OrderedDict()
+
+    async def handle_sse(request: Request) -> None:
+        async with sse.connect_sse(
+            request.scope, request.receive, request._send
+        ) as streams:
+            await server._mcp_server.run(
+                streams[0],
+                streams[1],
+                server._mcp_server.create_initialization_options(),
+            )
+
+    async def forward(scope: Scope, session_id: UUID, body: bytes) -> Response:
+        path = scope["path"] + "?" + scope["query_string"].decode()
+        headers = {"content-type": "application/json", FORWARDED_HEADER: "1"}
+        owner = owners.get(session_id)
+        for peer in [owner] if owner else peers:
+            client = peer_clients.get(peer)
+            if client is None:
+                client = httpx.AsyncClient(
+                    transport=httpx.AsyncHTTPTransport(uds=peer),
+                    base_url="http://worker",
+                )
+                peer_clients[peer] = client
+            try:
+                response = await client.post(path, content=body, headers=headers)
+            except httpx.RequestError as e:
+                logger.warning("Error forwarding message to %s: %s", peer, e)
+                continue
+            if response.status_code != 404:
+                owners[session_id] = peer
+                owners.move_to_end(session_id)
+                while len(owners) > MAX_SESSION_OWNERS:
+                    owners.popitem(last=False)
+                return Response(response.content, status_code=response.status_code)
+        owners.pop(session_id, None)
+        return Response("Could not find session", status_code=404)
+
+    async def handle_messages(scope: Scope, receive: Receive, send: Send) -> None:
+        session_id = _session_id(scope)
+        # SseServerTransport keeps its sessions in a private mapping
+        if (
+            peers
+            and session_id is not None
+            and session_id not in sse._read_stream_writers
+        ):
+            if any(name == FORWARDED_HEADER.encode() for name, _ in scope["headers"]):
+                # Another worker is probing for the owner of this session
+                response = Response("Could not find session", status_code=404)
+            else:
+                request = Request(scope, receive)
+                response = await forward(scope, session_id, await request.body())
+            await response(scope, receive, send)
+            return
+        await sse.handle_post_message(scope, receive, send)
+
+    @asynccontextmanager
+    async def lifespan(app: Starlette) -> AsyncIterator[None]:
+        if not warmup or not os.environ.get("WEATHER_WARMUP_CONFIG"):
+            yield
+            return
+
+        from .services.warmup import warmup_running
+
+        async with warmup_running():
+            yield
+
+    return Starlette(
+        debug=server.settings.debug,
+        routes=[
+            Route("/sse", endpoint=handle_sse),
+            Mount("/messages/", app=handle_messages),
+        ],
+        lifespan=lifespan,
+    )
+
+
+def _run_worker(
+    index: int,
+    listener: socket.socket,
+    peers: List[str],
+    server_factory: Callable[[], FastMCP],
+) -> None:
+    """
+    Serve requests in a forked worker process until told to stop.
+
+    Args:
+        index: Worker index, selecting this worker's entry in peers
+        listener: Shared listening socket
+        peers: Unix socket paths of all workers
+        server_factory: Callable creating the MCP server
+    """
+    signal.signal(signal.SIGINT, signal.SIG_DFL)
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+
+    own_path = peers[index]
+    if os.path.exists(own_path):
+        os.unlink(own_path)
+    private = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    private.bind(own_path)
+    private.listen(128)
+
+    server = server_factory()
+    freeze_startup_objects()
+    # The cache file is shared, so one worker keeps it warm for all of them
+    app = create_sse_app(
+        server, [peer for peer in peers if peer != own_path], warmup=index == 0
+    )
+    config = uvicorn.Config(
+        app,
+        log_level=server.settings.log_level.lower(),
+        # Open SSE streams never finish on their own
+        timeout_graceful_shutdown=5,
+    )
+    logger.info("Worker %s started with pid %s", index, os.getpid())
+    uvicorn.Server(config).run(sockets=[listener, private])
+
+
+def restart_delay(failed_starts: int) -> float:
+    """
+    Get how long to wait before restarting a worker.
+
+    Args:
+        failed_starts: Consecutive times the worker exited soon after starting
+
+    Returns:
+        Delay in seconds, doubling with every failed start
+    """
+    if failed_starts <= 0:
+        return 0.0
+    return min(RESTART_DELAY * 2 ** (failed_starts - 1), MAX_RESTART_DELAY)
+
+
+def run_workers(
+    workers: int,
+    host: str,
+    port: int,
+    server_factory: Callable[[], FastMCP],
+) -> None:
+    """
+    Run the SSE transport in several pre-forked worker processes.
+
+    Workers that exit unexpectedly are restarted, with an exponential backoff
+    when they keep exiting soon after starting, and given up on after
+    MAX_FAILED_STARTS such exits in a row. SIGINT and SIGTERM stop all
+    workers and return.
+
+    Args:
+        workers: Number of worker processes
+        host: Interface to listen on
+        port: Port to listen on
+        server_factory: Callable creating the MCP server in each worker
+    """
+    if not hasattr(os, "fork"):
+        raise RuntimeError("Multiple workers require a platform with os.fork")
+    # Before any worker creates a server; each forked worker starts a
+    # writer thread of its own
+    configure_logging()
+
+    runtime_dir = tempfile.mkdtemp(prefix="weather-workers-")
+    # Workers share upstream responses unless a cache file is configured
+    os.environ.setdefault(
+        "WEATHER_CACHE_PATH", os.path.join(runtime_dir, "cache.sqlite3")
+    )
+    peers = [
+        os.path.join(runtime_dir, f"worker-{index}.sock") for index in range(workers)
+    ]
+
+    listener = socket.create_server((host, port), backlog=2048)
+    listener.set_inheritable(True)
+    children: Dict[int, int] = {}
+    started: Dict[int, float] = {}
+    failed_starts: Dict[int, int] = {}
+    pending: Dict[int, float] = {}
+    stopping = False
+
+    def spawn(index: int) -> None:
+        pid = os.fork()
+        if pid == 0:
+            code = 0
+            try:
+                _run_worker(index, listener, peers, server_factory)
+            except BaseException:
+                logger.exception("Worker %s failed", index)
+                code = 1
+            finally:
+                # os._exit skips atexit, so write out queued records first
+                shutdown_logging()
+                os._exit(code)
+        children[pid] = index
+        started[index] = time.monotonic()
+
+    def stop(signum, frame) -> None:
+        nonlocal stopping
+        stopping = True
+        for pid in list(children):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    for index in range(workers):
+        spawn(index)
+    signal.signal(signal.SIGINT, stop)
+    signal.signal(signal.SIGTERM, stop)
+    logger.info("Serving SSE on %s:%s with %s workers", host, port, workers)
+
+    try:
+        while children or (pending and not stopping):
+            if not pending:
+                try:
+                    pid, status = os.wait()
+                except ChildProcessError:
+                    break
+            else:
+                now = time.monotonic()
+                for index, restart_at in list(pending.items()):
+                    if restart_at <= now and not stopping:
+                        del pending[index]
+                        spawn(index)
+                pid, status = os.waitpid(-1, os.WNOHANG) if children else (0, 0)
+                if pid == 0:
+                    time.sleep(0.1)
+                    continue
+
+            index = children.pop(pid, None)
+            if index is None or stopping:
+                continue
+            if time.monotonic() - started[index] < MIN_WORKER_UPTIME:
+                failed_starts[index] = failed_starts.get(index, 0) + 1
+            else:
+                failed_starts[index] = 0
+            if failed_starts[index] > MAX_FAILED_STARTS:
+                logger.error(
+                    "Worker %s keeps exiting at startup, not restarting it", index
+                )
+                continue
+            delay = restart_delay(failed_starts[index])
+            logger.warning(
+                "Worker %s exited with status %s, restarting in %.1fs",
+                index,
+                status,
+                delay,
+            )
+            pending[index] = time.monotonic() + delay
+    finally:
+        listener.close()
+        shutil.rmtree(runtime_dir, ignore_errors=True)
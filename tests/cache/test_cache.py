@@ -0,0 +1,368 @@
+"""Tests for the response cache backends."""
+
+import pytest
+import pytest_asyncio
+from unittest.mock import patch
+
+from benchmarks.redis_stub import RedisStub
+from src.weather.cache import (
+    MemoryCache,
+    NullCache,
+    OutputCache,
+    RedisCache,
+    SizedMemoryCache,
+    SQLiteCache,
+    create_cache,
+    get_cache,
+    output_key,
+    set_cache,
+)
+
+
+@pytest.mark.asyncio
+async def test_memory_cache_roundtrip():
+    """Test storing and reading a value from the memory cache."""
+    cache = MemoryCache()
+    await cache.set("key", {"value": 1}, ttl=60)
+
+    assert await cache.get("key") == {"value": 1}
+    assert await cache.get("missing") is None
+
+
+@pytest.mark.asyncio
+async def test_memory_cache_expiry():
+    """Test that expired entries are not returned."""
+    cache = MemoryCache()
+
+    with patch("src.weather.cache.memory.time.time", return_value=1000.0):
+        await cache.set("key", "value", ttl=10)
+    with patch("src.weather.cache.memory.time.time", return_value=1011.0):
+        assert await cache.get("key") is None
+
+
+@pytest.mark.asyncio
+async def test_memory_cache_lru_eviction():
+    """Test that the least recently used entry is evicted at capacity."""
+    cache = MemoryCache(max_entries=2)
+    await cache.set("a", 1, ttl=60)
+    await cache.set("b", 2, ttl=60)
+    await cache.get("a")
+    await cache.set("c", 3, ttl=60)
+
+    assert await cache.get("b") is None
+    assert await cache.get("a") == 1
+    assert await cache.get("c") == 3
+    assert len(cache) == 2
+
+
+@pytest.mark.asyncio
+async def test_memory_cache_sweeps_unread_entries():
+    """Test that expired entries are swept out even if never read again."""
+    cache = MemoryCache(sweep_interval=60)
+
+    with patch("src.weather.cache.memory.time.time", return_value=1000.0):
+        cache.sweep()
+        await cache.set("old", 1, ttl=10)
+    with patch("src.weather.cache.memory.time.time", return_value=1061.0):
+        await cache.set("new", 2, ttl=10)
+        assert await cache.get("new") == 2
+
+    assert len(cache) == 1
+
+
+@pytest.mark.asyncio
+async def test_sqlite_cache_shared_between_instances(tmp_path):
+    """Test that two SQLite caches on the same file see each other's entries."""
+    path = str(tmp_path / "cache.sqlite3")
+    writer = SQLiteCache(path)
+    reader = SQLiteCache(path)
+
+    await writer.set(
+        "https://example.com/points/1,2", {"properties": {"gridId": "TOP"}}, ttl=60
+    )
+
+    assert await reader.get("https://example.com/points/1,2") == {
+        "properties": {"gridId": "TOP"}
+    }
+    writer.close()
+    reader.close()
+
+
+@pytest.mark.asyncio
+async def test_sqlite_cache_expiry_and_clear(tmp_path):
+    """Test SQLite cache expiry and clearing."""
+    cache = SQLiteCache(str(tmp_path / "cache.sqlite3"))
+    await cache.set("expired", 1, ttl=-1)
+    await cache.set("fresh", 2, ttl=60)
+
+    assert await cache.get("expired") is None
+    assert await cache.get("fresh") == 2
+
+    await cache.clear()
+    assert await cache.get("fresh") is None
+    cache.close()
+
+
+def test_get_cache_uses_sqlite_when_configured(tmp_path, monkeypatch):
+    """Test that WEATHER_CACHE_PATH selects the SQLite backend."""
+    monkeypatch.setenv("WEATHER_CACHE_PATH", str(tmp_path / "cache.sqlite3"))
+    set_cache(None)
+
+    cache = get_cache()
+
+    assert isinstance(cache, SQLiteCache)
+    assert get_cache() is cache
+    cache.close()
+
+
+@pytest.mark.asyncio
+async def test_sqlite_cache_sweep(tmp_path):
+    """Test that expired rows are deleted from the SQLite file."""
+    cache = SQLiteCache(str(tmp_path / "cache.sqlite3"))
+    await cache.set("expired", 1, ttl=-1)
+    await cache.set("fresh", 2, ttl=60)
+
+    assert cache.sweep() == 1
+    count = cache._connection.execute("SELECT COUNT(*) FROM cache").fetchone()[0]
+    assert count == 1
+    cache.close()
+
+
+@pytest.mark.asyncio
+async def test_get_cache_disabled(monkeypatch):
+    """Test that WEATHER_CACHE_DISABLED turns caching off."""
+    monkeypatch.setenv("WEATHER_CACHE_DISABLED", "1")
+    set_cache(None)
+
+    cache = get_cache()
+    await cache.set("key", "value", ttl=60)
+
+    assert isinstance(cache, NullCache)
+    assert await cache.get("key") is None
+
+
+def test_output_key_requires_known_versions():
+    """Test that output built from unversioned payloads gets no key."""
+    assert output_key("tool", {"b": 1, "a": 2}, ["v1", "v2"]) == (
+        "tool",
+        (("a", 2), ("b", 1)),
+        ("v1", "v2"),
+    )
+    assert output_key("tool", {}, ["v1", None]) is None
+    assert output_key("tool", {}, []) is None
+
+
+def test_output_cache_lru():
+    """Test memoizing output with LRU eviction and hit counters."""
+    outputs = OutputCache(max_entries=2)
+    outputs.set(("a",), "A")
+    outputs.set(("b",), "B")
+    assert outputs.get(("a",)) == "A"
+    outputs.set(("c",), "C")
+    outputs.set(None, "never stored")
+
+    assert outputs.get(("b",)) is None
+    assert outputs.get(None) is None
+    assert len(outputs) == 2
+    assert (outputs.hits, outputs.misses) == (1, 2)
+
+
+@pytest_asyncio.fixture
+async def redis_stub():
+    """Run a local Redis stand-in for the duration of a test."""
+    stub = await RedisStub().start()
+    yield stub
+    await stub.stop()
+
+
+@pytest_asyncio.fixture(params=["memory", "sized", "sqlite", "redis"])
+async def backend(request, tmp_path, redis_stub):
+    """Create each cache backend in turn."""
+    if request.param == "memory":
+        cache = MemoryCache()
+    elif request.param == "sized":
+        cache = SizedMemoryCache()
+    elif request.param == "sqlite":
+        cache = SQLiteCache(str(tmp_path / "cache.sqlite3"))
+    else:
+        cache = RedisCache(redis_stub.url)
+    yield cache
+    if hasattr(cache, "close"):
+        cache.close()
+
+
+@pytest.mark.asyncio
+async def test_backend_interface(backend):
+    """Test TTL, deletion and metrics on every backend."""
+    await backend.set("key", {"value": [1, 2]}, ttl=60)
+    await backend.set("expired", 1, ttl=-1)
+
+    assert await backend.get("key") == {"value": [1, 2]}
+    assert await backend.get("expired") is None
+    assert await backend.delete("key") is True
+    assert await backend.delete("key") is False
+    assert await backend.get("key") is None
+
+    stats = await backend.stats()
+    assert stats["name"] == backend.name
+    assert (stats["hits"], stats["misses"]) == (1, 2)
+    assert stats["hit_ratio"] == pytest.approx(1 / 3)
+
+
+@pytest.mark.asyncio
+async def test_backend_tag_invalidation(backend):
+    """Test that invalidating a tag removes exactly the entries stored with it."""
+    await backend.set("alerts/KS", 1, ttl=60, tags=["alerts", "KS"])
+    await backend.set("alerts/MO", 2, ttl=60, tags=["alerts"])
+    await backend.set("points/KS", 3, ttl=60, tags=["points", "KS"])
+
+    assert await backend.invalidate_tag("alerts") == 2
+    assert await backend.invalidate_tag("alerts") == 0
+    assert await backend.get("alerts/KS") is None
+    assert await backend.get("alerts/MO") is None
+    assert await backend.get("points/KS") == 3
+
+    # Storing an entry again replaces its tags
+    await backend.set("points/KS", 4, ttl=60, tags=["points"])
+    assert await backend.invalidate_tag("KS") == 0
+    assert await backend.get("points/KS") == 4
+
+    await backend.clear()
+    assert await backend.get("points/KS") is None
+    assert (await backend.stats())["invalidations"] == 2
+
+
+@pytest.mark.asyncio
+async def test_backend_values_are_copies(backend):
+    """Test that changing a stored or returned value leaves the entry alone."""
+    value = {"features": [{"id": "a"}]}
+    await backend.set("alerts", value, ttl=60)
+    value["features"].append({"id": "b"})
+
+    first = await backend.get("alerts")
+    first["features"].clear()
+
+    assert await backend.get("alerts") == {"features": [{"id": "a"}]}
+
+
+@pytest.mark.asyncio
+async def test_sized_memory_cache_evicts_by_bytes():
+    """Test that the sized cache stays within its byte limit."""
+    cache = SizedMemoryCache(max_bytes=250)
+    await cache.set("a", "x" * 100, ttl=60)
+    await cache.set("b", "y" * 100, ttl=60)
+    assert cache.bytes == 2 * (1 + 102)
+
+    await cache.get("a")
+    await cache.set("c", "z" * 100, ttl=60)
+
+    assert await cache.get("b") is None
+    assert await cache.get("a") is not None
+    assert cache.bytes == 2 * (1 + 102)
+
+    # An entry larger than the whole cache is not stored at all
+    await cache.set("huge", "h" * 1000, ttl=60)
+    assert await cache.get("huge") is None
+    assert await cache.get("c") is not None
+
+    stats = await cache.stats()
+    assert stats["max_bytes"] == 250
+    assert stats["evictions"] == 1
+
+
+@pytest.mark.asyncio
+async def test_memory_cache_shrink_and_resize():
+    """Test shedding a share of entries and lowering the byte limit."""
+    cache = SizedMemoryCache(max_bytes=1000)
+    for key in "abcd":
+        await cache.set(key, "x" * 100, ttl=60)
+    await cache.get("a")
+
+    assert cache.shrink(0.5) == 2
+    assert [await cache.get(key) is not None for key in "abcd"] == [
+        True,
+        False,
+        False,
+        True,
+    ]
+
+    # Reading the entries above left "d" as the most recently used
+    assert cache.resize(150) == 1
+    assert await cache.get("d") is not None
+    assert cache.bytes == 103
+    assert (await cache.stats())["evictions"] == 3
+
+
+def test_output_cache_bounded_by_size():
+    """Test that the output cache evicts by size and sheds on request."""
+    outputs = OutputCache()
+    for key in "abcd":
+        outputs.set((key,), "x" * 100)
+    assert outputs.bytes == 400
+
+    assert outputs.resize(250) == 2
+    assert outputs.get(("b",)) is None
+    assert outputs.shrink(0.5) == 1
+    assert len(outputs) == 1
+    assert outputs.bytes == 100
+
+
+@pytest.mark.asyncio
+async def test_redis_cache_uses_server_expiry(redis_stub):
+    """Test that Redis entries and tag sets carry TTLs."""
+    cache = RedisCache(redis_stub.url, prefix="test:")
+    await cache.set("short", 1, ttl=10, tags=["tag"])
+    await cache.set("long", 2, ttl=100, tags=["tag"])
+
+    assert 0 < redis_stub._pttl(b"test:k:short") <= 10_000
+    # The tag set lives as long as its longest-lived entry
+    assert 10_000 < redis_stub._pttl(b"test:t:tag") <= 100_000
+
+    stats = await cache.stats()
+    # Two entries, their tag lists and the tag set
+    assert stats["entries"] == 5
+    assert stats["bytes"] > 0
+    cache.close()
+
+
+@pytest.mark.asyncio
+async def test_redis_cache_unreachable():
+    """Test that an unreachable Redis server degrades to cache misses."""
+    cache = RedisCache("redis://127.0.0.1:1/0", timeout=0.5)
+    await cache.set("key", 1, ttl=60)
+
+    assert await cache.get("key") is None
+    assert await cache.invalidate_tag("tag") == 0
+    stats = await cache.stats()
+    assert stats["entries"] is None
+    assert (stats["sets"], stats["misses"]) == (0, 1)
+
+
+def test_create_cache(tmp_path, monkeypatch):
+    """Test selecting backends by name."""
+    monkeypatch.setenv("WEATHER_CACHE_MAX_BYTES", "1000")
+    assert create_cache("sized").max_bytes == 1000
+    assert isinstance(create_cache("none"), NullCache)
+    assert create_cache("redis").port == 6379
+
+    with pytest.raises(ValueError):
+        create_cache("sqlite")
+    with pytest.raises(ValueError):
+        create_cache("memcached")
+
+    monkeypatch.setenv("WEATHER_CACHE_BACKEND", "Sized")
+    set_cache(None)
+    assert isinstance(get_cache(), SizedMemoryCache)
+
+
+@pytest.mark.asyncio
+async def test_cache_stats_resource(weather_server, fresh_cache):
+    """Test the cache://stats resource."""
+    await fresh_cache.set("key", 1, ttl=60)
+    await fresh_cache.get("key")
+
+    contents = await weather_server.read_resource("cache://stats")
+    text = contents[0].content if hasattr(contents[0], "content") else contents[0]
+
+    assert "Response cache: memory, Entries: 1" in str(text)
+    assert "Hits: 1" in str(text)
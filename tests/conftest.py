@@ -1,9 +1,29 @@
 """Pytest configuration and fixtures."""
 
 import pytest
+from src.weather.cache import MemoryCache, set_cache, set_output_cache
+from src.weather.memory import set_governor
 from src.weather.server import create_server
 
 
+@pytest.fixture(autouse=True)
+def fresh_cache():
+    """Give every test an empty response cache and output cache."""
+    cache = MemoryCache()
+    set_cache(cache)
+    set_output_cache(None)
+    yield cache
+    set_cache(None)
+    set_output_cache(None)
+
+
+@pytest.fixture(autouse=True)
+async def fresh_governor():
+    """Stop any memory governor a tool call started, while its loop runs."""
+    yield
+    set_governor(None)
+
+
 @pytest.fixture
 def weather_server():
     """Create a weather server instance for testing."""
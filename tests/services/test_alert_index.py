@@ -0,0 +1,171 @@
+"""Tests for the alert spatial index."""
+
+import pytest
+from unittest.mock import patch, AsyncMock
+from src.weather.services import weather_service
+from src.weather.services.alert_index import AlertIndex
+
+
+def square(x0, y0, x1, y1):
+    """Build a closed (lon, lat) ring for an axis-aligned rectangle."""
+    return [[x0, y0], [x1, y0], [x1, y1], [x0, y1], [x0, y0]]
+
+
+def alert(alert_id, geometry=None, zones=(), sent="2025-01-01T00:00:00Z", updated=None):
+    """Build a minimal alert feature."""
+    return {
+        "id": alert_id,
+        "geometry": geometry,
+        "properties": {
+            "id": alert_id,
+            "event": f"Event {alert_id}",
+            "sent": sent,
+            "updated": updated or sent,
+            "geocode": {"UGC": list(zones)},
+        },
+    }
+
+
+@pytest.fixture
+def fresh_alert_index():
+    """Reset the service-level alert index around a test."""
+    with (
+        patch.object(weather_service, "_alert_index", AlertIndex()),
+        patch.object(weather_service, "_alert_index_refreshed", 0.0),
+    ):
+        yield
+
+
+def test_polygon_lookup():
+    """Test that only polygons containing the point match."""
+    index = AlertIndex()
+    index.update(
+        [
+            alert("a", {"type": "Polygon", "coordinates": [square(-97, 38, -96, 39)]}),
+            alert("b", {"type": "Polygon", "coordinates": [square(-90, 30, -89, 31)]}),
+        ]
+    )
+
+    assert [f["id"] for f in index.lookup(38.5, -96.5)] == ["a"]
+    assert index.lookup(30.5, -96.5) == []
+
+
+def test_polygon_with_hole():
+    """Test that points inside a hole do not match."""
+    index = AlertIndex()
+    rings = [square(-98, 37, -95, 40), square(-97, 38, -96, 39)]
+    index.update([alert("a", {"type": "Polygon", "coordinates": rings})])
+
+    assert index.lookup(38.5, -96.5) == []
+    assert len(index.lookup(37.5, -97.5)) == 1
+
+
+def test_multipolygon_spanning_cells():
+    """Test MultiPolygon geometries covering several grid cells."""
+    index = AlertIndex(cell_size=0.5)
+    geometry = {
+        "type": "MultiPolygon",
+        "coordinates": [[square(-100, 35, -98, 37)], [square(-90, 30, -89.5, 30.5)]],
+    }
+    index.update([alert("a", geometry)])
+
+    assert len(index.lookup(36.9, -98.1)) == 1
+    assert len(index.lookup(30.2, -89.8)) == 1
+    assert index.lookup(33.0, -95.0) == []
+
+
+def test_zone_lookup():
+    """Test that alerts without geometry match through zone codes."""
+    index = AlertIndex()
+    index.update([alert("a", zones=["KSZ009", "KSZ010"]), alert("b", zones=["MOZ001"])])
+
+    assert [f["id"] for f in index.lookup(39.0, -96.0, ["KSC201", "KSZ009"])] == ["a"]
+    assert index.lookup(39.0, -96.0) == []
+
+
+def test_polygon_alert_ignores_zone_codes():
+    """Test that a polygon alert does not match the rest of its counties."""
+    index = AlertIndex()
+    geometry = {"type": "Polygon", "coordinates": [square(-97, 38, -96, 39)]}
+    index.update([alert("a", geometry, zones=["KSC201", "KSZ009"])])
+
+    assert index.lookup(39.5, -96.5, ["KSC201", "KSZ009"]) == []
+    assert [f["id"] for f in index.lookup(38.5, -96.5, ["KSC201"])] == ["a"]
+
+
+def test_incremental_update():
+    """Test that refreshing only touches added, changed and expired alerts."""
+    index = AlertIndex()
+    geometry = {"type": "Polygon", "coordinates": [square(-97, 38, -96, 39)]}
+    assert index.update([alert("a", geometry), alert("b", zones=["KSZ009"])]) == {
+        "added": 2,
+        "updated": 0,
+        "removed": 0,
+    }
+
+    moved = {"type": "Polygon", "coordinates": [square(-90, 30, -89, 31)]}
+    counts = index.update(
+        [alert("a", moved, updated="2025-01-01T01:00:00Z"), alert("c")]
+    )
+
+    assert counts == {"added": 1, "updated": 1, "removed": 1}
+    assert len(index) == 2
+    assert index.lookup(38.5, -96.5, ["KSZ009"]) == []
+    assert [f["id"] for f in index.lookup(30.5, -89.5)] == ["a"]
+
+
+def test_lookup_sorted_by_sent():
+    """Test that matches are returned oldest first."""
+    index = AlertIndex()
+    index.update(
+        [
+            alert("new", zones=["KSZ009"], sent="2025-01-02T00:00:00Z"),
+            alert("old", zones=["KSZ009"], sent="2025-01-01T00:00:00Z"),
+        ]
+    )
+
+    assert [f["id"] for f in index.lookup(0, 0, ["KSZ009"])] == ["old", "new"]
+
+
+@pytest.mark.asyncio
+async def test_get_alerts_for_point(fresh_alert_index):
+    """Test point lookup through the weather service."""
+    alerts = {
+        "features": [
+            alert("a", {"type": "Polygon", "coordinates": [square(-97, 38, -96, 39)]}),
+            alert("b", zones=["KSZ009"]),
+            alert("c", zones=["MOZ001"]),
+        ]
+    }
+    point = {
+        "properties": {
+            "forecastZone": "https://api.weather.gov/zones/forecast/KSZ009",
+            "county": "https://api.weather.gov/zones/county/KSC201",
+        }
+    }
+
+    async def fake_request(url, headers=None):
+        return alerts if url.endswith("/alerts/active") else point
+
+    with patch(
+        "src.weather.services.weather_service.make_request", side_effect=fake_request
+    ) as mock_request:
+        result = await weather_service.get_alerts_for_point(38.5, -96.5)
+        again = await weather_service.get_alerts_for_point(38.5, -96.5)
+
+    assert sorted(f["id"] for f in result) == ["a", "b"]
+    assert again == result
+    # Alerts and point metadata are fetched once and then served from the cache
+    assert mock_request.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_get_alerts_for_point_unavailable(fresh_alert_index):
+    """Test that None is returned when alerts have never been fetched."""
+    with patch(
+        "src.weather.services.weather_service.make_request", new_callable=AsyncMock
+    ) as mock_request:
+        mock_request.return_value = None
+        result = await weather_service.get_alerts_for_point(38.5, -96.5)
+
+    assert result is None
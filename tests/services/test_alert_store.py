@@ -0,0 +1,127 @@
+"""Tests for the versioned alert store."""
+
+import pytest
+from unittest.mock import patch, AsyncMock
+from src.weather.services import weather_service
+from src.weather.services.alert_store import AlertStore
+
+
+def alert(alert_id, sent="2025-01-01T00:00:00Z", updated=None, references=()):
+    """Build a minimal alert feature."""
+    return {
+        "id": alert_id,
+        "properties": {
+            "id": alert_id,
+            "event": f"Event {alert_id}",
+            "areaDesc": f"Area {alert_id}",
+            "sent": sent,
+            "updated": updated or sent,
+            "references": [{"identifier": ref} for ref in references],
+        },
+    }
+
+
+def ids(features):
+    """Get the ids of alert features."""
+    return [feature["id"] for feature in features]
+
+
+def test_changes_since_token():
+    """Test that only new, updated and expired alerts are reported."""
+    store = AlertStore()
+    store.update("KS", [alert("a"), alert("b"), alert("c")])
+    token = store.changes("KS")["token"]
+
+    store.update(
+        "KS", [alert("a"), alert("b", updated="2025-01-01T01:00:00Z"), alert("d")]
+    )
+    changes = store.changes("KS", token)
+
+    assert ids(changes["new"]) == ["d"]
+    assert ids(changes["updated"]) == ["b"]
+    assert changes["expired"] == [("c", "Event c", "Area c")]
+    assert not changes["resync"]
+    assert changes["token"] != token
+
+
+def test_unchanged_feed_keeps_version():
+    """Test that an unchanged feed reports no changes and the same token."""
+    store = AlertStore()
+    assert store.update("KS", [alert("a")], source="v1") == 1
+    token = store.changes("KS")["token"]
+
+    assert store.update("KS", [alert("a")], source="v1") == 1
+    assert store.update("KS", [alert("a")], source="v2") == 1
+    changes = store.changes("KS", token)
+
+    assert changes["token"] == token
+    assert changes["new"] == changes["updated"] == changes["expired"] == []
+
+
+def test_superseding_alert_reported_as_update():
+    """Test that an alert replacing an expired one counts as an update."""
+    store = AlertStore()
+    store.update("KS", [alert("a")])
+    token = store.changes("KS")["token"]
+
+    store.update("KS", [alert("a2", references=["a"])])
+    changes = store.changes("KS", token)
+
+    assert ids(changes["updated"]) == ["a2"]
+    assert changes["new"] == changes["expired"] == []
+
+
+def test_unknown_tokens_resync():
+    """Test that foreign, stale and malformed tokens get every alert."""
+    store = AlertStore(history=2)
+    store.update("KS", [alert("a")])
+    first = store.changes("KS")["token"]
+    store.update("KS", [alert("a"), alert("b")])
+    store.update("KS", [alert("b")])
+
+    for token in (first, AlertStore().changes("KS")["token"], "garbage"):
+        changes = store.changes("KS", token)
+        assert changes["resync"]
+        assert ids(changes["new"]) == ["b"]
+
+    assert store.changes("MO", store.changes("KS")["token"])["resync"]
+    assert not store.changes("KS")["resync"]
+
+
+def test_shrink_keeps_current_version():
+    """Test that shedding history forgets old versions but never the current one."""
+    store = AlertStore()
+    for i in range(5):
+        store.update("KS", [alert(str(n)) for n in range(i + 1)])
+    store.update("MO", [alert("m")])
+    first = store.changes("KS")["token"].rsplit(".", 1)[0] + ".1"
+    assert len(store) == 6
+
+    assert store.shrink(0.5) == 2
+    assert store.changes("KS", first)["resync"]
+    assert store.shrink(1.0) == 2
+    assert len(store) == 2
+    assert not store.changes("KS", store.changes("KS")["token"])["resync"]
+
+
+@pytest.mark.asyncio
+async def test_get_alert_changes_service():
+    """Test polling alert changes through the weather service."""
+    with (
+        patch.object(weather_service, "_alert_store", AlertStore()),
+        patch(
+            "src.weather.services.weather_service.make_request",
+            new_callable=AsyncMock,
+        ) as mock_request,
+    ):
+        mock_request.return_value = {"features": [alert("a")]}
+        first = await weather_service.get_alert_changes("ks")
+        assert ids(first["new"]) == ["a"]
+
+        # Served from the response cache: nothing changed
+        again = await weather_service.get_alert_changes("KS", first["token"])
+        assert again["token"] == first["token"]
+        assert again["new"] == []
+
+        mock_request.return_value = None
+        assert await weather_service.get_alert_changes("MO") is None
@@ -0,0 +1,104 @@
+"""Tests for the gazetteer module."""
+
+import pytest
+
+from src.weather.services.gazetteer import (
+    Gazetteer,
+    build_from_census,
+    get_gazetteer,
+    normalize,
+    parse_query,
+)
+
+PLACES = """\
+# key\tname\tstate\tlatitude\tlongitude\tweight
+boulder city,nv\tBoulder City\tNV\t35.9786\t-114.8325\t15000
+boulder,co\tBoulder\tCO\t40.0150\t-105.2705\t108000
+springfield,il\tSpringfield\tIL\t39.7817\t-89.6501\t114000
+springfield,mo\tSpringfield\tMO\t37.2090\t-93.2923\t168000
+st louis,mo\tSt. Louis\tMO\t38.6270\t-90.1994\t300000
+"""
+
+
+@pytest.fixture
+def gazetteer(tmp_path):
+    """Gazetteer over a small place file."""
+    path = tmp_path / "places.tsv"
+    path.write_text(PLACES, encoding="utf-8")
+    gazetteer = Gazetteer(path)
+    yield gazetteer
+    gazetteer.close()
+
+
+def test_normalize():
+    """Test that case, accents, punctuation and abbreviations are unified."""
+    assert normalize("Saint Louis") == normalize("St. Louis") == "st louis"
+    assert normalize("Mayagüez") == "mayaguez"
+    assert normalize("Coeur d'Alene") == "coeur d alene"
+
+
+def test_parse_query():
+    """Test splitting the state from queries in the forms people write."""
+    assert parse_query("Boulder, CO") == ("boulder", "co")
+    assert parse_query("boulder colorado") == ("boulder", "co")
+    assert parse_query("Charleston, West Virginia") == ("charleston", "wv")
+    assert parse_query("charleston west virginia") == ("charleston", "wv")
+    assert parse_query("Boulder") == ("boulder", None)
+    # A lone state name is a place name
+    assert parse_query("Washington") == ("washington", None)
+
+
+def test_search_exact_before_prefix(gazetteer):
+    """Test that an exact name wins over longer names starting with it."""
+    assert len(gazetteer) == 5
+    assert [p.name for p in gazetteer.search("boulder")] == ["Boulder"]
+    assert [p.name for p in gazetteer.search("bould")] == ["Boulder", "Boulder City"]
+
+
+def test_search_ranks_by_weight_and_filters_state(gazetteer):
+    """Test that places sharing a name rank by weight unless a state is given."""
+    assert [p.state for p in gazetteer.search("Springfield")] == ["MO", "IL"]
+    assert gazetteer.resolve("Springfield, Illinois").state == "IL"
+    assert gazetteer.resolve("saint louis").name == "St. Louis"
+
+
+def test_search_fuzzy(gazetteer):
+    """Test that misspelled names fall back to trigram similarity."""
+    place = gazetteer.resolve("Sprinfield MO")
+    assert (place.name, place.state) == ("Springfield", "MO")
+    assert gazetteer.resolve("Xyzzy") is None
+    assert gazetteer.search("") == []
+
+
+def test_bundled_gazetteer():
+    """Test that the bundled place file is sorted and loads."""
+    gazetteer = get_gazetteer()
+    keys = [gazetteer._key(i) for i in range(len(gazetteer))]
+    assert keys == sorted(keys)
+    place = gazetteer.resolve("Boulder, CO")
+    assert (place.latitude, place.longitude) == (40.015, -105.2705)
+
+
+def test_build_from_census(tmp_path):
+    """Test converting a Census gazetteer file, dropping area descriptions."""
+    source = tmp_path / "census.txt"
+    source.write_text(
+        "USPS\tGEOID\tNAME\tALAND\tINTPTLAT\tINTPTLONG      \n"
+        "MO\t2965000\tSt. Louis city\t160343174\t38.635699\t-90.244582\n"
+        "CO\t0807850\tBoulder city\t66500000\t40.027443\t-105.251945\n",
+        encoding="utf-8",
+    )
+    destination = tmp_path / "places.tsv"
+
+    assert build_from_census(source, destination) == 2
+
+    gazetteer = Gazetteer(destination)
+    assert gazetteer.resolve("st louis") == (
+        "St. Louis",
+        "MO",
+        38.6357,
+        -90.2446,
+        160343,
+    )
+    assert gazetteer.resolve("Boulder, CO").name == "Boulder"
+    gazetteer.close()
@@ -0,0 +1,90 @@
+"""Tests for the station index module."""
+
+import random
+
+import pytest
+from src.weather.services.station_index import (
+    StationIndex,
+    distance_km,
+    parse_stations,
+)
+
+
+def random_stations(count, seed=0):
+    """Generate stations scattered over North America."""
+    rng = random.Random(seed)
+    return [
+        (f"S{i:05d}", f"Station {i}", rng.uniform(20, 65), rng.uniform(-170, -60), "")
+        for i in range(count)
+    ]
+
+
+def test_nearest_matches_brute_force():
+    """Test that KD-tree lookups agree with an exhaustive search."""
+    stations = random_stations(3000)
+    index = StationIndex(stations)
+    rng = random.Random(1)
+
+    for _ in range(50):
+        latitude, longitude = rng.uniform(20, 65), rng.uniform(-170, -60)
+        expected = sorted(
+            stations,
+            key=lambda station: distance_km(latitude, longitude, *station[2:4]),
+        )[:4]
+
+        found = index.nearest(latitude, longitude, 4)
+
+        assert [station for station, _ in found] == expected
+        assert [distance for _, distance in found] == pytest.approx(
+            [distance_km(latitude, longitude, *station[2:4]) for station in expected]
+        )
+
+
+def test_nearest_across_antimeridian():
+    """Test that stations on either side of 180° are neighbours."""
+    index = StationIndex(
+        [
+            ("WEST", "West", 52.0, 179.9, ""),
+            ("EAST", "East", 52.0, -179.9, ""),
+            ("FAR", "Far", 52.0, 170.0, ""),
+        ]
+    )
+
+    found = index.nearest(52.0, -179.95, 2)
+
+    assert [station[0] for station, _ in found] == ["EAST", "WEST"]
+
+
+def test_nearest_edge_cases():
+    """Test empty indexes and requests for more stations than exist."""
+    assert StationIndex().nearest(40.0, -100.0, 3) == []
+
+    index = StationIndex(random_stations(2))
+    assert len(index.nearest(40.0, -100.0, 5)) == 2
+    assert index.nearest(40.0, -100.0, 0) == []
+
+
+def test_distance_km():
+    """Test great-circle distances."""
+    assert distance_km(40.0, -100.0, 41.0, -100.0) == pytest.approx(111.2, abs=0.1)
+    assert distance_km(40.0, -100.0, 40.0, -100.0) == 0.0
+
+
+def test_parse_stations():
+    """Test reducing station features to compact records."""
+    features = [
+        {
+            "geometry": {"type": "Point", "coordinates": [-96.67, 39.13]},
+            "properties": {
+                "stationIdentifier": "KMHK",
+                "name": "Manhattan Regional Airport",
+                "timeZone": "America/Chicago",
+            },
+        },
+        {"geometry": None, "properties": {"stationIdentifier": "NOGEO"}},
+        {"geometry": {"type": "Point", "coordinates": [-96.0, 39.0]}},
+    ]
+
+    assert parse_stations(features) == [
+        ("KMHK", "Manhattan Regional Airport", 39.13, -96.67, "America/Chicago")
+    ]
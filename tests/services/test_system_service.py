@@ -0,0 +1,172 @@
+"""Tests for the system service module."""
+
+import asyncio
+import os
+import sys
+
+import pytest
+from src.weather.services import system_service
+from src.weather.services.system_service import ShellPool, run_shell_command
+from src.weather.utils.deadline import deadline
+
+
+def running(pid):
+    """Check whether a process is still running (not gone or a zombie)."""
+    try:
+        with open(f"/proc/{pid}/stat") as f:
+            return f.read().rsplit(")", 1)[1].split()[0] != "Z"
+    except FileNotFoundError:
+        return False
+
+
+@pytest.mark.asyncio
+async def test_run_shell_command_success():
+    """Test running a successful command."""
+    result = await run_shell_command("echo hello")
+
+    assert result == {"success": True, "stdout": "hello\n", "stderr": ""}
+
+
+@pytest.mark.asyncio
+async def test_run_shell_command_failure():
+    """Test running a failing command."""
+    result = await run_shell_command("echo oops >&2; exit 3")
+
+    assert result == {"success": False, "stdout": "", "stderr": "oops\n"}
+
+
+@pytest.mark.skipif(sys.platform != "linux", reason="reads /proc")
+@pytest.mark.asyncio
+async def test_run_shell_command_timeout_kills_process_group(tmp_path):
+    """Test that a command past its timeout is killed with its children."""
+    pid_file = tmp_path / "pid"
+
+    result = await run_shell_command(
+        f"echo started; echo warning >&2; sleep 30 & echo $! > {pid_file}; wait",
+        timeout=0.2,
+    )
+
+    assert result == {
+        "success": False,
+        "stdout": "started\n",
+        "stderr": "warning\nCommand timed out after 0.2s",
+        "timed_out": True,
+    }
+    await asyncio.sleep(0.1)
+    assert not running(int(pid_file.read_text()))
+
+
+@pytest.mark.asyncio
+async def test_run_shell_command_outlives_tool_budget():
+    """Test that shell commands are not held to the upstream time budget."""
+    with deadline(0.1):
+        result = await run_shell_command("sleep 0.3; echo done")
+
+    assert result == {"success": True, "stdout": "done\n", "stderr": ""}
+
+
+@pytest.mark.skipif(sys.platform != "linux", reason="reads /proc")
+@pytest.mark.asyncio
+async def test_run_shell_command_cancelled_kills_process(tmp_path):
+    """Test that cancelling the caller kills the command."""
+    pid_file = tmp_path / "pid"
+    task = asyncio.create_task(run_shell_command(f"echo $$ > {pid_file}; sleep 30"))
+    while not pid_file.exists() or not pid_file.read_text().strip():
+        await asyncio.sleep(0.01)
+
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+    await asyncio.sleep(0.1)
+    assert not running(int(pid_file.read_text()))
+
+
+@pytest.fixture
+async def shell_pool():
+    """Shell pool with one shell, replaced every three commands."""
+    pool = ShellPool(size=1, max_commands=3, max_output=1000)
+    yield pool
+    await pool.close()
+
+
+@pytest.mark.asyncio
+async def test_shell_pool_runs_commands_in_subshells(shell_pool):
+    """Test that pooled commands see none of each other's state."""
+    assert await shell_pool.run("cd / && X=1 && exit 0", 5) == {
+        "success": True,
+        "stdout": "",
+        "stderr": "",
+    }
+    result = await shell_pool.run('pwd; echo "x=$X"; printf end', 5)
+
+    assert result["stdout"] == f"{os.getcwd()}\nx=\nend"
+    assert await shell_pool.run("echo oops >&2; exit 3", 5) == {
+        "success": False,
+        "stdout": "",
+        "stderr": "oops\n",
+    }
+
+
+@pytest.mark.asyncio
+async def test_shell_pool_reuses_and_recycles_shells(shell_pool):
+    """Test that a shell serves several commands and is then replaced."""
+    pids = [(await shell_pool.run("echo $$", 5))["stdout"] for _ in range(6)]
+
+    assert pids[0] == pids[1] == pids[2]
+    assert pids[3] == pids[4] == pids[5]
+    assert pids[0] != pids[3]
+
+
+@pytest.mark.asyncio
+async def test_shell_pool_does_not_read_commands_as_input(shell_pool):
+    """Test that a command reading stdin cannot consume later commands."""
+    result = await shell_pool.run("cat", 5)
+
+    assert result["stdout"] == ""
+    assert (await shell_pool.run("echo next", 5))["stdout"] == "next\n"
+
+
+@pytest.mark.skipif(sys.platform != "linux", reason="reads /proc")
+@pytest.mark.asyncio
+async def test_shell_pool_timeout_kills_shell(shell_pool, tmp_path):
+    """Test that a command past its timeout is killed with its shell."""
+    pid_file = tmp_path / "pid"
+
+    result = await shell_pool.run(
+        f"echo $$ > {pid_file}; echo started; echo warning >&2; sleep 30", 0.2
+    )
+
+    assert result == {
+        "success": False,
+        "stdout": "started\n",
+        "stderr": "warning\nCommand timed out after 0.2s",
+        "timed_out": True,
+    }
+    await asyncio.sleep(0.1)
+    assert not running(int(pid_file.read_text()))
+    assert (await shell_pool.run("echo next", 5))["stdout"] == "next\n"
+
+
+@pytest.mark.asyncio
+async def test_shell_pool_output_limit(shell_pool):
+    """Test that a command writing too much output is stopped."""
+    result = await shell_pool.run("yes", 5)
+
+    assert result == {
+        "success": False,
+        "stdout": "",
+        "stderr": "Command stopped after 1000 bytes of output",
+    }
+    assert (await shell_pool.run("echo next", 5))["stdout"] == "next\n"
+
+
+@pytest.mark.asyncio
+async def test_run_shell_command_uses_pool(shell_pool, monkeypatch):
+    """Test that run_shell_command runs commands in the configured pool."""
+    monkeypatch.setattr(system_service, "_shell_pool", shell_pool)
+
+    first = await run_shell_command("echo $$")
+    second = await run_shell_command("echo $$")
+
+    assert first["stdout"] == second["stdout"]
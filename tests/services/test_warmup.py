@@ -0,0 +1,152 @@
+"""Tests for the cache warm-up subsystem."""
+
+import asyncio
+import time
+
+import pytest
+from unittest.mock import DEFAULT, AsyncMock, patch
+from src.weather.services import warmup
+from src.weather.services.warmup import RateLimiter, Warmer, load_config, warmup_running
+
+POINT = {
+    "properties": {"forecast": "https://api.weather.gov/gridpoints/TOP/32,81/forecast"}
+}
+
+
+class FakeClock:
+    """Manually advanced monotonic clock."""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def config_file(tmp_path):
+    """Write a small watch-list."""
+    path = tmp_path / "warmup.toml"
+    path.write_text(
+        "concurrency = 2\n"
+        "rate = 1000.0\n"
+        'states = ["ks"]\n'
+        "locations = [[39.7456, -97.0892], { latitude = 38.9, longitude = -96.5 }]\n"
+    )
+    return str(path)
+
+
+@pytest.fixture
+def mock_service():
+    """Patch the weather service functions used by the warmer."""
+    with patch.multiple(
+        "src.weather.services.weather_service",
+        get_weather_point=DEFAULT,
+        get_weather_forecast=DEFAULT,
+        get_weather_alerts=DEFAULT,
+        new_callable=AsyncMock,
+    ) as mocks:
+        mocks["get_weather_point"].return_value = POINT
+        mocks["get_weather_forecast"].return_value = {"properties": {"periods": []}}
+        mocks["get_weather_alerts"].return_value = {"features": []}
+        yield mocks
+
+
+def test_load_config(config_file):
+    """Test watch-list parsing and defaults."""
+    config = load_config(config_file)
+
+    assert config["locations"] == [(39.7456, -97.0892), (38.9, -96.5)]
+    assert config["states"] == ["KS"]
+    assert config["concurrency"] == 2
+    assert config["refresh_margin"] == 30
+
+
+def test_load_config_invalid_location(tmp_path):
+    """Test that malformed locations are rejected."""
+    path = tmp_path / "warmup.toml"
+    path.write_text('locations = [["north", 1]]\n')
+
+    with pytest.raises(ValueError):
+        load_config(str(path))
+
+
+@pytest.mark.asyncio
+async def test_rate_limiter():
+    """Test that acquisitions are spaced at the configured rate."""
+    limiter = RateLimiter(rate=100)
+
+    start = time.perf_counter()
+    for _ in range(6):
+        await limiter.acquire()
+
+    assert time.perf_counter() - start >= 0.045
+
+
+@pytest.mark.asyncio
+async def test_warmer_schedule(config_file, mock_service):
+    """Test the initial warm-up and refreshes shortly before expiry."""
+    clock = FakeClock()
+    warmer = Warmer(load_config(config_file), clock=clock)
+
+    assert await warmer.run_once() == {"refreshed": 3, "failed": 0}
+    assert mock_service["get_weather_point"].await_count == 2
+    mock_service["get_weather_forecast"].assert_awaited_with(
+        POINT["properties"]["forecast"], refresh=True
+    )
+    mock_service["get_weather_alerts"].assert_awaited_once_with("KS", refresh=True)
+
+    # Nothing is due again until the alerts are about to expire
+    assert await warmer.run_once() == {"refreshed": 0, "failed": 0}
+    assert warmer.seconds_until_due() == 30
+
+    clock.now += 30
+    assert await warmer.run_once() == {"refreshed": 1, "failed": 0}
+
+    # Forecasts are refreshed, but point metadata is reused from the cache
+    clock.now += 600
+    await warmer.run_once()
+    assert mock_service["get_weather_forecast"].await_count == 4
+    mock_service["get_weather_point"].assert_awaited_with(38.9, -96.5, refresh=False)
+
+
+@pytest.mark.asyncio
+async def test_warmer_retries_failures(config_file, mock_service):
+    """Test that failed entries are retried after the retry interval."""
+    clock = FakeClock()
+    warmer = Warmer(load_config(config_file), clock=clock)
+    mock_service["get_weather_alerts"].return_value = None
+
+    assert await warmer.run_once() == {"refreshed": 2, "failed": 1}
+
+    clock.now += 59
+    assert (await warmer.run_once())["failed"] == 0
+    clock.now += 1
+    assert (await warmer.run_once())["failed"] == 1
+
+
+@pytest.mark.asyncio
+async def test_warmup_running_shared(config_file, mock_service):
+    """Test that nested users share one warm-up loop."""
+    async with warmup_running(config_file) as first:
+        async with warmup_running(config_file) as second:
+            assert first is second is not None
+        # The shared loop keeps running for the remaining user
+        assert warmup._task is not None
+        for _ in range(100):
+            if mock_service["get_weather_alerts"].await_count:
+                break
+            await asyncio.sleep(0.01)
+
+    assert warmup._task is None
+    assert mock_service["get_weather_alerts"].await_count == 1
+
+
+@pytest.mark.asyncio
+async def test_warmup_running_without_config(monkeypatch):
+    """Test that warm-up is a no-op when no watch-list is configured."""
+    monkeypatch.delenv("WEATHER_WARMUP_CONFIG", raising=False)
+
+    async with warmup_running() as warmer:
+        assert warmer is None
+    assert warmup._users == 0
@@ -1,12 +1,19 @@
 """Tests for the weather service module."""
 
+import json
+
 import pytest
 from unittest.mock import patch, AsyncMock
+from src.weather.cache import SizedMemoryCache, encode, set_cache
 from src.weather.services.weather_service import (
     get_weather_alerts,
     get_weather_point,
     get_weather_forecast,
+    get_gridpoint_data,
+    payload_version,
+    payload_versions,
 )
+from src.weather.utils.deadline import MAX_HOP_TIMEOUT, deadline, hop_timeout
 
 
 @pytest.mark.asyncio
@@ -129,3 +136,303 @@ async def test_get_weather_forecast_failure():
         result = await get_weather_forecast(forecast_url)
 
         assert result is None
+
+
+@pytest.mark.asyncio
+async def test_get_weather_point_cached():
+    """Test that repeated point lookups are served from the cache."""
+    mock_data = {
+        "properties": {
+            "forecast": "https://api.weather.gov/gridpoints/ABC/1,2/forecast"
+        }
+    }
+
+    with patch(
+        "src.weather.services.weather_service.make_request", new_callable=AsyncMock
+    ) as mock_request:
+        mock_request.return_value = mock_data
+        first = await get_weather_point(37.7749, -122.4194)
+        second = await get_weather_point(37.7749, -122.4194)
+
+        assert first == second == mock_data
+        mock_request.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_get_weather_alerts_failure_not_cached():
+    """Test that failed requests are retried instead of cached."""
+    with patch(
+        "src.weather.services.weather_service.make_request", new_callable=AsyncMock
+    ) as mock_request:
+        mock_request.return_value = None
+        await get_weather_alerts("CA")
+        await get_weather_alerts("CA")
+
+        assert mock_request.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_get_gridpoint_data_success():
+    """Test successful raw gridpoint data retrieval."""
+    mock_data = {
+        "properties": {
+            "validTimes": "2025-03-18T04:00:00+00:00/P7DT21H",
+            "temperature": {"uom": "wmoUnit:degC", "values": []},
+        }
+    }
+
+    with patch(
+        "src.weather.services.weather_service.make_request", new_callable=AsyncMock
+    ) as mock_request:
+        mock_request.return_value = mock_data
+        result = await get_gridpoint_data("https://api.weather.gov/gridpoints/ABC/1,2")
+
+        assert result == mock_data
+        mock_request.assert_called_once_with(
+            "https://api.weather.gov/gridpoints/ABC/1,2",
+            headers={"Accept": "application/geo+json"},
+        )
+
+
+@pytest.mark.asyncio
+async def test_get_gridpoint_data_refresh():
+    """Test that refresh bypasses a cached gridpoint response."""
+    url = "https://api.weather.gov/gridpoints/ABC/1,2"
+
+    with patch(
+        "src.weather.services.weather_service.make_request", new_callable=AsyncMock
+    ) as mock_request:
+        mock_request.return_value = {"properties": {}}
+        await get_gridpoint_data(url)
+        await get_gridpoint_data(url)
+        await get_gridpoint_data(url, refresh=True)
+
+        assert mock_request.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_get_weather_point_refresh_falls_back_to_cache():
+    """Test that a failed forced refresh returns the cached response."""
+    mock_data = {"properties": {}}
+
+    with patch(
+        "src.weather.services.weather_service.make_request", new_callable=AsyncMock
+    ) as mock_request:
+        mock_request.return_value = mock_data
+        await get_weather_point(37.7749, -122.4194)
+
+        mock_request.return_value = None
+        result = await get_weather_point(37.7749, -122.4194, refresh=True)
+
+        assert result == mock_data
+        assert mock_request.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_cache_hit_leaves_budget_to_next_hop():
+    """Test that a cached first hop gives its time to the second."""
+    timeouts = []
+
+    async def request(url, headers=None):
+        timeouts.append(hop_timeout())
+        return {"properties": {}}
+
+    with patch(
+        "src.weather.services.weather_service.make_request", side_effect=request
+    ):
+        await get_weather_point(37.7749, -122.4194)
+        with deadline(20, hops=2):
+            await get_weather_point(37.7749, -122.4194)
+            await get_gridpoint_data("https://api.weather.gov/gridpoints/ABC/1,2")
+
+    assert timeouts[0] == MAX_HOP_TIMEOUT
+    assert timeouts[1] > 10
+
+
+@pytest.mark.asyncio
+async def test_payload_versions_tracked_across_cache_hits():
+    """Test that payload versions are reported for fetches and cache hits."""
+    with patch(
+        "src.weather.services.weather_service.make_request", new_callable=AsyncMock
+    ) as mock_request:
+        mock_request.return_value = {"features": [{"id": "a"}]}
+        with payload_versions() as fetched:
+            await get_weather_alerts("KS")
+        with payload_versions() as cached:
+            await get_weather_alerts("KS")
+
+        mock_request.return_value = {"features": [{"id": "b"}]}
+        with payload_versions() as refreshed:
+            await get_weather_alerts("KS", refresh=True)
+
+    assert fetched == cached == [payload_version({"features": [{"id": "a"}]})]
+    assert refreshed[0] != fetched[0]
+
+
+@pytest.mark.asyncio
+async def test_response_and_version_stored_together():
+    """Test that a fetch is encoded once and cached in one entry with its version."""
+    cache = SizedMemoryCache()
+    set_cache(cache)
+    payload = {"features": [{"id": "a"}]}
+
+    with (
+        patch(
+            "src.weather.services.weather_service.make_request",
+            new_callable=AsyncMock,
+            return_value=payload,
+        ),
+        patch("src.weather.cache.base.json.dumps", wraps=json.dumps) as dumps,
+        payload_versions() as versions,
+    ):
+        await get_weather_alerts("KS")
+
+    assert dumps.call_count == 1
+    assert len(cache) == 1
+    key = next(iter(cache._entries))
+    entry = await cache.get(key)
+    assert entry == {"data": payload, "version": versions[0]}
+    assert cache.bytes == len(key) + len(encode(entry))
+
+
+def observation(temperature):
+    """Build an observation response."""
+    return {
+        "properties": {
+            "timestamp": "2024-01-01T12:00:00+00:00",
+            "temperature": {"value": temperature, "unitCode": "wmoUnit:degC"},
+        }
+    }
+
+
+@pytest.fixture
+def station_index(monkeypatch):
+    """Install a fresh station index over three Kansas stations."""
+    import time
+
+    from src.weather.services import weather_service
+    from src.weather.services.station_index import StationIndex
+
+    index = StationIndex(
+        [
+            ("KMHK", "Manhattan", 39.14, -96.67, "America/Chicago"),
+            ("KTOP", "Topeka", 39.07, -95.62, "America/Chicago"),
+            ("KDEN", "Denver", 39.85, -104.66, "America/Denver"),
+        ]
+    )
+    monkeypatch.setattr(weather_service, "_station_index", index)
+    monkeypatch.setattr(weather_service, "_station_list_fetched", time.time())
+    return index
+
+
+@pytest.mark.asyncio
+async def test_get_current_conditions_uses_station_index(station_index):
+    """Test that current conditions take one request, to the nearest station."""
+    from src.weather.services.weather_service import get_current_conditions
+
+    with patch(
+        "src.weather.services.weather_service.make_request", new_callable=AsyncMock
+    ) as mock_request:
+        mock_request.return_value = observation(5.0)
+        result = await get_current_conditions(39.2, -96.6)
+
+    assert mock_request.call_count == 1
+    assert mock_request.call_args[0][0].endswith("/stations/KMHK/observations/latest")
+    assert result["station"][0] == "KMHK"
+    assert result["distance_km"] < 10
+    assert result["observation"]["temperature"]["value"] == 5.0
+
+
+@pytest.mark.asyncio
+async def test_get_current_conditions_skips_stations_without_data(station_index):
+    """Test falling back to the next station when one reports no temperature."""
+    from src.weather.services.weather_service import get_current_conditions
+
+    with patch(
+        "src.weather.services.weather_service.make_request", new_callable=AsyncMock
+    ) as mock_request:
+        mock_request.side_effect = [observation(None), None]
+        # Denver is too far away to be tried
+        result = await get_current_conditions(39.2, -96.6)
+
+    assert mock_request.call_count == 2
+    assert result["station"][0] == "KMHK"
+    assert result["observation"]["temperature"]["value"] is None
+
+    with patch(
+        "src.weather.services.weather_service.make_request", new_callable=AsyncMock
+    ) as mock_request:
+        mock_request.return_value = observation(1.0)
+        assert await get_current_conditions(10.0, -150.0) is None
+        mock_request.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_get_current_conditions_before_index_built(monkeypatch):
+    """Test the point lookup fallback while the station index is empty."""
+    from src.weather.services import weather_service
+    from src.weather.services.station_index import StationIndex
+
+    monkeypatch.setattr(weather_service, "_station_index", StationIndex())
+    monkeypatch.setattr(weather_service, "_station_list_fetched", 0.0)
+    point = {"properties": {"observationStations": "https://api.weather.gov/points/s"}}
+    stations = {
+        "features": [
+            {
+                "geometry": {"type": "Point", "coordinates": [-96.67, 39.14]},
+                "properties": {"stationIdentifier": "KMHK", "name": "Manhattan"},
+            }
+        ]
+    }
+
+    with (
+        patch.object(weather_service, "_start_station_refresh") as mock_refresh,
+        patch(
+            "src.weather.services.weather_service.make_request",
+            new_callable=AsyncMock,
+        ) as mock_request,
+    ):
+        mock_request.side_effect = [point, stations, observation(3.0)]
+        result = await weather_service.get_current_conditions(39.2, -96.6)
+
+    mock_refresh.assert_called_once()
+    assert result["station"][0] == "KMHK"
+
+
+@pytest.mark.asyncio
+async def test_station_index_refresh(monkeypatch, fresh_cache):
+    """Test fetching every page of stations and loading them from the cache."""
+    from src.weather.services import weather_service
+    from src.weather.services.station_index import StationIndex
+
+    monkeypatch.setattr(weather_service, "_station_index", StationIndex())
+    monkeypatch.setattr(weather_service, "_station_list_fetched", 0.0)
+
+    def page(identifier, next_url):
+        return {
+            "features": [
+                {
+                    "geometry": {"type": "Point", "coordinates": [-96.0, 39.0]},
+                    "properties": {"stationIdentifier": identifier},
+                }
+            ],
+            "pagination": {"next": next_url},
+        }
+
+    with patch(
+        "src.weather.services.weather_service.make_request", new_callable=AsyncMock
+    ) as mock_request:
+        mock_request.side_effect = [page("A", "https://next"), page("B", None)]
+        await weather_service._refresh_stations()
+
+    assert len(weather_service._station_index) == 2
+    assert mock_request.call_args[0][0] == "https://next"
+
+    # A new process builds its index from the cached list
+    monkeypatch.setattr(weather_service, "_station_index", StationIndex())
+    monkeypatch.setattr(weather_service, "_station_list_fetched", 0.0)
+    with patch.object(weather_service, "_start_station_refresh") as mock_refresh:
+        index = await weather_service.get_station_index()
+
+    assert len(index) == 2
+    mock_refresh.assert_not_called()
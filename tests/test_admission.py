@@ -0,0 +1,297 @@
+"""Tests for admission control of tool calls."""
+
+import asyncio
+import time
+from types import SimpleNamespace
+
+import pytest
+from unittest.mock import patch
+from src.weather.admission import (
+    BATCH,
+    INTERACTIVE,
+    AdmissionController,
+    Overloaded,
+    call_identity,
+    set_controller,
+)
+from src.weather.services import weather_service
+from src.weather.utils.deadline import DEFAULT_BUDGET, current_budget, deadline
+
+
+async def hold(controller, tool, client, priority, release, order):
+    """Take a slot, record the admission and hold it until released."""
+    async with controller.admit(tool, client, priority):
+        order.append((tool, client, priority))
+        await release.wait()
+
+
+async def settle():
+    """Let queued tasks run until they block."""
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+@pytest.mark.asyncio
+async def test_tool_limit_queues_and_admits_in_order():
+    """Test that calls past the tool limit wait for a slot, in arrival order."""
+    controller = AdmissionController(max_concurrent=1)
+    release, order = asyncio.Event(), []
+    tasks = [
+        asyncio.create_task(hold(controller, "t", f"c{i}", INTERACTIVE, release, order))
+        for i in range(3)
+    ]
+    await settle()
+
+    assert [client for _, client, _ in order] == ["c0"]
+    snapshot = controller.snapshot()["tools"]["t"]
+    assert snapshot["active"] == 1
+    assert snapshot["queued_interactive"] == 2
+
+    release.set()
+    await asyncio.gather(*tasks)
+
+    assert [client for _, client, _ in order] == ["c0", "c1", "c2"]
+    snapshot = controller.snapshot()["tools"]["t"]
+    assert snapshot["active"] == 0
+    assert snapshot["admitted"] == 3
+    assert snapshot["queued"] == 2
+
+
+@pytest.mark.asyncio
+async def test_interactive_admitted_before_batch():
+    """Test that a waiting interactive call overtakes waiting batch calls."""
+    controller = AdmissionController(max_concurrent=2, batch_share=1.0)
+    first, release, order = asyncio.Event(), asyncio.Event(), []
+    running = [
+        asyncio.create_task(hold(controller, "t", "a", INTERACTIVE, first, order)),
+        asyncio.create_task(hold(controller, "t", "b", INTERACTIVE, release, order)),
+    ]
+    await settle()
+    waiting = [
+        asyncio.create_task(hold(controller, "t", "c", BATCH, release, order)),
+        asyncio.create_task(hold(controller, "t", "d", INTERACTIVE, release, order)),
+    ]
+    await settle()
+
+    first.set()
+    await settle()
+
+    assert [client for _, client, _ in order] == ["a", "b", "d"]
+    release.set()
+    await asyncio.gather(*running, *waiting)
+    assert order[-1][1] == "c"
+
+
+@pytest.mark.asyncio
+async def test_batch_share_reserves_slots_for_interactive():
+    """Test that batch calls cannot take every slot of a tool."""
+    controller = AdmissionController(max_concurrent=2, batch_share=0.5)
+    release, order = asyncio.Event(), []
+    tasks = [
+        asyncio.create_task(hold(controller, "t", "a", BATCH, release, order)),
+        asyncio.create_task(hold(controller, "t", "b", BATCH, release, order)),
+        asyncio.create_task(hold(controller, "t", "c", INTERACTIVE, release, order)),
+    ]
+    await settle()
+
+    assert [client for _, client, _ in order] == ["a", "c"]
+    assert controller.snapshot()["tools"]["t"]["queued_batch"] == 1
+
+    release.set()
+    await asyncio.gather(*tasks)
+
+
+@pytest.mark.asyncio
+async def test_client_limit():
+    """Test that one client cannot take more than its share of calls."""
+    controller = AdmissionController(max_per_client=1)
+    release, order = asyncio.Event(), []
+    tasks = [
+        asyncio.create_task(hold(controller, tool, client, INTERACTIVE, release, order))
+        for tool, client in (("t", "a"), ("u", "a"), ("t", "b"))
+    ]
+    await settle()
+
+    assert order == [("t", "a", INTERACTIVE), ("t", "b", INTERACTIVE)]
+    assert controller.snapshot()["clients"] == 2
+
+    release.set()
+    await asyncio.gather(*tasks)
+
+
+@pytest.mark.asyncio
+async def test_full_queue_rejects_immediately():
+    """Test that calls are rejected when the tool's queue is full."""
+    controller = AdmissionController(max_concurrent=1, max_queue=1)
+    release, order = asyncio.Event(), []
+    tasks = [
+        asyncio.create_task(hold(controller, "t", f"c{i}", INTERACTIVE, release, order))
+        for i in range(2)
+    ]
+    await settle()
+
+    with pytest.raises(Overloaded, match="too many t calls"):
+        async with controller.admit("t", "c2"):
+            pass
+
+    assert controller.snapshot()["tools"]["t"]["rejected"] == 1
+    release.set()
+    await asyncio.gather(*tasks)
+
+
+@pytest.mark.asyncio
+async def test_client_queue_limit():
+    """Test that one client cannot fill the queue."""
+    controller = AdmissionController(max_per_client=1, max_queue_per_client=1)
+    release, order = asyncio.Event(), []
+    tasks = [
+        asyncio.create_task(hold(controller, "t", "a", INTERACTIVE, release, order))
+        for _ in range(2)
+    ]
+    await settle()
+
+    with pytest.raises(Overloaded, match="your calls"):
+        async with controller.admit("t", "a"):
+            pass
+
+    release.set()
+    await asyncio.gather(*tasks)
+
+
+@pytest.mark.asyncio
+async def test_queue_timeout_and_cancellation():
+    """Test that waiters leave the queue on timeout or cancellation."""
+    controller = AdmissionController(max_concurrent=1, queue_timeout=0.05)
+    release, order = asyncio.Event(), []
+    running = asyncio.create_task(
+        hold(controller, "t", "a", INTERACTIVE, release, order)
+    )
+    await settle()
+
+    with pytest.raises(Overloaded, match="waited"):
+        async with controller.admit("t", "b"):
+            pass
+
+    cancelled = asyncio.create_task(
+        hold(controller, "t", "c", INTERACTIVE, release, order)
+    )
+    await settle()
+    cancelled.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await cancelled
+
+    snapshot = controller.snapshot()["tools"]["t"]
+    assert snapshot["timed_out"] == 1
+    assert snapshot["queued_interactive"] == 0
+
+    release.set()
+    await running
+    assert controller.snapshot()["tools"]["t"]["active"] == 0
+
+
+@pytest.mark.asyncio
+async def test_queue_wait_limited_by_budget():
+    """Test that a call waits no longer than its time budget allows."""
+    controller = AdmissionController(max_concurrent=1, queue_timeout=10)
+    release, order = asyncio.Event(), []
+    running = asyncio.create_task(
+        hold(controller, "t", "a", INTERACTIVE, release, order)
+    )
+    await settle()
+
+    began = time.monotonic()
+    with deadline(0.05), pytest.raises(Overloaded, match="waited"):
+        async with controller.admit("t", "b"):
+            pass
+    assert time.monotonic() - began < 1
+
+    release.set()
+    await running
+
+
+def test_call_identity_ignores_client_supplied_id():
+    """Test that clients are keyed on their session, not on _meta."""
+
+    def context(session, client_id):
+        meta = SimpleNamespace(client_id=client_id, priority=BATCH)
+        request = SimpleNamespace(meta=meta, session=session)
+        return SimpleNamespace(request_context=request, client_id=client_id)
+
+    first, second = object(), object()
+
+    assert call_identity(context(first, "a")) == (f"session-{id(first):x}", BATCH)
+    assert (
+        call_identity(context(first, "b"))[0] == call_identity(context(first, "a"))[0]
+    )
+    assert (
+        call_identity(context(second, "a"))[0] != call_identity(context(first, "a"))[0]
+    )
+
+
+def test_call_identity_outside_request(weather_server):
+    """Test that direct calls share the local client."""
+    assert call_identity(weather_server.get_context()) == ("local", INTERACTIVE)
+
+
+@pytest.mark.asyncio
+async def test_server_rejects_when_overloaded(weather_server):
+    """Test that tool calls through the server are admitted and rejected."""
+    set_controller(AdmissionController(max_concurrent=1, max_queue=0))
+    started, release = asyncio.Event(), asyncio.Event()
+
+    async def slow_alerts(state):
+        started.set()
+        await release.wait()
+        return {"features": []}
+
+    try:
+        with patch.object(
+            weather_service, "get_weather_alerts", side_effect=slow_alerts
+        ):
+            first = asyncio.create_task(
+                weather_server.call_tool("get_alerts", {"state": "KS"})
+            )
+            await started.wait()
+
+            with pytest.raises(Overloaded):
+                await weather_server.call_tool("get_alerts", {"state": "MO"})
+
+            release.set()
+            result = await first
+
+        assert result[0].text == "No active alerts for this state."
+    finally:
+        set_controller(None)
+
+
+@pytest.mark.asyncio
+async def test_server_charges_queue_wait_to_budget(weather_server):
+    """Test that time spent queued is taken from the tool's time budget."""
+    set_controller(AdmissionController(max_concurrent=1))
+    started, release = asyncio.Event(), asyncio.Event()
+    remaining = []
+
+    async def slow_alerts(state):
+        remaining.append(current_budget().remaining())
+        started.set()
+        await release.wait()
+        return {"features": []}
+
+    try:
+        with patch.object(
+            weather_service, "get_weather_alerts", side_effect=slow_alerts
+        ):
+            first = asyncio.create_task(
+                weather_server.call_tool("get_alerts", {"state": "KS"})
+            )
+            await started.wait()
+            second = asyncio.create_task(
+                weather_server.call_tool("get_alerts", {"state": "MO"})
+            )
+            await asyncio.sleep(0.3)
+            release.set()
+            await asyncio.gather(first, second)
+
+        assert remaining[1] < DEFAULT_BUDGET - 0.25
+    finally:
+        set_controller(None)
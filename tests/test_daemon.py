@@ -0,0 +1,156 @@
+"""Tests for the shared local daemon."""
+
+import asyncio
+import json
+import os
+import socket
+import sys
+
+import pytest
+
+from src.weather.daemon import (
+    acquire_lock,
+    check_settings,
+    private_directory,
+    run_daemon,
+)
+from src.weather.server import create_server
+
+INITIALIZE = {
+    "jsonrpc": "2.0",
+    "id": 1,
+    "method": "initialize",
+    "params": {
+        "protocolVersion": "2024-11-05",
+        "capabilities": {},
+        "clientInfo": {"name": "test", "version": "1.0"},
+    },
+}
+INITIALIZED = {"jsonrpc": "2.0", "method": "notifications/initialized"}
+LIST_TOOLS = {"jsonrpc": "2.0", "id": 2, "method": "tools/list"}
+
+
+def encode(*messages):
+    """Encode messages as newline-delimited JSON."""
+    return b"".join(json.dumps(message).encode() + b"\n" for message in messages)
+
+
+async def wait_for_socket(path):
+    """Wait until a daemon accepts connections on a socket."""
+    for _ in range(200):
+        try:
+            _, writer = await asyncio.open_unix_connection(path)
+            writer.close()
+            return
+        except (FileNotFoundError, ConnectionRefusedError):
+            await asyncio.sleep(0.01)
+    raise AssertionError(f"Nothing listening on {path}")
+
+
+@pytest.fixture
+async def daemon(tmp_path):
+    """Daemon serving on a temporary socket."""
+    path = str(tmp_path / "weather.sock")
+    task = asyncio.create_task(run_daemon(create_server(warmup=False), path))
+    await wait_for_socket(path)
+    yield path
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+
+async def list_tools(path):
+    """Run a session on the daemon and list its tools."""
+    reader, writer = await asyncio.open_unix_connection(path)
+    writer.write(encode(INITIALIZE, INITIALIZED, LIST_TOOLS))
+    await writer.drain()
+    initialized = json.loads(await reader.readline())
+    tools = json.loads(await reader.readline())
+    writer.close()
+    assert initialized["result"]["serverInfo"]["name"] == "weather"
+    return [tool["name"] for tool in tools["result"]["tools"]]
+
+
+@pytest.mark.asyncio
+async def test_daemon_serves_concurrent_sessions(daemon):
+    """Test that each connection gets a session of its own."""
+    first, second = await asyncio.gather(list_tools(daemon), list_tools(daemon))
+
+    assert "get_forecast" in first
+    assert first == second
+
+
+@pytest.mark.asyncio
+async def test_daemon_single_instance(daemon):
+    """Test that a second daemon for the same socket steps aside."""
+    assert acquire_lock(daemon) is None
+    assert await run_daemon(create_server(warmup=False), daemon) is False
+    assert "get_forecast" in await list_tools(daemon)
+
+
+@pytest.mark.asyncio
+async def test_daemon_replaces_stale_socket_and_exits_when_idle(tmp_path):
+    """Test that a socket left by a dead daemon is reused and idle daemons exit."""
+    path = str(tmp_path / "weather.sock")
+    stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    stale.bind(path)
+    stale.close()
+
+    task = asyncio.create_task(
+        run_daemon(create_server(warmup=False), path, idle_timeout=0.2)
+    )
+    await wait_for_socket(path)
+    assert "get_forecast" in await list_tools(path)
+
+    assert await asyncio.wait_for(task, timeout=5) is True
+    assert not (tmp_path / "weather.sock").exists()
+
+
+@pytest.mark.asyncio
+async def test_forward_stdio(daemon):
+    """Test that the forwarder relays a session between stdio and the daemon."""
+    process = await asyncio.create_subprocess_exec(
+        sys.executable,
+        "-c",
+        "import sys; from src.weather.daemon import forward_stdio; "
+        f"sys.exit(forward_stdio({daemon!r}))",
+        stdin=asyncio.subprocess.PIPE,
+        stdout=asyncio.subprocess.PIPE,
+    )
+    process.stdin.write(encode(INITIALIZE, INITIALIZED, LIST_TOOLS))
+    replies = [
+        json.loads(await asyncio.wait_for(process.stdout.readline(), timeout=10))
+        for _ in range(2)
+    ]
+    # Closing stdin ends the session, and the forwarder with it
+    process.stdin.close()
+
+    assert await asyncio.wait_for(process.wait(), timeout=10) == 0
+    assert [reply["id"] for reply in replies] == [1, 2]
+    assert "get_forecast" in [tool["name"] for tool in replies[1]["result"]["tools"]]
+
+
+def test_private_directory(tmp_path):
+    """Test that only a directory private to this user is used for the socket."""
+    created = str(tmp_path / "own")
+    assert private_directory(created) == created
+    assert os.stat(created).st_mode & 0o777 == 0o700
+
+    shared = tmp_path / "shared"
+    shared.mkdir(mode=0o755)
+    shared.chmod(0o755)
+    link = tmp_path / "link"
+    link.symlink_to(created)
+
+    for path in (shared, link):
+        with pytest.raises(PermissionError):
+            private_directory(str(path))
+
+
+@pytest.mark.asyncio
+async def test_daemon_settings_compared(daemon, monkeypatch):
+    """Test that clients with other WEATHER_* settings than the daemon's are told."""
+    assert check_settings(daemon) == []
+
+    monkeypatch.setenv("WEATHER_TOOL_BUDGET", "5")
+    assert check_settings(daemon) == ["WEATHER_TOOL_BUDGET"]
@@ -0,0 +1,110 @@
+"""Tests for the logging pipeline."""
+
+import json
+import logging
+import queue
+
+from src.weather.logs import (
+    ContextQueueHandler,
+    JsonFormatter,
+    TextFormatter,
+    log_context,
+    sampled,
+)
+
+
+class CountingArg:
+    """Argument counting how often it is formatted."""
+
+    def __init__(self):
+        self.formatted = 0
+
+    def __str__(self):
+        self.formatted += 1
+        return "value"
+
+
+def queue_logger(name, maxsize=0):
+    """Create a logger writing to a ContextQueueHandler."""
+    handler = ContextQueueHandler(queue.Queue(maxsize))
+    logger = logging.getLogger(name)
+    logger.handlers = [handler]
+    logger.propagate = False
+    logger.setLevel(logging.INFO)
+    return logger, handler
+
+
+def test_records_queued_unformatted_with_context():
+    """Test that messages are formatted by the writer, with context fields."""
+    logger, handler = queue_logger("test.logs.context")
+    arg = CountingArg()
+
+    with log_context(tool="get_forecast", request_id="7"):
+        with log_context(client="c1"):
+            logger.info("Fetched %s", arg)
+    logger.info("Outside")
+
+    record = handler.queue.get_nowait()
+    assert arg.formatted == 0
+    assert record.context == {"tool": "get_forecast", "request_id": "7", "client": "c1"}
+    assert handler.queue.get_nowait().context == {}
+
+    entry = json.loads(JsonFormatter().format(record))
+    assert arg.formatted == 1
+    assert entry["message"] == "Fetched value"
+    assert entry["level"] == "INFO"
+    assert entry["logger"] == "test.logs.context"
+    assert entry["tool"] == "get_forecast"
+    assert (
+        TextFormatter()
+        .format(record)
+        .endswith("Fetched value [tool=get_forecast request_id=7 client=c1]")
+    )
+
+
+def test_json_formatter_includes_exception():
+    """Test that exceptions are written as one JSON field."""
+    logger, handler = queue_logger("test.logs.exception")
+    try:
+        raise ValueError("bad")
+    except ValueError:
+        logger.exception("Failed")
+
+    entry = json.loads(JsonFormatter().format(handler.queue.get_nowait()))
+    assert entry["level"] == "ERROR"
+    assert "ValueError: bad" in entry["exception"]
+
+
+def test_full_queue_drops_records():
+    """Test that a backed-up writer costs dropped records, not blocking."""
+    logger, handler = queue_logger("test.logs.full", maxsize=2)
+    for i in range(5):
+        logger.info("Record %d", i)
+
+    assert handler.queue.qsize() == 2
+    assert handler.dropped == 3
+
+
+def test_sampled_logger():
+    """Test that one record in every few is passed on, marked with the rate."""
+    logger, handler = queue_logger("test.logs.sampled")
+    debug = sampled(logger, every=10)
+
+    for i in range(25):
+        debug.debug("Request %d", i)
+    assert handler.queue.empty()
+    assert debug._seen == 0
+
+    logger.setLevel(logging.DEBUG)
+    for i in range(25):
+        debug.debug("Request %d", i)
+    records = [handler.queue.get_nowait() for _ in range(handler.queue.qsize())]
+
+    assert [record.getMessage() for record in records] == [
+        "Request 0",
+        "Request 10",
+        "Request 20",
+    ]
+    assert records[0].sample_every == 10
+    assert records[0].funcName == "test_sampled_logger"
+    assert '"sample_every": 10' in JsonFormatter().format(records[0])
@@ -0,0 +1,207 @@
+"""Tests for the memory governor."""
+
+import asyncio
+
+import pytest
+from src.weather.cache import SizedMemoryCache, get_output_cache, set_cache
+from src.weather.memory import (
+    CRITICAL,
+    ELEVATED,
+    HIGH,
+    NORMAL,
+    MemoryGovernor,
+    Subsystem,
+    cgroup_memory,
+    default_subsystems,
+    pressure_level,
+    set_governor,
+)
+from src.weather.services import weather_service
+from src.weather.utils import http
+
+MB = 1024 * 1024
+
+
+def sampler(samples):
+    """Sample memory from a mutable dictionary."""
+    return lambda: dict(samples)
+
+
+def test_pressure_levels():
+    """Test mapping the share of the limit in use to pressure levels."""
+    assert pressure_level(0.0) == NORMAL
+    assert pressure_level(0.7) == ELEVATED
+    assert pressure_level(0.9) == HIGH
+    assert pressure_level(1.5) == CRITICAL
+
+
+def test_cgroup_memory_v2(tmp_path):
+    """Test reading the limit and working set of a cgroup v2 group."""
+    (tmp_path / "memory.max").write_text("1073741824\n")
+    (tmp_path / "memory.current").write_text("600000000\n")
+    (tmp_path / "memory.stat").write_text("anon 1\ninactive_file 100000000\n")
+    proc = str(tmp_path / "missing")
+    assert cgroup_memory(str(tmp_path), proc) == (1073741824, 500000000)
+
+    (tmp_path / "memory.max").write_text("max\n")
+    assert cgroup_memory(str(tmp_path), proc)[0] is None
+
+
+def test_cgroup_memory_nested_v2(tmp_path):
+    """Test finding the process's own group and the tightest limit above it."""
+    root = tmp_path / "cgroup"
+    group = root / "system.slice" / "weather.service"
+    group.mkdir(parents=True)
+    (root / "cgroup.controllers").write_text("memory\n")
+    (root / "system.slice" / "memory.max").write_text("2000\n")
+    (group / "memory.max").write_text("max\n")
+    (group / "memory.current").write_text("500\n")
+    (root / "system.slice" / "memory.current").write_text("1500\n")
+    proc = tmp_path / "cgroup.list"
+    proc.write_text("0::/system.slice/weather.service\n")
+    assert cgroup_memory(str(root), str(proc)) == (2000, 1500)
+
+    (group / "memory.max").write_text("1000\n")
+    assert cgroup_memory(str(root), str(proc)) == (1000, 500)
+
+    # A group not visible under the mount point falls back to the mount point
+    proc.write_text("0::/elsewhere\n")
+    assert cgroup_memory(str(root), str(proc)) == (None, None)
+
+
+def test_cgroup_memory_v1(tmp_path):
+    """Test reading a cgroup v1 group, where no limit is a huge number."""
+    (tmp_path / "memory").mkdir()
+    (tmp_path / "memory" / "memory.limit_in_bytes").write_text("9223372036854771712\n")
+    (tmp_path / "memory" / "memory.usage_in_bytes").write_text("1000\n")
+    proc = tmp_path / "cgroup.list"
+    proc.write_text("5:cpu,cpuacct:/other\n4:memory:/job\n0::/\n")
+    assert cgroup_memory(str(tmp_path), str(proc)) == (None, 1000)
+
+    (tmp_path / "memory" / "job").mkdir()
+    (tmp_path / "memory" / "job" / "memory.limit_in_bytes").write_text("4096\n")
+    (tmp_path / "memory" / "job" / "memory.usage_in_bytes").write_text("100\n")
+    assert cgroup_memory(str(tmp_path), str(proc)) == (4096, 100)
+    assert cgroup_memory(str(tmp_path / "missing"), str(proc)) == (None, None)
+
+
+def test_governor_budgets_and_sheds_with_pressure():
+    """Test that budgets shrink and entries are shed as pressure rises."""
+    budgets, sheds = [], []
+    subsystem = Subsystem(
+        "cache",
+        0.5,
+        lambda: (None, None),
+        budgets.append,
+        lambda fraction: sheds.append(fraction) or 3,
+        minimum=10 * MB,
+    )
+    samples = {"rss": 10 * MB, "cgroup_limit": None, "cgroup_usage": None}
+    governor = MemoryGovernor(100 * MB, [subsystem], sample=sampler(samples))
+
+    assert governor.check() == NORMAL
+    assert governor.check() == NORMAL
+    # The budget is applied once per change, nothing is shed
+    assert budgets == [50 * MB]
+    assert sheds == []
+
+    samples["rss"] = 90 * MB
+    assert governor.check() == HIGH
+    assert budgets[-1] == 25 * MB
+    assert sheds == [0.25]
+
+    # The cgroup's working set counts when it is the tighter of the two
+    samples.update(rss=10 * MB, cgroup_limit=200 * MB, cgroup_usage=195 * MB)
+    assert governor.check() == CRITICAL
+    assert budgets[-1] == 12.5 * MB
+    assert sheds == [0.25, 0.5]
+
+    snapshot = governor.snapshot()
+    assert snapshot["level"] == CRITICAL
+    assert snapshot["ratio"] == pytest.approx(0.975)
+    assert snapshot["sheds"] == 2
+    assert snapshot["subsystems"]["cache"]["shed"] == 6
+    assert snapshot["subsystems"]["cache"]["budget"] == 12.5 * MB
+
+
+def test_governor_lowers_level_with_hysteresis():
+    """Test that a level is left only once usage is clear of its threshold."""
+    samples = {"rss": 90 * MB, "cgroup_limit": None, "cgroup_usage": None}
+    governor = MemoryGovernor(100 * MB, [], sample=sampler(samples))
+    assert governor.check() == HIGH
+
+    samples["rss"] = 83 * MB
+    assert governor.check() == HIGH
+    samples["rss"] = 79 * MB
+    assert governor.check() == ELEVATED
+    samples["rss"] = 10 * MB
+    assert governor.check() == NORMAL
+    # Rising is not delayed
+    samples["rss"] = 86 * MB
+    assert governor.check() == HIGH
+
+
+def test_governor_stops_shedding_within_budget():
+    """Test that a cache already within its budget is not shed."""
+    usage = {"bytes": 40 * MB}
+
+    def shed(fraction):
+        usage["bytes"] = int(usage["bytes"] * (1 - fraction))
+        return 1
+
+    subsystem = Subsystem(
+        "cache", 0.5, lambda: (usage["bytes"], None), lambda max_bytes: None, shed
+    )
+    samples = {"rss": 96 * MB, "cgroup_limit": None, "cgroup_usage": None}
+    governor = MemoryGovernor(100 * MB, [subsystem], sample=sampler(samples))
+
+    # Halved each check until within the 12.5 MB budget, never emptied
+    for _ in range(4):
+        assert governor.check() == CRITICAL
+    assert usage["bytes"] == 10 * MB
+    assert subsystem.shed_entries == 2
+
+
+@pytest.mark.asyncio
+async def test_default_subsystems_shed_caches_and_cap_responses():
+    """Test that pressure bounds the response, output and buffer budgets."""
+    cache = SizedMemoryCache()
+    set_cache(cache)
+    for i in range(8):
+        await cache.set(f"k{i}", "x" * 1000, ttl=60)
+        get_output_cache().set((i,), "y" * 1000)
+    samples = {"rss": 96 * MB, "cgroup_limit": None, "cgroup_usage": None}
+    governor = MemoryGovernor(100 * MB, default_subsystems(), sample=sampler(samples))
+
+    try:
+        assert governor.check() == CRITICAL
+        assert cache.max_bytes == 10 * MB
+        assert http._response_budget == 2.5 * MB
+        # Both caches are far within their budgets, so nothing is shed
+        assert len(cache) == len(get_output_cache()) == 8
+
+        samples["rss"] = 10 * MB
+        assert governor.check() == NORMAL
+        assert http._response_budget == 10 * MB
+        usage = governor.snapshot()["subsystems"]
+        assert usage["response_cache"]["shed"] == 0
+        assert usage["alert_history"]["entries"] == len(weather_service._alert_store)
+    finally:
+        http.set_response_budget(None)
+
+
+@pytest.mark.asyncio
+async def test_governor_runs_after_first_tool_call(weather_server):
+    """Test that a tool call starts the periodic checks."""
+    samples = {"rss": 1 * MB, "cgroup_limit": None, "cgroup_usage": None}
+    governor = MemoryGovernor(100 * MB, [], interval=0.01, sample=sampler(samples))
+    set_governor(governor)
+
+    await weather_server.call_tool("get_forecast_by_place", {"place": "Qqqq"})
+    await asyncio.sleep(0.05)
+
+    assert governor.checks >= 2
+    contents = await weather_server.read_resource("memory://usage")
+    text = contents[0].content if hasattr(contents[0], "content") else contents[0]
+    assert "Memory limit: 104857600 B, Resident: 1048576 B (1%)" in str(text)
+    assert "Pressure: normal" in str(text)
@@ -0,0 +1,101 @@
+"""Tests for runtime profiles and the loop-lag monitor."""
+
+import asyncio
+import gc
+import time
+
+import pytest
+from src.weather import runtime
+from src.weather.runtime import (
+    SERVER_GC_THRESHOLDS,
+    LoopLagMonitor,
+    apply_profile,
+    freeze_startup_objects,
+    get_profile,
+    set_monitor,
+)
+
+
+@pytest.fixture
+async def restore_runtime():
+    """Restore the interpreter and the default profile after a test."""
+    thresholds = gc.get_threshold()
+    policy = asyncio.get_event_loop_policy()
+    yield
+    set_monitor(None)
+    gc.unfreeze()
+    gc.set_threshold(*thresholds)
+    asyncio.set_event_loop_policy(policy)
+    runtime._profile = runtime.PROFILES["default"]
+
+
+def test_get_profile(monkeypatch):
+    """Test selecting profiles by name and from the environment."""
+    monkeypatch.delenv("WEATHER_RUNTIME_PROFILE", raising=False)
+    assert get_profile().name == "default"
+    monkeypatch.setenv("WEATHER_RUNTIME_PROFILE", "Server")
+    assert get_profile().gc_thresholds == SERVER_GC_THRESHOLDS
+    assert get_profile("tuned").name == "tuned"
+
+    with pytest.raises(ValueError):
+        get_profile("turbo")
+
+
+@pytest.mark.asyncio
+async def test_server_profile_tunes_collector(restore_runtime):
+    """Test that the server profile raises thresholds and freezes startup objects."""
+    profile = apply_profile("server")
+    freeze_startup_objects()
+
+    assert gc.get_threshold() == SERVER_GC_THRESHOLDS
+    assert gc.get_freeze_count() > 0
+    assert runtime.get_monitor().threshold == profile.lag_threshold
+
+
+@pytest.mark.asyncio
+async def test_default_profile_changes_nothing(restore_runtime):
+    """Test that the default profile neither freezes nor monitors."""
+    thresholds = gc.get_threshold()
+    apply_profile("default")
+    freeze_startup_objects()
+
+    assert gc.get_threshold() == thresholds
+    assert gc.get_freeze_count() == 0
+    assert runtime.get_monitor() is None
+
+
+@pytest.mark.asyncio
+async def test_monitor_reports_stalled_coroutine(restore_runtime, caplog):
+    """Test that a blocking call is reported with the coroutine that made it."""
+    monitor = LoopLagMonitor(threshold=0.05)
+    set_monitor(monitor)
+    monitor.start()
+    await asyncio.sleep(0.05)
+
+    async def parse_huge_payload():
+        time.sleep(0.3)
+
+    await asyncio.create_task(parse_huge_payload(), name="slow-call")
+    await asyncio.sleep(0.05)
+
+    stats = monitor.snapshot()
+    assert stats["stalls"] == 1
+    assert stats["max_lag_ms"] >= 250
+    stall = stats["recent"][0]
+    assert stall["task"] == "slow-call"
+    assert stall["coroutine"].endswith("parse_huge_payload")
+    assert "in parse_huge_payload" in stall["stack"][-1]
+    assert "Event loop stalled" in caplog.text
+
+
+@pytest.mark.asyncio
+async def test_runtime_resource(weather_server, restore_runtime):
+    """Test that a tool call starts monitoring and the resource reports it."""
+    apply_profile("tuned")
+    await weather_server.call_tool("get_forecast_by_place", {"place": "Qqqq"})
+
+    contents = await weather_server.read_resource("runtime://loop")
+    text = contents[0].content if hasattr(contents[0], "content") else contents[0]
+
+    assert "Profile: tuned" in str(text)
+    assert "Loop-lag threshold: 100 ms" in str(text)
@@ -3,6 +3,7 @@
 import pytest
 from unittest.mock import patch, AsyncMock, MagicMock
 from src.weather.server import create_server, run_server
+from src.weather.tools import FEATURES
 
 
 @pytest.mark.asyncio
@@ -61,19 +62,55 @@ async def test_run_server():
         mock_server.run_async.assert_called_once_with(transport="test-transport")
 
 
+@pytest.mark.asyncio
+async def test_run_server_without_run_async():
+    """Test that run_server falls back to the per-transport coroutines."""
+    mock_server = MagicMock(spec=["run_stdio_async", "run_sse_async"])
+    mock_server.run_stdio_async = AsyncMock()
+    mock_server.run_sse_async = AsyncMock()
+
+    with patch("src.weather.server.create_server", return_value=mock_server):
+        await run_server(transport="sse")
+
+        mock_server.run_sse_async.assert_called_once_with()
+        mock_server.run_stdio_async.assert_not_called()
+
+
 def test_main_function():
     """Test that the main function initializes and runs the server."""
     mock_server = MagicMock()
     mock_server.run = MagicMock()
-
-    with patch("src.weather.server.create_server", return_value=mock_server):
+    calls = MagicMock()
+
+    with (
+        patch(
+            "src.weather.server.create_server", return_value=mock_server
+        ) as mock_create_server,
+        patch("src.weather.server.configure_logging") as mock_configure,
+    ):
         from src.weather.server import main
 
+        calls.attach_mock(mock_configure, "configure_logging")
+        calls.attach_mock(mock_create_server, "create_server")
         main()
 
         # Verify the server was created and run with stdio transport
         mock_server.run.assert_called_once_with(transport="stdio")
 
+    # Logging is configured before FastMCP can install a handler of its own
+    assert [name for name, _, _ in calls.mock_calls] == [
+        "configure_logging",
+        "create_server",
+    ]
+
+
+def test_create_server_leaves_logging_to_entry_points():
+    """Test that creating a server does not configure logging."""
+    with patch("src.weather.server.configure_logging") as mock_configure:
+        create_server()
+
+    mock_configure.assert_not_called()
+
 
 @pytest.mark.asyncio
 async def test_server_resources_registration():
@@ -82,7 +119,7 @@ async def test_server_resources_registration():
         server = create_server()
 
         # Verify that register_all_resources was called once
-        mock_register_resources.assert_called_once_with(server)
+        mock_register_resources.assert_called_once_with(server, FEATURES)
 
 
 @pytest.mark.asyncio
@@ -92,4 +129,41 @@ async def test_server_tools_registration():
         server = create_server()
 
         # Verify that register_all_tools was called once
-        mock_register_tools.assert_called_once_with(server)
+        mock_register_tools.assert_called_once_with(server, FEATURES)
+
+
+@pytest.mark.asyncio
+async def test_standalone_launchers():
+    """Test that weather.py and shell.py serve their own tools from the package."""
+    import shell
+    import weather
+
+    weather_tools = [tool.name for tool in await weather.mcp.list_tools()]
+    shell_tools = [tool.name for tool in await shell.mcp.list_tools()]
+    shell_resources = [str(r.uri) for r in await shell.mcp.list_resources()]
+
+    assert weather.mcp.name == "weather"
+    assert {"get_alerts", "get_forecast"} <= set(weather_tools)
+    assert "run_shell_command" not in weather_tools
+    assert "processes://top" not in [
+        str(r.uri) for r in await weather.mcp.list_resources()
+    ]
+    assert shell.mcp.name == "Shell Command Server"
+    assert shell_tools == ["run_shell_command"]
+    assert "processes://top" in shell_resources
+
+    result = await shell.mcp.call_tool("run_shell_command", {"command": "echo hi"})
+    assert result[0].text == "hi\n"
+
+
+def test_main_runs_given_server():
+    """Test that main runs a launcher's server instead of creating one."""
+    mock_server = MagicMock()
+
+    with patch("src.weather.server.create_server") as mock_create_server:
+        from src.weather.server import main
+
+        main(server=mock_server)
+
+    mock_create_server.assert_not_called()
+    mock_server.run.assert_called_once_with(transport="stdio")
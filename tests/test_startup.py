@@ -0,0 +1,35 @@
+"""Tests for the startup import-time measurement."""
+
+from src.weather.startup import measure_startup, parse_importtime
+
+SAMPLE_OUTPUT = """\
+import time: self [us] | cumulative | imported package
+import time:       120 |        120 |   _io
+import time:       950 |       1300 |     src.weather.cache.memory
+import time:      2000 |       3300 |   src.weather.server
+"""
+
+
+def test_parse_importtime():
+    """Test parsing of -X importtime output."""
+    entries = parse_importtime(SAMPLE_OUTPUT)
+
+    assert [entry["module"] for entry in entries] == [
+        "_io",
+        "src.weather.cache.memory",
+        "src.weather.server",
+    ]
+    assert entries[1] == {
+        "module": "src.weather.cache.memory",
+        "depth": 2,
+        "self_us": 950,
+        "cumulative_us": 1300,
+    }
+
+
+def test_heavy_modules_load_lazily():
+    """Test that importing the server does not import lazily-loaded modules."""
+    measurement = measure_startup()
+
+    assert measurement["eager"] == []
+    assert measurement["import_ms"] > 0
@@ -0,0 +1,91 @@
+"""Tests for the multi-worker SSE deployment."""
+
+import signal
+import time
+from uuid import uuid4
+
+from starlette.testclient import TestClient
+
+from src.weather import workers
+from src.weather.server import create_server
+from src.weather.workers import (
+    FORWARDED_HEADER,
+    _session_id,
+    create_sse_app,
+    restart_delay,
+)
+
+
+def test_session_id_parsing():
+    """Test extracting the session id from a message request."""
+    session_id = uuid4()
+
+    assert (
+        _session_id({"query_string": f"session_id={session_id.hex}".encode()})
+        == session_id
+    )
+    assert _session_id({"query_string": b"session_id=nope"}) is None
+    assert _session_id({"query_string": b""}) is None
+
+
+def test_forwarded_message_for_unknown_session():
+    """Test that a probe from a sibling for a foreign session gets a 404."""
+    app = create_sse_app(create_server(), peers=["/nonexistent/worker-1.sock"])
+    client = TestClient(app)
+
+    response = client.post(
+        f"/messages/?session_id={uuid4().hex}",
+        json={"jsonrpc": "2.0", "method": "ping", "id": 1},
+        headers={FORWARDED_HEADER: "1"},
+    )
+
+    assert response.status_code == 404
+
+
+def test_unknown_session_with_unreachable_peers():
+    """Test that forwarding gives up with a 404 when no sibling answers."""
+    app = create_sse_app(create_server(), peers=["/nonexistent/worker-1.sock"])
+    client = TestClient(app)
+
+    response = client.post(
+        f"/messages/?session_id={uuid4().hex}",
+        json={"jsonrpc": "2.0", "method": "ping", "id": 1},
+    )
+
+    assert response.status_code == 404
+
+
+def test_restart_delay_backs_off():
+    """Test that restart delays double per failed start up to the cap."""
+    assert restart_delay(0) == 0.0
+    assert restart_delay(1) == workers.RESTART_DELAY
+    assert restart_delay(2) == workers.RESTART_DELAY * 2
+    assert restart_delay(100) == workers.MAX_RESTART_DELAY
+
+
+def test_crashing_worker_is_given_up_on(monkeypatch):
+    """Test that a worker failing at startup is not re-forked in a tight loop."""
+    monkeypatch.setattr(workers, "RESTART_DELAY", 0.05)
+    monkeypatch.setattr(workers, "MAX_FAILED_STARTS", 3)
+    handlers = {sig: signal.getsignal(sig) for sig in (signal.SIGINT, signal.SIGTERM)}
+    forks = []
+    real_fork = workers.os.fork
+
+    def counting_fork():
+        forks.append(time.monotonic())
+        return real_fork()
+
+    def crashing_factory():
+        raise RuntimeError("broken configuration")
+
+    monkeypatch.setattr(workers.os, "fork", counting_fork)
+    try:
+        start = time.monotonic()
+        workers.run_workers(1, "127.0.0.1", 0, crashing_factory)
+    finally:
+        for sig, handler in handlers.items():
+            signal.signal(sig, handler)
+
+    # The first start plus three restarts after 0.05, 0.1 and 0.2 seconds
+    assert len(forks) == 4
+    assert time.monotonic() - start >= 0.35
@@ -2,6 +2,10 @@
 
 import pytest
 from unittest.mock import patch, AsyncMock
+from datetime import datetime, timedelta, timezone
+from src.weather.services import weather_service
+from src.weather.tools.weather_tools import _location_tz
+from src.weather.utils.deadline import current_budget
 
 
 @pytest.mark.asyncio
@@ -168,3 +172,464 @@ async def test_get_forecast_tool_forecast_failure(weather_server):
         mock_call_tool.assert_called_once_with(
             "get_forecast", {"latitude": 37.7749, "longitude": -122.4194}
         )
+
+
+async def call_tool_text(server, name, arguments):
+    """Call a tool and return the text of its result."""
+    result = await server.call_tool(name, arguments)
+    return result[0].text
+
+
+@pytest.mark.asyncio
+async def test_get_alerts_for_point_tool_unavailable(weather_server):
+    """Test the get_alerts_for_point MCP tool when no alert data is available."""
+    with patch.object(
+        weather_service, "get_alerts_for_point", new_callable=AsyncMock
+    ) as mock_find:
+        mock_find.return_value = None
+
+        result = await call_tool_text(
+            weather_server,
+            "get_alerts_for_point",
+            {"latitude": 38.9, "longitude": -96.5},
+        )
+
+        assert result == "Unable to fetch alerts for the specified location."
+        mock_find.assert_called_once_with(38.9, -96.5)
+
+
+@pytest.mark.asyncio
+async def test_get_alerts_for_point_tool_no_alerts(weather_server):
+    """Test the get_alerts_for_point MCP tool with no matching alerts."""
+    with patch.object(
+        weather_service, "get_alerts_for_point", new_callable=AsyncMock
+    ) as mock_find:
+        mock_find.return_value = []
+
+        result = await call_tool_text(
+            weather_server,
+            "get_alerts_for_point",
+            {"latitude": 38.9, "longitude": -96.5},
+        )
+
+        assert result == "No active alerts for this location."
+
+
+@pytest.mark.asyncio
+async def test_get_alerts_for_point_tool_success(weather_server):
+    """Test the get_alerts_for_point MCP tool with a matching alert."""
+    with patch.object(
+        weather_service, "get_alerts_for_point", new_callable=AsyncMock
+    ) as mock_find:
+        mock_find.return_value = [
+            {
+                "properties": {
+                    "event": "Tornado Warning",
+                    "areaDesc": "Riley County",
+                    "severity": "Extreme",
+                }
+            }
+        ]
+
+        result = await call_tool_text(
+            weather_server,
+            "get_alerts_for_point",
+            {"latitude": 38.9, "longitude": -96.5},
+        )
+
+        assert "Event: Tornado Warning" in result
+        assert "Area: Riley County" in result
+        assert "Severity: Extreme" in result
+
+
+POINT = {
+    "properties": {
+        "forecast": "https://api.weather.gov/gridpoints/TOP/32,81/forecast",
+        "forecastHourly": "https://api.weather.gov/gridpoints/TOP/32,81/forecast/hourly",
+        "forecastGridData": "https://api.weather.gov/gridpoints/TOP/32,81",
+        "timeZone": "America/Chicago",
+    }
+}
+
+
+def hourly_periods(count):
+    """Build consecutive hourly forecast periods."""
+    start = datetime(2025, 3, 18, 5, tzinfo=timezone(timedelta(hours=-5)))
+    return [
+        {
+            "startTime": (start + timedelta(hours=hour)).isoformat(),
+            "temperature": 40 + hour % 10,
+            "temperatureUnit": "F",
+            "probabilityOfPrecipitation": {"value": 60 if hour < 3 else 10},
+            "windSpeed": "5 to 10 mph",
+        }
+        for hour in range(count)
+    ]
+
+
+def gridpoint_data():
+    """Build a raw gridpoint response with a single temperature value."""
+    return {
+        "properties": {
+            "validTimes": "2025-03-18T04:00:00+00:00/P7DT21H",
+            "temperature": {
+                "uom": "wmoUnit:degC",
+                "values": [
+                    {"validTime": "2025-03-18T04:00:00+00:00/P2D", "value": 10.0}
+                ],
+            },
+        }
+    }
+
+
+@pytest.mark.asyncio
+async def test_get_hourly_forecast_tool_success(weather_server):
+    """Test the get_hourly_forecast MCP tool summarizing hourly periods."""
+    with (
+        patch.object(
+            weather_service, "get_weather_point", new_callable=AsyncMock
+        ) as mock_point,
+        patch.object(
+            weather_service, "get_weather_forecast", new_callable=AsyncMock
+        ) as mock_forecast,
+    ):
+        mock_point.return_value = POINT
+        mock_forecast.return_value = {"properties": {"periods": hourly_periods(24)}}
+
+        result = await call_tool_text(
+            weather_server,
+            "get_hourly_forecast",
+            {"latitude": 39.7456, "longitude": -97.0892, "hours": 12},
+        )
+
+        mock_forecast.assert_called_once_with(POINT["properties"]["forecastHourly"])
+        assert "(12 hours)" in result
+        assert "Temperature: low 40°F" in result
+        # Times are shown in the point's time zone
+        assert "Rain likely: Tue 18 Mar 05:00 to Tue 18 Mar 08:00 (peak 60%)" in result
+
+
+@pytest.mark.asyncio
+async def test_get_hourly_forecast_tool_clamps_hours(weather_server):
+    """Test that the requested number of hours is clamped to 1-156."""
+    with (
+        patch.object(
+            weather_service, "get_weather_point", new_callable=AsyncMock
+        ) as mock_point,
+        patch.object(
+            weather_service, "get_weather_forecast", new_callable=AsyncMock
+        ) as mock_forecast,
+    ):
+        mock_point.return_value = POINT
+        mock_forecast.return_value = {"properties": {"periods": hourly_periods(200)}}
+        arguments = {"latitude": 39.7456, "longitude": -97.0892}
+
+        many = await call_tool_text(
+            weather_server, "get_hourly_forecast", {**arguments, "hours": 1000}
+        )
+        none = await call_tool_text(
+            weather_server, "get_hourly_forecast", {**arguments, "hours": 0}
+        )
+
+        assert "(156 hours)" in many
+        assert "(1 hours)" in none
+
+
+@pytest.mark.asyncio
+async def test_get_hourly_forecast_tool_failures(weather_server):
+    """Test the get_hourly_forecast MCP tool when upstream data is missing."""
+    arguments = {"latitude": 39.7456, "longitude": -97.0892}
+    with (
+        patch.object(
+            weather_service, "get_weather_point", new_callable=AsyncMock
+        ) as mock_point,
+        patch.object(
+            weather_service, "get_weather_forecast", new_callable=AsyncMock
+        ) as mock_forecast,
+    ):
+        mock_point.return_value = None
+        assert (
+            await call_tool_text(weather_server, "get_hourly_forecast", arguments)
+            == "Unable to fetch forecast data for the specified location."
+        )
+
+        mock_point.return_value = POINT
+        mock_forecast.return_value = {"properties": {"periods": []}}
+        assert (
+            await call_tool_text(weather_server, "get_hourly_forecast", arguments)
+            == "Unable to fetch hourly forecast data."
+        )
+
+
+@pytest.mark.asyncio
+async def test_get_gridpoint_forecast_tool_success(weather_server):
+    """Test the get_gridpoint_forecast MCP tool and clamping of days."""
+    arguments = {"latitude": 39.7456, "longitude": -97.0892}
+    with (
+        patch.object(
+            weather_service, "get_weather_point", new_callable=AsyncMock
+        ) as mock_point,
+        patch.object(
+            weather_service, "get_gridpoint_data", new_callable=AsyncMock
+        ) as mock_grid,
+    ):
+        mock_point.return_value = POINT
+        mock_grid.return_value = gridpoint_data()
+
+        result = await call_tool_text(
+            weather_server, "get_gridpoint_forecast", {**arguments, "days": 30}
+        )
+        one_day = await call_tool_text(
+            weather_server, "get_gridpoint_forecast", {**arguments, "days": 0}
+        )
+
+        mock_grid.assert_called_with(POINT["properties"]["forecastGridData"])
+        assert "(168 hours)" in result
+        assert "Temperature: low 50°F" in result
+        assert "(24 hours)" in one_day
+
+
+@pytest.mark.asyncio
+async def test_get_gridpoint_forecast_tool_failures(weather_server):
+    """Test the get_gridpoint_forecast MCP tool when upstream data is missing."""
+    arguments = {"latitude": 39.7456, "longitude": -97.0892}
+    with (
+        patch.object(
+            weather_service, "get_weather_point", new_callable=AsyncMock
+        ) as mock_point,
+        patch.object(
+            weather_service, "get_gridpoint_data", new_callable=AsyncMock
+        ) as mock_grid,
+    ):
+        mock_point.return_value = None
+        assert (
+            await call_tool_text(weather_server, "get_gridpoint_forecast", arguments)
+            == "Unable to fetch forecast data for the specified location."
+        )
+
+        mock_point.return_value = POINT
+        mock_grid.return_value = None
+        assert (
+            await call_tool_text(weather_server, "get_gridpoint_forecast", arguments)
+            == "Unable to fetch gridpoint forecast data."
+        )
+
+        # A response without validTimes cannot be placed on an hourly axis
+        mock_grid.return_value = {"properties": {"temperature": {"values": []}}}
+        assert (
+            await call_tool_text(weather_server, "get_gridpoint_forecast", arguments)
+            == "Unable to fetch gridpoint forecast data."
+        )
+
+
+def test_location_tz():
+    """Test resolving a point's time zone."""
+    assert _location_tz(POINT).key == "America/Chicago"
+    assert _location_tz({"properties": {"timeZone": "Nowhere/Special"}}) is None
+    assert _location_tz({"properties": {}}) is None
+
+
+@pytest.mark.asyncio
+async def test_get_forecast_tool_out_of_time(weather_server):
+    """Test that the get_forecast tool reports running out of time."""
+
+    async def slow_point(latitude, longitude):
+        current_budget().exhausted = True
+        return None
+
+    with patch.object(weather_service, "get_weather_point", side_effect=slow_point):
+        result = await call_tool_text(
+            weather_server, "get_forecast", {"latitude": 38.9, "longitude": -96.5}
+        )
+
+    assert result.startswith("Unable to fetch forecast data")
+    assert "ran out of time" in result
+
+
+@pytest.mark.asyncio
+async def test_get_alerts_for_point_tool_partial(weather_server):
+    """Test that alerts found without all the data are flagged as incomplete."""
+
+    async def partial(latitude, longitude):
+        current_budget().exhausted = True
+        return []
+
+    with patch.object(weather_service, "get_alerts_for_point", side_effect=partial):
+        result = await call_tool_text(
+            weather_server,
+            "get_alerts_for_point",
+            {"latitude": 38.9, "longitude": -96.5},
+        )
+
+    assert result.startswith("No active alerts for this location.")
+    assert "may be incomplete" in result
+
+
+@pytest.mark.asyncio
+async def test_get_alerts_tool_memoizes_output(weather_server, fresh_cache):
+    """Test that unchanged alert payloads are formatted only once."""
+    feature = {"properties": {"event": "Flood Warning", "areaDesc": "Test County"}}
+    payload = {"features": [feature]}
+
+    with (
+        patch(
+            "src.weather.services.weather_service.make_request",
+            new_callable=AsyncMock,
+        ) as mock_request,
+        patch(
+            "src.weather.utils.formatting.format_alert", return_value="formatted"
+        ) as mock_format,
+    ):
+        mock_request.return_value = payload
+        first = await call_tool_text(weather_server, "get_alerts", {"state": "KS"})
+        second = await call_tool_text(weather_server, "get_alerts", {"state": "ks"})
+        assert first == second == "formatted"
+        assert mock_format.call_count == 1
+
+        # New upstream data has a new version and is formatted again
+        await fresh_cache.clear()
+        mock_request.return_value = {"features": [feature, feature]}
+        third = await call_tool_text(weather_server, "get_alerts", {"state": "KS"})
+        assert third == "formatted\nformatted"
+        assert mock_format.call_count == 3
+
+
+@pytest.mark.asyncio
+async def test_get_alert_changes_tool(weather_server):
+    """Test the get_alert_changes MCP tool."""
+    with patch.object(
+        weather_service, "get_alert_changes", new_callable=AsyncMock
+    ) as mock_changes:
+        mock_changes.return_value = None
+        result = await call_tool_text(
+            weather_server, "get_alert_changes", {"state": "KS"}
+        )
+        assert result == "Unable to fetch alerts for this state."
+
+        mock_changes.return_value = {
+            "token": "KS.abc.2",
+            "new": [],
+            "updated": [],
+            "expired": [],
+            "resync": False,
+        }
+        result = await call_tool_text(
+            weather_server,
+            "get_alert_changes",
+            {"state": "KS", "since_token": "KS.abc.2"},
+        )
+
+        assert result == "No changes since the last call.\n\nToken: KS.abc.2"
+        mock_changes.assert_called_with("KS", "KS.abc.2")
+
+
+@pytest.mark.asyncio
+async def test_get_alerts_tool_pages(weather_server):
+    """Test that get_alerts returns pages of alerts, most severe first."""
+    features = [
+        {
+            "properties": {
+                "id": f"alert-{number}",
+                "event": f"Event {number}",
+                "severity": "Severe" if number % 2 else "Minor",
+            }
+        }
+        for number in range(5)
+    ]
+
+    with patch.object(
+        weather_service, "get_weather_alerts", new_callable=AsyncMock
+    ) as mock_alerts:
+        mock_alerts.return_value = {"features": features}
+        first = await call_tool_text(
+            weather_server, "get_alerts", {"state": "KS", "max_results": 2}
+        )
+        cursor = first.split('cursor="')[1].split('"')[0]
+        second = await call_tool_text(
+            weather_server,
+            "get_alerts",
+            {"state": "KS", "max_results": 10, "cursor": cursor},
+        )
+        invalid = await call_tool_text(
+            weather_server, "get_alerts", {"state": "KS", "cursor": "bogus"}
+        )
+
+    assert "Event: Event 1" in first and "Event: Event 3" in first
+    assert "Event 0" not in first
+    assert "Showing alerts 1-2 of 5." in first
+    assert second.count("Event: ") == 3
+    assert second.endswith("Showing alerts 3-5 of 5.")
+    assert invalid.startswith("Invalid cursor")
+
+
+@pytest.mark.asyncio
+async def test_get_current_conditions_tool(weather_server):
+    """Test the get_current_conditions MCP tool."""
+    conditions = {
+        "station": ("KMHK", "Manhattan", 39.1, -96.7, "America/Chicago"),
+        "distance_km": 4.6,
+        "observation": {
+            "timestamp": "2024-01-01T18:53:00+00:00",
+            "temperature": {"value": 0.0},
+        },
+    }
+
+    with patch.object(
+        weather_service, "get_current_conditions", new_callable=AsyncMock
+    ) as mock_conditions:
+        mock_conditions.return_value = conditions
+        result = await call_tool_text(
+            weather_server,
+            "get_current_conditions",
+            {"latitude": 39.2, "longitude": -96.6},
+        )
+        mock_conditions.return_value = None
+        failure = await call_tool_text(
+            weather_server,
+            "get_current_conditions",
+            {"latitude": 39.2, "longitude": -96.6},
+        )
+
+    # Shown in the station's time zone
+    assert "Observed: Mon 01 Jan 12:53" in result
+    assert "Temperature: 32°F (0.0°C)" in result
+    assert failure == "Unable to fetch current conditions for the specified location."
+
+
+@pytest.mark.asyncio
+async def test_get_forecast_by_place_tool(weather_server):
+    """Test the get_forecast_by_place MCP tool resolving a place offline."""
+    with (
+        patch.object(
+            weather_service, "get_weather_point", new_callable=AsyncMock
+        ) as mock_point,
+        patch.object(
+            weather_service, "get_weather_forecast", new_callable=AsyncMock
+        ) as mock_forecast,
+    ):
+        mock_point.return_value = POINT
+        mock_forecast.return_value = {
+            "properties": {
+                "periods": [
+                    {
+                        "name": "Today",
+                        "temperature": 61,
+                        "temperatureUnit": "F",
+                        "windSpeed": "5 mph",
+                        "windDirection": "W",
+                        "detailedForecast": "Sunny",
+                    }
+                ]
+            }
+        }
+        result = await call_tool_text(
+            weather_server, "get_forecast_by_place", {"place": "boulder colorado"}
+        )
+        missing = await call_tool_text(
+            weather_server, "get_forecast_by_place", {"place": "Xyzzy, ZZ"}
+        )
+
+    mock_point.assert_called_once_with(40.015, -105.2705)
+    assert result.startswith("Forecast for Boulder, CO (40.0150, -105.2705):\n")
+    assert "Temperature: 61°F" in result
+    assert missing == "Unable to find a US place matching 'Xyzzy, ZZ'."
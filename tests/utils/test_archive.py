@@ -0,0 +1,80 @@
+"""Tests for the response record/replay archive."""
+
+import gzip
+import json
+
+import httpx
+import pytest
+from unittest.mock import patch
+from src.weather.utils.archive import (
+    INDEX_FILE,
+    ResponseArchive,
+    archive_key,
+    http_mode,
+)
+from src.weather.utils.http import make_request
+
+
+def test_archive_key_ignores_host_and_sorts_query():
+    """Test that keys do not depend on the base URL or parameter order."""
+    assert archive_key("https://api.weather.gov/points/1,2") == "/points/1,2"
+    assert archive_key("http://127.0.0.1:8765/points/1,2") == "/points/1,2"
+    assert (
+        archive_key("https://api.weather.gov/alerts?b=2", {"a": "1"})
+        == "/alerts?a=1&b=2"
+    )
+
+
+def test_http_mode(monkeypatch):
+    """Test reading the HTTP mode from the environment."""
+    monkeypatch.delenv("WEATHER_HTTP_MODE", raising=False)
+    assert http_mode() == "live"
+    monkeypatch.setenv("WEATHER_HTTP_MODE", "Replay")
+    assert http_mode() == "replay"
+    monkeypatch.setenv("WEATHER_HTTP_MODE", "bogus")
+    assert http_mode() == "live"
+
+
+def test_archive_roundtrip(tmp_path):
+    """Test saving, compressing and reloading responses."""
+    archive = ResponseArchive(str(tmp_path))
+    entry = archive.save("/points/1,2", {"properties": {"gridId": "TOP"}})
+    archive.save("/points/1,2", {"properties": {"gridId": "OAX"}})
+
+    raw = gzip.decompress((tmp_path / entry["file"]).read_bytes())
+    assert json.loads(raw) == {"properties": {"gridId": "OAX"}}
+    assert len((tmp_path / INDEX_FILE).read_text().splitlines()) == 2
+
+    # A fresh instance reads the index back, with the latest entry winning
+    reopened = ResponseArchive(str(tmp_path))
+    assert len(reopened) == 1
+    assert reopened.load("/points/1,2") == {"properties": {"gridId": "OAX"}}
+    assert reopened.load("/points/3,4") is None
+
+
+@pytest.mark.asyncio
+async def test_make_request_record_then_replay(tmp_path, monkeypatch):
+    """Test recording a live response and replaying it without the network."""
+    monkeypatch.setenv("WEATHER_ARCHIVE_DIR", str(tmp_path))
+    calls = []
+    real_client = httpx.AsyncClient
+
+    def respond(request):
+        calls.append(request)
+        return httpx.Response(200, json={"features": []})
+
+    transport = httpx.MockTransport(respond)
+    with patch(
+        "httpx.AsyncClient",
+        side_effect=lambda **kwargs: real_client(transport=transport, **kwargs),
+    ):
+        monkeypatch.setenv("WEATHER_HTTP_MODE", "record")
+        recorded = await make_request("https://api.weather.gov/alerts/active/area/KS")
+
+        monkeypatch.setenv("WEATHER_HTTP_MODE", "replay")
+        replayed = await make_request("http://localhost:9/alerts/active/area/KS")
+        missing = await make_request("http://localhost:9/alerts/active/area/TX")
+
+        assert recorded == replayed == {"features": []}
+        assert missing is None
+        assert len(calls) == 1
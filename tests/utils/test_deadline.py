@@ -0,0 +1,70 @@
+"""Tests for the per-call deadline module."""
+
+import asyncio
+
+import pytest
+from unittest.mock import patch
+from src.weather.utils.deadline import (
+    MAX_HOP_TIMEOUT,
+    DeadlineExceeded,
+    current_budget,
+    deadline,
+    hop_timeout,
+    skip_hop,
+)
+
+
+def test_hop_timeout_outside_budget():
+    """Test that hops outside any budget get the fixed timeout."""
+    assert current_budget() is None
+    assert hop_timeout() == MAX_HOP_TIMEOUT
+
+
+def test_budget_split_across_hops():
+    """Test that each hop gets an even share of the time left."""
+    with patch("src.weather.utils.deadline.time.monotonic", return_value=100.0):
+        with deadline(20, hops=2) as budget:
+            assert hop_timeout() == 10
+            # The last hop gets everything that is left
+            assert hop_timeout() == 20
+            assert hop_timeout() == 20
+            assert not budget.exhausted
+    assert current_budget() is None
+
+
+def test_skipped_hop_gives_time_to_the_next():
+    """Test that a cache hit leaves its share to the following hop."""
+    with patch("src.weather.utils.deadline.time.monotonic", return_value=100.0):
+        with deadline(20, hops=2):
+            skip_hop()
+            assert hop_timeout() == 20
+
+
+def test_nested_budget_never_outlasts_outer():
+    """Test that an inner budget is capped by the outer one."""
+    with patch("src.weather.utils.deadline.time.monotonic", return_value=100.0):
+        with deadline(5) as outer:
+            with deadline(60) as inner:
+                assert inner.expires_at == outer.expires_at
+                assert current_budget() is inner
+            assert current_budget() is outer
+
+
+def test_exhausted_budget():
+    """Test that no hop starts once the budget has run out."""
+    with deadline(0) as budget:
+        with pytest.raises(DeadlineExceeded):
+            hop_timeout()
+        assert budget.exhausted
+
+
+@pytest.mark.asyncio
+async def test_budget_is_shared_with_tasks():
+    """Test that hops made in tasks started under a budget count against it."""
+
+    async def hop():
+        return hop_timeout()
+
+    with deadline(20, hops=3) as budget:
+        await asyncio.create_task(hop())
+        assert budget.hops == 2
@@ -1,6 +1,13 @@
 """Tests for the formatting utilities module."""
 
-from src.weather.utils.formatting import format_alert, format_forecast
+from datetime import timezone
+
+from src.weather.utils.formatting import (
+    format_alert,
+    format_alert_changes,
+    format_forecast,
+    format_observation,
+)
 
 
 def test_format_alert_complete():
@@ -86,3 +93,64 @@ def test_format_forecast_integer_temperature():
     assert "Temperature: 72°F" in formatted
     assert "Wind: 5 mph SW" in formatted
     assert "Forecast: Sunny and clear" in formatted
+
+
+def test_format_alert_changes():
+    """Test formatting alert changes with the next token."""
+    feature = {"properties": {"event": "Flood Warning", "areaDesc": "Test County"}}
+    changes = {
+        "token": "KS.abc.2",
+        "new": [feature],
+        "updated": [],
+        "expired": [("old", "Wind Advisory", "Other County")],
+        "resync": False,
+    }
+
+    result = format_alert_changes(changes, "KS.abc.1")
+
+    assert result.startswith("New alerts (1):")
+    assert "Event: Flood Warning" in result
+    assert "Updated alerts" not in result
+    assert "Expired alerts (1):\n    Wind Advisory (Other County)" in result
+    assert result.endswith("Token: KS.abc.2")
+
+
+def test_format_alert_changes_nothing_changed():
+    """Test formatting when nothing changed or the token was unknown."""
+    changes = {"token": "t", "new": [], "updated": [], "expired": [], "resync": False}
+    assert (
+        format_alert_changes(changes, "t")
+        == "No changes since the last call.\n\nToken: t"
+    )
+
+    changes["resync"] = True
+    assert format_alert_changes(changes, "stale").startswith("Token not recognized")
+
+
+def test_format_observation():
+    """Test formatting an observation, leaving out unreported measurements."""
+    conditions = {
+        "station": ("KMHK", "Manhattan Regional Airport", 39.1, -96.7, ""),
+        "distance_km": 4.6,
+        "observation": {
+            "timestamp": "2024-01-01T18:53:00+00:00",
+            "textDescription": "Partly Cloudy",
+            "temperature": {"value": 22.2},
+            "dewpoint": {"value": None},
+            "relativeHumidity": {"value": 46.3},
+            "windSpeed": {"value": 20.4},
+            "windDirection": {"value": 220},
+            "windGust": {"value": None},
+            "barometricPressure": {"value": 101520},
+        },
+    }
+
+    assert format_observation(conditions, timezone.utc) == (
+        "Station: Manhattan Regional Airport (KMHK), 5 km away\n"
+        "Observed: Mon 01 Jan 18:53\n"
+        "Conditions: Partly Cloudy\n"
+        "Temperature: 72°F (22.2°C)\n"
+        "Humidity: 46%\n"
+        "Wind: SW 13 mph\n"
+        "Pressure: 1015 hPa"
+    )
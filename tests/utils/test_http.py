@@ -1,115 +1,235 @@
 """Tests for the HTTP utilities module."""
 
+import asyncio
+import gzip
+import json
+
 import pytest
-from unittest.mock import patch, AsyncMock, MagicMock
+from unittest.mock import patch
 import httpx
-from src.weather.utils.http import make_request
+from src.weather.utils.deadline import deadline
+from src.weather.utils.http import (
+    ACCEPT_ENCODING,
+    endpoint_name,
+    get_transfer_stats,
+    make_request,
+    get_buffered_bytes,
+    reset_transfer_stats,
+    set_response_budget,
+    shared_client,
+)
+
+REAL_ASYNC_CLIENT = httpx.AsyncClient
+
+
+async def stream_body(body):
+    """Yield a body as a stream, so httpx counts the bytes it downloads."""
+    yield body
+
+
+@pytest.fixture
+def mock_transport():
+    """Route make_request through an httpx.MockTransport with a given handler."""
+    requests = []
+
+    def install(handler):
+        def record(request):
+            requests.append(request)
+            return handler(request)
+
+        transport = httpx.MockTransport(record)
+        return patch(
+            "httpx.AsyncClient",
+            side_effect=lambda **kwargs: REAL_ASYNC_CLIENT(
+                transport=transport, **kwargs
+            ),
+        )
+
+    install.requests = requests
+    reset_transfer_stats()
+    yield install
+    reset_transfer_stats()
 
 
 @pytest.mark.asyncio
-async def test_make_request_success():
+async def test_make_request_success(mock_transport):
     """Test successful HTTP request."""
-    mock_response = MagicMock()
-    mock_response.json.return_value = {"data": "test_data"}
-    mock_response.raise_for_status = MagicMock()
+    with mock_transport(lambda request: httpx.Response(200, json={"data": "x"})):
+        result = await make_request("https://test.com/api")
 
-    with patch("httpx.AsyncClient") as mock_client:
-        mock_client_instance = AsyncMock()
-        mock_client_instance.get.return_value = mock_response
-        mock_client.return_value.__aenter__.return_value = mock_client_instance
+    assert result == {"data": "x"}
+    request = mock_transport.requests[0]
+    assert str(request.url) == "https://test.com/api"
+    assert request.headers["User-Agent"] == "weather-app/1.0"
+    assert request.headers["Accept-Encoding"] == ACCEPT_ENCODING
+    assert request.extensions["timeout"]["read"] == 30
 
-        result = await make_request("https://test.com/api")
 
-        assert result == {"data": "test_data"}
-        mock_client_instance.get.assert_called_once_with(
+@pytest.mark.asyncio
+async def test_make_request_with_headers_and_params(mock_transport):
+    """Test HTTP request with custom headers and parameters."""
+    with mock_transport(lambda request: httpx.Response(200, json={"data": "x"})):
+        result = await make_request(
             "https://test.com/api",
-            headers={"User-Agent": "weather-app/1.0"},
-            params=None,
-            timeout=30,
+            headers={"Accept": "application/json", "X-Custom": "Value"},
+            params={"param1": "value1"},
         )
 
+    assert result == {"data": "x"}
+    request = mock_transport.requests[0]
+    assert request.url.params["param1"] == "value1"
+    assert request.headers["Accept"] == "application/json"
+    assert request.headers["X-Custom"] == "Value"
+    assert request.headers["User-Agent"] == "weather-app/1.0"
+
 
 @pytest.mark.asyncio
-async def test_make_request_with_headers_and_params():
-    """Test HTTP request with custom headers and parameters."""
-    mock_response = MagicMock()
-    mock_response.json.return_value = {"data": "test_data"}
-    mock_response.raise_for_status = MagicMock()
+async def test_make_request_failure_request_error(mock_transport):
+    """Test HTTP request failure handling for request errors."""
 
-    with patch("httpx.AsyncClient") as mock_client:
-        mock_client_instance = AsyncMock()
-        mock_client_instance.get.return_value = mock_response
-        mock_client.return_value.__aenter__.return_value = mock_client_instance
+    def fail(request):
+        raise httpx.ConnectError("Connection error", request=request)
 
-        headers = {"Accept": "application/json", "X-Custom": "Value"}
-        params = {"param1": "value1"}
+    with mock_transport(fail):
+        result = await make_request("https://test.com/api")
 
-        result = await make_request(
-            "https://test.com/api", headers=headers, params=params
+    assert result is None
+
+
+@pytest.mark.asyncio
+async def test_make_request_failure_http_error(mock_transport):
+    """Test HTTP request failure handling for HTTP status errors."""
+    with mock_transport(lambda request: httpx.Response(404, text="Not Found")):
+        result = await make_request("https://test.com/api")
+
+    assert result is None
+
+
+@pytest.mark.asyncio
+async def test_make_request_custom_timeout(mock_transport):
+    """Test HTTP request with custom timeout."""
+    with mock_transport(lambda request: httpx.Response(200, json={"data": "x"})):
+        result = await make_request("https://test.com/api", timeout=60)
+
+    assert result == {"data": "x"}
+    assert mock_transport.requests[0].extensions["timeout"]["read"] == 60
+
+
+@pytest.mark.asyncio
+async def test_make_request_gzip_and_byte_counters(mock_transport):
+    """Test decoding a gzip response and counting wire and body bytes."""
+    body = json.dumps({"features": [{"id": str(i)} for i in range(500)]}).encode()
+
+    def respond(request):
+        return httpx.Response(
+            200,
+            content=stream_body(gzip.compress(body)),
+            headers={"Content-Encoding": "gzip"},
         )
 
-        assert result == {"data": "test_data"}
-        mock_client_instance.get.assert_called_once_with(
-            "https://test.com/api",
-            headers={
-                "User-Agent": "weather-app/1.0",
-                "Accept": "application/json",
-                "X-Custom": "Value",
-            },
-            params=params,
-            timeout=30,
+    with mock_transport(respond):
+        result = await make_request(
+            "https://api.weather.gov/alerts/active/area/KS", max_bytes=len(body)
         )
 
+    assert len(result["features"]) == 500
+    stats = get_transfer_stats()["/alerts/active/area/{}"]
+    assert stats["requests"] == 1
+    assert stats["body_bytes"] == len(body)
+    assert stats["wire_bytes"] == len(gzip.compress(body))
+    assert stats["wire_bytes"] < stats["body_bytes"]
+
 
 @pytest.mark.asyncio
-async def test_make_request_failure_request_error():
-    """Test HTTP request failure handling for request errors."""
-    with patch("httpx.AsyncClient") as mock_client:
-        mock_client_instance = AsyncMock()
-        mock_client_instance.get.side_effect = httpx.RequestError("Connection error")
-        mock_client.return_value.__aenter__.return_value = mock_client_instance
+async def test_make_request_aborts_oversized_body(mock_transport):
+    """Test that a body decoding past the limit is abandoned."""
+    body = json.dumps({"data": "x" * 10_000}).encode()
 
-        result = await make_request("https://test.com/api")
+    def respond(request):
+        return httpx.Response(
+            200, content=gzip.compress(body), headers={"Content-Encoding": "gzip"}
+        )
+
+    with mock_transport(respond):
+        # The compressed body is small enough, but it decodes past the limit
+        result = await make_request("https://test.com/api", max_bytes=1_000)
 
-        assert result is None
+    assert result is None
+    assert get_transfer_stats()["/api"]["oversized"] == 1
 
 
 @pytest.mark.asyncio
-async def test_make_request_failure_http_error():
-    """Test HTTP request failure handling for HTTP status errors."""
-    mock_response = MagicMock()
-    mock_response.raise_for_status.side_effect = httpx.HTTPStatusError(
-        "404 Not Found", request=MagicMock(), response=MagicMock()
+async def test_make_request_rejects_declared_oversized_body(mock_transport):
+    """Test that a declared Content-Length over the limit is rejected up front."""
+    with mock_transport(lambda request: httpx.Response(200, content=b"{}" * 600)):
+        result = await make_request("https://test.com/api", max_bytes=1_000)
+
+    assert result is None
+
+
+@pytest.mark.asyncio
+async def test_make_request_capped_by_response_budget(mock_transport):
+    """Test that the memory governor's response budget lowers the body limit."""
+    body = json.dumps({"data": "x" * 2_000}).encode()
+    set_response_budget(1_000)
+    try:
+        with mock_transport(lambda request: httpx.Response(200, content=body)):
+            assert await make_request("https://test.com/api") is None
+            set_response_budget(None)
+            assert await make_request("https://test.com/api") is not None
+    finally:
+        set_response_budget(None)
+
+    assert get_buffered_bytes() == 0
+
+
+def test_endpoint_name():
+    """Test reducing URLs to endpoints."""
+    assert endpoint_name("https://api.weather.gov/points/39.7,-97.1") == "/points/{}"
+    assert (
+        endpoint_name("https://api.weather.gov/gridpoints/TOP/32,81/forecast/hourly")
+        == "/gridpoints/{}/{}/forecast/hourly"
     )
+    assert endpoint_name("https://api.weather.gov/alerts/active") == "/alerts/active"
 
-    with patch("httpx.AsyncClient") as mock_client:
-        mock_client_instance = AsyncMock()
-        mock_client_instance.get.return_value = mock_response
-        mock_client.return_value.__aenter__.return_value = mock_client_instance
 
-        # The make_request function should catch the exception and return None
-        result = await make_request("https://test.com/api")
-        assert result is None
+@pytest.mark.asyncio
+async def test_make_request_bounded_by_budget(mock_transport):
+    """Test that a slow response is abandoned when the budget runs out."""
+
+    async def slow(request):
+        await asyncio.sleep(5)
+        return httpx.Response(200, json={})
+
+    with mock_transport(slow):
+        with deadline(0.05) as budget:
+            result = await make_request("https://test.com/api")
+
+    assert result is None
+    assert budget.exhausted
+    assert get_transfer_stats()["/api"]["requests"] == 1
 
 
 @pytest.mark.asyncio
-async def test_make_request_custom_timeout():
-    """Test HTTP request with custom timeout."""
-    mock_response = MagicMock()
-    mock_response.json.return_value = {"data": "test_data"}
-    mock_response.raise_for_status = MagicMock()
+async def test_make_request_skipped_when_budget_exhausted(mock_transport):
+    """Test that no request is made once the budget has run out."""
+    with mock_transport(lambda request: httpx.Response(200, json={})):
+        with deadline(0):
+            result = await make_request("https://test.com/api")
 
-    with patch("httpx.AsyncClient") as mock_client:
-        mock_client_instance = AsyncMock()
-        mock_client_instance.get.return_value = mock_response
-        mock_client.return_value.__aenter__.return_value = mock_client_instance
+    assert result is None
+    assert mock_transport.requests == []
 
-        result = await make_request("https://test.com/api", timeout=60)
 
-        assert result == {"data": "test_data"}
-        mock_client_instance.get.assert_called_once_with(
-            "https://test.com/api",
-            headers={"User-Agent": "weather-app/1.0"},
-            params=None,
-            timeout=60,
-        )
+@pytest.mark.asyncio
+async def test_shared_client_reuses_one_client(mock_transport):
+    """Test that requests made while a shared client is open all go through it."""
+    with mock_transport(lambda request: httpx.Response(200, json={})) as client_class:
+        async with shared_client():
+            await make_request("https://test.com/a")
+            await make_request("https://test.com/b")
+        await make_request("https://test.com/c")
+
+    # One shared client, then one for the request made after it closed
+    assert client_class.call_count == 2
+    assert len(mock_transport.requests) == 3
@@ -0,0 +1,144 @@
+"""Tests for the paging module."""
+
+import pytest
+from src.weather.utils.paging import (
+    alert_sort_key,
+    decode_cursor,
+    encode_cursor,
+    page_footer,
+    paginate,
+)
+
+
+def alert(alert_id, severity, onset):
+    """Build an alert feature."""
+    return {"properties": {"id": alert_id, "severity": severity, "onset": onset}}
+
+
+ALERTS = [
+    alert("a", "Minor", "2024-01-01T10:00:00-05:00"),
+    alert("b", "Extreme", "2024-01-01T12:00:00-05:00"),
+    alert("c", "Severe", None),
+    alert("d", "Extreme", "2024-01-01T16:00:00+00:00"),
+    alert("e", None, "2024-01-01T08:00:00-05:00"),
+    alert("f", "Severe", "2024-01-01T09:00:00-05:00"),
+]
+
+
+def alert_id(feature):
+    """Render an alert as its id."""
+    return feature["properties"]["id"]
+
+
+def test_alert_sort_key():
+    """Test that alerts sort by severity, then onset, with no onset last."""
+    ordered = sorted(ALERTS, key=alert_sort_key)
+    # 16:00 UTC is 11:00 at -05:00, so 'd' starts before 'b'
+    assert [alert_id(feature) for feature in ordered] == [
+        "d",
+        "b",
+        "f",
+        "c",
+        "a",
+        "e",
+    ]
+
+
+def test_cursor_round_trip():
+    """Test that cursors decode to the key they were made from."""
+    key = alert_sort_key(ALERTS[0])
+    assert decode_cursor(encode_cursor(key)) == key
+
+    with pytest.raises(ValueError):
+        decode_cursor("not a cursor")
+    with pytest.raises(ValueError):
+        decode_cursor(encode_cursor(({"nested": 1},)))
+
+
+@pytest.mark.parametrize(
+    "key",
+    [
+        ("a", 1, 2),
+        (1, 2.5),
+        (1, 2.5, "a", "b"),
+        (True, 2.5, "a"),
+        (1, "2025-01-01", "a"),
+        (1.5, 2.5, "a"),
+    ],
+)
+def test_decode_cursor_rejects_wrong_shape(key):
+    """Test that cursors not shaped like an alert sort key are rejected."""
+    with pytest.raises(ValueError):
+        decode_cursor(encode_cursor(key))
+    with pytest.raises(ValueError):
+        paginate(ALERTS, alert_sort_key, alert_id, encode_cursor(key))
+
+
+def test_paginate_walks_every_item_once():
+    """Test that following cursors visits each item once, in order."""
+    seen = []
+    cursor = ""
+    while True:
+        page = paginate(ALERTS, alert_sort_key, alert_id, cursor, max_results=4)
+        seen.extend(page["entries"])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+
+    assert seen == ["d", "b", "f", "c", "a", "e"]
+    assert page["before"] == 4
+    assert page["total"] == 6
+
+
+def test_paginate_renders_only_the_page():
+    """Test that items past the page are never rendered."""
+    rendered = []
+
+    def render(feature):
+        rendered.append(alert_id(feature))
+        return alert_id(feature)
+
+    paginate(ALERTS, alert_sort_key, render, max_results=2)
+
+    assert rendered == ["d", "b"]
+
+
+def test_paginate_max_chars():
+    """Test that a page stops before exceeding max_chars."""
+    render = lambda feature: alert_id(feature) * 10  # noqa: E731
+
+    page = paginate(ALERTS, alert_sort_key, render, max_chars=25)
+    # Two entries and the newline between them
+    assert page["entries"] == ["d" * 10, "b" * 10]
+
+    # A single oversized entry is truncated rather than dropped
+    page = paginate(ALERTS, alert_sort_key, render, max_chars=4)
+    assert page["entries"] == ["dddd..."]
+    assert page["next_cursor"] is not None
+
+
+def test_paginate_stable_when_items_change():
+    """Test that a cursor still resumes after the items it has seen change."""
+    page = paginate(ALERTS, alert_sort_key, alert_id, max_results=2)
+
+    # An earlier alert expires and a later one appears
+    changed = [feature for feature in ALERTS if alert_id(feature) != "d"]
+    changed.append(alert("g", "Minor", "2024-01-01T11:00:00-05:00"))
+    page = paginate(changed, alert_sort_key, alert_id, page["next_cursor"])
+
+    assert page["entries"] == ["f", "c", "a", "g", "e"]
+    assert page["next_cursor"] is None
+
+
+def test_page_footer():
+    """Test the footer describing a page."""
+    page = paginate(ALERTS, alert_sort_key, alert_id)
+    assert page_footer(page) == ""
+
+    page = paginate(ALERTS, alert_sort_key, alert_id, max_results=2)
+    footer = page_footer(page)
+    assert footer.startswith("\n\nShowing alerts 1-2 of 6.")
+    assert f'cursor="{page["next_cursor"]}"' in footer
+
+    page = paginate(ALERTS, alert_sort_key, alert_id, page["next_cursor"])
+    assert page_footer(page) == "\n\nShowing alerts 3-6 of 6."
@@ -0,0 +1,159 @@
+"""Tests for the forecast time series utilities."""
+
+import math
+from array import array
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from src.weather.utils.formatting import format_forecast_digest
+from src.weather.utils.timeseries import (
+    crossings,
+    decode_hourly,
+    decode_layer,
+    extremes,
+    parse_duration,
+    parse_interval,
+    series_start,
+    summarize,
+    windows,
+)
+
+START = datetime(2025, 3, 18, 4, tzinfo=timezone.utc)
+
+
+def test_parse_duration():
+    """Test ISO-8601 duration parsing."""
+    assert parse_duration("PT1H") == timedelta(hours=1)
+    assert parse_duration("P1DT6H") == timedelta(days=1, hours=6)
+    assert parse_duration("P7DT21H") == timedelta(days=7, hours=21)
+    assert parse_duration("P1W") == timedelta(weeks=1)
+    with pytest.raises(ValueError):
+        parse_duration("P")
+    with pytest.raises(ValueError):
+        parse_duration("3 hours")
+
+
+def test_parse_interval():
+    """Test ISO-8601 interval parsing."""
+    assert parse_interval("2025-03-18T04:00:00+00:00/PT3H") == (
+        START,
+        timedelta(hours=3),
+    )
+
+
+def test_series_start():
+    """Test that the axis starts at the current hour inside the valid times."""
+    valid_times = "2025-03-18T04:00:00+00:00/P7DT21H"
+
+    now = datetime(2025, 3, 19, 10, 42, tzinfo=timezone.utc)
+    assert series_start(valid_times, now) == datetime(
+        2025, 3, 19, 10, tzinfo=timezone.utc
+    )
+    assert series_start(valid_times, datetime(2030, 1, 1, tzinfo=timezone.utc)) == START
+
+
+def test_decode_layer_expands_intervals():
+    """Test expansion of multi-hour intervals and unit conversion."""
+    layer = {
+        "uom": "wmoUnit:degC",
+        "values": [
+            {"validTime": "2025-03-18T03:00:00+00:00/PT2H", "value": 0},
+            {"validTime": "2025-03-18T05:00:00+00:00/PT3H", "value": 10},
+        ],
+    }
+
+    values, unit = decode_layer(layer, START, 6)
+
+    assert unit == "°F"
+    assert list(values[:4]) == [32.0, 50.0, 50.0, 50.0]
+    assert all(math.isnan(value) for value in values[4:])
+
+
+def test_decode_layer_accumulated():
+    """Test that interval totals are spread across their hours."""
+    layer = {
+        "uom": "wmoUnit:mm",
+        "values": [{"validTime": "2025-03-18T04:00:00+00:00/PT6H", "value": 25.4 * 6}],
+    }
+
+    values, unit = decode_layer(layer, START, 6, accumulated=True)
+
+    assert unit == "in"
+    assert list(values) == pytest.approx([1.0] * 6)
+
+
+def test_decode_hourly():
+    """Test conversion of hourly periods to series."""
+    periods = [
+        {
+            "startTime": "2025-03-18T05:00:00-05:00",
+            "temperature": 40,
+            "temperatureUnit": "F",
+            "probabilityOfPrecipitation": {"value": 20},
+            "windSpeed": "10 mph",
+        },
+        {
+            "startTime": "2025-03-18T06:00:00-05:00",
+            "temperature": 0,
+            "temperatureUnit": "C",
+            "probabilityOfPrecipitation": {"value": None},
+            "windSpeed": "5 to 15 mph",
+        },
+    ]
+
+    start, series = decode_hourly(periods, 3)
+
+    assert start == datetime(2025, 3, 18, 10, tzinfo=timezone.utc)
+    assert list(series["temperature"][:2]) == [40.0, 32.0]
+    assert series["precipitation"][0] == 20.0
+    assert math.isnan(series["precipitation"][1])
+    assert list(series["wind"][:2]) == [10.0, 15.0]
+    assert math.isnan(series["temperature"][2])
+
+
+def test_extremes_and_windows():
+    """Test min/max, threshold windows and crossings."""
+    nan = float("nan")
+    values = array("d", [35, 30, nan, 28, 40, 60, 70, 20, 55])
+
+    assert extremes(values) == {"min": 20, "min_at": 7, "max": 70, "max_at": 6}
+    assert extremes(array("d", [nan])) is None
+    assert windows(values, 50) == [(5, 7, 70), (8, 9, 55)]
+    assert crossings(values, 32) == [
+        (1, "below"),
+        (4, "above"),
+        (7, "below"),
+        (8, "above"),
+    ]
+
+
+def test_summarize_and_format():
+    """Test digest construction and formatting."""
+    series = {
+        "temperature": array("d", [34, 30, 31, 36]),
+        "precipitation": array("d", [10, 60, 80, 20]),
+        "wind": array("d", [5, 12, 8, 4]),
+        "amount": array("d", [0, 0.1, 0.25, 0]),
+    }
+
+    digest = summarize(START, series)
+
+    assert digest["hours"] == 4
+    assert digest["temperature"]["min_at"] == START + timedelta(hours=1)
+    assert digest["freezing"] == [
+        (START + timedelta(hours=1), "below"),
+        (START + timedelta(hours=3), "above"),
+    ]
+    assert digest["rain_windows"] == [
+        (START + timedelta(hours=1), START + timedelta(hours=3), 80)
+    ]
+    assert digest["precipitation_total"] == pytest.approx(0.35)
+    assert digest["gust"] is None
+
+    formatted = format_forecast_digest(digest, timezone.utc)
+
+    assert "low 30°F (Tue 18 Mar 05:00)" in formatted
+    assert "Freezing: drops below 32°F at Tue 18 Mar 05:00" in formatted
+    assert "Rain likely: Tue 18 Mar 05:00 to Tue 18 Mar 07:00 (peak 80%)" in formatted
+    assert "Total precipitation: 0.35 in" in formatted
+    assert "Wind: up to 12 mph" in formatted
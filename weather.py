@@ -1,84 +1,18 @@
-import httpx
-from typing import Any
-from mcp.server.fastmcp import FastMCP
+"""Standalone weather MCP server with the NWS alert and forecast tools.
 
+Kept for configurations that launch this file (``uv run weather.py`` or
+``mcp dev weather.py``). The server is the package's own (see
+src/weather/server.py), limited to the weather tools, so it shares the
+package's pooled HTTP client, caching, admission control and logging.
+"""
 
-mcp = FastMCP("weather")
+from src.weather.logs import configure_logging
+from src.weather.server import create_server, main
 
-# Constants
-NWS_API_BASE = "https://api.weather.gov"
-USER_AGENT = "weather-app/1.0"
-
-
-async def make_nws_request(url: str) -> dict[str, Any] | None:
-    headers = {
-        "User-Agent": USER_AGENT,
-        "Accept": "application/geo+json",
-    }
-
-    async with httpx.AsyncClient() as client:
-        try:
-            response = await client.get(url, headers=headers, timeout=30)
-            response.raise_for_status()
-            return response.json()
-        except httpx.RequestError:
-            return None
-
-
-def format_alert(feature: dict) -> str:
-    props = feature["properties"]
-
-    return f"""
-    Event: {props.get('event', 'Unknown')}
-    Area: {props.get('areaDesc', 'Unknown')}
-    Severity: {props.get('severity', 'Unknown')}
-    Description: {props.get('description', 'No description available')}
-    Instructions: {props.get('instruction', 'No specific instructions provided')}
-    """
-
-
-@mcp.tool()
-async def get_alerts(state: str) -> str:
-    url = f"{NWS_API_BASE}/alerts/active/area/{state}"
-    data = await make_nws_request(url)
-
-    if not data or "features" not in data:
-        return "Unable to fetch alerts or no alerts found."
-
-    if not data["features"]:
-        return "No active alerts for this state."
-
-    alerts = [format_alert(feature) for feature in data["features"]]
-    return "\n".join(alerts)
-
-
-@mcp.tool()
-async def get_forecast(latitude: float, longitude: float) -> str:
-    points_url = f"{NWS_API_BASE}/points/{latitude},{longitude}"
-    points_data = await make_nws_request(points_url)
-
-    if not points_data:
-        return "Unable to fetch forecast data for the specified location."
-
-    forecast_url = points_data["properties"]["forecast"]
-    forecast_data = await make_nws_request(forecast_url)
-
-    if not forecast_data:
-        return "Unable to fetch detailed forecast data."
-
-    periods = forecast_data["properties"]["periods"]
-    forecasts = []
-    for period in periods[:5]:  # Only show next 5 periods
-        forecast = f"""
-        {period['name']}:
-        Temperature: {period['temperature']}°{period['temperatureUnit']}
-        Wind: {period['windSpeed']} {period['windDirection']}
-        Forecast: {period['detailedForecast']}
-        """
-        forecasts.append(forecast)
-
-    return "\n---\n".join(forecasts)
+# Before FastMCP sets up logging of its own
+configure_logging()
+mcp = create_server("weather", features=("weather",))
 
 
 if __name__ == "__main__":
-    mcp.run(transport="stdio")
+    main(server=mcp)